@@ -0,0 +1,99 @@
+"""
+Benchmark: streaming Parquet export vs. DataFrame then to_parquet.
+
+Offline, rows are generated in batches the way the cursor hands them over
+and written with ArrowTableBuilder + ParquetSink (what export_to_parquet
+does per batch), then the same rows are collected into one DataFrame and
+written with to_parquet (the previous way). The streaming run goes first:
+the process RSS only grows, so the second run's peak includes the first.
+
+With --live, export_to_parquet is timed on generated rows through
+PostgresConnectorAsyncPool (connection settings from the environment / .env).
+
+Usage:
+    python benchmarks/bench_export_parquet.py [n_rows] [--live]
+"""
+
+import asyncio
+import datetime
+import os
+import sys
+import tempfile
+import time
+from decimal import Decimal
+
+import pandas as pd
+
+from postgres_helpers.arrow import ArrowTableBuilder, DATE, INT8, NUMERIC, TEXT, TIMESTAMP
+from postgres_helpers.parquet import ParquetSink, process_rss
+
+BATCH_SIZE = 10_000
+COLUMNS = ["id", "name", "day", "created", "amount"]
+OIDS = [INT8, TEXT, DATE, TIMESTAMP, NUMERIC]
+
+
+def make_batches(n_rows: int):
+    start = datetime.datetime(2024, 1, 1)
+    for first in range(0, n_rows, BATCH_SIZE):
+        yield [
+            (i, f"customer {i % 5000}", (start + datetime.timedelta(days=i % 365)).date(),
+             start + datetime.timedelta(seconds=i), Decimal(i % 100_000) / 100)
+            for i in range(first, min(first + BATCH_SIZE, n_rows))
+        ]
+
+
+def streaming(n_rows: int, path: str) -> None:
+    started = time.perf_counter()
+    builder = ArrowTableBuilder(COLUMNS, OIDS, [None, None, None, None, 12], [None, None, None, None, 2])
+    sink = ParquetSink(path, row_group_rows=100_000)
+    for rows in make_batches(n_rows):
+        builder.add_rows(rows)
+        sink.write(builder.take_table())
+    sink.close()
+    report("streaming", n_rows, time.perf_counter() - started, path)
+
+
+def whole_dataframe(n_rows: int, path: str) -> None:
+    started = time.perf_counter()
+    rows = [row for batch in make_batches(n_rows) for row in batch]
+    pd.DataFrame(rows, columns=COLUMNS).to_parquet(path)
+    report("DataFrame", n_rows, time.perf_counter() - started, path)
+
+
+def report(name: str, n_rows: int, elapsed: float, path: str) -> None:
+    print(
+        f"{name:>10}: {elapsed:7.2f} s   {n_rows / elapsed:12,.0f} rows/s   "
+        f"{os.path.getsize(path) / 2 ** 20:7.1f} MiB file   RSS now {process_rss() / 2 ** 20:7.0f} MiB"
+    )
+
+
+async def live(n_rows: int, directory: str) -> None:
+    from postgres_helpers.postgres_async_pool import PostgresConnectorAsyncPool
+
+    sql_query = """
+        SELECT i AS id, 'customer ' || (i % 5000) AS name, DATE '2024-01-01' + (i % 365) AS day,
+               TIMESTAMP '2024-01-01' + i * INTERVAL '1 second' AS created, (i % 100000) / 100.0 AS amount
+        FROM generate_series(1, $1) AS i
+    """
+    async with PostgresConnectorAsyncPool(pool_size_min=1, pool_size_max=1) as db:
+        result = await db.export_to_parquet(sql_query, (n_rows,), os.path.join(directory, "live.parquet"))
+    print(
+        f"{'live':>10}: {result.elapsed_seconds:7.2f} s   {result.rows_per_second:12,.0f} rows/s   "
+        f"{result.bytes_written / 2 ** 20:7.1f} MiB file   peak RSS {result.peak_rss_bytes / 2 ** 20:7.0f} MiB"
+    )
+
+
+def main(argv: list) -> None:
+    numbers = [int(arg) for arg in argv if not arg.startswith("--")]
+    n_rows = numbers[0] if numbers else 1_000_000
+    print(f"{n_rows:,} rows, RSS at start {process_rss() / 2 ** 20:.0f} MiB")
+
+    with tempfile.TemporaryDirectory() as directory:
+        streaming(n_rows, os.path.join(directory, "streaming.parquet"))
+        whole_dataframe(n_rows, os.path.join(directory, "dataframe.parquet"))
+        if "--live" in argv:
+            asyncio.run(live(n_rows, directory))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
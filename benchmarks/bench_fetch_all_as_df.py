@@ -0,0 +1,71 @@
+"""
+Benchmark: DataFrame construction in fetch_all_as_df.
+
+Compares the previous path (one dict per row, then pd.DataFrame(list_of_dicts))
+with the column-wise rows_to_df used by the connectors. Rows are generated
+locally as tuples, the shape psycopg2 returns and asyncpg Records mimic, so no
+database is needed and only the Python-side conversion is measured.
+
+Usage:
+    python benchmarks/bench_fetch_all_as_df.py [n_rows]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from postgres_helpers.columnar import rows_to_df
+
+COLUMNS = ["id", "account", "amount", "price", "created_at", "active"]
+
+
+def make_rows(n_rows: int) -> list:
+    start = datetime(2024, 1, 1)
+    return [
+        (i, f"account_{i % 1000}", i * 3, i / 7, start + timedelta(seconds=i), i % 2 == 0)
+        for i in range(n_rows)
+    ]
+
+
+def via_dicts(rows: list) -> pd.DataFrame:
+    results = [dict(zip(COLUMNS, row)) for row in rows]
+    return pd.DataFrame(results) if results else pd.DataFrame()
+
+
+def via_columns(rows: list) -> pd.DataFrame:
+    return rows_to_df(rows, COLUMNS)
+
+
+def measure(func, rows: list):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    df = func(rows)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return df, elapsed, peak
+
+
+def main(n_rows: int) -> None:
+    rows = make_rows(n_rows)
+    print(f"{n_rows:,} rows x {len(COLUMNS)} columns")
+
+    results = {}
+    for name, func in (("list of dicts", via_dicts), ("column-wise", via_columns)):
+        df, elapsed, peak = measure(func, rows)
+        results[name] = (df, elapsed, peak)
+        print(f"{name:>14}: {elapsed:8.3f} s   peak {peak / 1024 ** 2:9.1f} MiB")
+
+    old_df, old_time, old_peak = results["list of dicts"]
+    new_df, new_time, new_peak = results["column-wise"]
+    pd.testing.assert_frame_equal(old_df, new_df)
+    print(f"speed-up {old_time / new_time:.2f}x, peak memory {new_peak / old_peak:.0%} of previous")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,83 @@
+"""
+Benchmark: SQL generation of the dict-based insert/upsert helpers.
+
+Compares the previous per-call string building (column list, placeholders
+and SET clause joined on every call) with build_insert_sql, which looks the
+statement up in the insert_template cache. Only the Python side is
+measured, no database is needed. Also counts the distinct statement texts
+produced when the same keys arrive in varying order: each one is a separate
+prepared statement for the driver.
+
+Usage:
+    python benchmarks/bench_insert_sql.py [n_calls] [n_columns]
+"""
+
+import random
+import sys
+import time
+
+from postgres_helpers.bulk import build_insert_sql, insert_template
+
+
+def previous_upsert_sql(table_name: str, parameters_dict: dict, constraint_key=None) -> tuple:
+    columns = '"' + '","'.join(parameters_dict.keys()) + '"'
+    placeholders = ", ".join(f"${i + 1}" for i in range(len(parameters_dict)))
+    if constraint_key is None:
+        constraint_key = f"{table_name}_pkey"
+    set_clause = ", ".join(
+        f'"{key}" = EXCLUDED."{key}"' for key in parameters_dict.keys()
+    )
+    query = (
+        f'INSERT INTO "{table_name}" ({columns}) VALUES ({placeholders})'
+        f' ON CONFLICT ON CONSTRAINT {constraint_key}'
+        f' DO UPDATE SET {set_clause}'
+        f' RETURNING *, xmax'
+    )
+    return query, tuple(parameters_dict.values())
+
+
+def cached_upsert_sql(table_name: str, parameters_dict: dict, constraint_key=None) -> tuple:
+    return build_insert_sql(table_name, parameters_dict, "update", constraint_key, returning="*, xmax")
+
+
+def make_events(n_calls: int, n_columns: int, shuffled: bool) -> list:
+    keys = [f"field_{i}" for i in range(n_columns)]
+    rng = random.Random(0)
+    events = []
+    for call in range(n_calls):
+        order = rng.sample(keys, len(keys)) if shuffled else keys
+        events.append({key: call for key in order})
+    return events
+
+
+def measure(func, events: list) -> tuple:
+    started = time.perf_counter()
+    texts = set()
+    for event in events:
+        query, _ = func("events", event)
+        texts.add(query)
+    return time.perf_counter() - started, len(texts)
+
+
+def main(n_calls: int, n_columns: int) -> None:
+    print(f"{n_calls:,} upserts of {n_columns} columns")
+    for shuffled in (False, True):
+        events = make_events(n_calls, n_columns, shuffled)
+        insert_template.cache_clear()
+        results = {}
+        for name, func in (("previous", previous_upsert_sql), ("cached", cached_upsert_sql)):
+            elapsed, statements = measure(func, events)
+            results[name] = elapsed
+            print(
+                f"{'shuffled keys' if shuffled else 'same key order':>14} {name:>8}: "
+                f"{elapsed / n_calls * 1e6:7.2f} us/call   {statements:,} distinct statements"
+            )
+        print(f"{'':>14} speed-up {results['previous'] / results['cached']:.2f}x")
+    print(insert_template.cache_info())
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    )
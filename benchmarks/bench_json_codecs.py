@@ -0,0 +1,111 @@
+"""
+Benchmark: decoding wide jsonb rows with the json codecs.
+
+Decodes rows of jsonb documents the way the driver hands them to the codec
+(one JSON text per value) with the stdlib json module and, when installed,
+with orjson: the per-row work JsonCodecs takes over. Documents are generated
+locally, so no database is needed and only the decode is measured.
+
+With --live, also times fetch_all_as_dicts of the same number of generated
+jsonb rows through PostgresConnectorAsyncPool (connection settings from the
+environment / .env): text returned as-is (driver default), then decoded by
+JsonCodecs with the stdlib and orjson. n_keys is at most 50 there
+(jsonb_build_object takes up to 100 arguments).
+
+Usage:
+    python benchmarks/bench_json_codecs.py [n_rows] [n_keys] [--live]
+"""
+
+import asyncio
+import json
+import sys
+import time
+
+from postgres_helpers.json_codecs import JsonCodecs, orjson
+
+
+def make_document(row: int, n_keys: int) -> dict:
+    document = {}
+    for key in range(n_keys):
+        kind = key % 5
+        if kind == 0:
+            document[f"int_{key}"] = row * key
+        elif kind == 1:
+            document[f"float_{key}"] = row / (key + 1)
+        elif kind == 2:
+            document[f"text_{key}"] = f"value {row} of field {key}"
+        elif kind == 3:
+            document[f"list_{key}"] = [row, key, row + key]
+        else:
+            document[f"nested_{key}"] = {"id": row, "active": row % 2 == 0, "tags": ["a", "b"]}
+    return document
+
+
+def make_texts(n_rows: int, n_keys: int) -> list:
+    return [json.dumps(make_document(row, n_keys)) for row in range(n_rows)]
+
+
+def measure(loads, texts: list) -> float:
+    started = time.perf_counter()
+    for text in texts:
+        loads(text)
+    return time.perf_counter() - started
+
+
+def offline(n_rows: int, n_keys: int) -> None:
+    texts = make_texts(n_rows, n_keys)
+    megabytes = sum(len(text) for text in texts) / 1024 ** 2
+    print(f"{n_rows:,} rows x {n_keys} keys, {megabytes:.1f} MiB of JSON text")
+
+    decoders = [("json", json.loads)]
+    if orjson is not None:
+        decoders.append(("orjson", orjson.loads))
+    else:
+        print("orjson not installed: pip install postgres_helpers[json]")
+
+    results = {}
+    for name, loads in decoders:
+        elapsed = measure(loads, texts)
+        results[name] = elapsed
+        print(f"{name:>8}: {elapsed:8.3f} s   {n_rows / elapsed:12,.0f} rows/s   {megabytes / elapsed:8.1f} MiB/s")
+
+    if "orjson" in results:
+        assert orjson.loads(texts[-1]) == json.loads(texts[-1])
+        print(f"speed-up {results['json'] / results['orjson']:.2f}x")
+
+
+async def live(n_rows: int, n_keys: int) -> None:
+    from postgres_helpers.postgres_async_pool import PostgresConnectorAsyncPool
+
+    fields = ", ".join(
+        f"'key_{key}', jsonb_build_object('id', i, 'value', i * {key}, 'text', 'row ' || i, 'tags', '[1, 2, 3]'::jsonb)"
+        for key in range(n_keys)
+    )
+    sql_query = f"SELECT jsonb_build_object({fields}) AS doc FROM generate_series(1, $1) AS i"
+
+    setups = [("text (default)", None), ("json", JsonCodecs(dumps=json.dumps, loads=json.loads))]
+    if orjson is not None:
+        setups.append(("orjson", JsonCodecs()))
+
+    for name, codecs in setups:
+        async with PostgresConnectorAsyncPool(pool_size_min=1, pool_size_max=1, json_codecs=codecs) as db:
+            await db.fetch_all_as_dicts(sql_query, (10,))  # connection and plan warm
+            started = time.perf_counter()
+            rows = await db.fetch_all_as_dicts(sql_query, (n_rows,))
+            elapsed = time.perf_counter() - started
+        print(f"{name:>15}: {elapsed:8.3f} s   {len(rows) / elapsed:12,.0f} rows/s   ({type(rows[0]['doc']).__name__})")
+
+
+def main(argv: list) -> None:
+    flags = [arg for arg in argv if arg.startswith("--")]
+    numbers = [int(arg) for arg in argv if not arg.startswith("--")]
+    n_rows = numbers[0] if numbers else 100_000
+    n_keys = numbers[1] if len(numbers) > 1 else 50
+
+    offline(n_rows, n_keys)
+    if "--live" in flags:
+        asyncio.run(live(n_rows, n_keys))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,206 @@
+"""
+NumPy conversion of query results.
+
+fetch_all_as_numpy() and fetch_column() on the connectors return typed
+NumPy arrays. When every column has a fixed-width type, the query is run as
+
+    COPY (SELECT coalesce(c0, '0'), c0 IS NULL, ... FROM (<query>) AS q(c0, ...))
+    TO STDOUT (FORMAT binary)
+
+Every row of that COPY output has the same layout, so the output is read
+with np.frombuffer as a big-endian structured array and copied into
+preallocated native arrays: no Python object is created per cell. The
+IS NULL flags give the null mask of each column.
+
+Fixed-width types: bool, int2, int4, int8, oid, float4, float8, date,
+timestamp, timestamptz (UTC), time, and numeric (read as float8). Results
+with other types (text, ...) are read row by row, those columns as object
+arrays.
+
+Nulls, with nulls="nan" (default): NaN in float columns, NaT in
+datetime64/timedelta64 columns; int and bool columns holding nulls become
+float64. With nulls="mask": a numpy.ma.MaskedArray with the null mask, and
+the column types unchanged.
+
+Usage:
+    prices = await db.fetch_all_as_numpy("SELECT ts, price, volume FROM ticks WHERE sym = $1", ("ABC",))
+    prices["price"].mean()
+
+    volumes = await db.fetch_column("SELECT volume FROM ticks", dtype="float32")
+"""
+
+import struct
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from postgres_helpers.arrow import (
+    BOOL, INT2, INT4, INT8, OID, FLOAT4, FLOAT8, DATE, TIMESTAMP, TIMESTAMPTZ, TIME, NUMERIC
+)
+
+NULL_MODES = ("nan", "mask")
+
+# Type OID -> (wire dtype in the binary COPY output, result dtype, SQL zero)
+FIXED_WIDTH_TYPES = {
+    BOOL: (">?", "bool", "'f'"),
+    INT2: (">i2", "int16", "'0'"),
+    INT4: (">i4", "int32", "'0'"),
+    INT8: (">i8", "int64", "'0'"),
+    OID: (">u4", "uint32", "'0'"),
+    FLOAT4: (">f4", "float32", "'0'"),
+    FLOAT8: (">f8", "float64", "'0'"),
+    NUMERIC: (">f8", "float64", "'0'"),
+    DATE: (">i4", "datetime64[D]", "'epoch'"),
+    TIMESTAMP: (">i8", "datetime64[us]", "'epoch'"),
+    TIMESTAMPTZ: (">i8", "datetime64[us]", "'epoch'"),
+    TIME: (">i8", "timedelta64[us]", "'00:00'"),
+}
+
+# Dates and timestamps are sent relative to 2000-01-01
+_PG_EPOCH_DAYS = 10957
+_PG_EPOCH_MICROSECONDS = _PG_EPOCH_DAYS * 86400 * 1000000
+
+_COPY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+
+Columns = Sequence[Tuple[str, int]]
+
+
+def _check_nulls(nulls: str) -> None:
+    if nulls not in NULL_MODES:
+        raise ValueError(f"nulls must be one of {NULL_MODES}, got {nulls!r}")
+
+
+def is_fixed_width(columns: Columns) -> bool:
+    """True when every (name, type OID) column can go through binary COPY."""
+    return bool(columns) and all(oid in FIXED_WIDTH_TYPES for _, oid in columns)
+
+
+def copy_select(sql_query: str, columns: Columns) -> str:
+    """
+    SELECT returning, per column of sql_query, its value (zero when null)
+    and an IS NULL flag.
+    """
+    aliases = [f"c{index}" for index in range(len(columns))]
+    selected = []
+    for alias, (_, oid) in zip(aliases, columns):
+        value = f"q.{alias}::float8" if oid == NUMERIC else f"q.{alias}"
+        selected.append(f"coalesce({value}, {FIXED_WIDTH_TYPES[oid][2]}), q.{alias} IS NULL")
+    return f"SELECT {', '.join(selected)} FROM ({sql_query}) AS q({', '.join(aliases)})"
+
+
+def copy_query(sql_query: str, columns: Columns) -> str:
+    """COPY statement sending the rows of copy_select() in binary format."""
+    return f"COPY ({copy_select(sql_query, columns)}) TO STDOUT (FORMAT binary)"
+
+
+def _result_dtype(columns: Columns, dtypes: List[str], masks: List[np.ndarray], nulls: str) -> np.dtype:
+    fields = []
+    for (name, _), dtype, mask in zip(columns, dtypes, masks):
+        if nulls == "nan" and mask.any() and np.dtype(dtype).kind in "biu":
+            dtype = "float64"
+        fields.append((name, dtype))
+    return np.dtype(fields)
+
+
+def _finish(out: np.ndarray, masks: List[np.ndarray], nulls: str) -> Union[np.ndarray, np.ma.MaskedArray]:
+    names = out.dtype.names
+    if nulls == "mask":
+        mask = np.zeros(len(out), dtype=[(name, "?") for name in names])
+        for name, column_mask in zip(names, masks):
+            mask[name] = column_mask
+        return np.ma.MaskedArray(out, mask=mask)
+
+    for name, column_mask in zip(names, masks):
+        if column_mask.any():
+            column = out[name]
+            column[column_mask] = np.datetime64("NaT") if column.dtype.kind == "M" else (
+                np.timedelta64("NaT") if column.dtype.kind == "m" else np.nan
+            )
+    return out
+
+
+def parse_copy(data: Union[bytes, bytearray, memoryview], columns: Columns, nulls: str = "nan"):
+    """
+    Arrays from the binary COPY output of copy_query()/copy_select().
+
+    Args:
+        data: The whole COPY output.
+        columns: (name, type OID) of the columns of the original query.
+        nulls: "nan" or "mask".
+
+    Returns:
+        Structured array with one field per column (MaskedArray for "mask").
+    """
+    _check_nulls(nulls)
+    data = memoryview(data)
+    if bytes(data[:11]) != _COPY_SIGNATURE:
+        raise ValueError("Not a binary COPY output")
+    extension_length = struct.unpack_from(">i", data, 15)[0]
+    body = data[19 + extension_length:-2]  # header, trailer (-1 as int16)
+
+    fields = [("count", ">i2")]
+    for index, (_, oid) in enumerate(columns):
+        fields += [
+            (f"length{index}", ">i4"), (f"value{index}", FIXED_WIDTH_TYPES[oid][0]),
+            (f"flag_length{index}", ">i4"), (f"null{index}", ">?"),
+        ]
+    row = np.dtype(fields)  # packed, as on the wire
+    if len(body) % row.itemsize:
+        raise ValueError("Unexpected binary COPY row layout")
+    wire = np.frombuffer(body, dtype=row)
+
+    masks = [wire[f"null{index}"].astype(bool) for index in range(len(columns))]
+    dtypes = [FIXED_WIDTH_TYPES[oid][1] for _, oid in columns]
+    out = np.empty(len(wire), dtype=_result_dtype(columns, dtypes, masks, nulls))
+
+    for index, ((name, oid), dtype) in enumerate(zip(columns, dtypes)):
+        values = wire[f"value{index}"]
+        target = out[name]
+        if oid == DATE:
+            np.add(values, _PG_EPOCH_DAYS, out=target.view("int64"), casting="unsafe")
+        elif oid in (TIMESTAMP, TIMESTAMPTZ):
+            np.add(values, _PG_EPOCH_MICROSECONDS, out=target.view("int64"), casting="unsafe")
+        elif oid == TIME:
+            target.view("int64")[:] = values
+        else:
+            target[:] = values
+    return _finish(out, masks, nulls)
+
+
+def _time_microseconds(value: Any) -> int:
+    return ((value.hour * 60 + value.minute) * 60 + value.second) * 1000000 + value.microsecond
+
+
+def _naive_utc(value: Any) -> Any:
+    return value.replace(tzinfo=None) - value.utcoffset()
+
+
+def rows_to_numpy(rows: Sequence[Sequence[Any]], columns: Columns, nulls: str = "nan"):
+    """
+    Arrays from rows decoded by the driver, for results with types that
+    can't go through binary COPY. Those columns become object arrays.
+    """
+    _check_nulls(nulls)
+    count = len(rows)
+    values_by_column = list(zip(*rows)) if rows else [() for _ in columns]
+    masks = [np.fromiter((value is None for value in values), dtype=bool, count=count) for values in values_by_column]
+    dtypes = [FIXED_WIDTH_TYPES[oid][1] if oid in FIXED_WIDTH_TYPES else "object" for _, oid in columns]
+    out = np.empty(count, dtype=_result_dtype(columns, dtypes, masks, nulls))
+
+    for (name, oid), values in zip(columns, values_by_column):
+        target = out[name]
+        if target.dtype == object:
+            target[:] = values
+            continue
+        convert = {TIME: _time_microseconds, TIMESTAMPTZ: _naive_utc}.get(oid)
+        if oid == TIME:
+            target = target.view("int64")
+        zero = 0 if target.dtype.kind in "biuf" else None
+        target[:] = [zero if value is None else (convert(value) if convert else value) for value in values]
+    return _finish(out, masks, nulls)
+
+
+def first_column(arrays, dtype: Optional[Any] = None):
+    """The first column of a fetch_all_as_numpy result, converted to dtype if given."""
+    column = arrays[arrays.dtype.names[0]]
+    return column if dtype is None else column.astype(dtype, copy=False)
@@ -0,0 +1,211 @@
+"""
+Arrow conversion of query results.
+
+fetch_all_as_arrow() on the connectors reads a result through a server-side
+cursor and turns each batch of rows into Arrow arrays straight away, so the
+rows of only one batch are held as Python objects at a time. The table is
+assembled from the batches without concatenating them.
+
+Column types come from the Postgres type OIDs of the result:
+
+- int2/int4/int8/oid, float4/float8, bool, bytea, text types,
+- numeric(p, s) -> decimal128/decimal256 (unconstrained numeric: inferred
+  from the values, widened across batches). asyncpg doesn't report the
+  precision, so numeric is always inferred on the async connectors. NaN and
+  infinite numerics have no decimal value and become null,
+- date, time, timestamp, timestamptz (UTC), interval -> duration,
+- uuid -> arrow.uuid extension type,
+- json/jsonb -> string (the JSON text),
+- 1-D arrays of the above -> list.
+
+Other types are inferred by pyarrow from the values.
+
+Requires pyarrow (pip install postgres_helpers[arrow]).
+
+Usage:
+    table = await db.fetch_all_as_arrow("SELECT * FROM events", batch_size=50_000)
+    pq.write_table(table, "events.parquet")
+    df = polars.from_arrow(table)
+"""
+
+import json
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence
+
+import psycopg2.extras
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+# Type OIDs (pg_type.oid) of the built-in types
+BOOL, BYTEA, NAME, INT8, INT2, INT4, TEXT, OID = 16, 17, 19, 20, 21, 23, 25, 26
+JSON, XML, CIDR, FLOAT4, FLOAT8, MACADDR, INET = 114, 142, 650, 700, 701, 829, 869
+BPCHAR, VARCHAR, DATE, TIME, TIMESTAMP, TIMESTAMPTZ = 1042, 1043, 1082, 1083, 1114, 1184
+INTERVAL, TIMETZ, NUMERIC, UUID, JSONB = 1186, 1266, 1700, 2950, 3802
+
+# Array type OID -> element type OID
+ARRAY_ELEMENTS = {
+    1000: BOOL, 1001: BYTEA, 1003: NAME, 1005: INT2, 1007: INT4, 1009: TEXT,
+    1014: BPCHAR, 1015: VARCHAR, 1016: INT8, 1021: FLOAT4, 1022: FLOAT8,
+    1182: DATE, 1183: TIME, 1115: TIMESTAMP, 1185: TIMESTAMPTZ, 1187: INTERVAL,
+    1231: NUMERIC, 2951: UUID, 199: JSON, 3807: JSONB,
+}
+
+# Types sent to Arrow as text, with the value converted when the driver
+# decoded it (ip addresses, json decoded by a codec...)
+_TEXT_VALUES: Dict[int, Callable[[Any], str]] = {
+    JSON: json.dumps,
+    JSONB: json.dumps,
+    CIDR: str,
+    MACADDR: str,
+    INET: str,
+    TIMETZ: str,
+}
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError as ex:
+        raise ImportError(
+            "fetch_all_as_arrow requires pyarrow: pip install postgres_helpers[arrow]"
+        ) from ex
+    return pyarrow
+
+
+def arrow_type(oid: int, precision: Optional[int] = None, scale: Optional[int] = None) -> Optional["pa.DataType"]:
+    """
+    Arrow type of a Postgres type.
+
+    Args:
+        oid: Type OID.
+        precision: Declared precision of a numeric, if known.
+        scale: Declared scale of a numeric, if known.
+
+    Returns:
+        The Arrow type, or None when it has to be inferred from the values.
+    """
+    pa = _pyarrow()
+    if oid in ARRAY_ELEMENTS:
+        element = arrow_type(ARRAY_ELEMENTS[oid])
+        return pa.list_(element) if element is not None else None
+    if oid == NUMERIC:
+        if not precision or scale is None:
+            return None
+        if precision <= 38:
+            return pa.decimal128(precision, scale)
+        return pa.decimal256(precision, scale) if precision <= 76 else None
+
+    types = {
+        BOOL: pa.bool_,
+        BYTEA: pa.binary,
+        INT2: pa.int16,
+        INT4: pa.int32,
+        INT8: pa.int64,
+        OID: pa.uint32,
+        FLOAT4: pa.float32,
+        FLOAT8: pa.float64,
+        DATE: pa.date32,
+        TIME: lambda: pa.time64("us"),
+        TIMESTAMP: lambda: pa.timestamp("us"),
+        TIMESTAMPTZ: lambda: pa.timestamp("us", tz="UTC"),
+        INTERVAL: lambda: pa.duration("us"),
+        UUID: pa.uuid,
+    }
+    if oid in types:
+        return types[oid]()
+    if oid in (NAME, TEXT, XML, BPCHAR, VARCHAR) or oid in _TEXT_VALUES:
+        return pa.string()
+    return None
+
+
+class ArrowTableBuilder:
+    """
+    Builds a pyarrow Table from batches of rows.
+
+    Args:
+        names: Column names.
+        oids: Type OID of each column.
+        precisions: Declared numeric precision of each column (optional).
+        scales: Declared numeric scale of each column (optional).
+    """
+
+    def __init__(
+            self,
+            names: Sequence[str],
+            oids: Sequence[int],
+            precisions: Optional[Sequence[Optional[int]]] = None,
+            scales: Optional[Sequence[Optional[int]]] = None
+    ):
+        precisions = precisions or [None] * len(names)
+        scales = scales or [None] * len(names)
+        self.names = list(names)
+        self.types = [arrow_type(*column) for column in zip(oids, precisions, scales)]
+        self._to_text = [_TEXT_VALUES.get(oid) for oid in oids]
+        self._numeric = [oid == NUMERIC for oid in oids]
+        self._chunks: List[List[Any]] = [[] for _ in self.names]
+
+    @classmethod
+    def from_attributes(cls, attributes: Sequence[Any]) -> "ArrowTableBuilder":
+        """Builder for an asyncpg statement (PreparedStatement.get_attributes())."""
+        return cls([a.name for a in attributes], [a.type.oid for a in attributes])
+
+    @classmethod
+    def from_description(cls, description: Sequence[Any]) -> "ArrowTableBuilder":
+        """Builder for a psycopg2 cursor.description (numeric precision included)."""
+        return cls(
+            [c.name for c in description],
+            [c.type_code for c in description],
+            [c.precision for c in description],
+            [c.scale for c in description]
+        )
+
+    def add_rows(self, rows: Sequence[Sequence[Any]]) -> None:
+        """Convert a batch of rows (tuples, asyncpg Records) to one chunk per column."""
+        if not rows:
+            return
+        pa = _pyarrow()
+        for index, values in enumerate(zip(*rows)):
+            to_text = self._to_text[index]
+            if to_text is not None:
+                values = [v if v is None or isinstance(v, str) else to_text(v) for v in values]
+            try:
+                chunk = pa.array(values, self.types[index])
+            except pa.ArrowInvalid:
+                if not self._numeric[index]:
+                    raise
+                # Decimal('NaN') / Decimal('Infinity') don't fit a decimal type
+                values = [v if v is None or v.is_finite() else None for v in values]
+                chunk = pa.array(values, self.types[index])
+            self._chunks[index].append(chunk)
+
+    def table(self) -> "pa.Table":
+        pa = _pyarrow()
+        columns = []
+        for chunks, column_type in zip(self._chunks, self.types):
+            if column_type is None:
+                # Inferred: batches may disagree (decimal scales, all-null batch)
+                column_type = pa.null()
+                for chunk in chunks:
+                    column_type = pa.unify_schemas(
+                        [pa.schema([("c", column_type)]), pa.schema([("c", chunk.type)])],
+                        promote_options="permissive"
+                    ).field("c").type
+                chunks = [chunk if chunk.type == column_type else chunk.cast(column_type) for chunk in chunks]
+            columns.append(pa.chunked_array(chunks, column_type))
+        return pa.Table.from_arrays(columns, names=self.names)
+
+    def take_table(self) -> "pa.Table":
+        """Table of the rows added since the last call; the builder starts over."""
+        table = self.table()
+        self._chunks = [[] for _ in self.names]
+        return table
+
+
+def prepare_psycopg2_cursor(cursor: Any) -> None:
+    """
+    Make a psycopg2 cursor return json/jsonb as text and uuid as uuid.UUID,
+    the values Arrow takes without conversion.
+    """
+    psycopg2.extras.register_default_json(cursor, loads=lambda text: text)
+    psycopg2.extras.register_default_jsonb(cursor, loads=lambda text: text)
+    psycopg2.extras.register_uuid(conn_or_curs=cursor)
@@ -0,0 +1,200 @@
+"""
+Adaptive sizing of the async connection pool.
+
+With an AutoscalePolicy, PostgresConnectorAsyncPool creates its asyncpg pool
+with max_size=policy.max_size (the hard ceiling) but lets only an effective
+number of connections be checked out at once. That number starts at
+pool_size_max and:
+
+- grows when an acquire waited longer than target_wait, or more than
+  target_queue callers are waiting, since the last check,
+- shrinks by step once cooldown seconds have passed without pressure and
+  with fewer connections in use than the effective size,
+- stays between pool_size_min and max_size.
+
+Connections idle for idle_timeout seconds are closed by asyncpg, so the
+backend connections follow the effective size down. Every resize is logged.
+
+Usage:
+    from postgres_helpers.autoscale import AutoscalePolicy
+
+    db = PostgresConnectorAsyncPool(
+        pool_size_min=2, pool_size_max=5,
+        autoscale=AutoscalePolicy(max_size=40, target_wait=0.02, cooldown=120)
+    )
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Deque, Optional
+
+logger = logging.getLogger(f"postgres_helpers:{Path(__file__).name}")
+
+
+@dataclass
+class AutoscalePolicy:
+    """
+    How the async pool resizes itself.
+
+    Attributes:
+        max_size: Hard ceiling on connections to the primary.
+        target_wait: Acquire wait in seconds above which the pool grows.
+        target_queue: Callers waiting for a connection above which the pool
+                      grows.
+        step: Connections added or removed per decision. Growth adds at
+              least the number of waiting callers.
+        cooldown: Seconds without pressure before the pool shrinks.
+        check_interval: Minimum seconds between two decisions.
+        idle_timeout: Seconds after which asyncpg closes an idle connection
+                      (default: cooldown).
+    """
+    max_size: int
+    target_wait: float = 0.01
+    target_queue: int = 0
+    step: int = 1
+    cooldown: float = 60.0
+    check_interval: float = 1.0
+    idle_timeout: Optional[float] = None
+
+
+class PoolGate:
+    """
+    Limit on the connections checked out at once, resizable while in use.
+
+    Waiters are served in arrival order. Not thread-safe: use it from the
+    event loop of the pool.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_use = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def waiting(self) -> int:
+        """Callers waiting for a slot."""
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        if self.in_use < self.limit and not self._waiters:
+            self.in_use += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # Cancelled after the slot was handed over: pass it on
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        self.in_use -= 1
+        self._wake()
+
+    def resize(self, limit: int) -> None:
+        self.limit = limit
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_use < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_use += 1
+                waiter.set_result(None)
+
+
+class PoolAutoscaler:
+    """
+    Resize decisions of PoolGate.
+
+    Args:
+        policy: AutoscalePolicy.
+        min_size: Floor of the effective size.
+        initial_size: Effective size to start with.
+
+    Raises:
+        ValueError: If the ceiling is below initial_size or step is not positive.
+    """
+
+    def __init__(self, policy: AutoscalePolicy, min_size: int, initial_size: int):
+        if policy.max_size < initial_size:
+            raise ValueError(
+                f"AutoscalePolicy.max_size ({policy.max_size}) is below pool_size_max ({initial_size})"
+            )
+        if policy.step < 1:
+            raise ValueError(f"AutoscalePolicy.step must be at least 1, got {policy.step}")
+
+        self.policy = policy
+        self.min_size = max(1, min_size)
+        self.size = initial_size
+
+        now = time.monotonic()
+        self._checked_at = now
+        self._calm_since = now
+        self._max_wait = 0.0
+        self._peak_in_use = 0
+        self._at_ceiling = False
+
+    def observe(self, wait: float, in_use: int) -> None:
+        """Record the wait of an acquire and the connections in use after it."""
+        if wait > self._max_wait:
+            self._max_wait = wait
+        if in_use > self._peak_in_use:
+            self._peak_in_use = in_use
+
+    def evaluate(self, in_use: int, waiting: int) -> Optional[int]:
+        """
+        Decide on a resize, at most once per check_interval.
+
+        Returns:
+            The new effective size, or None to keep the current one.
+        """
+        now = time.monotonic()
+        if now - self._checked_at < self.policy.check_interval:
+            return None
+        self._checked_at = now
+
+        policy = self.policy
+        max_wait, self._max_wait = self._max_wait, 0.0
+        old = self.size
+
+        if max_wait > policy.target_wait or waiting > policy.target_queue:
+            self._calm_since = now
+            self._peak_in_use = in_use
+            if old >= policy.max_size:
+                if not self._at_ceiling:
+                    logger.warning(
+                        f"Pool kept at its ceiling of {policy.max_size}: acquire wait "
+                        f"{max_wait * 1000:.1f}ms, {waiting} waiting"
+                    )
+                self._at_ceiling = True
+                return None
+            self.size = min(policy.max_size, old + max(policy.step, waiting))
+            logger.info(
+                f"Pool grown {old} -> {self.size}: acquire wait {max_wait * 1000:.1f}ms "
+                f"(target {policy.target_wait * 1000:.1f}ms), {waiting} waiting"
+            )
+            return self.size
+
+        self._at_ceiling = False
+        peak = max(self._peak_in_use, in_use)
+        if now - self._calm_since >= policy.cooldown and old > self.min_size and peak < old:
+            self.size = max(self.min_size, peak, old - policy.step)
+            logger.info(
+                f"Pool shrunk {old} -> {self.size}: at most {peak} in use "
+                f"over the last {now - self._calm_since:.0f}s"
+            )
+            self._calm_since = now
+            self._peak_in_use = in_use
+            return self.size
+
+        return None
@@ -0,0 +1,686 @@
+"""
+Helpers shared by the bulk loading methods of the connectors.
+
+These functions prepare row data for PostgreSQL's COPY protocol and parse
+the status strings it returns. They hold no connection state, so every
+connector variant (sync, async, pool, non-pool) can use them.
+
+Usage:
+    from postgres_helpers.bulk import records_as_tuples, parse_copy_status
+
+    rows = records_as_tuples([{"id": 1, "name": "a"}], ["id", "name"])
+    status = await conn.copy_records_to_table("users", records=rows, columns=["id", "name"])
+    print(parse_copy_status(status))  # 1
+"""
+
+import functools
+import json
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from typing import (
+    Any, AsyncIterable, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+)
+
+import pandas as pd
+
+Record = Union[Sequence[Any], Dict[str, Any]]
+Records = Union[Iterable[Record], AsyncIterable[Record]]
+
+# Temporary table bulk_upsert() stages rows in, dropped at commit, and the
+# column holding each row's input position (used to keep the last duplicate)
+UPSERT_STAGING_TABLE = "_ph_upsert_staging"
+UPSERT_ROW_NUMBER = "_ph_row"
+
+
+def _as_tuple(record: Record, columns: Sequence[str]) -> Tuple:
+    """Return a row tuple ordered like `columns`."""
+    if isinstance(record, dict):
+        return tuple(record[column] for column in columns)
+    return tuple(record)
+
+
+def _iter_tuples(records: Iterable[Record], columns: Sequence[str]) -> Iterator[Tuple]:
+    for record in records:
+        yield _as_tuple(record, columns)
+
+
+async def _aiter_tuples(records: AsyncIterable[Record], columns: Sequence[str]) -> AsyncIterator[Tuple]:
+    async for record in records:
+        yield _as_tuple(record, columns)
+
+
+def _numbered(records: Iterable[Tuple]) -> Iterator[Tuple]:
+    for number, record in enumerate(records):
+        yield record + (number,)
+
+
+async def _anumbered(records: AsyncIterable[Tuple]) -> AsyncIterator[Tuple]:
+    number = 0
+    async for record in records:
+        yield record + (number,)
+        number += 1
+
+
+def records_as_tuples(
+        records: Records,
+        columns: Sequence[str]
+) -> Union[Iterator[Tuple], AsyncIterator[Tuple]]:
+    """
+    Lazily convert tuples or dicts to row tuples ordered like `columns`.
+
+    Sync iterables give a sync iterator and async iterables give an async
+    iterator, so the rows are never materialised as a list.
+
+    Args:
+        records: List, iterator or async iterator of tuples or dicts.
+        columns: Column order of the produced tuples. Dicts are read by key.
+
+    Returns:
+        An iterator (or async iterator) of tuples.
+    """
+    if hasattr(records, "__aiter__"):
+        return _aiter_tuples(records, columns)
+    return _iter_tuples(records, columns)
+
+
+def parse_copy_status(status: str) -> int:
+    """
+    Get the row count from a COPY status string (e.g. "COPY 1500").
+
+    Returns:
+        Number of rows copied, or -1 if the status can't be parsed.
+    """
+    try:
+        return int(status.split()[-1])
+    except (AttributeError, ValueError, IndexError):
+        return -1
+
+
+def numbered_records_as_tuples(
+        records: Records,
+        columns: Sequence[str]
+) -> Union[Iterator[Tuple], AsyncIterator[Tuple]]:
+    """Like records_as_tuples(), with each row's input position appended."""
+    tuples = records_as_tuples(records, columns)
+    if hasattr(tuples, "__aiter__"):
+        return _anumbered(tuples)
+    return _numbered(tuples)
+
+
+def resolve_columns(records: Records, columns: Optional[Sequence[str]]) -> Optional[List[str]]:
+    """
+    Get the column list of a bulk load.
+
+    Returns `columns` when given, otherwise the keys of the first record of a
+    list of dicts, or None for an empty list.
+
+    Raises:
+        ValueError: If the columns can't be read from the records.
+    """
+    if columns is not None:
+        return list(columns)
+    if isinstance(records, (list, tuple)):
+        if not records:
+            return None
+        if isinstance(records[0], dict):
+            return list(records[0].keys())
+    raise ValueError("columns is required unless records is a list of dicts")
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def build_bulk_upsert_sql(
+        table_name: str,
+        columns: Sequence[str],
+        conflict_columns: Sequence[str],
+        update_columns: Optional[Sequence[str]] = None,
+        schema_name: Optional[str] = None
+) -> Tuple[str, str]:
+    """
+    Build the two statements of a staged bulk upsert.
+
+    The first creates UPSERT_STAGING_TABLE with the types of the target
+    columns plus UPSERT_ROW_NUMBER, dropped at commit. The second moves the
+    staged rows into the target table, keeping the last row of each
+    conflict key, and returns the (inserted, updated) counts, told apart
+    with xmax (0 for a freshly inserted row). Rows with a NULL in a conflict
+    column never conflict on the unique index, so they are all inserted.
+
+    Args:
+        table_name: Target table.
+        columns: Columns loaded into the staging table.
+        conflict_columns: Columns of the unique index used for ON CONFLICT.
+        update_columns: Columns overwritten on conflict. None means every
+                        column not in conflict_columns; empty means DO NOTHING.
+        schema_name: Schema of the target table (optional).
+
+    Returns:
+        (create_staging_sql, upsert_sql)
+
+    Raises:
+        ValueError: If conflict_columns is empty or not a subset of columns.
+    """
+    if not conflict_columns:
+        raise ValueError("conflict_columns must name at least one column")
+    missing = [column for column in conflict_columns if column not in columns]
+    if missing:
+        raise ValueError(f"conflict_columns {missing} are not in the loaded columns")
+    if update_columns is None:
+        update_columns = [column for column in columns if column not in conflict_columns]
+
+    target = f"{_quote(schema_name)}.{_quote(table_name)}" if schema_name else _quote(table_name)
+    staging = _quote(UPSERT_STAGING_TABLE)
+    row_number = _quote(UPSERT_ROW_NUMBER)
+    column_list = ", ".join(map(_quote, columns))
+    conflict_list = ", ".join(map(_quote, conflict_columns))
+
+    create_staging_sql = (
+        f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS"
+        f" SELECT {column_list}, 0::bigint AS {row_number} FROM {target} WITH NO DATA"
+    )
+
+    if update_columns:
+        set_clause = ", ".join(f"{_quote(column)} = EXCLUDED.{_quote(column)}" for column in update_columns)
+        conflict_action = f"DO UPDATE SET {set_clause}"
+    else:
+        conflict_action = "DO NOTHING"
+
+    keyed = " AND ".join(f"{_quote(column)} IS NOT NULL" for column in conflict_columns)
+    upsert_sql = (
+        f"WITH upserted AS ("
+        f"INSERT INTO {target} ({column_list})"
+        f" (SELECT DISTINCT ON ({conflict_list}) {column_list} FROM {staging} WHERE {keyed}"
+        f" ORDER BY {conflict_list}, {row_number} DESC)"
+        f" UNION ALL SELECT {column_list} FROM {staging} WHERE NOT ({keyed})"
+        f" ON CONFLICT ({conflict_list}) {conflict_action}"
+        f" RETURNING (xmax = 0) AS inserted)"
+        f" SELECT count(*) FILTER (WHERE inserted) AS inserted,"
+        f" count(*) FILTER (WHERE NOT inserted) AS updated FROM upserted"
+    )
+    return create_staging_sql, upsert_sql
+
+
+def build_copy_from_stdin_sql(table_name: str, columns: Sequence[str]) -> str:
+    """COPY ... FROM STDIN statement for psycopg2's copy_expert()."""
+    return f"COPY {_quote(table_name)} ({', '.join(map(_quote, columns))}) FROM STDIN"
+
+
+# =============================================================================
+# Multi-row INSERT from unnest() arrays
+# =============================================================================
+
+def group_by_columns(rows: Sequence[Dict[str, Any]]) -> Dict[Tuple[str, ...], List[int]]:
+    """
+    Positions of the dicts sharing each column set, in first-seen order.
+
+    Columns are sorted, so dicts with the same keys in any order share a
+    statement.
+    """
+    groups: Dict[Tuple[str, ...], List[int]] = {}
+    for position, row in enumerate(rows):
+        groups.setdefault(tuple(sorted(row)), []).append(position)
+    return groups
+
+
+def build_unnest_insert_sql(
+        table_name: str,
+        columns: Sequence[str],
+        column_types: Dict[str, str],
+        placeholder: str = "$",
+        on_duplicate_ignore: bool = True,
+        returning: Optional[Sequence[str]] = None,
+        key_columns: Optional[Sequence[str]] = None
+) -> str:
+    """
+    Build INSERT ... SELECT ... FROM unnest($1::type[], ...) for one column set.
+
+    The statement text depends only on the table, the columns and the
+    options, never on the number of rows, so it can be prepared once.
+    Array columns are sent as array literals in a text[] and cast back,
+    because unnest() would flatten a multi-dimensional array.
+
+    With returning, the inserted rows are joined back to the input in SQL
+    (after type coercion, defaults and triggers), since RETURNING neither
+    follows the input order nor includes the rows skipped by ON CONFLICT.
+    Each row gets the position of its input row in a "_ph_ord" column
+    (1-based), see align_returning().
+
+    Args:
+        table_name: Target table.
+        columns: Inserted columns.
+        column_types: SQL type of each column (format_type output).
+        placeholder: "$" for asyncpg ($1, $2, ...), "%s" for psycopg2.
+        on_duplicate_ignore: Add ON CONFLICT DO NOTHING.
+        returning: Columns to return ("*" allowed), or None.
+        key_columns: Inserted columns of a primary key or unique constraint,
+                     to join the inserted rows back to the input on. None
+                     compares all the inserted columns instead.
+
+    Raises:
+        ValueError: If a column is not in column_types.
+    """
+    missing = [column for column in columns if column not in column_types]
+    if missing:
+        raise ValueError(f"Unknown columns {missing} for table {table_name}")
+
+    arrays = []
+    selected = []
+    for position, column in enumerate(columns, start=1):
+        sql_type = column_types[column]
+        param = f"${position}" if placeholder == "$" else placeholder
+        if sql_type.endswith("[]"):
+            arrays.append(f"{param}::text[]")
+            selected.append(f"{_quote(column)}::{sql_type} AS {_quote(column)}")
+        else:
+            arrays.append(f"{param}::{sql_type}[]")
+            selected.append(_quote(column))
+
+    column_list = ", ".join(map(_quote, columns))
+    source = f"unnest({', '.join(arrays)}) WITH ORDINALITY AS _ph_rows({column_list}, _ph_ord)"
+    returning_list = None
+    if returning:
+        returning_list = ", ".join(column if column == "*" else _quote(column) for column in returning)
+
+    conflict = " ON CONFLICT DO NOTHING" if on_duplicate_ignore else ""
+    if not returning:
+        return (
+            f"INSERT INTO {_quote(table_name)} ({column_list})"
+            f" SELECT {', '.join(selected)}"
+            f" FROM {source}"
+            f" ORDER BY _ph_ord{conflict}"
+        )
+
+    if key_columns:
+        keys = [_quote(column) for column in key_columns]
+        join = " AND ".join(f"_ph_numbered.{_quote(column)} = _ph_rows.{_quote(column)}" for column in key_columns)
+    else:
+        keys = [f"{_quote(column)}::text" for column in columns]
+        join = " AND ".join(
+            f"_ph_numbered.{_quote(column)}::text IS NOT DISTINCT FROM _ph_rows.{_quote(column)}::text"
+            for column in columns
+        )
+    # The n-th inserted row of a key is the n-th input row of that key
+    # ("_ph_dup"): the first one when ON CONFLICT skipped the repeats
+    return (
+        f"WITH _ph_rows AS (SELECT {', '.join(selected)}, _ph_ord,"
+        f" row_number() OVER (PARTITION BY {', '.join(keys)} ORDER BY _ph_ord) AS _ph_dup"
+        f" FROM {source}),"
+        f" _ph_inserted AS ("
+        f"INSERT INTO {_quote(table_name)} ({column_list})"
+        f" SELECT {column_list} FROM _ph_rows ORDER BY _ph_ord{conflict}"
+        f" RETURNING {returning_list}),"
+        f" _ph_numbered AS ("
+        f"SELECT *, row_number() OVER (PARTITION BY {', '.join(keys)}) AS _ph_dup FROM _ph_inserted)"
+        f" SELECT _ph_rows._ph_ord, _ph_numbered.*"
+        f" FROM _ph_numbered LEFT JOIN _ph_rows ON {join} AND _ph_numbered._ph_dup = _ph_rows._ph_dup"
+    )
+
+
+def unnest_params(
+        rows: Sequence[Dict[str, Any]],
+        columns: Sequence[str],
+        column_types: Dict[str, str]
+) -> Tuple[List[Any], ...]:
+    """One list of values per column, matching build_unnest_insert_sql()."""
+    params = []
+    for column in columns:
+        values = [row[column] for row in rows]
+        if column_types[column].endswith("[]"):
+            values = [None if value is None else array_literal(value) for value in values]
+        params.append(values)
+    return tuple(params)
+
+
+def _requested_columns(returning: Union[str, Sequence[str]]) -> List[str]:
+    """returning= as a list: a string is one column (or "*")."""
+    return [returning] if isinstance(returning, str) else list(returning)
+
+
+def returning_columns(
+        returning: Optional[Union[str, Sequence[str]]],
+        columns: Sequence[str],
+        key_columns: Optional[Sequence[str]] = None
+) -> Optional[List[str]]:
+    """
+    RETURNING list of one group: the requested columns, plus the ones the
+    inserted rows are joined back to the input on.
+    """
+    if not returning:
+        return None
+    requested = _requested_columns(returning)
+    if "*" not in requested:
+        requested += [column for column in key_columns or columns if column not in requested]
+    return requested
+
+
+def insert_key_columns(columns: Sequence[str], unique_keys: Sequence[Sequence[str]]) -> Optional[List[str]]:
+    """Columns of the first primary key or unique constraint that are all inserted, if any."""
+    inserted = set(columns)
+    for key in unique_keys:
+        if key and inserted.issuperset(key):
+            return list(key)
+    return None
+
+
+@dataclass
+class InsertGroup:
+    """One INSERT ... FROM unnest() statement of insert_many_with_dict()."""
+    query: str
+    params: Tuple[List[Any], ...]
+    positions: List[int]
+    rows: List[Dict[str, Any]]
+
+
+def plan_insert_many(
+        table_name: str,
+        rows: Sequence[Dict[str, Any]],
+        column_types: Dict[str, str],
+        placeholder: str = "$",
+        on_duplicate_ignore: bool = True,
+        returning: Optional[Union[str, Sequence[str]]] = None,
+        unique_keys: Sequence[Sequence[str]] = ()
+) -> List[InsertGroup]:
+    """
+    Split dicts by column set into one unnest() INSERT per set.
+
+    unique_keys (TableSchema.unique_keys) gives the constraint the returned
+    rows are matched to the input on.
+    """
+    groups = []
+    for columns, positions in group_by_columns(rows).items():
+        group_rows = [rows[position] for position in positions]
+        key_columns = insert_key_columns(columns, unique_keys)
+        query = build_unnest_insert_sql(
+            table_name,
+            columns,
+            column_types,
+            placeholder,
+            on_duplicate_ignore,
+            returning_columns(returning, columns, key_columns),
+            key_columns
+        )
+        groups.append(InsertGroup(query, unnest_params(group_rows, columns, column_types), positions, group_rows))
+    return groups
+
+
+def align_returning(
+        group: InsertGroup,
+        returned: List[Dict[str, Any]],
+        returning: Union[str, Sequence[str]]
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    RETURNING rows of a group, one per input row (None if skipped).
+
+    Rows are placed by the input position build_unnest_insert_sql() returns
+    with them.
+    """
+    aligned: List[Optional[Dict[str, Any]]] = [None] * len(group.rows)
+    for row in returned:
+        row = dict(row)
+        ordinal = row.pop("_ph_ord")
+        row.pop("_ph_dup", None)
+        if ordinal is not None:
+            aligned[ordinal - 1] = row
+    requested = _requested_columns(returning)
+    if "*" in requested:
+        return aligned
+    return [None if row is None else {column: row[column] for column in requested} for row in aligned]
+
+
+# =============================================================================
+# Single-row INSERT / upsert from a dict
+# =============================================================================
+
+INSERT_MODES = ("insert", "ignore", "update")
+
+# Statement texts kept by insert_template(), least recently used dropped first
+INSERT_SQL_CACHE_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=INSERT_SQL_CACHE_SIZE)
+def insert_template(
+        table_name: str,
+        columns: Tuple[str, ...],
+        mode: str = "insert",
+        constraint_key: Optional[str] = None,
+        placeholder: str = "$",
+        returning: str = ""
+) -> str:
+    """
+    INSERT statement of the dict-based insert helpers, built once per signature.
+
+    Args:
+        table_name: Target table.
+        columns: Inserted columns, in the order of the parameters.
+        mode: "insert", "ignore" (ON CONFLICT DO NOTHING) or "update"
+              (ON CONFLICT ON CONSTRAINT ... DO UPDATE SET every column).
+        constraint_key: Constraint of "update". Defaults to "{table_name}_pkey".
+        placeholder: "$" for asyncpg ($1, $2, ...), "%s" for psycopg2.
+        returning: RETURNING list ("*", "*, xmax"), or "" for none.
+    """
+    if mode not in INSERT_MODES:
+        raise ValueError(f"mode must be one of {INSERT_MODES}, got {mode!r}")
+
+    column_list = ", ".join(map(_quote, columns))
+    if placeholder == "$":
+        params = ", ".join(f"${position}" for position in range(1, len(columns) + 1))
+    else:
+        params = ", ".join([placeholder] * len(columns))
+    query = f"INSERT INTO {_quote(table_name)} ({column_list}) VALUES ({params})"
+
+    if mode == "ignore":
+        query += " ON CONFLICT DO NOTHING"
+    elif mode == "update":
+        set_clause = ", ".join(f"{_quote(column)} = EXCLUDED.{_quote(column)}" for column in columns)
+        query += f" ON CONFLICT ON CONSTRAINT {constraint_key or f'{table_name}_pkey'} DO UPDATE SET {set_clause}"
+    if returning:
+        query += f" RETURNING {returning}"
+    return query
+
+
+def build_insert_sql(
+        table_name: str,
+        parameters_dict: Dict[str, Any],
+        mode: str = "insert",
+        constraint_key: Optional[str] = None,
+        placeholder: str = "$",
+        returning: str = ""
+) -> Tuple[str, Tuple[Any, ...]]:
+    """
+    (query, params) inserting one dict, see insert_template().
+
+    Columns are sorted, so dicts with the same keys in any order give the
+    same statement text (one prepared statement, one cache entry) and the
+    text is only built the first time.
+    """
+    columns = tuple(sorted(parameters_dict))
+    query = insert_template(table_name, columns, mode, constraint_key, placeholder, returning)
+    return query, tuple([parameters_dict[column] for column in columns])
+
+
+# =============================================================================
+# COPY text format (psycopg2)
+# =============================================================================
+
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _scalar_text(value: Any) -> str:
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "\\x" + bytes(value).hex()
+    if isinstance(value, dict):
+        return json.dumps(value, default=str)
+    return str(value)
+
+
+def array_literal(values: Sequence[Any]) -> str:
+    """PostgreSQL array literal ('{"1","2",NULL}') of a (nested) list."""
+    items = []
+    for value in values:
+        if value is None:
+            items.append("NULL")
+        elif isinstance(value, (list, tuple)):
+            items.append(array_literal(value))
+        else:
+            text = _scalar_text(value).replace("\\", "\\\\").replace('"', '\\"')
+            items.append(f'"{text}"')
+    return "{" + ",".join(items) + "}"
+
+
+def copy_text_value(value: Any) -> str:
+    """
+    Format a Python value as a field of COPY's text format.
+
+    None is NULL, lists and tuples are arrays, dicts are JSON and bytes are
+    bytea hex. Other values use their str() (isoformat() for dates).
+    """
+    if value is None:
+        return "\\N"
+    if isinstance(value, (list, tuple)):
+        text = array_literal(value)
+    else:
+        text = _scalar_text(value)
+    return text.translate(_COPY_ESCAPES)
+
+
+class CopyTextReader:
+    """
+    Read-only file object streaming row tuples in COPY text format.
+
+    Lets psycopg2's cursor.copy_expert() load an iterator of rows without
+    building the whole payload in memory.
+
+    Example:
+        rows = records_as_tuples(records, columns)
+        cursor.copy_expert('COPY users ("id", "name") FROM STDIN', CopyTextReader(rows))
+    """
+
+    def __init__(self, rows: Iterable[Sequence[Any]]):
+        self._lines = ("\t".join(map(copy_text_value, row)) + "\n" for row in rows)
+        self._buffer = ""
+
+    def read(self, size: int = -1) -> str:
+        """Return up to size characters (all remaining if size < 0)."""
+        parts = [self._buffer]
+        length = len(self._buffer)
+        while size < 0 or length < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            parts.append(line)
+            length += len(line)
+
+        data = "".join(parts)
+        if size < 0:
+            size = length
+        self._buffer = data[size:]
+        return data[:size]
+
+    def readline(self, size: int = -1) -> str:
+        """Return the next row, "" at the end (size is ignored)."""
+        if "\n" not in self._buffer:
+            self._buffer += next(self._lines, "")
+        end = self._buffer.find("\n") + 1 or len(self._buffer)
+        line, self._buffer = self._buffer[:end], self._buffer[end:]
+        return line
+
+
+# =============================================================================
+# DataFrame loading
+# =============================================================================
+
+WRITE_DF_MODES = ("append", "replace", "truncate")
+
+# SQL type of the values found in an object column (pandas infer_dtype)
+_INFERRED_SQL_TYPES = {
+    "string": "text",
+    "integer": "bigint",
+    "floating": "double precision",
+    "mixed-integer-float": "double precision",
+    "decimal": "numeric",
+    "boolean": "boolean",
+    "date": "date",
+    "time": "time",
+    "bytes": "bytea",
+    "timedelta": "interval",
+}
+
+
+def qualified_name(table_name: str, schema_name: Optional[str] = None) -> str:
+    """Quoted "schema"."table" (or "table")."""
+    return f"{_quote(schema_name)}.{_quote(table_name)}" if schema_name else _quote(table_name)
+
+
+def series_sql_type(series: pd.Series) -> str:
+    """
+    Column type for the values of a pandas Series.
+
+    Nullable and numpy integers keep their width, categoricals take the
+    type of their categories, tz-aware datetimes become timestamptz. Object
+    columns are typed from their values; anything else is text.
+    """
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        return series_sql_type(pd.Series(dtype.categories))
+    if pd.api.types.is_bool_dtype(dtype):
+        return "boolean"
+    if pd.api.types.is_integer_dtype(dtype):
+        size = dtype.itemsize + (1 if pd.api.types.is_unsigned_integer_dtype(dtype) else 0)
+        return "smallint" if size <= 2 else "integer" if size <= 4 else "bigint" if size <= 8 else "numeric(20)"
+    if pd.api.types.is_float_dtype(dtype):
+        return "real" if dtype.itemsize == 4 else "double precision"
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        return "timestamptz"
+    if pd.api.types.is_datetime64_dtype(dtype):
+        return "timestamp"
+    if pd.api.types.is_timedelta64_dtype(dtype):
+        return "interval"
+    if dtype != object:
+        return "text"
+
+    inferred = pd.api.types.infer_dtype(series, skipna=True)
+    if inferred == "datetime":
+        first = series.dropna().iloc[0]
+        return "timestamptz" if getattr(first, "tzinfo", None) is not None else "timestamp"
+    return _INFERRED_SQL_TYPES.get(inferred, "text")
+
+
+def build_create_table_sql(
+        table_name: str,
+        columns: Sequence[str],
+        sql_types: Sequence[str],
+        schema_name: Optional[str] = None
+) -> str:
+    """CREATE TABLE statement for write_df()."""
+    definitions = ", ".join(f"{_quote(column)} {sql_type}" for column, sql_type in zip(columns, sql_types))
+    return f"CREATE TABLE {qualified_name(table_name, schema_name)} ({definitions})"
+
+
+def _python_values(series: pd.Series) -> Any:
+    values = series.to_numpy(dtype=object)
+    missing = series.isna().to_numpy()
+    if missing.any():
+        # NaN, NaT and pd.NA all become NULL (object columns come as a
+        # read-only view of the frame)
+        values = values.copy()
+        values[missing] = None
+    return values
+
+
+def dataframe_records(df: pd.DataFrame, chunk_rows: int) -> Iterator[Tuple]:
+    """
+    Row tuples of a DataFrame, converted chunk_rows rows at a time.
+
+    Values are Python scalars (numpy and nullable dtypes converted, missing
+    values as None) and only the tuples of the current chunk exist at once,
+    so the frame is never materialised as Python objects in full.
+    """
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        yield from zip(*(_python_values(chunk.iloc[:, position]) for position in range(chunk.shape[1])))
@@ -0,0 +1,82 @@
+"""
+Column-oriented conversion of query results.
+
+The connectors fetch rows as asyncpg Records or psycopg2 tuples. Building a
+DataFrame from them column by column avoids the intermediate list of dicts,
+which costs one dict per row and a second pass over every key.
+
+Chunks of one result (iter_df) are cast to dtypes derived from the column
+types, so every chunk has the same dtypes whatever its values: an integer
+column holding a null stays Int64 instead of turning into float64, an
+all-null chunk doesn't turn into object.
+
+Usage:
+    from postgres_helpers.columnar import rows_to_df
+
+    df = rows_to_df([(1, "a"), (2, "b")], ["id", "name"])
+"""
+
+from typing import Any, Optional, Sequence, List
+
+import pandas as pd
+
+from postgres_helpers.arrow import (
+    BOOL, INT2, INT4, INT8, FLOAT4, FLOAT8, TEXT, NAME, BPCHAR, VARCHAR, TIMESTAMP, TIMESTAMPTZ
+)
+
+# What pandas makes of a column of strings (object before pandas 3, str after)
+_TEXT_DTYPE = pd.Series([""]).dtype
+
+# Type OID -> dtype of the column in every chunk; other types stay object
+CHUNK_DTYPES = {
+    BOOL: "boolean",
+    INT2: "Int16",
+    INT4: "Int32",
+    INT8: "Int64",
+    FLOAT4: "float32",
+    FLOAT8: "float64",
+    TEXT: _TEXT_DTYPE,
+    NAME: _TEXT_DTYPE,
+    BPCHAR: _TEXT_DTYPE,
+    VARCHAR: _TEXT_DTYPE,
+    TIMESTAMP: "datetime64[us]",
+    TIMESTAMPTZ: "datetime64[us, UTC]",
+}
+
+
+def chunk_dtypes(oids: Sequence[int]) -> List[Any]:
+    """dtypes for the chunks of a result, from the type OIDs of its columns."""
+    return [CHUNK_DTYPES.get(oid, object) for oid in oids]
+
+
+def rows_to_df(
+        rows: Sequence[Sequence[Any]],
+        columns: Sequence[str],
+        dtypes: Optional[Sequence[Any]] = None
+) -> pd.DataFrame:
+    """
+    Build a DataFrame column by column from a sequence of rows.
+
+    Args:
+        rows: Row sequences (tuples, asyncpg Records...) in column order.
+        columns: Column names, as given by the cursor description.
+        dtypes: dtype of each column (chunk_dtypes()); default: inferred.
+
+    Returns:
+        DataFrame with one column per name. An empty result keeps the
+        column names. Duplicate column names are preserved.
+    """
+    if not rows:
+        return pd.DataFrame(columns=list(columns))
+
+    # zip(*rows) transposes without copying the cell values
+    df = pd.DataFrame(dict(enumerate(zip(*rows))))
+    if dtypes is not None:
+        for index, dtype in enumerate(dtypes):
+            if str(dtype).startswith("datetime64"):
+                # Aware values may carry several offsets (DST): go through UTC
+                df[index] = pd.to_datetime(df[index], utc="UTC" in str(dtype)).astype(dtype)
+            elif df[index].dtype != dtype:
+                df[index] = df[index].astype(dtype)
+    df.columns = list(columns)
+    return df
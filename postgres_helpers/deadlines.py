@@ -0,0 +1,410 @@
+"""
+Per-call timeouts and deadlines.
+
+Every query method of the connectors accepts two keyword-only arguments,
+added by @deadline_aware:
+
+- timeout: seconds the call may take,
+- deadline: time.monotonic() value by which the call must be done.
+
+With both, the earliest wins. The budget covers getting a connection and
+running the statements; a method called from another one (the cache loader,
+get_postgresql_version, ...) runs under the caller's budget.
+
+When the budget runs out, the statement is cancelled on the server: by
+asyncpg's protocol cancel when the awaiting task is cancelled (async
+connectors), or by connection.cancel() from a watchdog thread (psycopg2).
+The call then raises QueryTimeoutError with the time spent acquiring a
+connection and executing.
+
+For transaction(), acquire_connection() and fetch_iter(), the budget covers
+the steps run by the library (acquire, BEGIN, each fetch, COMMIT). Async
+connectors don't cancel the caller's own code between those steps; the sync
+connectors cancel any statement still running on the connection. Other
+calls made between the steps don't run under that budget.
+
+Usage:
+    try:
+        rows = await db.fetch_all_as_dicts("SELECT ...", timeout=0.5)
+    except QueryTimeoutError as e:
+        print(e.acquire_seconds, e.execute_seconds)
+"""
+
+import asyncio
+import functools
+import heapq
+import inspect
+import itertools
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, List, Optional
+
+from postgres_helpers.exceptions import QueryTimeoutError
+
+
+class _Alarm:
+    __slots__ = ("when", "callback", "cancelled")
+
+    def __init__(self, when: float, callback: Callable[[], None]):
+        self.when = when
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class _Watchdog:
+    """One daemon thread firing the alarms of all sync calls with a deadline."""
+
+    def __init__(self):
+        self._heap: List[Any] = []
+        self._order = itertools.count()
+        self._condition = threading.Condition()
+        thread = threading.Thread(target=self._run, name="postgres_helpers-watchdog", daemon=True)
+        thread.start()
+
+    def schedule(self, when: float, callback: Callable[[], None]) -> _Alarm:
+        alarm = _Alarm(when, callback)
+        with self._condition:
+            heapq.heappush(self._heap, (when, next(self._order), alarm))
+            if self._heap[0][2] is alarm:
+                self._condition.notify()
+        return alarm
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._heap or self._heap[0][0] > time.monotonic():
+                    timeout = self._heap[0][0] - time.monotonic() if self._heap else None
+                    self._condition.wait(timeout)
+                _, _, alarm = heapq.heappop(self._heap)
+            if not alarm.cancelled:
+                alarm.callback()
+
+
+_watchdog: Optional[_Watchdog] = None
+_watchdog_lock = threading.Lock()
+
+
+def _get_watchdog() -> _Watchdog:
+    global _watchdog
+    with _watchdog_lock:
+        if _watchdog is None:
+            _watchdog = _Watchdog()
+        return _watchdog
+
+
+class CallBudget:
+    """
+    Time budget of one call, split between acquire and execution.
+
+    Args:
+        method: Name of the method, for the error message.
+        timeout: Seconds from now, or None.
+        deadline: time.monotonic() value, or None.
+    """
+
+    def __init__(self, method: str, timeout: Optional[float], deadline: Optional[float]):
+        now = time.monotonic()
+        limits = [limit for limit in (deadline, None if timeout is None else now + timeout) if limit is not None]
+        self.method = method
+        self.started = now
+        self.deadline = min(limits)
+        self.timeout_seconds = self.deadline - now
+        self.acquire_seconds = 0.0
+        self.expired = False
+
+        self._acquiring_since: Optional[float] = None
+        self._connections: List[Any] = []
+        self._alarm: Optional[_Alarm] = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def remaining(self) -> float:
+        return self.deadline - time.monotonic()
+
+    def begin_acquire(self) -> None:
+        self._acquiring_since = time.monotonic()
+
+    def end_acquire(self, connection: Any = None) -> None:
+        """
+        Close the acquire phase. A psycopg2 connection passed here is
+        cancelled by the watchdog if the deadline passes.
+        """
+        if self._acquiring_since is not None:
+            self.acquire_seconds += time.monotonic() - self._acquiring_since
+            self._acquiring_since = None
+        if connection is None:
+            return
+        with self._lock:
+            self._connections.append(connection)
+            if self._alarm is None and not self._closed:
+                self._alarm = _get_watchdog().schedule(self.deadline, self._expire)
+
+    def release(self, connection: Any) -> None:
+        """Stop watching a connection going back to its pool."""
+        with self._lock:
+            if connection in self._connections:
+                self._connections.remove(connection)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._connections.clear()
+            if self._alarm is not None:
+                self._alarm.cancel()
+
+    def _expire(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self.expired = True
+            for connection in self._connections:
+                try:
+                    connection.cancel()
+                except Exception:
+                    pass
+
+    def error(
+            self,
+            query: Optional[str] = None,
+            params: Optional[tuple] = None,
+            original_error: Optional[Exception] = None
+    ) -> QueryTimeoutError:
+        """QueryTimeoutError reporting the acquire/execute split at this point."""
+        now = time.monotonic()
+        acquire = self.acquire_seconds
+        if self._acquiring_since is not None:
+            acquire += now - self._acquiring_since
+        execute = max(now - self.started - acquire, 0.0)
+        phase = "acquiring a connection" if self._acquiring_since is not None else "executing"
+        safe_query = query[:200] + "..." if query and len(query) > 200 else query
+        return QueryTimeoutError(
+            f"{self.method} timed out after {self.timeout_seconds:.3f}s while {phase} "
+            f"(acquire {acquire:.3f}s, execute {execute:.3f}s)",
+            query=safe_query,
+            params=params,
+            original_error=original_error,
+            timeout_seconds=self.timeout_seconds,
+            acquire_seconds=acquire,
+            execute_seconds=execute
+        )
+
+
+_current_budget: ContextVar[Optional[CallBudget]] = ContextVar("postgres_helpers_budget", default=None)
+
+
+def begin_acquire() -> None:
+    """Mark the start of a connection checkout for the call in progress."""
+    budget = _current_budget.get()
+    if budget is not None:
+        budget.begin_acquire()
+
+
+def end_acquire(connection: Any = None) -> None:
+    """Mark the end of a checkout; pass psycopg2 connections to have them cancelled at the deadline."""
+    budget = _current_budget.get()
+    if budget is not None:
+        budget.end_acquire(connection)
+
+
+def release_connection(connection: Any) -> None:
+    """Stop cancelling a psycopg2 connection at the deadline (it goes back to its pool)."""
+    budget = _current_budget.get()
+    if budget is not None:
+        budget.release(connection)
+
+
+async def _await_within(awaitable: Any, seconds: float) -> Any:
+    """
+    Await in the current task, cancelling it after seconds (TimeoutError).
+
+    Unlike asyncio.wait_for before Python 3.12, no Task is created for the
+    awaitable, so context variables it sets stay visible to the caller.
+    """
+    task = asyncio.current_task()
+    expired = False
+
+    def expire() -> None:
+        nonlocal expired
+        expired = True
+        task.cancel()
+
+    handle = asyncio.get_running_loop().call_later(seconds, expire)
+    try:
+        return await awaitable
+    except asyncio.CancelledError:
+        if not expired:
+            raise
+        if hasattr(task, "uncancel"):  # Python 3.11+
+            task.uncancel()
+        raise asyncio.TimeoutError() from None
+    finally:
+        handle.cancel()
+
+
+def _query_getter(func: Callable) -> Callable[[tuple, dict], tuple]:
+    """(sql_query, sql_variables) of a call, for the error, if the method has them."""
+    parameters = list(inspect.signature(func).parameters)[1:]
+
+    def get(args: tuple, kwargs: dict) -> tuple:
+        values = dict(zip(parameters, args))
+        values.update(kwargs)
+        query = values.get("sql_query")
+        params = values.get("sql_variables")
+        return (query if isinstance(query, str) else None), (params if isinstance(params, tuple) else None)
+    return get
+
+
+def deadline_aware(func: Callable) -> Callable:
+    """
+    Add keyword-only timeout= and deadline= to a connector method.
+
+    Works on coroutines, plain methods and (async) generators; apply it
+    below @contextmanager/@asynccontextmanager and @instrumented.
+    """
+    method = func.__name__
+    query_of = _query_getter(func)
+
+    if inspect.isasyncgenfunction(func):
+        @functools.wraps(func)
+        async def async_gen_wrapper(self, *args, timeout: Optional[float] = None,
+                                    deadline: Optional[float] = None, **kwargs):
+            agen = func(self, *args, **kwargs)
+            budget = None if timeout is None and deadline is None else CallBudget(method, timeout, deadline)
+            # The budget is current only while the generator runs, not while
+            # the caller holds a row (or the body of a context manager runs),
+            # and each step resets it in the context that set it
+            step, sent, thrown = agen.__anext__, None, None
+            try:
+                while True:
+                    token = _current_budget.set(budget) if budget is not None else None
+                    try:
+                        if thrown is not None:
+                            # Exceptions of the caller's block are always passed
+                            # in, so a transaction can roll back
+                            awaitable = agen.athrow(thrown)
+                        else:
+                            if budget is not None and budget.remaining() <= 0:
+                                await agen.aclose()
+                                raise budget.error(*query_of(args, kwargs))
+                            awaitable = step() if step is not None else agen.asend(sent)
+                        throwing = thrown is not None
+                        step, sent, thrown = None, None, None
+
+                        if budget is None or throwing:
+                            value = await awaitable
+                        else:
+                            try:
+                                value = await _await_within(awaitable, budget.remaining())
+                            except asyncio.TimeoutError as ex:
+                                raise budget.error(*query_of(args, kwargs)) from ex
+                    finally:
+                        if token is not None:
+                            _current_budget.reset(token)
+
+                    try:
+                        sent = yield value
+                    except GeneratorExit:
+                        token = _current_budget.set(budget) if budget is not None else None
+                        try:
+                            await agen.aclose()
+                        finally:
+                            if token is not None:
+                                _current_budget.reset(token)
+                        raise
+                    except BaseException as exc:
+                        thrown = exc
+            except StopAsyncIteration:
+                pass
+        return async_gen_wrapper
+
+    if inspect.isgeneratorfunction(func):
+        @functools.wraps(func)
+        def gen_wrapper(self, *args, timeout: Optional[float] = None,
+                        deadline: Optional[float] = None, **kwargs):
+            if timeout is None and deadline is None:
+                return (yield from func(self, *args, **kwargs))
+            budget = CallBudget(method, timeout, deadline)
+            gen = func(self, *args, **kwargs)
+            # Current only while the generator runs: calls made in the body
+            # of transaction() don't register their connections with it
+            step, sent, thrown = gen.__next__, None, None
+            try:
+                if budget.remaining() <= 0:
+                    raise budget.error(*query_of(args, kwargs))
+                while True:
+                    token = _current_budget.set(budget)
+                    try:
+                        if thrown is not None:
+                            value = gen.throw(thrown)
+                        elif step is None:
+                            value = gen.send(sent)
+                        else:
+                            value = step()
+                    finally:
+                        _current_budget.reset(token)
+                    step, sent, thrown = None, None, None
+                    try:
+                        sent = yield value
+                    except GeneratorExit:
+                        token = _current_budget.set(budget)
+                        try:
+                            gen.close()
+                        finally:
+                            _current_budget.reset(token)
+                        raise
+                    except BaseException as exc:
+                        thrown = exc
+            except StopIteration as stop:
+                return stop.value
+            except Exception as ex:
+                if budget.expired and getattr(ex, "execute_seconds", None) is None:
+                    raise budget.error(*query_of(args, kwargs), original_error=ex) from ex
+                raise
+            finally:
+                budget.close()
+        return gen_wrapper
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(self, *args, timeout: Optional[float] = None,
+                                deadline: Optional[float] = None, **kwargs):
+            if timeout is None and deadline is None:
+                return await func(self, *args, **kwargs)
+            budget = CallBudget(method, timeout, deadline)
+            token = _current_budget.set(budget)
+            try:
+                remaining = budget.remaining()
+                if remaining <= 0:
+                    raise budget.error(*query_of(args, kwargs))
+                # Cancelling the query makes asyncpg send a cancel request
+                return await _await_within(func(self, *args, **kwargs), remaining)
+            except asyncio.TimeoutError as ex:
+                raise budget.error(*query_of(args, kwargs)) from ex
+            finally:
+                _current_budget.reset(token)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(self, *args, timeout: Optional[float] = None, deadline: Optional[float] = None, **kwargs):
+        if timeout is None and deadline is None:
+            return func(self, *args, **kwargs)
+        budget = CallBudget(method, timeout, deadline)
+        token = _current_budget.set(budget)
+        try:
+            if budget.remaining() <= 0:
+                raise budget.error(*query_of(args, kwargs))
+            return func(self, *args, **kwargs)
+        except Exception as ex:
+            # The watchdog cancelled the statement: the method converted the
+            # driver's QueryCanceled, report the budget instead
+            if budget.expired and getattr(ex, "execute_seconds", None) is None:
+                raise budget.error(*query_of(args, kwargs), original_error=ex) from ex
+            raise
+        finally:
+            budget.close()
+            _current_budget.reset(token)
+    return wrapper
@@ -197,10 +197,14 @@ class QueryTimeoutError(QueryExecutionError):
     """
     Query execution timeout.
 
-    Raised when a query takes longer than the configured timeout.
+    Raised when a call runs past its timeout=/deadline= (the statement is
+    cancelled on the server), when command_timeout expires, or when the
+    server cancels a statement (statement_timeout).
 
     Attributes:
         timeout_seconds: The timeout value that was exceeded
+        acquire_seconds: Time spent getting a connection (timeout=/deadline= only)
+        execute_seconds: Time spent executing (timeout=/deadline= only)
     """
 
     def __init__(
@@ -209,10 +213,14 @@ class QueryTimeoutError(QueryExecutionError):
             query: Optional[str] = None,
             params: Optional[tuple] = None,
             original_error: Optional[Exception] = None,
-            timeout_seconds: Optional[float] = None
+            timeout_seconds: Optional[float] = None,
+            acquire_seconds: Optional[float] = None,
+            execute_seconds: Optional[float] = None
     ):
         super().__init__(message, query, params, original_error)
         self.timeout_seconds = timeout_seconds
+        self.acquire_seconds = acquire_seconds
+        self.execute_seconds = execute_seconds
 
 
 class TransactionError(PostgresHelperError):
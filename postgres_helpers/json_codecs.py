@@ -0,0 +1,110 @@
+"""
+Fast JSON codecs for json/jsonb columns.
+
+By default asyncpg returns json/jsonb values as text and psycopg2 decodes
+them with the stdlib json module. A JsonCodecs given to a connector
+(json_codecs=) is registered on every connection it opens, so json/jsonb
+values are decoded to Python objects and encoded from them with a faster
+serializer: orjson when installed (pip install postgres_helpers[json]),
+the stdlib json module otherwise. Any dumps/loads pair can be passed instead.
+
+- Async connectors: asyncpg set_type_codec() for json and jsonb, in the
+  pool's connection init (or after connecting), in the binary format so
+  that COPY (bulk_insert_records, bulk_upsert, write_df) uses them too.
+  Parameters for json/jsonb columns can then be dicts and lists.
+- Sync connectors: psycopg2 register_default_json/register_default_jsonb
+  on the connection. psycopg2 has no per-connection adapters: dicts passed
+  as parameters are only adapted with dumps when adapt_dicts=True, which
+  registers an adapter for the whole process
+  (psycopg2.extensions.register_adapter(dict, ...)), used by every
+  psycopg2 connection, the last registered dumps winning. Lists still
+  become Postgres arrays.
+
+Usage:
+    from postgres_helpers.json_codecs import JsonCodecs
+
+    async with PostgresConnectorAsyncPool(json_codecs=JsonCodecs()) as db:
+        await db.execute_one_query("INSERT INTO events (payload) VALUES ($1)", ({"a": 1},))
+        payload = await db.fetch_value("SELECT payload FROM events LIMIT 1")  # dict
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+import psycopg2.extensions
+import psycopg2.extras
+
+try:
+    import orjson
+except ImportError:  # optional
+    orjson = None
+
+JSON_TYPES = ("json", "jsonb")
+
+# First byte of a jsonb value in the binary format
+JSONB_VERSION = b"\x01"
+
+
+def _orjson_dumps(value: Any) -> str:
+    return orjson.dumps(value, default=str).decode()
+
+
+def _stdlib_dumps(value: Any) -> str:
+    return json.dumps(value, default=str)
+
+
+@dataclass
+class JsonCodecs:
+    """
+    Serializer pair for json/jsonb values.
+
+    Attributes:
+        dumps: Python value -> JSON text (str). Default: orjson if installed,
+               else json.dumps; values it can't serialize go through str().
+        loads: JSON text (str or bytes) -> Python value. Default: orjson.loads
+               if installed, else json.loads.
+        adapt_dicts: Sync connectors: adapt dict parameters to JSON with
+                     dumps. Process-wide opt-in, see the module docstring
+                     (default: False, dicts need psycopg2.extras.Json).
+    """
+    dumps: Optional[Callable[[Any], str]] = None
+    loads: Optional[Callable[[Any], Any]] = None
+    adapt_dicts: bool = False
+
+    def __post_init__(self):
+        if self.dumps is None:
+            self.dumps = _orjson_dumps if orjson is not None else _stdlib_dumps
+        if self.loads is None:
+            self.loads = orjson.loads if orjson is not None else json.loads
+
+    @property
+    def backend(self) -> str:
+        """Module of the loads function ("orjson", "json", ...), for logs."""
+        return getattr(self.loads, "__module__", None) or type(self.loads).__name__
+
+    async def register_asyncpg(self, conn: Any) -> None:
+        """Decode and encode json/jsonb on an asyncpg connection (binary format, usable by COPY)."""
+        dumps, loads = self.dumps, self.loads
+        await conn.set_type_codec(
+            "json",
+            encoder=lambda value: dumps(value).encode(),
+            decoder=loads,
+            schema="pg_catalog",
+            format="binary"
+        )
+        await conn.set_type_codec(
+            "jsonb",
+            encoder=lambda value: JSONB_VERSION + dumps(value).encode(),
+            decoder=lambda data: loads(data[1:]),
+            schema="pg_catalog",
+            format="binary"
+        )
+
+    def register_psycopg2(self, conn: Any) -> None:
+        """Decode json/jsonb on a psycopg2 connection; with adapt_dicts, adapt dict parameters (process-wide)."""
+        psycopg2.extras.register_default_json(conn, loads=self.loads)
+        psycopg2.extras.register_default_jsonb(conn, loads=self.loads)
+        if self.adapt_dicts:
+            dumps = self.dumps
+            psycopg2.extensions.register_adapter(dict, lambda value: psycopg2.extras.Json(value, dumps=dumps))
@@ -0,0 +1,128 @@
+"""
+Batched key lookups for the async pool (DataLoader pattern).
+
+Resolvers that each fetch one row by key cost one round trip per key. A
+RowLoader collects the keys requested during one event-loop tick and loads
+them with a single `WHERE key = ANY($1)` query, then hands each caller its
+row. Loaded rows are cached by key for the life of the loader: create one
+loader per request so that a request sees its own writes.
+
+Usage:
+    async with PostgresConnectorAsyncPool() as db:
+        users = db.loader("users")
+
+        # One query for all three keys
+        alice, bob, nobody = await asyncio.gather(
+            users.load(1), users.load(2), users.load(404)
+        )
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set
+
+FetchRows = Callable[[str, tuple], Awaitable[List[Dict[str, Any]]]]
+
+
+class RowLoader:
+    """
+    Loads rows by key, batching the keys requested in the same tick.
+
+    Not thread-safe: use it from the event loop of its connector.
+
+    Args:
+        fetch: Coroutine function running (sql_query, sql_variables) and
+               returning a list of dicts (the connector's fetch_all_as_dicts).
+        sql_query: Query taking the array of keys as $1, e.g.
+                   "SELECT * FROM users WHERE id = ANY($1)".
+        key_column: Column of the result holding the key of each row.
+        max_batch_size: Maximum keys per query; larger batches are split.
+    """
+
+    def __init__(self, fetch: FetchRows, sql_query: str, key_column: str = "id", max_batch_size: int = 1000):
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be at least 1, got {max_batch_size}")
+        self.sql_query = sql_query
+        self.key_column = key_column
+        self.max_batch_size = max_batch_size
+
+        self._fetch = fetch
+        self._cache: Dict[Any, asyncio.Future] = {}
+        self._queue: List[Any] = []
+        self._batches: Set[asyncio.Task] = set()
+
+    async def load(self, key: Any) -> Optional[Dict[str, Any]]:
+        """
+        Get the row of a key.
+
+        Args:
+            key: Key value, of the Python type the driver returns for the
+                 key column (int, str, uuid.UUID...).
+
+        Returns:
+            The row as a dict, or None if no row has this key. Rows are shared
+            between the callers of a key: treat them as read-only.
+
+        Raises:
+            QueryExecutionError: If the batch query fails. Failed keys are not
+                                 cached and are retried on the next load.
+        """
+        future = self._cache.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._cache[key] = loop.create_future()
+            self._queue.append(key)
+            if len(self._queue) == 1:
+                # Runs after the callbacks already scheduled for this tick,
+                # i.e. after the other resolvers asked for their keys
+                loop.call_soon(self._dispatch)
+        # A caller giving up must not cancel the load for the others
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: Sequence[Any]) -> List[Optional[Dict[str, Any]]]:
+        """Get the rows of several keys, in the order of keys (None where missing)."""
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key: Any, row: Optional[Dict[str, Any]]) -> None:
+        """Put a row already at hand in the cache, unless the key is loaded or loading."""
+        if key not in self._cache:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(row)
+            self._cache[key] = future
+
+    def clear(self, key: Any = None) -> None:
+        """Forget the row of a key (after writing it), or every row without a key."""
+        if key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(key, None)
+
+    def _dispatch(self) -> None:
+        keys, self._queue = self._queue, []
+        for start in range(0, len(keys), self.max_batch_size):
+            task = asyncio.ensure_future(self._load_batch(keys[start:start + self.max_batch_size]))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _load_batch(self, keys: List[Any]) -> None:
+        futures = [(key, self._cache.get(key)) for key in keys]
+        try:
+            rows = await self._fetch(self.sql_query, (keys,))
+        except BaseException as ex:
+            for key, future in futures:
+                if self._cache.get(key) is future:
+                    del self._cache[key]
+                if future is not None and not future.done():
+                    if isinstance(ex, asyncio.CancelledError):
+                        future.cancel()
+                    else:
+                        future.set_exception(ex)
+            if not isinstance(ex, Exception):
+                raise
+            return
+
+        by_key: Dict[Any, Dict[str, Any]] = {}
+        for row in rows:
+            by_key.setdefault(row[self.key_column], row)
+        for key, future in futures:
+            if future is not None and not future.done():
+                future.set_result(by_key.get(key))
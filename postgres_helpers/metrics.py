@@ -0,0 +1,414 @@
+"""
+Per-method metrics of the connectors.
+
+Every query method of a connector is wrapped with @instrumented, which
+records for each call:
+
+- acquire_wait: seconds spent getting a connection (pool checkout, or the
+  connect of a single connector that wasn't connected yet),
+- execution: the rest of the call,
+- rows: rows returned, streamed or affected,
+- bytes: approximate size of the decoded result.
+
+Values go into fixed-bucket histograms: recording a value is a bisect and
+a few additions, and percentiles are read from the buckets, so memory does
+not grow with traffic. get_metrics() on a connector returns a snapshot.
+
+Usage:
+    metrics = db.get_metrics()
+    wait = metrics.methods["fetch_all_as_dicts"].acquire_wait
+    if wait.p99 > 0.05 or metrics.pool_saturation > 0.9:
+        alert(...)
+"""
+
+import functools
+import inspect
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from asyncpg import Record
+
+from postgres_helpers.result_cache import estimate_size
+from postgres_helpers.results import HistogramSnapshot, MethodMetrics, MetricsSnapshot
+
+# Upper bounds of the buckets: 50us to ~105s for durations, 1 to ~4G for
+# counts and sizes. A last bucket holds everything above.
+DURATION_BUCKETS = tuple(0.00005 * 2 ** i for i in range(22))
+COUNT_BUCKETS = tuple(4 ** i for i in range(17))
+
+
+class Histogram:
+    """
+    Histogram with fixed bucket bounds.
+
+    Percentiles are the upper bound of the bucket holding the rank, capped
+    by the largest value seen, so they are over-estimated by at most one
+    bucket width.
+
+    Args:
+        bounds: Increasing upper bounds of the buckets.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "total", "min", "max")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        self.counts: List[int] = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def record(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q: float) -> float:
+        """Estimated value below which a share q (0 to 1) of the values fall."""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                bound = self.bounds[index] if index < len(self.bounds) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self) -> HistogramSnapshot:
+        if not self.count:
+            return HistogramSnapshot()
+        return HistogramSnapshot(
+            count=self.count,
+            total=self.total,
+            min=self.min,
+            max=self.max,
+            p50=self.percentile(0.50),
+            p90=self.percentile(0.90),
+            p99=self.percentile(0.99)
+        )
+
+
+class _MethodStats:
+    __slots__ = ("calls", "errors", "acquire_wait", "execution", "rows", "bytes")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.acquire_wait = Histogram(DURATION_BUCKETS)
+        self.execution = Histogram(DURATION_BUCKETS)
+        self.rows = Histogram(COUNT_BUCKETS)
+        self.bytes = Histogram(COUNT_BUCKETS)
+
+
+class _Call:
+    """Measures of the call in progress, filled by record_acquire_wait() and the wrapper."""
+    __slots__ = ("method", "acquire_wait", "rows", "bytes")
+
+    def __init__(self, method: str):
+        self.method = method
+        self.acquire_wait = 0.0
+        self.rows = 0
+        self.bytes = 0
+
+
+_current_call: ContextVar[Optional[_Call]] = ContextVar("postgres_helpers_call", default=None)
+
+
+def record_acquire_wait(seconds: float) -> None:
+    """Add time spent getting a connection to the instrumented call in progress."""
+    call = _current_call.get()
+    if call is not None:
+        call.acquire_wait += seconds
+
+
+class ConnectorMetrics:
+    """Histograms of one connector, keyed by method name. Thread-safe."""
+
+    def __init__(self):
+        self._methods: Dict[str, _MethodStats] = {}
+        self._lock = threading.Lock()
+        self._started_at = time.monotonic()
+
+    def record(
+            self,
+            method: str,
+            acquire_wait: float,
+            execution: float,
+            rows: int,
+            size: int,
+            failed: bool = False
+    ) -> None:
+        with self._lock:
+            stats = self._methods.get(method)
+            if stats is None:
+                stats = self._methods[method] = _MethodStats()
+            stats.calls += 1
+            if failed:
+                stats.errors += 1
+            stats.acquire_wait.record(acquire_wait)
+            stats.execution.record(execution)
+            stats.rows.record(rows)
+            stats.bytes.record(size)
+
+    def snapshot(self, reset: bool = False, **pool_gauges: Any) -> MetricsSnapshot:
+        """
+        Copy of the histograms.
+
+        Args:
+            reset: Start new histograms after the copy (for windowed alerting).
+            pool_gauges: pool_size, pool_in_use, pool_max reported by the connector.
+        """
+        with self._lock:
+            methods = {
+                name: MethodMetrics(
+                    calls=stats.calls,
+                    errors=stats.errors,
+                    acquire_wait=stats.acquire_wait.snapshot(),
+                    execution=stats.execution.snapshot(),
+                    rows=stats.rows.snapshot(),
+                    bytes=stats.bytes.snapshot()
+                )
+                for name, stats in self._methods.items()
+            }
+            window = time.monotonic() - self._started_at
+            if reset:
+                self._methods = {}
+                self._started_at = time.monotonic()
+        return MetricsSnapshot(methods=methods, window_seconds=window, **pool_gauges)
+
+
+def _is_rows(value: list) -> bool:
+    """Whether a list holds rows, not the items of an array value (fetch_value)."""
+    return not value or isinstance(value[0], (dict, tuple, Record))
+
+
+def _result_rows(value: Any) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, list):
+        return len(value) if _is_rows(value) else 1
+    if isinstance(value, (pd.DataFrame, np.ndarray)):
+        return len(value)
+    num_rows = getattr(value, "num_rows", None)
+    if isinstance(num_rows, int):
+        # pyarrow Table
+        return num_rows
+    rows_affected = getattr(value, "rows_affected", None)
+    if isinstance(rows_affected, int):
+        return max(rows_affected, 0)
+    items = getattr(value, "items", None)
+    if isinstance(items, list):
+        return len(items)
+    return 1
+
+
+def _yielded_rows(value: Any) -> int:
+    """Rows in a value yielded by a generator method: a row, a batch, a chunk."""
+    if isinstance(value, (list, pd.DataFrame)):
+        return len(value)
+    return 1 if isinstance(value, (dict, tuple, Record)) else 0
+
+
+def _result_bytes(value: Any) -> int:
+    """Approximate size of a decoded result; 0 for write results."""
+    if isinstance(value, pd.DataFrame):
+        # Shallow: a deep count walks every object cell
+        return int(value.memory_usage(index=False, deep=False).sum())
+    if isinstance(value, list):
+        return estimate_size(value) if _is_rows(value) else sys.getsizeof(value)
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        # pyarrow Table, NumPy array: size of the buffers
+        return nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sys.getsizeof(item) for item in value.values())
+    if value is None or hasattr(value, "rows_affected") or hasattr(value, "items"):
+        return 0
+    return sys.getsizeof(value)
+
+
+def _count_result(call: _Call, value: Any) -> None:
+    """Rows and bytes of a returned value; never fails the call."""
+    try:
+        call.rows = _result_rows(value)
+        call.bytes = _result_bytes(value)
+    except Exception:
+        pass
+
+
+def _count_yielded(call: _Call, value: Any) -> None:
+    """Add the rows and bytes of a yielded value; never fails the call."""
+    try:
+        rows = _yielded_rows(value)
+        if rows:
+            call.rows += rows
+            call.bytes += _result_bytes(value)
+    except Exception:
+        pass
+
+
+def _start(method: str):
+    if _current_call.get() is not None:
+        # Called by another instrumented method (fetch_column ->
+        # fetch_all_as_numpy, table_exists -> get_table_schema, cache
+        # loaders): part of that call, which gets the acquire wait
+        return None, None
+    call = _Call(method)
+    return call, _current_call.set(call)
+
+
+def _finish(self, call: _Call, started: float, failed: bool) -> None:
+    elapsed = time.perf_counter() - started
+    self.metrics.record(
+        call.method,
+        call.acquire_wait,
+        max(elapsed - call.acquire_wait, 0.0),
+        call.rows,
+        call.bytes,
+        failed
+    )
+
+
+def instrumented(func: Callable) -> Callable:
+    """
+    Record the metrics of a connector method in self.metrics.
+
+    Works on coroutines, plain methods and (async) generators; apply it
+    below @contextmanager/@asynccontextmanager so it times the body.
+    """
+    method = func.__name__
+
+    if inspect.isasyncgenfunction(func):
+        @functools.wraps(func)
+        async def async_gen_wrapper(self, *args, **kwargs):
+            # Iterated by another instrumented method: part of its call
+            outer = _current_call.get()
+            call = outer if outer is not None else _Call(method)
+            started = time.perf_counter()
+            failed = False
+            agen = func(self, *args, **kwargs)
+            # The call is current only while the generator runs, not while
+            # the caller holds a row (or the body of a context manager runs)
+            step, sent, thrown = agen.__anext__, None, None
+            try:
+                while True:
+                    token = _current_call.set(call)
+                    try:
+                        if thrown is not None:
+                            value = await agen.athrow(thrown)
+                        elif step is None:
+                            value = await agen.asend(sent)
+                        else:
+                            value = await step()
+                    finally:
+                        _current_call.reset(token)
+                    step, sent, thrown = None, None, None
+                    if outer is None:
+                        _count_yielded(call, value)
+                    # Forward send/throw so context managers built on the
+                    # generator see the exceptions of their with block
+                    try:
+                        sent = yield value
+                    except GeneratorExit:
+                        await agen.aclose()
+                        raise
+                    except BaseException as exc:
+                        thrown = exc
+            except StopAsyncIteration:
+                pass
+            except BaseException as exc:
+                failed = not isinstance(exc, GeneratorExit)
+                raise
+            finally:
+                if outer is None:
+                    _finish(self, call, started, failed)
+        return async_gen_wrapper
+
+    if inspect.isgeneratorfunction(func):
+        @functools.wraps(func)
+        def gen_wrapper(self, *args, **kwargs):
+            outer = _current_call.get()
+            call = outer if outer is not None else _Call(method)
+            started = time.perf_counter()
+            failed = False
+            gen = func(self, *args, **kwargs)
+            step, sent, thrown = gen.__next__, None, None
+            try:
+                while True:
+                    token = _current_call.set(call)
+                    try:
+                        if thrown is not None:
+                            value = gen.throw(thrown)
+                        elif step is None:
+                            value = gen.send(sent)
+                        else:
+                            value = step()
+                    finally:
+                        _current_call.reset(token)
+                    step, sent, thrown = None, None, None
+                    if outer is None:
+                        _count_yielded(call, value)
+                    try:
+                        sent = yield value
+                    except GeneratorExit:
+                        gen.close()
+                        raise
+                    except BaseException as exc:
+                        thrown = exc
+            except StopIteration:
+                pass
+            except BaseException as exc:
+                failed = not isinstance(exc, GeneratorExit)
+                raise
+            finally:
+                if outer is None:
+                    _finish(self, call, started, failed)
+        return gen_wrapper
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(self, *args, **kwargs):
+            call, token = _start(method)
+            if call is None:
+                return await func(self, *args, **kwargs)
+            started = time.perf_counter()
+            failed = True
+            try:
+                result = await func(self, *args, **kwargs)
+                _count_result(call, result)
+                failed = False
+                return result
+            finally:
+                _current_call.reset(token)
+                _finish(self, call, started, failed)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        call, token = _start(method)
+        if call is None:
+            return func(self, *args, **kwargs)
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = func(self, *args, **kwargs)
+            _count_result(call, result)
+            failed = False
+            return result
+        finally:
+            _current_call.reset(token)
+            _finish(self, call, started, failed)
+    return wrapper
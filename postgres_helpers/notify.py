@@ -0,0 +1,165 @@
+"""
+LISTEN/NOTIFY for the async pool.
+
+listen() turns notifications into an async iterator, so a service can react
+to changes instead of polling a table:
+
+- one pooled connection is taken out of the pool for the whole iteration and
+  LISTENs on the channels,
+- notifications arriving close together are yielded as one batch (up to
+  max_batch, waiting at most batch_window after the first one),
+- a bounded buffer gives backpressure: when max_queue notifications wait
+  for a slow consumer, the connection stops reading from its socket, and
+  the rest wait in the server's notification queue
+  (pg_notification_queue_usage()) until the consumer catches up,
+- on connection loss (noticed by asyncpg, or by a keepalive query when the
+  channels are quiet), a new connection is acquired and LISTENs again, with
+  exponential backoff. Notifications sent while disconnected are lost: an
+  empty batch is yielded after each reconnect, so consumers can re-read the
+  state they watch.
+
+notify() sends a notification with pg_notify(). Inside transaction(),
+notifications are collected and sent in one statement just before the
+commit: Postgres delivers them at commit, and drops them on rollback.
+
+Usage:
+    async for batch in db.listen(["orders", "invoices"]):
+        for notification in batch:
+            print(notification.channel, notification.payload)
+
+    async with db.transaction() as conn:
+        await conn.execute("UPDATE orders SET status = 'paid' WHERE id = $1", order_id)
+        await db.notify("orders", str(order_id))
+"""
+
+import asyncio
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+from postgres_helpers.results import Notification
+
+# One statement for any number of notifications, in order
+NOTIFY_SQL = "SELECT pg_notify(channel, payload) FROM unnest($1::text[], $2::text[]) AS n(channel, payload)"
+
+# Longest wait between two reconnect attempts of listen()
+MAX_RECONNECT_DELAY = 30.0
+
+# (channel, payload) pairs waiting for the commit of the current transaction()
+pending_notifications: ContextVar[Optional[List[Tuple[str, str]]]] = ContextVar(
+    "postgres_helpers_notifications", default=None
+)
+
+
+def notify_params(notifications: Iterable[Tuple[str, str]]) -> Tuple[List[str], List[str]]:
+    """
+    Parameters of NOTIFY_SQL: channels and payloads.
+
+    Identical notifications are sent once, as Postgres does within a
+    transaction.
+    """
+    unique = list(dict.fromkeys(notifications))
+    return [channel for channel, _ in unique], [payload for _, payload in unique]
+
+
+class NotificationBuffer:
+    """
+    Bounded buffer between asyncpg's listener callbacks and listen().
+
+    Args:
+        channels: Channels listened on.
+        max_size: Notifications held before the connection stops reading.
+                  Reading resumes once the consumer has drained half.
+    """
+
+    def __init__(self, channels: Sequence[str], max_size: int):
+        self.channels = list(channels)
+        self.max_size = max_size
+        self.conn: Optional[Any] = None
+        self.gate: Optional[Any] = None  # PoolGate slot held with conn (autoscaling)
+        self.lost = False
+        self.closed = False
+
+        self._items: deque = deque()
+        self._event = asyncio.Event()
+        self._transport: Optional[Any] = None
+        self._paused = False
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def paused(self) -> bool:
+        """Whether reading from the connection is paused (buffer full)."""
+        return self._paused
+
+    def attach(self, conn: Any) -> None:
+        """Start buffering the notifications of a connection that LISTENs."""
+        self.conn = conn
+        self.lost = False
+        # asyncpg has no public flow control: pause the socket transport
+        self._transport = getattr(conn, "_transport", None)
+
+    def detach(self) -> Optional[Any]:
+        """Stop reading-side flow control and hand back the connection (once)."""
+        self._resume()
+        conn, self.conn, self._transport = self.conn, None, None
+        return conn
+
+    def on_notification(self, conn: Any, pid: int, channel: str, payload: str) -> None:
+        """asyncpg listener callback."""
+        self._items.append(Notification(channel, payload, pid))
+        if len(self._items) >= self.max_size and not self._paused and self._transport is not None:
+            self._transport.pause_reading()
+            self._paused = True
+        self._event.set()
+
+    def on_termination(self, conn: Any) -> None:
+        """asyncpg termination listener: the connection is gone."""
+        self.lost = True
+        self._event.set()
+
+    def close(self) -> None:
+        """End the iteration (the pool is closing)."""
+        self.closed = True
+        self._event.set()
+
+    def _resume(self) -> None:
+        if self._paused:
+            self._paused = False
+            if self._transport is not None and not self._transport.is_closing():
+                self._transport.resume_reading()
+
+    async def _wait(self, timeout: float) -> bool:
+        self._event.clear()
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def get_batch(self, max_batch: int, batch_window: float, timeout: float) -> List[Notification]:
+        """
+        Next batch of notifications.
+
+        Waits up to timeout for a first one, then up to batch_window for
+        more. Returns an empty list on timeout, connection loss or close.
+        """
+        if self.closed:
+            return []
+        if not self._items and not self.lost:
+            if not await self._wait(timeout):
+                return []
+
+        if self._items and batch_window > 0:
+            loop = asyncio.get_running_loop()
+            window_end = loop.time() + batch_window
+            while len(self._items) < max_batch and not (self.lost or self.closed):
+                remaining = window_end - loop.time()
+                if remaining <= 0 or not await self._wait(remaining):
+                    break
+
+        batch = [self._items.popleft() for _ in range(min(max_batch, len(self._items)))]
+        if self._paused and len(self._items) <= self.max_size // 2:
+            self._resume()
+        return batch
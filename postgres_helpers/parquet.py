@@ -0,0 +1,255 @@
+"""
+Streaming Parquet export of query results.
+
+export_to_parquet() on the async pool reads a result through a server-side
+cursor, converts each batch of rows to Arrow (see postgres_helpers.arrow) and
+hands it to a ParquetSink, which writes a row group every row_group_rows
+rows. Memory holds one batch of rows and one row group, whatever the size of
+the result.
+
+With partition_by, the output is a hive-partitioned dataset: one file per
+value of the column, path/<column>=<value>/part-0.parquet (nulls under
+__HIVE_DEFAULT_PARTITION__), the column itself left out of the files as
+pyarrow.dataset does. Each partition buffers up to one row group, so memory
+grows with the number of partitions.
+
+The schema of the files is set when the first row group is written, from
+the rows buffered so far, and later batches are cast to it. Columns whose
+type is inferred from the values are widened so later batches fit: decimals
+(numeric; asyncpg doesn't report its precision) to precision 38 (76 when
+needed) with the largest scale seen, and columns still all null to string.
+Pass schema= to choose the types instead.
+
+Requires pyarrow (pip install postgres_helpers[arrow]).
+
+Usage:
+    result = await db.export_to_parquet(
+        "SELECT * FROM events WHERE day >= $1", (start,), "exports/events",
+        partition_by="day"
+    )
+    print(result.rows_per_second, result.peak_rss_bytes)
+
+    dataset = pyarrow.dataset.dataset("exports/events", partitioning="hive")
+"""
+
+import os
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+from urllib.parse import quote
+
+from postgres_helpers.arrow import _pyarrow
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+# Directory of the null partition, as pyarrow names it
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+# Largest decimal128 / decimal256 precisions
+DECIMAL128_PRECISION = 38
+DECIMAL256_PRECISION = 76
+
+PARTITION_FILE_NAME = "part-0.parquet"
+
+
+def _pyarrow_modules():
+    pa = _pyarrow()
+    import pyarrow.compute
+    import pyarrow.parquet
+    return pa, pyarrow.compute, pyarrow.parquet
+
+
+def process_rss() -> Optional[int]:
+    """
+    Resident set size of this process in bytes.
+
+    Read from /proc on Linux. Elsewhere, the peak RSS of the process so far
+    (getrusage); None where neither is available.
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def file_schema(schemas: List["pa.Schema"]) -> "pa.Schema":
+    """
+    Schema of the Parquet files, from the schemas of the first tables.
+
+    Decimals are widened to the largest precision with the largest scale,
+    and null-only columns become strings, so that later tables can be cast.
+    """
+    pa = _pyarrow()
+    unified = pa.unify_schemas(schemas, promote_options="permissive")
+    fields = []
+    for field in unified:
+        column_type = field.type
+        if pa.types.is_decimal(column_type):
+            if column_type.precision <= DECIMAL128_PRECISION:
+                column_type = pa.decimal128(DECIMAL128_PRECISION, column_type.scale)
+            else:
+                column_type = pa.decimal256(DECIMAL256_PRECISION, column_type.scale)
+        elif pa.types.is_null(column_type):
+            column_type = pa.string()
+        fields.append(field.with_type(column_type))
+    return pa.schema(fields)
+
+
+def partition_dir(column: str, value: Any) -> str:
+    """Directory name of a hive partition, the value percent-encoded."""
+    if value is None:
+        return f"{column}={NULL_PARTITION}"
+    return f"{column}={quote(str(value), safe='')}"
+
+
+class ParquetSink:
+    """
+    Writes Arrow tables to Parquet, one row group per row_group_rows rows.
+
+    Args:
+        path: File to write, or root directory with partition_by.
+        row_group_rows: Rows per row group (the last one may be smaller).
+        partition_by: Column splitting the output into one file per value.
+        compression: Parquet compression codec (default: "snappy").
+        schema: Arrow schema of the files (default: see file_schema(), from
+                the tables buffered for the first row group).
+    """
+
+    def __init__(
+            self,
+            path: Union[str, "os.PathLike"],
+            row_group_rows: int = 100_000,
+            partition_by: Optional[str] = None,
+            compression: str = "snappy",
+            schema: Optional["pa.Schema"] = None
+    ):
+        if row_group_rows < 1:
+            raise ValueError(f"row_group_rows must be at least 1, got {row_group_rows}")
+        self.path = Path(path)
+        self.row_group_rows = row_group_rows
+        self.partition_by = partition_by
+        self.compression = compression
+        self.schema = schema
+
+        self.rows = 0
+        self.row_groups = 0
+        self.files: List[str] = []
+
+        self._data_schema: Optional["pa.Schema"] = None  # schema without the partition column
+        if schema is not None:
+            self._data_schema = self._without_partition(schema)
+        self._empty: Optional["pa.Table"] = None
+
+        self._buffers: Dict[Any, List["pa.Table"]] = {}  # partition value -> tables
+        self._buffered_rows: Dict[Any, int] = {}
+        self._writers: Dict[Any, Any] = {}  # partition value -> ParquetWriter
+
+    def write(self, table: "pa.Table") -> None:
+        """Add rows; full row groups are written at once."""
+        if self.partition_by is not None and self.partition_by not in table.schema.names:
+            raise ValueError(f"partition_by: no column {self.partition_by!r} in the result")
+        self.rows += table.num_rows
+        if self._empty is None:
+            self._empty = table.slice(0, 0)
+
+        if self.partition_by is None:
+            self._add(None, table)
+            return
+
+        pa, pc, _ = _pyarrow_modules()
+        column = table.column(self.partition_by)
+        data = table.drop_columns([self.partition_by])
+        for value in pc.unique(column).to_pylist():
+            mask = pc.is_null(column) if value is None else pc.equal(column, pa.scalar(value, column.type))
+            self._add(value, data.filter(mask))
+
+    def close(self) -> None:
+        """Write the rows still buffered and close the files."""
+        for key in list(self._buffers):
+            self._flush(key, final=True)
+        if self.partition_by is None and not self._writers and self._empty is not None:
+            # Empty result: a file with the columns and no rows
+            if self._data_schema is None:
+                self._data_schema = file_schema([self._empty.schema])
+            self._writer(None)
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
+
+    def abort(self) -> None:
+        """Close the files without writing the buffered rows."""
+        self._buffers.clear()
+        for writer in self._writers.values():
+            try:
+                writer.close()
+            except Exception:
+                pass
+        self._writers.clear()
+
+    def bytes_written(self) -> int:
+        return sum(os.path.getsize(file) for file in self.files if os.path.exists(file))
+
+    def _without_partition(self, schema: "pa.Schema") -> "pa.Schema":
+        if self.partition_by is None or self.partition_by not in schema.names:
+            return schema
+        return schema.remove(schema.get_field_index(self.partition_by))
+
+    def _cast(self, table: "pa.Table") -> "pa.Table":
+        if table.schema == self._data_schema:
+            return table
+        pa = _pyarrow()
+        try:
+            return table.cast(self._data_schema)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as ex:
+            raise ValueError(f"Rows don't fit the Parquet schema {self._data_schema}, pass schema=: {ex}") from ex
+
+    def _add(self, key: Any, table: "pa.Table") -> None:
+        if table.num_rows == 0:
+            return
+        if self._data_schema is not None:
+            table = self._cast(table)
+        self._buffers.setdefault(key, []).append(table)
+        self._buffered_rows[key] = self._buffered_rows.get(key, 0) + table.num_rows
+        if self._buffered_rows[key] >= self.row_group_rows:
+            self._flush(key)
+
+    def _flush(self, key: Any, final: bool = False) -> None:
+        pa, _, _ = _pyarrow_modules()
+        if self._data_schema is None:
+            # First row group: its rows (of every partition) set the schema
+            buffered = [table for tables in self._buffers.values() for table in tables]
+            self._data_schema = file_schema([table.schema for table in buffered])
+            for buffer_key, tables in self._buffers.items():
+                self._buffers[buffer_key] = [self._cast(table) for table in tables]
+        pending = pa.concat_tables(self._buffers.pop(key, []))
+        offset = 0
+        while pending.num_rows - offset >= self.row_group_rows or (final and offset < pending.num_rows):
+            row_group = pending.slice(offset, self.row_group_rows)
+            self._writer(key).write_table(row_group, row_group_size=self.row_group_rows)
+            self.row_groups += 1
+            offset += row_group.num_rows
+        if offset < pending.num_rows:
+            self._buffers[key] = [pending.slice(offset)]
+        self._buffered_rows[key] = pending.num_rows - offset
+
+    def _writer(self, key: Any) -> Any:
+        writer = self._writers.get(key)
+        if writer is None:
+            _, _, pq = _pyarrow_modules()
+            if self.partition_by is None:
+                file = self.path
+            else:
+                file = self.path / partition_dir(self.partition_by, key) / PARTITION_FILE_NAME
+            file.parent.mkdir(parents=True, exist_ok=True)
+            writer = pq.ParquetWriter(str(file), self._data_schema, compression=self.compression)
+            self._writers[key] = writer
+            self.files.append(str(file))
+        return writer
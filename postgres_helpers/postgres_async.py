@@ -27,16 +27,35 @@ Usage:
 
 import asyncio
 import logging
+import time
 from contextlib import asynccontextmanager
 from os import environ
 from pathlib import Path
-from typing import Union, Optional, List, Dict, Any, Tuple, AsyncIterator
+from typing import Union, Optional, List, Dict, Any, Tuple, AsyncIterator, Iterable, Callable, Awaitable, TYPE_CHECKING
 
 import asyncpg
+import numpy as np
 import pandas as pd
 from asyncpg.connection import Connection
 
+if TYPE_CHECKING:
+    import pyarrow as pa
+
 from postgres_helpers.app_config import load_postgres_details_to_env
+from postgres_helpers.bulk import (
+    Records,
+    plan_insert_many,
+    align_returning,
+    numbered_records_as_tuples,
+    parse_copy_status,
+    resolve_columns,
+    build_bulk_upsert_sql,
+    build_insert_sql,
+    qualified_name,
+    UPSERT_STAGING_TABLE,
+    UPSERT_ROW_NUMBER
+)
+from postgres_helpers.columnar import rows_to_df
 from postgres_helpers.exceptions import (
     PostgresHelperError,
     ConnectionError,
@@ -44,6 +63,7 @@ from postgres_helpers.exceptions import (
     UniqueViolationError,
     ForeignKeyViolationError,
     CheckViolationError,
+    QueryTimeoutError,
     TransactionError
 )
 from postgres_helpers.results import (
@@ -51,8 +71,24 @@ from postgres_helpers.results import (
     ExecuteManyResult,
     InsertResult,
     UpsertResult,
-    ConnectionInfo
+    InsertManyResult,
+    BulkUpsertResult,
+    MetricsSnapshot,
+    ConnectionInfo,
+    TableSchema
+)
+from postgres_helpers.arrays import NULL_MODES, copy_select, first_column, is_fixed_width, parse_copy, rows_to_numpy
+from postgres_helpers.arrow import ArrowTableBuilder
+from postgres_helpers.deadlines import deadline_aware, begin_acquire, end_acquire
+from postgres_helpers.json_codecs import JsonCodecs
+from postgres_helpers.metrics import ConnectorMetrics, instrumented, record_acquire_wait
+from postgres_helpers.result_cache import (
+    ResultCache,
+    make_cache_key,
+    extract_read_tables
 )
+from postgres_helpers.rows import check_row_format, convert_rows, record_columns, row_converter
+from postgres_helpers.schema_cache import SchemaCache, TABLE_SCHEMA_SQL, parse_table_schema
 
 logger = logging.getLogger(f"postgres_helpers:{Path(__file__).name}")
 
@@ -64,6 +100,10 @@ class PostgresConnectorAsync:
     This class manages a single database connection. For concurrent
     applications, consider using PostgresConnectorAsyncPool instead.
 
+    Every query method accepts keyword-only timeout= (seconds) and deadline=
+    (time.monotonic() value) covering the connect and the execution; past
+    it the statement is cancelled and QueryTimeoutError is raised.
+
     Args:
         db_host: Database host (falls back to POSTGRES_DB_HOST env var)
         db_port: Database port (falls back to POSTGRES_DB_PORT env var)
@@ -72,6 +112,15 @@ class PostgresConnectorAsync:
         db_name: Database name (falls back to POSTGRES_DB_NAME env var)
         application_name: Name shown in pg_stat_activity (optional)
         command_timeout: Default query timeout in seconds (optional)
+        result_cache: ResultCache shared by the fetch methods called with
+                      cache_ttl= (optional, default: no caching).
+        json_codecs: JsonCodecs registered on every connection to decode
+                     and encode json/jsonb values (optional, default:
+                     driver defaults).
+        schema_cache: SchemaCache of the table metadata used by
+                      table_exists(), get_table_schema(), the upsert helpers
+                      and insert_many_with_dict() (optional, default: a new
+                      SchemaCache with a 300 s TTL).
 
     Example:
         async with PostgresConnectorAsync() as db:
@@ -86,7 +135,10 @@ class PostgresConnectorAsync:
             db_password: Optional[str] = None,
             db_name: Optional[str] = None,
             application_name: Optional[str] = None,
-            command_timeout: Optional[float] = None
+            command_timeout: Optional[float] = None,
+            result_cache: Optional[ResultCache] = None,
+            json_codecs: Optional[JsonCodecs] = None,
+            schema_cache: Optional[SchemaCache] = None
     ):
         if None in [db_host, db_port, db_name, db_user, db_password]:
             load_postgres_details_to_env()
@@ -100,8 +152,20 @@ class PostgresConnectorAsync:
         self.command_timeout: Optional[float] = command_timeout
         self.server_settings = {'application_name': application_name} if application_name else None
 
+        # Query result cache (opt-in per call with cache_ttl=)
+        self.result_cache: Optional[ResultCache] = result_cache
+
+        # json/jsonb codecs registered on connect
+        self.json_codecs: Optional[JsonCodecs] = json_codecs
+
         self.db_connection: Optional[Connection] = None
 
+        # Table metadata (columns, keys, partitions) read from pg_catalog
+        self.schema_cache: SchemaCache = schema_cache if schema_cache is not None else SchemaCache()
+
+        # Histograms of acquire wait, execution time, rows and bytes per method
+        self.metrics = ConnectorMetrics()
+
     # =========================================================================
     # Context Manager Support
     # =========================================================================
@@ -129,6 +193,8 @@ class PostgresConnectorAsync:
         if self.db_connection is not None and not self.db_connection.is_closed():
             return
 
+        started = time.perf_counter()
+        begin_acquire()
         try:
             self.db_connection = await asyncpg.connect(
                 host=self.db_host,
@@ -139,6 +205,8 @@ class PostgresConnectorAsync:
                 command_timeout=self.command_timeout,
                 server_settings=self.server_settings
             )
+            if self.json_codecs is not None:
+                await self.json_codecs.register_asyncpg(self.db_connection)
         except Exception as ex:
             logger.error(f"Failed to connect: {ex}")
             raise ConnectionError(
@@ -149,6 +217,10 @@ class PostgresConnectorAsync:
                 original_error=ex
             )
 
+        # Connecting is the single connector's acquire wait
+        record_acquire_wait(time.perf_counter() - started)
+        end_acquire()
+
     async def close_connection(self) -> None:
         """
         Close database connection.
@@ -185,11 +257,26 @@ class PostgresConnectorAsync:
 
         return info
 
+    # =========================================================================
+    # Metrics
+    # =========================================================================
+
+    def get_metrics(self, reset: bool = False) -> MetricsSnapshot:
+        """
+        Get the per-method metrics. Acquire wait is the time spent connecting.
+
+        Args:
+            reset: Start new histograms after taking the snapshot.
+        """
+        return self.metrics.snapshot(reset, pool_size=1 if self.is_connected() else 0)
+
     # =========================================================================
     # Transaction Support
     # =========================================================================
 
     @asynccontextmanager
+    @instrumented
+    @deadline_aware
     async def transaction(self) -> AsyncIterator[Connection]:
         """
         Context manager for database transactions.
@@ -252,6 +339,15 @@ class PostgresConnectorAsync:
                 original_error=ex,
                 constraint_name=getattr(ex, 'constraint_name', None)
             )
+        elif isinstance(ex, (asyncpg.QueryCanceledError, asyncio.TimeoutError)):
+            # statement_timeout on the server, command_timeout in asyncpg
+            return QueryTimeoutError(
+                f"Query timed out: {ex}",
+                query=safe_query,
+                params=params,
+                original_error=ex,
+                timeout_seconds=self.command_timeout if isinstance(ex, asyncio.TimeoutError) else None
+            )
         elif isinstance(ex, asyncpg.PostgresError):
             return QueryExecutionError(
                 f"Query execution failed: {ex}",
@@ -267,10 +363,59 @@ class PostgresConnectorAsync:
                 original_error=ex
             )
 
+    # =========================================================================
+    # Result Cache
+    # =========================================================================
+
+    async def _fetch_cached(
+            self,
+            kind: str,
+            sql_query: str,
+            sql_variables: Optional[tuple],
+            cache_ttl: float,
+            cache_tags: Optional[Iterable[str]],
+            loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Serve a read from the result cache, calling loader() on a miss.
+
+        Expired entries are reloaded in the foreground; only the async pool
+        serves them stale while refreshing in the background.
+        """
+        cache = self.result_cache
+        key = make_cache_key(kind, sql_query, sql_variables)
+
+        hit = cache.get(key, allow_stale=False)
+        if hit is not None:
+            return hit.value
+
+        version = cache.version()
+        value = await loader()
+        tags = extract_read_tables(sql_query) | set(cache_tags or ())
+        cache.set(key, value, cache_ttl, tags=tags, loaded_at_version=version)
+        return value
+
+    def _invalidate_cached_results(
+            self,
+            sql_query: Optional[str] = None,
+            table_name: Optional[str] = None
+    ) -> None:
+        """Drop the cached results of the table a write touched, and the table metadata DDL changed."""
+        if sql_query is not None:
+            self.schema_cache.invalidate_for_sql(sql_query)
+        if self.result_cache is None:
+            return
+        if table_name is not None:
+            self.result_cache.invalidate_tables([table_name])
+        else:
+            self.result_cache.invalidate_for_sql(sql_query)
+
     # =========================================================================
     # Query Execution Methods
     # =========================================================================
 
+    @instrumented
+    @deadline_aware
     async def execute_one_query(
             self,
             sql_query: str,
@@ -301,6 +446,8 @@ class PostgresConnectorAsync:
                 *(sql_variables if sql_variables else ())
             )
 
+            self._invalidate_cached_results(sql_query=sql_query)
+
             rows_affected = -1
             try:
                 rows_affected = int(result.split()[-1])
@@ -321,6 +468,8 @@ class PostgresConnectorAsync:
             if close_connection:
                 await self.close_connection()
 
+    @instrumented
+    @deadline_aware
     async def execute_many_query(
             self,
             sql_query: str,
@@ -343,6 +492,8 @@ class PostgresConnectorAsync:
         try:
             await self.db_connection.executemany(sql_query, tuples)
 
+            self._invalidate_cached_results(sql_query=sql_query)
+
             return ExecuteManyResult(
                 success=True,
                 total_statements=len(tuples)
@@ -360,23 +511,42 @@ class PostgresConnectorAsync:
     # Fetch Methods
     # =========================================================================
 
+    @instrumented
+    @deadline_aware
     async def fetch_all_as_dicts(
             self,
             sql_query: str,
             sql_variables: Optional[Tuple] = None,
-            close_connection: bool = False
-    ) -> List[Dict[str, Any]]:
+            close_connection: bool = False,
+            cache_ttl: Optional[float] = None,
+            cache_tags: Optional[Iterable[str]] = None,
+            row_format: str = "dict"
+    ) -> List[Any]:
         """
-        Fetch all rows as a list of dictionaries.
+        Fetch all rows as a list of dictionaries (or row_format rows).
 
         Args:
             sql_query: SELECT query to execute.
             sql_variables: Query parameters as a tuple.
             close_connection: If True, close connection after execution.
+            cache_ttl: Serve the result from the result cache for this many
+                       seconds (requires result_cache). Default: not cached.
+            cache_tags: Extra table names the cached result depends on, on
+                        top of the tables read in FROM/JOIN clauses.
+            row_format: "dict" (default), "tuple", "record" (asyncpg Record)
+                        or "row" (tuple subclass with attribute access), see
+                        postgres_helpers.rows.
 
         Returns:
-            List of dicts where keys are column names.
+            List of rows, dicts keyed by column name by default.
         """
+        check_row_format(row_format)
+        if cache_ttl is not None and self.result_cache is not None:
+            return await self._fetch_cached(
+                f"rows:{row_format}", sql_query, sql_variables, cache_ttl, cache_tags,
+                lambda: self.fetch_all_as_dicts(sql_query, sql_variables, close_connection, row_format=row_format)
+            )
+
         await self.open_connection()
 
         try:
@@ -384,7 +554,7 @@ class PostgresConnectorAsync:
                 sql_query,
                 *(sql_variables if sql_variables else ())
             )
-            return [dict(r.items()) for r in results]
+            return convert_rows(results, record_columns(results), row_format)
 
         except Exception as ex:
             logger.error(f"fetch_all_as_dicts failed: {ex}")
@@ -394,11 +564,80 @@ class PostgresConnectorAsync:
             if close_connection:
                 await self.close_connection()
 
+    @instrumented
+    @deadline_aware
+    async def fetch_iter(
+            self,
+            sql_query: str,
+            sql_variables: Optional[Tuple] = None,
+            batch_size: int = 1000,
+            as_batches: bool = False,
+            close_connection: bool = False,
+            row_format: str = "dict"
+    ) -> AsyncIterator[Any]:
+        """
+        Stream rows through a server-side cursor, batch_size rows at a time.
+
+        Only one batch is held in memory at once. The cursor runs inside a
+        transaction (a savepoint if one is already open) until iteration ends.
+
+        Args:
+            sql_query: SELECT query to execute.
+            sql_variables: Query parameters as a tuple.
+            batch_size: Number of rows fetched per round trip.
+            as_batches: If True, yield lists of dicts instead of single dicts.
+            close_connection: If True, close connection after iteration.
+            row_format: "dict" (default), "tuple", "record" (asyncpg Record)
+                        or "row" (tuple subclass with attribute access), see
+                        postgres_helpers.rows.
+
+        Yields:
+            One dict (row_format row) per row, or lists of them if
+            as_batches=True.
+        """
+        check_row_format(row_format)
+        await self.open_connection()
+
+        try:
+            async with self.db_connection.transaction():
+                cursor = await self.db_connection.cursor(
+                    sql_query,
+                    *(sql_variables if sql_variables else ())
+                )
+                convert = None
+                while True:
+                    records = await cursor.fetch(batch_size)
+                    if not records:
+                        break
+
+                    if convert is None:
+                        convert = row_converter(record_columns(records), row_format)
+                    if as_batches:
+                        yield [convert(r) for r in records]
+                    else:
+                        for r in records:
+                            yield convert(r)
+
+                    if len(records) < batch_size:
+                        break
+
+        except Exception as ex:
+            logger.error(f"fetch_iter failed: {ex}")
+            raise self._convert_exception(ex, sql_query, sql_variables)
+
+        finally:
+            if close_connection:
+                await self.close_connection()
+
+    @instrumented
+    @deadline_aware
     async def fetch_all_as_df(
             self,
             sql_query: str,
             sql_variables: Optional[Tuple] = None,
-            close_connection: bool = False
+            close_connection: bool = False,
+            cache_ttl: Optional[float] = None,
+            cache_tags: Optional[Iterable[str]] = None
     ) -> pd.DataFrame:
         """
         Fetch all rows as a pandas DataFrame.
@@ -407,34 +646,234 @@ class PostgresConnectorAsync:
             sql_query: SELECT query to execute.
             sql_variables: Query parameters as a tuple.
             close_connection: If True, close connection after execution.
+            cache_ttl: Serve the result from the result cache for this many
+                       seconds (requires result_cache). Default: not cached.
+            cache_tags: Extra table names the cached result depends on, on
+                        top of the tables read in FROM/JOIN clauses.
 
         Returns:
-            DataFrame with columns matching the query result.
+            DataFrame with columns matching the query result. An empty
+            result keeps the column names.
         """
-        results = await self.fetch_all_as_dicts(
-            sql_query=sql_query,
-            sql_variables=sql_variables,
-            close_connection=close_connection
-        )
-        return pd.DataFrame(results) if results else pd.DataFrame()
+        if cache_ttl is not None and self.result_cache is not None:
+            return await self._fetch_cached(
+                "df", sql_query, sql_variables, cache_ttl, cache_tags,
+                lambda: self.fetch_all_as_df(sql_query, sql_variables, close_connection)
+            )
 
-    async def fetch_one_as_dict(
+        await self.open_connection()
+
+        try:
+            records = await self.db_connection.fetch(
+                sql_query,
+                *(sql_variables if sql_variables else ())
+            )
+
+            if records:
+                columns = list(records[0].keys())
+            else:
+                statement = await self.db_connection.prepare(sql_query)
+                columns = [attribute.name for attribute in statement.get_attributes()]
+
+            return rows_to_df(records, columns)
+
+        except Exception as ex:
+            logger.error(f"fetch_all_as_df failed: {ex}")
+            raise self._convert_exception(ex, sql_query, sql_variables)
+
+        finally:
+            if close_connection:
+                await self.close_connection()
+
+    @instrumented
+    @deadline_aware
+    async def fetch_all_as_arrow(
+            self,
+            sql_query: str,
+            sql_variables: Optional[Tuple] = None,
+            batch_size: int = 10000,
+            close_connection: bool = False
+    ) -> "pa.Table":
+        """
+        Fetch all rows as a pyarrow Table, built batch by batch.
+
+        Rows are read through a server-side cursor, batch_size at a time, and
+        each batch is converted to Arrow arrays before the next one is
+        fetched, so peak memory stays close to the size of the table. Column
+        types follow the Postgres types (see postgres_helpers.arrow).
+
+        Args:
+            sql_query: SELECT query to execute.
+            sql_variables: Query parameters as a tuple.
+            batch_size: Number of rows fetched and converted at a time.
+            close_connection: If True, close connection after execution.
+
+        Returns:
+            pyarrow.Table; an empty result keeps the columns and their types.
+
+        Raises:
+            QueryExecutionError: If query execution fails.
+            ImportError: If pyarrow is not installed.
+
+        Example:
+            table = await db.fetch_all_as_arrow("SELECT * FROM events WHERE day = $1", (day,))
+            pyarrow.parquet.write_table(table, "events.parquet")
+        """
+        await self.open_connection()
+
+        try:
+            async with self.db_connection.transaction():
+                statement = await self.db_connection.prepare(sql_query)
+                builder = ArrowTableBuilder.from_attributes(statement.get_attributes())
+                cursor = await statement.cursor(*(sql_variables if sql_variables else ()))
+                while True:
+                    records = await cursor.fetch(batch_size)
+                    builder.add_rows(records)
+                    if len(records) < batch_size:
+                        break
+
+            return builder.table()
+
+        except ImportError:
+            raise
+        except Exception as ex:
+            logger.error(f"fetch_all_as_arrow failed: {ex}")
+            raise self._convert_exception(ex, sql_query, sql_variables)
+
+        finally:
+            if close_connection:
+                await self.close_connection()
+
+    @instrumented
+    @deadline_aware
+    async def fetch_all_as_numpy(
+            self,
+            sql_query: str,
+            sql_variables: Optional[Tuple] = None,
+            nulls: str = "nan",
+            close_connection: bool = False
+    ) -> np.ndarray:
+        """
+        Fetch all rows as a NumPy structured array, one field per column.
+
+        When every column has a fixed-width type (bool, integers, floats,
+        numeric, date, timestamp[tz], time), the result is read with a binary
+        COPY and decoded straight into preallocated typed arrays, without a
+        Python object per cell. Other results are read row by row, with
+        object arrays for the other types (see postgres_helpers.arrays).
+
+        Args:
+            sql_query: SELECT query to execute.
+            sql_variables: Query parameters as a tuple.
+            nulls: "nan" (default): NaN/NaT for nulls, int and bool columns
+                   holding nulls become float64. "mask": a
+                   numpy.ma.MaskedArray masking the nulls, types unchanged.
+            close_connection: If True, close connection after execution.
+
+        Returns:
+            Structured array (MaskedArray with nulls="mask"); timestamptz
+            values are in UTC.
+
+        Raises:
+            QueryExecutionError: If query execution fails.
+            ValueError: If nulls is not "nan" or "mask".
+
+        Example:
+            ticks = await db.fetch_all_as_numpy(
+                "SELECT ts, price, volume FROM ticks WHERE symbol = $1", ("ABC",)
+            )
+            vwap = (ticks["price"] * ticks["volume"]).sum() / ticks["volume"].sum()
+        """
+        if nulls not in NULL_MODES:
+            raise ValueError(f"nulls must be one of {NULL_MODES}, got {nulls!r}")
+
+        await self.open_connection()
+
+        try:
+            statement = await self.db_connection.prepare(sql_query)
+            columns = [(attribute.name, attribute.type.oid) for attribute in statement.get_attributes()]
+            if not is_fixed_width(columns):
+                records = await statement.fetch(*(sql_variables if sql_variables else ()))
+                return rows_to_numpy(records, columns, nulls)
+
+            output = bytearray()
+
+            async def collect(chunk: bytes) -> None:
+                output.extend(chunk)
+
+            await self.db_connection.copy_from_query(
+                copy_select(sql_query, columns),
+                *(sql_variables if sql_variables else ()),
+                output=collect,
+                format="binary"
+            )
+            return parse_copy(output, columns, nulls)
+
+        except Exception as ex:
+            logger.error(f"fetch_all_as_numpy failed: {ex}")
+            raise self._convert_exception(ex, sql_query, sql_variables)
+
+        finally:
+            if close_connection:
+                await self.close_connection()
+
+    @instrumented
+    @deadline_aware
+    async def fetch_column(
             self,
             sql_query: str,
             sql_variables: Optional[Tuple] = None,
+            dtype: Optional[Any] = None,
+            nulls: str = "nan",
             close_connection: bool = False
-    ) -> Optional[Dict[str, Any]]:
+    ) -> np.ndarray:
         """
-        Fetch a single row as a dictionary.
+        Fetch the first column of the result as a 1-D NumPy array.
+
+        Same decoding as fetch_all_as_numpy().
+
+        Args:
+            sql_query: SELECT query to execute.
+            sql_variables: Query parameters as a tuple.
+            dtype: Convert the column to this dtype (default: the type of the
+                   column, see fetch_all_as_numpy()).
+            nulls: "nan" (default) or "mask", as in fetch_all_as_numpy().
+            close_connection: If True, close connection after execution.
+
+        Returns:
+            1-D array (MaskedArray with nulls="mask").
+
+        Example:
+            prices = await db.fetch_column("SELECT price FROM ticks ORDER BY ts", dtype="float32")
+        """
+        arrays = await self.fetch_all_as_numpy(sql_query, sql_variables, nulls, close_connection)
+        return first_column(arrays, dtype)
+
+    @instrumented
+    @deadline_aware
+    async def fetch_one_as_dict(
+            self,
+            sql_query: str,
+            sql_variables: Optional[Tuple] = None,
+            close_connection: bool = False,
+            row_format: str = "dict"
+    ) -> Optional[Any]:
+        """
+        Fetch a single row as a dictionary (or row_format row).
 
         Args:
             sql_query: SELECT query (should return 0 or 1 row).
             sql_variables: Query parameters as a tuple.
             close_connection: If True, close connection after execution.
+            row_format: "dict" (default), "tuple", "record" (asyncpg Record)
+                        or "row" (tuple subclass with attribute access), see
+                        postgres_helpers.rows.
 
         Returns:
-            Dict with column names as keys, or None if no row found.
+            The row (a dict keyed by column name by default), or None if no
+            row found.
         """
+        check_row_format(row_format)
         await self.open_connection()
 
         try:
@@ -442,7 +881,7 @@ class PostgresConnectorAsync:
                 sql_query,
                 *(sql_variables if sql_variables else ())
             )
-            return dict(result.items()) if result else None
+            return row_converter(result.keys(), row_format)(result) if result else None
 
         except Exception as ex:
             logger.error(f"fetch_one_as_dict failed: {ex}")
@@ -452,6 +891,8 @@ class PostgresConnectorAsync:
             if close_connection:
                 await self.close_connection()
 
+    @instrumented
+    @deadline_aware
     async def fetch_value(
             self,
             sql_query: str,
@@ -489,6 +930,8 @@ class PostgresConnectorAsync:
     # Convenience Insert Methods
     # =========================================================================
 
+    @instrumented
+    @deadline_aware
     async def insert_into_with_dict(
             self,
             table_name: str,
@@ -508,18 +951,17 @@ class PostgresConnectorAsync:
         Returns:
             InsertResult with insertion details.
         """
-        columns = '"' + '","'.join(parameters_dict.keys()) + '"'
-        placeholders = ", ".join(f"${i + 1}" for i in range(len(parameters_dict)))
-        conflict_clause = " ON CONFLICT DO NOTHING" if on_duplicate_ignore else ""
-
-        query = f'INSERT INTO "{table_name}" ({columns}) VALUES ({placeholders}){conflict_clause}'
-        params = tuple(parameters_dict.values())
+        query, params = build_insert_sql(
+            table_name, parameters_dict, "ignore" if on_duplicate_ignore else "insert"
+        )
 
         await self.open_connection()
 
         try:
             result = await self.db_connection.execute(query, *params)
 
+            self._invalidate_cached_results(table_name=table_name)
+
             rows_affected = 0
             try:
                 rows_affected = int(result.split()[-1])
@@ -546,6 +988,8 @@ class PostgresConnectorAsync:
             if close_connection:
                 await self.close_connection()
 
+    @instrumented
+    @deadline_aware
     async def insert_with_dict_returning(
             self,
             table_name: str,
@@ -565,18 +1009,17 @@ class PostgresConnectorAsync:
         Returns:
             InsertResult with returning_row containing the full inserted row.
         """
-        columns = '"' + '","'.join(parameters_dict.keys()) + '"'
-        placeholders = ", ".join(f"${i + 1}" for i in range(len(parameters_dict)))
-        conflict_clause = " ON CONFLICT DO NOTHING" if on_duplicate_ignore else ""
-
-        query = f'INSERT INTO "{table_name}" ({columns}) VALUES ({placeholders}){conflict_clause} RETURNING *'
-        params = tuple(parameters_dict.values())
+        query, params = build_insert_sql(
+            table_name, parameters_dict, "ignore" if on_duplicate_ignore else "insert", returning="*"
+        )
 
         await self.open_connection()
 
         try:
             row = await self.db_connection.fetchrow(query, *params)
 
+            self._invalidate_cached_results(table_name=table_name)
+
             if row:
                 row_dict = dict(row.items())
                 return InsertResult(
@@ -602,6 +1045,110 @@ class PostgresConnectorAsync:
             if close_connection:
                 await self.close_connection()
 
+    @instrumented
+    @deadline_aware
+    async def insert_many_with_dict(
+            self,
+            table_name: str,
+            parameters_dicts: List[Dict[str, Any]],
+            on_duplicate_ignore: bool = True,
+            returning: Optional[Union[str, List[str]]] = None,
+            close_connection: bool = False
+    ) -> InsertManyResult:
+        """
+        Insert many rows from dicts, one statement per distinct column set.
+
+        Each group of dicts sharing the same keys is sent as a single
+        INSERT ... SELECT ... FROM unnest($1::type[], ...), whose text doesn't
+        depend on the number of rows. All groups run in one transaction.
+        Column types are read from the catalog once per table.
+
+        Args:
+            table_name: Name of the table to insert into.
+            parameters_dicts: Dicts mapping column names to values.
+            on_duplicate_ignore: If True, skip rows that violate a unique
+                                 constraint instead of failing the batch.
+            returning: Columns to return for each row ("*" for all).
+            close_connection: If True, close connection after execution.
+
+        Returns:
+            InsertManyResult. With returning=, returning_rows holds one row
+            per input dict in input order (None for skipped duplicates).
+        """
+        if not parameters_dicts:
+            return InsertManyResult(returning_rows=[] if returning else None)
+
+        returning_rows: List[Optional[Dict[str, Any]]] = [None] * len(parameters_dicts)
+        rows_affected = 0
+        query = None
+
+        await self.open_connection()
+
+        try:
+            schema = await self._table_schema(self.db_connection, table_name)
+            if schema is None:
+                raise ValueError(f'Table "{table_name}" does not exist')
+            groups = plan_insert_many(
+                table_name, parameters_dicts, schema.column_types, "$", on_duplicate_ignore, returning,
+                schema.unique_keys
+            )
+            async with self.db_connection.transaction():
+                for group in groups:
+                    query = group.query
+                    if returning:
+                        records = await self.db_connection.fetch(query, *group.params)
+                        returned = [dict(r.items()) for r in records]
+                        aligned = align_returning(group, returned, returning)
+                        for position, row in zip(group.positions, aligned):
+                            returning_rows[position] = row
+                        rows_affected += len(returned)
+                    else:
+                        status = await self.db_connection.execute(query, *group.params)
+                        rows_affected += int(status.split()[-1])
+
+            self._invalidate_cached_results(table_name=table_name)
+
+            return InsertManyResult(
+                rows_affected=rows_affected,
+                total_rows=len(parameters_dicts),
+                statements=len(groups),
+                returning_rows=returning_rows if returning else None
+            )
+
+        except Exception as ex:
+            logger.error(f"insert_many_with_dict failed: {ex}")
+            raise self._convert_exception(ex, query)
+
+        finally:
+            if close_connection:
+                await self.close_connection()
+
+    async def _table_schema(
+            self,
+            conn: Connection,
+            table_name: str,
+            schema_name: Optional[str] = None,
+            refresh: bool = False
+    ) -> Optional[TableSchema]:
+        """Metadata of a table from the schema cache, queried on conn on a miss (None if it doesn't exist)."""
+        if not refresh:
+            hit = self.schema_cache.get(table_name, schema_name)
+            if hit is not None:
+                return hit.value
+        version = self.schema_cache.version()
+        records = await conn.fetch(TABLE_SCHEMA_SQL.format(placeholder="$1"), qualified_name(table_name, schema_name))
+        schema = parse_table_schema(records)
+        self.schema_cache.set(table_name, schema_name, schema, loaded_at_version=version)
+        return schema
+
+    async def _primary_key(self, table_name: str) -> Optional[str]:
+        """Name of the primary key constraint of a table, from the schema cache."""
+        hit = self.schema_cache.get(table_name)
+        schema = hit.value if hit is not None else await self.get_table_schema(table_name, refresh=True)
+        return schema.primary_key if schema is not None else None
+
+    @instrumented
+    @deadline_aware
     async def insert_into_with_dict_update(
             self,
             table_name: str,
@@ -623,30 +1170,20 @@ class PostgresConnectorAsync:
         Returns:
             UpsertResult with operation details.
         """
-        columns = '"' + '","'.join(parameters_dict.keys()) + '"'
-        placeholders = ", ".join(f"${i + 1}" for i in range(len(parameters_dict)))
-
-        if on_duplicate_update:
-            if constraint_key is None:
-                constraint_key = f"{table_name}_pkey"
-            set_clause = ", ".join(
-                f'"{key}" = EXCLUDED."{key}"' for key in parameters_dict.keys()
-            )
-            conflict_clause = (
-                f" ON CONFLICT ON CONSTRAINT {constraint_key}"
-                f" DO UPDATE SET {set_clause}"
-            )
-        else:
-            conflict_clause = " ON CONFLICT DO NOTHING"
+        if constraint_key is None and on_duplicate_update:
+            constraint_key = await self._primary_key(table_name)
 
-        query = f'INSERT INTO "{table_name}" ({columns}) VALUES ({placeholders}){conflict_clause}'
-        params = tuple(parameters_dict.values())
+        query, params = build_insert_sql(
+            table_name, parameters_dict, "update" if on_duplicate_update else "ignore", constraint_key
+        )
 
         await self.open_connection()
 
         try:
             result = await self.db_connection.execute(query, *params)
 
+            self._invalidate_cached_results(table_name=table_name)
+
             rows_affected = 0
             try:
                 rows_affected = int(result.split()[-1])
@@ -669,6 +1206,8 @@ class PostgresConnectorAsync:
             if close_connection:
                 await self.close_connection()
 
+    @instrumented
+    @deadline_aware
     async def insert_into_with_dict_update_returning(
             self,
             table_name: str,
@@ -688,29 +1227,21 @@ class PostgresConnectorAsync:
         Returns:
             UpsertResult with accurate was_inserted/was_updated flags.
         """
-        columns = '"' + '","'.join(parameters_dict.keys()) + '"'
-        placeholders = ", ".join(f"${i + 1}" for i in range(len(parameters_dict)))
-
         if constraint_key is None:
-            constraint_key = f"{table_name}_pkey"
+            constraint_key = await self._primary_key(table_name)
 
-        set_clause = ", ".join(
-            f'"{key}" = EXCLUDED."{key}"' for key in parameters_dict.keys()
+        # xmax = 0 means insert, xmax > 0 means update
+        query, params = build_insert_sql(
+            table_name, parameters_dict, "update", constraint_key, returning="*, xmax"
         )
 
-        query = (
-            f'INSERT INTO "{table_name}" ({columns}) VALUES ({placeholders})'
-            f' ON CONFLICT ON CONSTRAINT {constraint_key}'
-            f' DO UPDATE SET {set_clause}'
-            f' RETURNING *, xmax'
-        )
-        params = tuple(parameters_dict.values())
-
         await self.open_connection()
 
         try:
             row = await self.db_connection.fetchrow(query, *params)
 
+            self._invalidate_cached_results(table_name=table_name)
+
             if row:
                 row_dict = dict(row.items())
                 xmax = row_dict.pop('xmax', 0)
@@ -733,10 +1264,81 @@ class PostgresConnectorAsync:
             if close_connection:
                 await self.close_connection()
 
+    @instrumented
+    @deadline_aware
+    async def bulk_upsert(
+            self,
+            table_name: str,
+            rows: Records,
+            conflict_columns: List[str],
+            update_columns: Optional[List[str]] = None,
+            columns: Optional[List[str]] = None,
+            schema_name: Optional[str] = None,
+            close_connection: bool = False
+    ) -> BulkUpsertResult:
+        """
+        Upsert many rows in one transaction through a COPY-loaded staging table.
+
+        Rows are streamed with binary COPY into a temporary table, then moved
+        with one INSERT ... SELECT ... ON CONFLICT DO UPDATE. The last
+        occurrence of a duplicated conflict key wins; rows with a NULL
+        conflict column are all inserted.
+
+        Args:
+            table_name: Name of the table.
+            rows: List, iterator or async iterator of tuples or dicts.
+            conflict_columns: Columns of the unique index used for conflicts.
+            update_columns: Columns overwritten on conflict (default: all
+                            others; empty list: leave existing rows untouched).
+            columns: Column names of the row values (optional for dicts).
+            schema_name: Schema of the table (optional).
+            close_connection: If True, close connection after execution.
+
+        Returns:
+            BulkUpsertResult with rows_staged, inserted and updated counts.
+        """
+        columns = resolve_columns(rows, columns)
+        if columns is None:
+            return BulkUpsertResult()
+
+        create_staging_sql, upsert_sql = build_bulk_upsert_sql(
+            table_name, columns, conflict_columns, update_columns, schema_name
+        )
+
+        await self.open_connection()
+
+        try:
+            async with self.db_connection.transaction():
+                await self.db_connection.execute(create_staging_sql)
+                status = await self.db_connection.copy_records_to_table(
+                    UPSERT_STAGING_TABLE,
+                    records=numbered_records_as_tuples(rows, columns),
+                    columns=[*columns, UPSERT_ROW_NUMBER]
+                )
+                counts = await self.db_connection.fetchrow(upsert_sql)
+
+            self._invalidate_cached_results(table_name=table_name)
+
+            return BulkUpsertResult(
+                rows_staged=parse_copy_status(status),
+                inserted=counts["inserted"],
+                updated=counts["updated"]
+            )
+
+        except Exception as ex:
+            logger.error(f"bulk_upsert failed: {ex}")
+            raise self._convert_exception(ex, upsert_sql)
+
+        finally:
+            if close_connection:
+                await self.close_connection()
+
     # =========================================================================
     # Utility Methods
     # =========================================================================
 
+    @instrumented
+    @deadline_aware
     async def get_postgresql_version(self, close_connection: bool = False) -> str:
         """Get the PostgreSQL server version."""
         result = await self.fetch_all_as_dicts(
@@ -747,6 +1349,8 @@ class PostgresConnectorAsync:
         logger.info(f"Connected to: {version}")
         return version
 
+    @instrumented
+    @deadline_aware
     async def table_exists(
             self,
             table_name: str,
@@ -754,17 +1358,61 @@ class PostgresConnectorAsync:
             close_connection: bool = False
     ) -> bool:
         """Check if a table exists."""
-        result = await self.fetch_value(
-            """
-            SELECT EXISTS (
-                SELECT FROM information_schema.tables 
-                WHERE table_schema = $1 AND table_name = $2
-            )
-            """,
-            (schema, table_name),
-            close_connection=close_connection
-        )
-        return bool(result)
+        return await self.get_table_schema(table_name, schema, close_connection=close_connection) is not None
+
+    @instrumented
+    @deadline_aware
+    async def get_table_schema(
+            self,
+            table_name: str,
+            schema_name: Optional[str] = None,
+            refresh: bool = False,
+            close_connection: bool = False
+    ) -> Optional[TableSchema]:
+        """
+        Columns, type OIDs, primary key, unique constraints and partitions of a table.
+
+        Served from schema_cache; pg_catalog is queried on a miss, past the
+        cache TTL or with refresh=True.
+
+        Args:
+            table_name: Name of the table, view or partitioned table.
+            schema_name: Schema of the table (default: first match on the
+                         search_path).
+            refresh: If True, reload the metadata even if it is cached.
+            close_connection: If True, close connection after execution.
+
+        Returns:
+            TableSchema, or None if the table doesn't exist.
+
+        Example:
+            orders = await db.get_table_schema("orders")
+            orders.primary_key, orders.column_types["total"]
+        """
+        await self.open_connection()
+
+        try:
+            return await self._table_schema(self.db_connection, table_name, schema_name, refresh)
+
+        except Exception as ex:
+            logger.error(f"get_table_schema failed: {ex}")
+            raise self._convert_exception(ex, TABLE_SCHEMA_SQL)
+
+        finally:
+            if close_connection:
+                await self.close_connection()
+
+    def refresh_schema(self, table_name: Optional[str] = None) -> None:
+        """
+        Drop cached table metadata after DDL run outside this connector.
+
+        Args:
+            table_name: Table to drop (default: all tables).
+        """
+        if table_name is None:
+            self.schema_cache.clear()
+        else:
+            self.schema_cache.invalidate_tables([table_name])
 
 
 # =============================================================================
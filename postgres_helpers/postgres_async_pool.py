@@ -38,20 +38,49 @@ Error Handling:
 """
 
 import asyncio
+import inspect
 import logging
+import time
+import weakref
 from contextlib import asynccontextmanager
+from dataclasses import replace
 from os import getenv
 from pathlib import Path
 from typing import (
-    Union, Optional, List, Dict, Tuple, Any, AsyncIterator
+    Union, Optional, List, Dict, Tuple, Any, AsyncIterator, Set, Iterable,
+    Callable, Awaitable, Hashable, Sequence, TYPE_CHECKING
 )
 
 import asyncpg
 from asyncpg.pool import Pool
 from asyncpg.connection import Connection
+import numpy as np
 import pandas as pd
 
+if TYPE_CHECKING:
+    import pyarrow as pa
+
 from postgres_helpers.app_config import load_postgres_details_to_env
+from postgres_helpers.autoscale import AutoscalePolicy, PoolAutoscaler, PoolGate
+from postgres_helpers.bulk import (
+    Records,
+    plan_insert_many,
+    align_returning,
+    records_as_tuples,
+    numbered_records_as_tuples,
+    parse_copy_status,
+    resolve_columns,
+    build_bulk_upsert_sql,
+    build_insert_sql,
+    UPSERT_STAGING_TABLE,
+    UPSERT_ROW_NUMBER,
+    WRITE_DF_MODES,
+    qualified_name,
+    series_sql_type,
+    build_create_table_sql,
+    dataframe_records
+)
+from postgres_helpers.columnar import chunk_dtypes, rows_to_df
 from postgres_helpers.exceptions import (
     PostgresHelperError,
     ConnectionError,
@@ -60,6 +89,7 @@ from postgres_helpers.exceptions import (
     UniqueViolationError,
     ForeignKeyViolationError,
     CheckViolationError,
+    QueryTimeoutError,
     TransactionError
 )
 from postgres_helpers.results import (
@@ -67,11 +97,57 @@ from postgres_helpers.results import (
     ExecuteManyResult,
     InsertResult,
     UpsertResult,
-    ConnectionInfo
+    MetricsSnapshot,
+    WarmupReport,
+    ConnectionInfo,
+    ReplicaStatus,
+    StatementCacheStats,
+    InsertManyResult,
+    BulkUpsertResult,
+    BatchItemResult,
+    BatchResult,
+    ExportResult,
+    Notification,
+    TableSchema
+)
+from postgres_helpers.arrays import NULL_MODES, copy_select, first_column, is_fixed_width, parse_copy, rows_to_numpy
+from postgres_helpers.arrow import ArrowTableBuilder
+from postgres_helpers.deadlines import deadline_aware, begin_acquire, end_acquire
+from postgres_helpers.json_codecs import JsonCodecs
+from postgres_helpers.loader import RowLoader
+from postgres_helpers.metrics import ConnectorMetrics, instrumented, record_acquire_wait
+from postgres_helpers.notify import (
+    NOTIFY_SQL,
+    MAX_RECONNECT_DELAY,
+    NotificationBuffer,
+    notify_params,
+    pending_notifications
+)
+from postgres_helpers.parquet import ParquetSink, process_rss
+from postgres_helpers.result_cache import (
+    ResultCache,
+    DEFAULT_INVALIDATION_CHANNEL,
+    make_cache_key,
+    extract_read_tables,
+    parse_invalidation_payload
 )
+from postgres_helpers.routing import ReplicaRouter, REPLICA_LAG_SQL, is_write_query
+from postgres_helpers.rows import check_row_format, convert_rows, record_columns, row_converter
+from postgres_helpers.schema_cache import SchemaCache, TABLE_SCHEMA_SQL, parse_table_schema
+from postgres_helpers.statement_cache import CachingConnection, StatementCache
+from postgres_helpers.warmup import WarmupSpec, WarmupTimer, timed_step
 
 logger = logging.getLogger(f"postgres_helpers:{Path(__file__).name}")
 
+# Methods a run_many() job may name as its mode
+RUN_MANY_MODES = (
+    "execute_one_query",
+    "fetch_all_as_dicts",
+    "fetch_all_as_df",
+    "fetch_one_as_dict",
+    "fetch_value",
+)
+
 
 class PostgresConnectorAsyncPool:
     """
@@ -81,6 +157,10 @@ class PostgresConnectorAsyncPool:
     concurrent database access. It supports context manager protocol
     for automatic cleanup.
 
+    Every query method accepts keyword-only timeout= (seconds) and deadline=
+    (time.monotonic() value) covering the pool acquire and the execution;
+    past it the statement is cancelled and QueryTimeoutError is raised.
+
     Args:
         pool_size_max: Maximum number of connections in the pool (default: 5)
         pool_size_min: Minimum number of connections to maintain (default: 3)
@@ -91,6 +171,33 @@ class PostgresConnectorAsyncPool:
         db_name: Database name (falls back to POSTGRES_DB_NAME env var)
         application_name: Name shown in pg_stat_activity (optional)
         command_timeout: Default query timeout in seconds (optional)
+        statement_cache_size: Prepared statements cached per connection by the
+                              library (default: 0, disabled). See prepare().
+        result_cache: ResultCache shared by the fetch methods called with
+                      cache_ttl= (optional, default: no caching).
+        replica_dsns: DSNs of hot standby replicas (optional). Each gets its
+                      own pool of the same size; fetch_* methods read from
+                      them while writes and transaction() use the primary.
+                      A replica unreachable at startup starts out of rotation.
+        replica_routing: "round_robin" (default) or "least_busy".
+        max_replica_lag: Replay lag in seconds above which a replica is taken
+                         out of rotation (default: None, not checked).
+        replica_check_interval: Seconds between two lag checks (default: 5).
+        autoscale: AutoscalePolicy to grow the primary pool from pool_size_max
+                   up to policy.max_size under acquire-wait pressure, and
+                   shrink it back towards pool_size_min when idle
+                   (optional, default: fixed size).
+        warmup: WarmupSpec applied to every new connection: session
+                settings, codecs and pre-prepared statements. The
+                pool_size_min first connections are warmed before the pool
+                is returned; timings are in warmup_report (optional).
+        json_codecs: JsonCodecs registered on every connection to decode
+                     and encode json/jsonb values (optional, default:
+                     driver defaults).
+        schema_cache: SchemaCache of the table metadata used by
+                      table_exists(), get_table_schema(), the upsert helpers
+                      and insert_many_with_dict() (optional, default: a new
+                      SchemaCache with a 300 s TTL).
 
     Example:
         # Using context manager (recommended)
@@ -115,7 +222,17 @@ class PostgresConnectorAsyncPool:
             db_password: Optional[str] = None,
             db_name: Optional[str] = None,
             application_name: Optional[str] = None,
-            command_timeout: Optional[float] = None
+            command_timeout: Optional[float] = None,
+            statement_cache_size: int = 0,
+            result_cache: Optional[ResultCache] = None,
+            replica_dsns: Optional[List[str]] = None,
+            replica_routing: str = "round_robin",
+            max_replica_lag: Optional[float] = None,
+            replica_check_interval: float = 5.0,
+            autoscale: Optional[AutoscalePolicy] = None,
+            warmup: Optional[WarmupSpec] = None,
+            json_codecs: Optional[JsonCodecs] = None,
+            schema_cache: Optional[SchemaCache] = None
     ):
         # Load env vars if any connection param is missing
         if None in [db_host, db_port, db_name, db_user, db_password]:
@@ -127,16 +244,72 @@ class PostgresConnectorAsyncPool:
         self.db_password: str = getenv("POSTGRES_DB_PASS") if db_password is None else db_password
         self.db_name: str = getenv("POSTGRES_DB_NAME") if db_name is None else db_name
 
+        if pool_size_min > pool_size_max:
+            logger.warning(f"pool_size_min={pool_size_min} is above pool_size_max={pool_size_max}, using {pool_size_max}")
+            pool_size_min = pool_size_max
+
         # Pool configuration
         self.pool_size_max: int = pool_size_max
         self.pool_size_min: int = pool_size_min
         self.command_timeout: Optional[float] = command_timeout
 
+        # Adaptive sizing: checkouts of the primary go through a resizable gate
+        self.autoscale: Optional[AutoscalePolicy] = autoscale
+        self._autoscaler = PoolAutoscaler(autoscale, pool_size_min, pool_size_max) if autoscale else None
+        self._pool_gate: Optional[PoolGate] = None
+
         # Pool instance
         self.db_connection_pool: Optional[Pool] = None
+        self._pool_creation: Optional[asyncio.Future] = None
+
+        # Read replicas (one pool per node, same order as replica_dsns; None
+        # while a replica can't be reached)
+        self.replica_pools: List[Optional[Pool]] = []
+        self._replica_router = ReplicaRouter(
+            replica_dsns or [], replica_routing, max_replica_lag, replica_check_interval
+        )
+
+        # Table metadata (columns, keys, partitions) read from pg_catalog
+        self.schema_cache: SchemaCache = schema_cache if schema_cache is not None else SchemaCache()
+
+        # Histograms of acquire wait, execution time, rows and bytes per method
+        self.metrics = ConnectorMetrics()
+
+        # Prepared statement cache (one StatementCache per pooled connection)
+        self.statement_cache_size: int = statement_cache_size
+        self._statement_stats = StatementCacheStats(capacity=statement_cache_size)
+        self._statement_caches: "weakref.WeakSet[StatementCache]" = weakref.WeakSet()
+        self._registered_statements: Dict[str, str] = {}  # name -> sql
+        self._pinned_statements: Dict[str, str] = {}  # sql -> name
+
+        # Query result cache (opt-in per call with cache_ttl=)
+        self.result_cache: Optional[ResultCache] = result_cache
+        self._cache_refresh_tasks: Set[asyncio.Task] = set()
+        self._invalidation_listener: Optional[Tuple[Connection, str]] = None
+
+        # Buffers of the running listen() iterators
+        self._listeners: Set[NotificationBuffer] = set()
 
         # Server settings for application name visibility in pg_stat_activity
-        self.server_settings = {'application_name': application_name} if application_name else None
+        # and the warm-up session settings, sent with the startup packet
+        server_settings = dict(warmup.session_settings) if warmup else {}
+        if application_name:
+            server_settings['application_name'] = application_name
+        self.server_settings = server_settings or None
+
+        # Warm-up of new connections; timings of the last pool creation
+        self.warmup: Optional[WarmupSpec] = warmup
+        self.warmup_report: Optional[WarmupReport] = None
+        self._warmup_timer: Optional[WarmupTimer] = None
+        if warmup is not None:
+            if warmup.prepare and statement_cache_size <= 0:
+                logger.warning("warmup.prepare: statement cache disabled, statements prepared but not kept")
+            for name, sql_query in warmup.prepare.items():
+                self._registered_statements[name] = sql_query
+                self._pinned_statements[sql_query] = name
+
+        # json/jsonb codecs registered on every new connection
+        self.json_codecs: Optional[JsonCodecs] = json_codecs
 
     # =========================================================================
     # Context Manager Support
@@ -159,15 +332,37 @@ class PostgresConnectorAsyncPool:
         """
         Create the connection pool if it doesn't exist.
 
+        Single flight: when many tasks make the first call at once, one
+        creation runs and the others await it. A failed creation is
+        reported to all of them and retried by the next call.
+
         Raises:
             PoolError: If pool creation fails.
         """
-        if self.db_connection_pool is not None:
+        if self.db_connection_pool is not None and self._pool_creation is None:
             return
 
-        # Ensure min < max
-        if self.pool_size_min >= self.pool_size_max:
-            self.pool_size_min = max(1, self.pool_size_max - 1)
+        if self._pool_creation is None:
+            self._pool_creation = asyncio.ensure_future(self._build_pool())
+        creation = self._pool_creation
+        try:
+            # A cancelled caller must not cancel the creation the others await
+            await asyncio.shield(creation)
+        finally:
+            if creation.done() and self._pool_creation is creation:
+                self._pool_creation = None
+
+    async def _build_pool(self) -> None:
+        """Create the primary pool, the replica pools and the autoscaling gate."""
+        max_size = self.pool_size_max
+        max_inactive_lifetime = 300.0  # asyncpg's default
+        if self.autoscale is not None:
+            # asyncpg may open up to the ceiling; the gate holds the effective size
+            max_size = self.autoscale.max_size
+            max_inactive_lifetime = self.autoscale.idle_timeout or self.autoscale.cooldown
+
+        if self.warmup is not None:
+            self._warmup_timer = WarmupTimer()
 
         try:
             self.db_connection_pool = await asyncpg.create_pool(
@@ -176,10 +371,13 @@ class PostgresConnectorAsyncPool:
                 user=self.db_user,
                 password=self.db_password,
                 database=self.db_name,
-                max_size=self.pool_size_max,
+                max_size=max_size,
                 min_size=self.pool_size_min,
+                max_inactive_connection_lifetime=max_inactive_lifetime,
                 command_timeout=self.command_timeout,
-                server_settings=self.server_settings
+                server_settings=self.server_settings,
+                connection_class=CachingConnection,
+                init=self._init_connection
             )
         except Exception as ex:
             logger.error(f"Failed to create connection pool: {ex}")
@@ -190,6 +388,62 @@ class PostgresConnectorAsyncPool:
                 original_error=ex
             )
 
+        if self._autoscaler is not None:
+            self._pool_gate = PoolGate(self._autoscaler.size)
+
+        for index, dsn in enumerate(self._replica_router.dsns):
+            try:
+                self.replica_pools.append(await self._create_replica_pool(dsn))
+            except Exception as ex:
+                # Out of rotation until a lag check reaches it
+                logger.warning(f"Failed to create pool for replica {index}, starting without it: {ex}")
+                self.replica_pools.append(None)
+                self._replica_router.record_lag(index, None)
+
+        if self._warmup_timer is not None:
+            self.warmup_report = self._warmup_timer.report()
+            self._warmup_timer = None
+            logger.info(
+                f"Pool warmed up: {self.warmup_report.connections} connections in "
+                f"{self.warmup_report.total_seconds * 1000:.0f}ms, "
+                + ", ".join(f"{step} {seconds * 1000:.0f}ms" for step, seconds in self.warmup_report.steps.items())
+            )
+
+    async def _init_connection(self, conn: Connection) -> None:
+        """Set up each new pooled connection (called by asyncpg)."""
+        if self.statement_cache_size > 0:
+            conn.statement_cache = StatementCache(
+                conn,
+                capacity=self.statement_cache_size,
+                stats=self._statement_stats,
+                pinned=self._pinned_statements
+            )
+            self._statement_caches.add(conn.statement_cache)
+
+        if self.json_codecs is not None:
+            await self.json_codecs.register_asyncpg(conn)
+
+        if self.warmup is not None:
+            await self._warm_connection(conn)
+
+    async def _warm_connection(self, conn: Connection) -> None:
+        """Register the warm-up codecs and prepare the hot statements on a new connection."""
+        timings = self._warmup_timer.connection() if self._warmup_timer is not None else None
+
+        with timed_step(timings, "codecs"):
+            for codec in self.warmup.codecs:
+                result = codec(conn)
+                if inspect.isawaitable(result):
+                    await result
+
+        with timed_step(timings, "prepare"):
+            cache = getattr(conn, "statement_cache", None)
+            for sql_query in self.warmup.prepare.values():
+                if cache is not None:
+                    await cache.get(sql_query)
+                else:
+                    await conn.prepare(sql_query)
+
     async def close_pool(self) -> None:
         """
         Close the connection pool and release all connections.
@@ -197,6 +451,30 @@ class PostgresConnectorAsyncPool:
         Safe to call multiple times. After closing, the pool can be
         recreated by calling any query method.
         """
+        for task in list(self._cache_refresh_tasks):
+            task.cancel()
+
+        if self._invalidation_listener is not None:
+            conn, channel = self._invalidation_listener
+            self._invalidation_listener = None
+            try:
+                await conn.remove_listener(channel, self._on_invalidation_notify)
+                await self.db_connection_pool.release(conn)
+            except Exception as ex:
+                logger.warning(f"Failed to stop listening on {channel}: {ex}")
+
+        for buffer in list(self._listeners):
+            buffer.close()
+            await self._stop_listening(buffer)
+
+        for replica_pool in self.replica_pools:
+            if replica_pool is not None:
+                await replica_pool.close()
+        self.replica_pools = []
+
+        self._pool_gate = None
+        self._warmup_timer = None
+
         if self.db_connection_pool is not None:
             await self.db_connection_pool.close()
             self.db_connection_pool = None
@@ -227,18 +505,89 @@ class PostgresConnectorAsyncPool:
 
             # Get server version
             try:
-                async with self.db_connection_pool.acquire() as conn:
+                async with self._acquire(self.db_connection_pool) as conn:
                     info.server_version = str(conn.get_server_version())
             except Exception:
                 pass
 
         return info
 
+    # =========================================================================
+    # Metrics
+    # =========================================================================
+
+    @asynccontextmanager
+    async def _acquire(self, pool: Pool) -> AsyncIterator[Connection]:
+        """
+        pool.acquire(), timing the wait for the metrics of the calling method.
+
+        With autoscaling, checkouts of the primary first pass the gate.
+        """
+        started = time.perf_counter()
+        begin_acquire()
+        gate = self._pool_gate if pool is self.db_connection_pool else None
+        if gate is None:
+            async with pool.acquire() as conn:
+                record_acquire_wait(time.perf_counter() - started)
+                end_acquire()
+                yield conn
+            return
+
+        self._autoscale(gate)
+        await gate.acquire()
+        # Only the queueing at the gate drives the autoscaler: opening a new
+        # connection after a resize is not pressure
+        self._autoscaler.observe(time.perf_counter() - started, gate.in_use)
+        try:
+            async with pool.acquire() as conn:
+                record_acquire_wait(time.perf_counter() - started)
+                end_acquire()
+                yield conn
+        finally:
+            gate.release()
+            self._autoscale(gate)
+
+    def _autoscale(self, gate: PoolGate) -> None:
+        """Apply the autoscaler's decision, if it has one due."""
+        size = self._autoscaler.evaluate(gate.in_use, gate.waiting)
+        if size is not None:
+            gate.resize(size)
+
+    def get_metrics(self, reset: bool = False) -> MetricsSnapshot:
+        """
+        Get the per-method metrics and the saturation of the primary pool.
+
+        Args:
+            reset: Start new histograms after taking the snapshot, so the
+                   next one covers only the calls made in between.
+
+        Returns:
+            MetricsSnapshot with acquire wait, execution time, rows and
+            bytes histograms keyed by method name.
+
+        Example:
+            metrics = db.get_metrics(reset=True)
+            if metrics.methods["fetch_all_as_dicts"].acquire_wait.p99 > 0.05:
+                logger.warning(f"Pool saturated at {metrics.pool_saturation:.0%}")
+        """
+        pool = self.db_connection_pool
+        size = pool.get_size() if pool is not None else 0
+        idle = pool.get_idle_size() if pool is not None else 0
+        return self.metrics.snapshot(
+            reset,
+            pool_size=size,
+            pool_in_use=size - idle,
+            # With autoscaling, saturation is relative to the current effective size
+            pool_max=self._pool_gate.limit if self._pool_gate is not None else self.pool_size_max
+        )
+
     # =========================================================================
     # Transaction Support
     # =========================================================================
 
     @asynccontextmanager
+    @instrumented
+    @deadline_aware
     async def transaction(self) -> AsyncIterator[Connection]:
         """
         Context manager for database transactions.
@@ -246,6 +595,7 @@ class PostgresConnectorAsyncPool:
         Provides a connection with an active transaction. The transaction
         is automatically committed on successful exit, or rolled back if
         an exception occurs.
+        Notifications sent with notify() inside are delivered on commit.
 
         Yields:
             asyncpg.Connection: A connection with an active transaction.
@@ -268,9 +618,16 @@ class PostgresConnectorAsyncPool:
         await self._create_pool_connection()
 
         try:
-            async with self.db_connection_pool.acquire() as conn:
+            async with self._acquire(self.db_connection_pool) as conn:
                 async with conn.transaction():
-                    yield conn
+                    token = pending_notifications.set([])
+                    try:
+                        yield conn
+                        notifications = pending_notifications.get()
+                        if notifications:
+                            await conn.execute(NOTIFY_SQL, *notify_params(notifications))
+                    finally:
+                        pending_notifications.reset(token)
         except asyncpg.PostgresError as ex:
             logger.error(f"Transaction error: {ex}")
             raise TransactionError(
@@ -279,6 +636,8 @@ class PostgresConnectorAsyncPool:
             )
 
     @asynccontextmanager
+    @instrumented
+    @deadline_aware
     async def acquire_connection(self) -> AsyncIterator[Connection]:
         """
         Acquire a connection from the pool without starting a transaction.
@@ -294,9 +653,478 @@ class PostgresConnectorAsyncPool:
                 await conn.copy_to_table('my_table', source=file)
         """
         await self._create_pool_connection()
-        async with self.db_connection_pool.acquire() as conn:
+        async with self._acquire(self.db_connection_pool) as conn:
             yield conn
 
+    # =========================================================================
+    # Read Replicas
+    # =========================================================================
+
+    async def _read_pool(self, sql_query: str) -> Pool:
+        """
+        Pool serving a fetch: a replica in rotation, else the primary.
+
+        Queries that write (INSERT ... RETURNING, SELECT ... FOR UPDATE)
+        always go to the primary.
+        """
+        if not self.replica_pools or is_write_query(sql_query):
+            return self.db_connection_pool
+
+        if self._replica_router.due_for_check():
+            await self._check_replica_lag()
+
+        index = self._replica_router.choose(
+            lambda i: self.replica_pools[i].get_size() - self.replica_pools[i].get_idle_size()
+        )
+        return self.db_connection_pool if index is None else self.replica_pools[index]
+
+    async def _create_replica_pool(self, dsn: str) -> Pool:
+        return await asyncpg.create_pool(
+            dsn=dsn,
+            max_size=self.pool_size_max,
+            min_size=self.pool_size_min,
+            command_timeout=self.command_timeout,
+            server_settings=self.server_settings,
+            connection_class=CachingConnection,
+            init=self._init_connection
+        )
+
+    async def _check_replica_lag(self) -> None:
+        """Measure the replay lag of every replica (creating the pools missing) and update the rotation."""
+        self._replica_router.start_check()
+
+        async def measure(index: int) -> Optional[float]:
+            if self.replica_pools[index] is None:
+                self.replica_pools[index] = await self._create_replica_pool(self._replica_router.dsns[index])
+            async with self.replica_pools[index].acquire() as conn:
+                return await conn.fetchval(REPLICA_LAG_SQL)
+
+        lags = await asyncio.gather(
+            *(
+                asyncio.wait_for(measure(index), self._replica_router.check_interval)
+                for index in range(len(self.replica_pools))
+            ),
+            return_exceptions=True
+        )
+        for index, lag in enumerate(lags):
+            if isinstance(lag, BaseException):
+                logger.warning(f"Lag check of replica {index} failed: {lag!r}")
+                lag = None
+            self._replica_router.record_lag(index, lag)
+
+    def get_replica_status(self) -> List[ReplicaStatus]:
+        """
+        Get the lag and rotation state of the read replicas.
+
+        Returns:
+            One ReplicaStatus per entry of replica_dsns.
+
+        Example:
+            for replica in db.get_replica_status():
+                print(replica.host, replica.lag_seconds, replica.in_rotation)
+        """
+        return self._replica_router.status()
+
+    # =========================================================================
+    # Prepared Statements
+    # =========================================================================
+
+    async def _run(
+            self,
+            conn: Connection,
+            method: str,
+            sql_query: str,
+            params: Optional[Tuple] = None
+    ) -> Any:
+        """
+        Run `method` ("execute", "fetch", "fetchrow" or "fetchval") on conn.
+
+        Goes through the connection's StatementCache when enabled. An execute
+        without parameters keeps asyncpg's simple query protocol, so scripts
+        with several statements still work.
+        """
+        params = params if params else ()
+        cache = getattr(conn, "statement_cache", None)
+
+        if cache is None or (method == "execute" and not params):
+            return await getattr(conn, method)(sql_query, *params)
+
+        return await cache.run(method, sql_query, params)
+
+    @instrumented
+    @deadline_aware
+    async def prepare(self, name: str, sql_query: str) -> None:
+        """
+        Register a hot statement under a name.
+
+        Registered statements are pinned in the statement cache of every
+        connection: they are never evicted, and their prepare count is
+        reported per name in get_statement_cache_stats().prepares_by_name.
+        The statement is prepared right away on one connection, which also
+        validates the SQL. Calls with the same SQL text then hit the cache.
+
+        Requires statement_cache_size > 0 to take effect on the hot path.
+
+        Args:
+            name: Name used in the statistics.
+            sql_query: SQL text, exactly as later passed to the query methods.
+
+        Raises:
+            PoolError: If pool creation fails.
+            QueryExecutionError: If the statement can't be prepared.
+
+        Example:
+            await db.prepare("user_by_id", "SELECT * FROM users WHERE id = $1")
+        """
+        if self.statement_cache_size <= 0:
+            logger.warning(f"prepare({name!r}): statement cache disabled, statement not pinned")
+
+        self._registered_statements[name] = sql_query
+        self._pinned_statements[sql_query] = name
+
+        await self._create_pool_connection()
+
+        try:
+            async with self._acquire(self.db_connection_pool) as conn:
+                cache = getattr(conn, "statement_cache", None)
+                if cache is not None:
+                    await cache.get(sql_query)
+                else:
+                    await conn.prepare(sql_query)
+
+        except Exception as ex:
+            logger.error(f"prepare failed: {ex}")
+            raise self._convert_exception(ex, sql_query)
+
+    def get_statement_cache_stats(self) -> StatementCacheStats:
+        """
+        Get a snapshot of the prepared statement cache counters.
+
+        Returns:
+            StatementCacheStats with hits, misses, evictions and re-prepares.
+
+        Example:
+            stats = db.get_statement_cache_stats()
+            print(f"{stats.hits} hits, {stats.misses} misses")
+        """
+        return replace(
+            self._statement_stats,
+            prepares_by_name=dict(self._statement_stats.prepares_by_name),
+            cached_statements=sum(len(cache) for cache in self._statement_caches)
+        )
+
+    # =========================================================================
+    # Result Cache
+    # =========================================================================
+
+    async def _fetch_cached(
+            self,
+            kind: str,
+            sql_query: str,
+            sql_variables: Optional[Tuple],
+            cache_ttl: float,
+            cache_tags: Optional[Iterable[str]],
+            loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Serve a read from the result cache, calling loader() on a miss.
+
+        A stale entry (within the cache's stale_ttl) is returned at once and
+        refreshed in the background, at most one refresh per key.
+        """
+        cache = self.result_cache
+        key = make_cache_key(kind, sql_query, sql_variables)
+        tags = extract_read_tables(sql_query) | set(cache_tags or ())
+
+        hit = cache.get(key)
+        if hit is not None:
+            if hit.is_stale and cache.start_refresh(key):
+                task = asyncio.ensure_future(self._refresh_cached(key, cache_ttl, tags, loader))
+                self._cache_refresh_tasks.add(task)
+                task.add_done_callback(self._cache_refresh_tasks.discard)
+            return hit.value
+
+        version = cache.version()
+        value = await loader()
+        cache.set(key, value, cache_ttl, tags=tags, loaded_at_version=version)
+        return value
+
+    async def _refresh_cached(
+            self,
+            key: Hashable,
+            cache_ttl: float,
+            tags: Set[str],
+            loader: Callable[[], Awaitable[Any]]
+    ) -> None:
+        """Reload a stale cache entry (runs as a background task)."""
+        cache = self.result_cache
+        try:
+            version = cache.version()
+            cache.set(key, await loader(), cache_ttl, tags=tags, loaded_at_version=version)
+        except Exception as ex:
+            logger.warning(f"Background refresh of a cached result failed: {ex}")
+        finally:
+            cache.end_refresh(key)
+
+    def _invalidate_cached_results(
+            self,
+            sql_query: Optional[str] = None,
+            table_name: Optional[str] = None
+    ) -> None:
+        """Drop the cached results of the table a write touched, and the table metadata DDL changed."""
+        if sql_query is not None:
+            self.schema_cache.invalidate_for_sql(sql_query)
+        if self.result_cache is None:
+            return
+        if table_name is not None:
+            self.result_cache.invalidate_tables([table_name])
+        else:
+            self.result_cache.invalidate_for_sql(sql_query)
+
+    def _on_invalidation_notify(
+            self,
+            connection: Connection,
+            pid: int,
+            channel: str,
+            payload: str
+    ) -> None:
+        """asyncpg listener: invalidate the tables named in a NOTIFY payload."""
+        tables = parse_invalidation_payload(payload)
+        if not tables or "*" in tables:
+            self.result_cache.clear()
+        else:
+            self.result_cache.invalidate_tables(tables)
+        logger.debug(f"Result cache invalidated by NOTIFY {channel} from pid {pid}: {payload!r}")
+
+    async def listen_for_cache_invalidation(
+            self,
+            channel: str = DEFAULT_INVALIDATION_CHANNEL
+    ) -> None:
+        """
+        Invalidate cached results when another process notifies a write.
+
+        Holds one pooled connection that LISTENs on `channel` until
+        close_pool(). The payload is a comma separated list of table names;
+        an empty payload or "*" clears the whole cache. Writes made by other
+        services (or by raw SQL inside transaction(), which the connector
+        can't see) can then keep the cache coherent:
+
+            NOTIFY postgres_helpers_cache, 'users,orders';
+            -- or from a trigger: PERFORM pg_notify('postgres_helpers_cache', TG_TABLE_NAME);
+
+        Args:
+            channel: Notification channel (default: "postgres_helpers_cache").
+
+        Raises:
+            PoolError: If pool creation fails.
+            QueryExecutionError: If LISTEN fails.
+
+        Example:
+            db = PostgresConnectorAsyncPool(result_cache=ResultCache())
+            await db.listen_for_cache_invalidation()
+        """
+        if self.result_cache is None:
+            logger.warning("listen_for_cache_invalidation: no result_cache configured, not listening")
+            return
+        if self._invalidation_listener is not None:
+            return
+
+        await self._create_pool_connection()
+
+        conn = await self.db_connection_pool.acquire()
+        try:
+            await conn.add_listener(channel, self._on_invalidation_notify)
+        except Exception as ex:
+            await self.db_connection_pool.release(conn)
+            logger.error(f"listen_for_cache_invalidation failed: {ex}")
+            raise self._convert_exception(ex, f"LISTEN {channel}")
+
+        self._invalidation_listener = (conn, channel)
+
+    # =========================================================================
+    # LISTEN / NOTIFY
+    # =========================================================================
+
+    async def listen(
+            self,
+            channels: Union[str, Sequence[str]],
+            max_batch: int = 500,
+            batch_window: float = 0.01,
+            max_queue: int = 10_000,
+            keepalive: float = 30.0,
+            reconnect_delay: float = 1.0
+    ) -> AsyncIterator[List[Notification]]:
+        """
+        Receive the notifications sent on channels, in batches.
+
+        Takes one connection out of the pool for the whole iteration, counted
+        by the autoscaling gate like other checkouts (close the iterator, or
+        close_pool(), to give it back).
+        Reconnects and LISTENs again after a connection loss; see
+        postgres_helpers.notify for batching and backpressure.
+
+        Args:
+            channels: Channel name, or list of channel names.
+            max_batch: Most notifications per batch (default: 500).
+            batch_window: Seconds to wait for more notifications after the
+                          first one of a batch (default: 0.01; 0 yields
+                          what has arrived).
+            max_queue: Notifications buffered before the connection stops
+                       reading, until the consumer catches up
+                       (default: 10000).
+            keepalive: Seconds without notifications after which the
+                       connection is checked with a query (default: 30).
+            reconnect_delay: First wait before reconnecting, doubled on each
+                             failed attempt up to 30 s (default: 1).
+
+        Yields:
+            Lists of Notification in arrival order; an empty list after a
+            reconnect (notifications sent in between are lost).
+
+        Raises:
+            PoolError: If pool creation fails.
+            QueryExecutionError: If the first LISTEN fails.
+
+        Example:
+            async for batch in db.listen("orders"):
+                order_ids = {int(n.payload) for n in batch}
+                await refresh_orders(order_ids)
+        """
+        buffer = NotificationBuffer([channels] if isinstance(channels, str) else channels, max_queue)
+
+        await self._create_pool_connection()
+        try:
+            await self._start_listening(buffer)
+        except Exception as ex:
+            logger.error(f"listen failed: {ex}")
+            raise self._convert_exception(ex, f"LISTEN {', '.join(buffer.channels)}")
+
+        self._listeners.add(buffer)
+        delay = reconnect_delay
+        try:
+            while not buffer.closed:
+                if buffer.conn is None:
+                    try:
+                        await self._create_pool_connection()
+                        await self._start_listening(buffer)
+                    except Exception as ex:
+                        logger.warning(f"listen: reconnect failed, next attempt in {delay:.1f}s: {ex}")
+                        await asyncio.sleep(delay)
+                        delay = min(delay * 2, MAX_RECONNECT_DELAY)
+                        continue
+                    logger.info(f"listen: listening again on {buffer.channels}")
+                    delay = reconnect_delay
+                    yield []
+                    continue
+
+                batch = await buffer.get_batch(max_batch, batch_window, keepalive)
+                if batch:
+                    yield batch
+                elif not buffer.closed and (buffer.lost or not await self._listen_connection_alive(buffer)):
+                    logger.warning(f"listen: connection lost, reconnecting to {buffer.channels}")
+                    await self._stop_listening(buffer)
+        finally:
+            self._listeners.discard(buffer)
+            await self._stop_listening(buffer)
+
+    async def _start_listening(self, buffer: NotificationBuffer) -> None:
+        """
+        Take a connection out of the pool and LISTEN on the buffer's channels.
+
+        With autoscaling, the connection holds a slot of the gate like any
+        other checkout of the primary, until _stop_listening().
+        """
+        gate = self._pool_gate
+        if gate is not None:
+            await gate.acquire()
+        try:
+            conn = await self.db_connection_pool.acquire()
+            try:
+                for channel in buffer.channels:
+                    await conn.add_listener(channel, buffer.on_notification)
+                conn.add_termination_listener(buffer.on_termination)
+            except Exception:
+                await self.db_connection_pool.release(conn)
+                raise
+        except BaseException:
+            if gate is not None:
+                gate.release()
+            raise
+        buffer.attach(conn)
+        buffer.gate = gate
+
+    async def _stop_listening(self, buffer: NotificationBuffer) -> None:
+        """UNLISTEN and give the buffer's connection back to the pool (no-op without one)."""
+        conn = buffer.detach()
+        if conn is None:
+            return
+        if not conn.is_closed():
+            try:
+                conn.remove_termination_listener(buffer.on_termination)
+                for channel in buffer.channels:
+                    await conn.remove_listener(channel, buffer.on_notification)
+            except Exception as ex:
+                logger.warning(f"Failed to stop listening on {buffer.channels}: {ex}")
+        if self.db_connection_pool is not None:
+            try:
+                await self.db_connection_pool.release(conn)
+            except Exception as ex:
+                logger.warning(f"Failed to release the listen connection: {ex}")
+        gate, buffer.gate = buffer.gate, None
+        if gate is not None:
+            gate.release()
+            if gate is self._pool_gate:
+                self._autoscale(gate)
+
+    async def _listen_connection_alive(self, buffer: NotificationBuffer) -> bool:
+        """Keepalive of a quiet listen connection."""
+        if buffer.paused:
+            return True
+        try:
+            await buffer.conn.fetchval("SELECT 1", timeout=10)
+            return True
+        except Exception:
+            return False
+
+    @instrumented
+    @deadline_aware
+    async def notify(self, channel: str, payload: str = "") -> None:
+        """
+        Send a notification to the listeners of a channel (pg_notify).
+
+        Inside transaction(), the notification is held and sent with the
+        others of the transaction in one statement before the commit, so
+        listeners get it only if the transaction commits. Elsewhere it is
+        sent at once.
+
+        Args:
+            channel: Channel name.
+            payload: Payload text, under 8000 bytes (default: none).
+
+        Raises:
+            PoolError: If pool creation fails.
+            QueryExecutionError: For query errors.
+
+        Example:
+            await db.notify("orders", str(order_id))
+        """
+        notifications = pending_notifications.get()
+        if notifications is not None:
+            notifications.append((channel, payload))
+            return
+
+        params = notify_params([(channel, payload)])
+
+        await self._create_pool_connection()
+
+        try:
+            async with self._acquire(self.db_connection_pool) as conn:
+                await self._run(conn, "execute", NOTIFY_SQL, params)
+
+        except Exception as ex:
+            logger.error(f"notify failed: {ex}")
+            raise self._convert_exception(ex, NOTIFY_SQL, params)
+
     # =========================================================================
     # Error Handling Helper
     # =========================================================================
@@ -338,6 +1166,15 @@ class PostgresConnectorAsyncPool:
                 original_error=ex,
                 constraint_name=getattr(ex, 'constraint_name', None)
             )
+        elif isinstance(ex, (asyncpg.QueryCanceledError, asyncio.TimeoutError)):
+            # statement_timeout on the server, command_timeout in asyncpg
+            return QueryTimeoutError(
+                f"Query timed out: {ex}",
+                query=safe_query,
+                params=params,
+                original_error=ex,
+                timeout_seconds=self.command_timeout if isinstance(ex, asyncio.TimeoutError) else None
+            )
         elif isinstance(ex, asyncpg.PostgresError):
             return QueryExecutionError(
                 f"Query execution failed: {ex}",
@@ -353,208 +1190,811 @@ class PostgresConnectorAsyncPool:
                 original_error=ex
             )
 
-    # =========================================================================
-    # Query Execution Methods
-    # =========================================================================
+    # =========================================================================
+    # Query Execution Methods
+    # =========================================================================
+
+    @instrumented
+    @deadline_aware
+    async def execute_one_query(
+            self,
+            sql_query: str,
+            sql_variables: Optional[Tuple] = None
+    ) -> QueryResult:
+        """
+        Execute a single SQL query (INSERT, UPDATE, DELETE, CREATE, etc.).
+
+        Args:
+            sql_query: The SQL query to execute.
+            sql_variables: Query parameters as a tuple.
+
+        Returns:
+            QueryResult with rows_affected, status_message, etc.
+
+        Raises:
+            PoolError: If pool creation fails.
+            UniqueViolationError: If unique constraint is violated.
+            ForeignKeyViolationError: If foreign key constraint is violated.
+            QueryExecutionError: For other query errors.
+
+        Example:
+            result = await db.execute_one_query(
+                "UPDATE users SET active = $1 WHERE last_login < $2",
+                (False, datetime(2023, 1, 1))
+            )
+            print(f"Deactivated {result.rows_affected} users")
+        """
+        await self._create_pool_connection()
+
+        try:
+            async with self._acquire(self.db_connection_pool) as conn:
+                result = await self._run(conn, "execute", sql_query, sql_variables)
+
+            self._invalidate_cached_results(sql_query=sql_query)
+
+            # Parse result string (e.g., "UPDATE 5" or "INSERT 0 1")
+            rows_affected = -1
+            try:
+                rows_affected = int(result.split()[-1])
+            except (ValueError, IndexError):
+                pass
+
+            return QueryResult(
+                rows_affected=rows_affected,
+                status_message=result,
+                success=True
+            )
+
+        except Exception as ex:
+            logger.error(f"execute_one_query failed: {ex}")
+            raise self._convert_exception(ex, sql_query, sql_variables)
+
+    @instrumented
+    @deadline_aware
+    async def execute_many_query(
+            self,
+            sql_query: str,
+            tuples: List[Tuple]
+    ) -> ExecuteManyResult:
+        """
+        Execute a query multiple times with different parameters.
+
+        This is more efficient than calling execute_one_query in a loop
+        as it uses a single transaction.
+
+        Note: If one statement fails, the entire batch is rolled back.
+
+        Args:
+            sql_query: The SQL query to execute (with $1, $2, ... placeholders).
+            tuples: List of parameter tuples, one per execution.
+
+        Returns:
+            ExecuteManyResult with execution statistics.
+
+        Raises:
+            PoolError: If pool creation fails.
+            QueryExecutionError: If any statement fails (batch is rolled back).
+
+        Example:
+            await db.execute_many_query(
+                "INSERT INTO logs (level, message) VALUES ($1, $2)",
+                [
+                    ("INFO", "User logged in"),
+                    ("WARNING", "Invalid password attempt"),
+                    ("INFO", "User logged out")
+                ]
+            )
+        """
+        await self._create_pool_connection()
+
+        try:
+            async with self._acquire(self.db_connection_pool) as conn:
+                await conn.executemany(sql_query, tuples)
+
+            self._invalidate_cached_results(sql_query=sql_query)
+
+            return ExecuteManyResult(
+                success=True,
+                total_statements=len(tuples)
+            )
+
+        except Exception as ex:
+            logger.error(f"execute_many_query failed: {ex}")
+            raise self._convert_exception(ex, sql_query)
+
+    @instrumented
+    @deadline_aware
+    async def bulk_insert_records(
+            self,
+            table_name: str,
+            columns: List[str],
+            records: Records,
+            schema_name: Optional[str] = None
+    ) -> ExecuteManyResult:
+        """
+        Bulk insert rows with PostgreSQL's binary COPY protocol.
+
+        Much faster than execute_many_query for large loads, as all rows are
+        streamed in a single COPY statement instead of one INSERT per row.
+
+        Note: COPY does not support ON CONFLICT. A duplicate key aborts the
+        whole load.
+
+        Args:
+            table_name: Name of the table to insert into.
+            columns: Column names, in the order of the values in each record.
+            records: List, iterator or async iterator of tuples or dicts.
+                     Dicts are read by column name.
+            schema_name: Schema of the table (optional).
+
+        Returns:
+            ExecuteManyResult with rows_affected taken from the COPY status.
+
+        Raises:
+            PoolError: If pool creation fails.
+            UniqueViolationError: If a row violates a unique constraint.
+            QueryExecutionError: For other errors.
+
+        Example:
+            result = await db.bulk_insert_records(
+                "logs",
+                ["level", "message"],
+                [("INFO", "User logged in"), {"level": "INFO", "message": "Bye"}]
+            )
+            print(f"Copied {result.rows_affected} rows")
+        """
+        await self._create_pool_connection()
+
+        try:
+            async with self._acquire(self.db_connection_pool) as conn:
+                status = await conn.copy_records_to_table(
+                    table_name,
+                    records=records_as_tuples(records, columns),
+                    columns=columns,
+                    schema_name=schema_name
+                )
+
+            self._invalidate_cached_results(table_name=table_name)
+
+            return ExecuteManyResult(
+                success=True,
+                total_statements=1,
+                rows_affected=parse_copy_status(status)
+            )
+
+        except Exception as ex:
+            logger.error(f"bulk_insert_records failed: {ex}")
+            raise self._convert_exception(ex, f"COPY {table_name}")
+
+    @instrumented
+    @deadline_aware
+    async def write_df(
+            self,
+            df: pd.DataFrame,
+            table_name: str,
+            if_exists: str = "append",
+            chunk_rows: int = 50000,
+            schema_name: Optional[str] = None
+    ) -> ExecuteManyResult:
+        """
+        Load a DataFrame into a table with the binary COPY protocol.
+
+        The rows are streamed in one COPY statement, converted to Python
+        values chunk_rows rows at a time, so the frame is never held as
+        Python tuples in full. The whole load runs in one transaction.
+
+        A missing table is created with column types mapped from the
+        dtypes: integers keep their width (nullable Int* included), floats,
+        booleans, datetime64 -> timestamp, tz-aware -> timestamptz,
+        timedelta -> interval, categoricals take the type of their
+        categories, object columns are typed from their values (text by
+        default). NaN, NaT and pd.NA are loaded as NULL. The index is not
+        loaded: reset_index() first to keep it.
+
+        Args:
+            df: DataFrame to load; its column names are the table columns.
+            table_name: Target table.
+            if_exists: What to do with an existing table: "append" (default)
+                       adds the rows, "truncate" empties it first, "replace"
+                       drops and recreates it from the dtypes.
+            chunk_rows: Rows converted at a time.
+            schema_name: Schema of the table (optional).
+
+        Returns:
+            ExecuteManyResult with rows_affected taken from the COPY status.
+
+        Raises:
+            ValueError: If if_exists or chunk_rows is invalid.
+            PoolError: If pool creation fails.
+            QueryExecutionError: If the load fails (nothing is written).
+
+        Example:
+            result = await db.write_df(prices_df, "prices", if_exists="truncate")
+            print(f"Loaded {result.rows_affected} rows")
+        """
+        if if_exists not in WRITE_DF_MODES:
+            raise ValueError(f"if_exists must be one of {WRITE_DF_MODES}, got {if_exists!r}")
+        if chunk_rows < 1:
+            raise ValueError(f"chunk_rows must be at least 1, got {chunk_rows}")
+
+        columns = [str(column) for column in df.columns]
+        target = qualified_name(table_name, schema_name)
+        await self._create_pool_connection()
+
+        try:
+            async with self._acquire(self.db_connection_pool) as conn:
+                async with conn.transaction():
+                    exists = await conn.fetchval("SELECT to_regclass($1) IS NOT NULL", target)
+                    if exists and if_exists == "replace":
+                        await conn.execute(f"DROP TABLE {target}")
+                        exists = False
+                    if not exists:
+                        sql_types = [series_sql_type(df.iloc[:, position]) for position in range(df.shape[1])]
+                        await conn.execute(build_create_table_sql(table_name, columns, sql_types, schema_name))
+                    elif if_exists == "truncate":
+                        await conn.execute(f"TRUNCATE {target}")
+
+                    status = await conn.copy_records_to_table(
+                        table_name,
+                        records=dataframe_records(df, chunk_rows),
+                        columns=columns,
+                        schema_name=schema_name
+                    )
+
+            self.schema_cache.invalidate_tables([table_name])
+            self._invalidate_cached_results(table_name=table_name)
+
+            return ExecuteManyResult(
+                success=True,
+                total_statements=1,
+                rows_affected=parse_copy_status(status)
+            )
+
+        except Exception as ex:
+            logger.error(f"write_df failed: {ex}")
+            raise self._convert_exception(ex, f"COPY {target}")
+
+    # =========================================================================
+    # Fetch Methods
+    # =========================================================================
+
+    @instrumented
+    @deadline_aware
+    async def fetch_all_as_dicts(
+            self,
+            sql_query: str,
+            sql_variables: Optional[Tuple] = None,
+            cache_ttl: Optional[float] = None,
+            cache_tags: Optional[Iterable[str]] = None,
+            row_format: str = "dict"
+    ) -> List[Any]:
+        """
+        Fetch all rows as a list of dictionaries (or row_format rows).
+
+        Args:
+            sql_query: SELECT query to execute.
+            sql_variables: Query parameters as a tuple.
+            cache_ttl: Serve the result from the result cache for this many
+                       seconds (requires result_cache). Default: not cached.
+            cache_tags: Extra table names the cached result depends on, on
+                        top of the tables read in FROM/JOIN clauses.
+            row_format: "dict" (default), "tuple", "record" (asyncpg Record)
+                        or "row" (tuple subclass with attribute access), see
+                        postgres_helpers.rows.
+
+        Returns:
+            List of rows, dicts keyed by column name by default.
+            Returns empty list if no rows found.
+
+        Raises:
+            PoolError: If pool creation fails.
+            QueryExecutionError: If query execution fails.
+
+        Example:
+            users = await db.fetch_all_as_dicts(
+                "SELECT id, name, email FROM users WHERE active = $1",
+                (True,)
+            )
+            for user in users:
+                print(f"{user['name']}: {user['email']}")
+        """
+        check_row_format(row_format)
+        if cache_ttl is not None and self.result_cache is not None:
+            return await self._fetch_cached(
+                f"rows:{row_format}", sql_query, sql_variables, cache_ttl, cache_tags,
+                lambda: self.fetch_all_as_dicts(sql_query, sql_variables, row_format=row_format)
+            )
+
+        await self._create_pool_connection()
+
+        try:
+            pool = await self._read_pool(sql_query)
+            async with self._acquire(pool) as conn:
+                results = await self._run(conn, "fetch", sql_query, sql_variables)
+
+            return convert_rows(results, record_columns(results), row_format)
+
+        except Exception as ex:
+            logger.error(f"fetch_all_as_dicts failed: {ex}")
+            raise self._convert_exception(ex, sql_query, sql_variables)
+
+    @instrumented
+    @deadline_aware
+    async def fetch_iter(
+            self,
+            sql_query: str,
+            sql_variables: Optional[Tuple] = None,
+            batch_size: int = 1000,
+            as_batches: bool = False,
+            row_format: str = "dict"
+    ) -> AsyncIterator[Any]:
+        """
+        Stream rows through a server-side cursor, batch_size rows at a time.
+
+        Only one batch is held in memory at once, whatever the size of the
+        result. A pooled connection and a transaction are held until the
+        generator finishes: consuming it fully releases them at once, but
+        breaking out of the `async for` loop leaves them held until the
+        generator is closed (by the event loop's async generator finalizer,
+        at some later point). Wrap it in contextlib.aclosing() (Python 3.10+;
+        before, call its aclose() in a finally block) to release them when
+        the loop is left.
+
+        Args:
+            sql_query: SELECT query to execute.
+            sql_variables: Query parameters as a tuple.
+            batch_size: Number of rows fetched per round trip.
+            as_batches: If True, yield lists of up to batch_size dicts
+                        instead of one dict per row.
+            row_format: "dict" (default), "tuple", "record" (asyncpg Record)
+                        or "row" (tuple subclass with attribute access), see
+                        postgres_helpers.rows.
+
+        Yields:
+            One dict (row_format row) per row, or lists of them if
+            as_batches=True.
+
+        Raises:
+            PoolError: If pool creation fails.
+            QueryExecutionError: If query execution fails.
+
+        Example:
+            async with contextlib.aclosing(db.fetch_iter("SELECT * FROM events", batch_size=5000)) as events:
+                async for event in events:
+                    if process(event):
+                        break
+        """
+        check_row_format(row_format)
+        await self._create_pool_connection()
+
+        try:
+            pool = await self._read_pool(sql_query)
+            async with self._acquire(pool) as conn:
+                async with conn.transaction():
+                    cursor = await conn.cursor(
+                        sql_query,
+                        *(sql_variables if sql_variables else ())
+                    )
+                    convert = None
+                    while True:
+                        records = await cursor.fetch(batch_size)
+                        if not records:
+                            break
+
+                        if convert is None:
+                            convert = row_converter(record_columns(records), row_format)
+                        if as_batches:
+                            yield [convert(r) for r in records]
+                        else:
+                            for r in records:
+                                yield convert(r)
+
+                        if len(records) < batch_size:
+                            break
+
+        except Exception as ex:
+            logger.error(f"fetch_iter failed: {ex}")
+            raise self._convert_exception(ex, sql_query, sql_variables)
+
+    @instrumented
+    @deadline_aware
+    async def iter_df(
+            self,
+            sql_query: str,
+            sql_variables: Optional[Tuple] = None,
+            chunk_rows: int = 50000
+    ) -> AsyncIterator[pd.DataFrame]:
+        """
+        Stream the result as DataFrames of up to chunk_rows rows.
+
+        Rows are read through a server-side cursor, one chunk at a time, so
+        memory is bounded by the chunk size whatever the size of the result.
+        Every chunk has the same dtypes, derived from the column types:
+        nullable Int16/Int32/Int64 and boolean, float32/float64, datetime64
+        (UTC for timestamptz), the pandas string dtype for text, object for
+        the other types. A pooled connection and a transaction are
+        held until the iteration ends.
+
+        Args:
+            sql_query: SELECT query to execute.
+            sql_variables: Query parameters as a tuple.
+            chunk_rows: Maximum rows per DataFrame.
+
+        Yields:
+            DataFrames with the columns of the result; nothing for an empty
+            result.
+
+        Raises:
+            PoolError: If pool creation fails.
+            QueryExecutionError: If query execution fails.
+
+        Example:
+            total = 0
+            async for chunk in db.iter_df("SELECT user_id, amount FROM events WHERE year = $1", (2024,)):
+                total += chunk["amount"].sum()
+        """
+        await self._create_pool_connection()
+
+        try:
+            pool = await self._read_pool(sql_query)
+            async with self._acquire(pool) as conn:
+                async with conn.transaction():
+                    statement = await conn.prepare(sql_query)
+                    attributes = statement.get_attributes()
+                    columns = [attribute.name for attribute in attributes]
+                    dtypes = chunk_dtypes([attribute.type.oid for attribute in attributes])
+
+                    cursor = await statement.cursor(*(sql_variables if sql_variables else ()))
+                    while True:
+                        records = await cursor.fetch(chunk_rows)
+                        if records:
+                            yield rows_to_df(records, columns, dtypes)
+                        if len(records) < chunk_rows:
+                            break
+
+        except Exception as ex:
+            logger.error(f"iter_df failed: {ex}")
+            raise self._convert_exception(ex, sql_query, sql_variables)
+
+    @instrumented
+    @deadline_aware
+    async def fetch_all_as_df(
+            self,
+            sql_query: str,
+            sql_variables: Optional[Tuple] = None,
+            cache_ttl: Optional[float] = None,
+            cache_tags: Optional[Iterable[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Fetch all rows as a pandas DataFrame.
+
+        Args:
+            sql_query: SELECT query to execute.
+            sql_variables: Query parameters as a tuple.
+            cache_ttl: Serve the result from the result cache for this many
+                       seconds (requires result_cache). Default: not cached.
+            cache_tags: Extra table names the cached result depends on, on
+                        top of the tables read in FROM/JOIN clauses.
+
+        Returns:
+            DataFrame with columns matching the query result, built column
+            by column from the records. An empty result keeps the column names.
+
+        Raises:
+            PoolError: If pool creation fails.
+            QueryExecutionError: If query execution fails.
+
+        Example:
+            df = await db.fetch_all_as_df(
+                "SELECT date, amount FROM transactions WHERE user_id = $1",
+                (user_id,)
+            )
+            total = df['amount'].sum()
+        """
+        if cache_ttl is not None and self.result_cache is not None:
+            return await self._fetch_cached(
+                "df", sql_query, sql_variables, cache_ttl, cache_tags,
+                lambda: self.fetch_all_as_df(sql_query, sql_variables)
+            )
+
+        await self._create_pool_connection()
 
-    async def execute_one_query(
+        try:
+            pool = await self._read_pool(sql_query)
+            async with self._acquire(pool) as conn:
+                records = await self._run(conn, "fetch", sql_query, sql_variables)
+
+                if records:
+                    columns = list(records[0].keys())
+                else:
+                    # No row to read the names from: describe the statement
+                    statement = await conn.prepare(sql_query)
+                    columns = [attribute.name for attribute in statement.get_attributes()]
+
+            return rows_to_df(records, columns)
+
+        except Exception as ex:
+            logger.error(f"fetch_all_as_df failed: {ex}")
+            raise self._convert_exception(ex, sql_query, sql_variables)
+
+    @instrumented
+    @deadline_aware
+    async def fetch_all_as_arrow(
             self,
             sql_query: str,
-            sql_variables: Optional[Tuple] = None
-    ) -> QueryResult:
+            sql_variables: Optional[Tuple] = None,
+            batch_size: int = 10000
+    ) -> "pa.Table":
         """
-        Execute a single SQL query (INSERT, UPDATE, DELETE, CREATE, etc.).
+        Fetch all rows as a pyarrow Table, built batch by batch.
+
+        Rows are read through a server-side cursor, batch_size at a time, and
+        each batch is converted to Arrow arrays before the next one is
+        fetched, so peak memory stays close to the size of the table. Column
+        types follow the Postgres types (see postgres_helpers.arrow).
 
         Args:
-            sql_query: The SQL query to execute.
+            sql_query: SELECT query to execute.
             sql_variables: Query parameters as a tuple.
+            batch_size: Number of rows fetched and converted at a time.
 
         Returns:
-            QueryResult with rows_affected, status_message, etc.
+            pyarrow.Table; an empty result keeps the columns and their types.
 
         Raises:
             PoolError: If pool creation fails.
-            UniqueViolationError: If unique constraint is violated.
-            ForeignKeyViolationError: If foreign key constraint is violated.
-            QueryExecutionError: For other query errors.
+            QueryExecutionError: If query execution fails.
+            ImportError: If pyarrow is not installed.
 
         Example:
-            result = await db.execute_one_query(
-                "UPDATE users SET active = $1 WHERE last_login < $2",
-                (False, datetime(2023, 1, 1))
-            )
-            print(f"Deactivated {result.rows_affected} users")
+            table = await db.fetch_all_as_arrow("SELECT * FROM events WHERE day = $1", (day,))
+            pyarrow.parquet.write_table(table, "events.parquet")
         """
         await self._create_pool_connection()
 
         try:
-            async with self.db_connection_pool.acquire() as conn:
-                result = await conn.execute(
-                    sql_query,
-                    *(sql_variables if sql_variables else ())
-                )
-
-            # Parse result string (e.g., "UPDATE 5" or "INSERT 0 1")
-            rows_affected = -1
-            try:
-                rows_affected = int(result.split()[-1])
-            except (ValueError, IndexError):
-                pass
-
-            return QueryResult(
-                rows_affected=rows_affected,
-                status_message=result,
-                success=True
-            )
-
+            pool = await self._read_pool(sql_query)
+            async with self._acquire(pool) as conn:
+                async with conn.transaction():
+                    statement = await conn.prepare(sql_query)
+                    builder = ArrowTableBuilder.from_attributes(statement.get_attributes())
+                    cursor = await statement.cursor(*(sql_variables if sql_variables else ()))
+                    while True:
+                        records = await cursor.fetch(batch_size)
+                        builder.add_rows(records)
+                        if len(records) < batch_size:
+                            break
+
+            return builder.table()
+
+        except ImportError:
+            raise
         except Exception as ex:
-            logger.error(f"execute_one_query failed: {ex}")
+            logger.error(f"fetch_all_as_arrow failed: {ex}")
             raise self._convert_exception(ex, sql_query, sql_variables)
 
-    async def execute_many_query(
+    @instrumented
+    @deadline_aware
+    async def export_to_parquet(
             self,
             sql_query: str,
-            tuples: List[Tuple]
-    ) -> ExecuteManyResult:
+            sql_variables: Optional[Tuple],
+            path: Union[str, Path],
+            row_group_rows: int = 100_000,
+            batch_size: int = 10000,
+            partition_by: Optional[str] = None,
+            compression: str = "snappy",
+            schema: Optional["pa.Schema"] = None
+    ) -> ExportResult:
         """
-        Execute a query multiple times with different parameters.
+        Write the result of a query to Parquet, streaming.
 
-        This is more efficient than calling execute_one_query in a loop
-        as it uses a single transaction.
-
-        Note: If one statement fails, the entire batch is rolled back.
+        Rows are read through a server-side cursor, batch_size at a time;
+        each batch is converted to Arrow and row groups are written as they
+        fill, so memory holds one batch and one row group (per partition)
+        instead of the whole result. Column types follow the Postgres types
+        (see postgres_helpers.arrow and postgres_helpers.parquet).
 
         Args:
-            sql_query: The SQL query to execute (with $1, $2, ... placeholders).
-            tuples: List of parameter tuples, one per execution.
+            sql_query: SELECT query to execute.
+            sql_variables: Query parameters as a tuple (None for none).
+            path: Parquet file, or root directory with partition_by.
+            row_group_rows: Rows per row group (default: 100000).
+            batch_size: Rows fetched and converted at a time (default: 10000).
+            partition_by: Column to split the output on: one file per value,
+                          path/<column>=<value>/part-0.parquet (optional).
+            compression: Parquet compression codec (default: "snappy").
+            schema: pyarrow schema of the files, to fix the types of columns
+                    inferred from the values (default: from the first row
+                    group, decimals widened, see postgres_helpers.parquet).
 
         Returns:
-            ExecuteManyResult with execution statistics.
+            ExportResult with rows, files, row groups, rows_per_second and
+            the peak RSS seen during the export.
 
         Raises:
             PoolError: If pool creation fails.
-            QueryExecutionError: If any statement fails (batch is rolled back).
+            QueryExecutionError: If the query or the writing fails, or if
+                                 partition_by is not a column of the result
+                                 (files written so far are left in place).
+            ImportError: If pyarrow is not installed.
 
         Example:
-            await db.execute_many_query(
-                "INSERT INTO logs (level, message) VALUES ($1, $2)",
-                [
-                    ("INFO", "User logged in"),
-                    ("WARNING", "Invalid password attempt"),
-                    ("INFO", "User logged out")
-                ]
+            result = await db.export_to_parquet(
+                "SELECT * FROM events WHERE day >= $1", (start,), "exports/events.parquet"
             )
+            logger.info(f"{result.rows_per_second:,.0f} rows/s, peak RSS {result.peak_rss_bytes / 2**20:.0f} MiB")
         """
+        started = time.perf_counter()
+        sink = ParquetSink(path, row_group_rows, partition_by, compression, schema)
+        peak_rss = process_rss()
+
         await self._create_pool_connection()
 
         try:
-            async with self.db_connection_pool.acquire() as conn:
-                await conn.executemany(sql_query, tuples)
-
-            return ExecuteManyResult(
-                success=True,
-                total_statements=len(tuples)
-            )
-
+            pool = await self._read_pool(sql_query)
+            async with self._acquire(pool) as conn:
+                async with conn.transaction():
+                    statement = await conn.prepare(sql_query)
+                    builder = ArrowTableBuilder.from_attributes(statement.get_attributes())
+                    cursor = await statement.cursor(*(sql_variables if sql_variables else ()))
+                    while True:
+                        records = await cursor.fetch(batch_size)
+                        builder.add_rows(records)
+                        sink.write(builder.take_table())
+                        rss = process_rss()
+                        if rss is not None:
+                            peak_rss = max(rss, peak_rss or 0)
+                        if len(records) < batch_size:
+                            break
+            sink.close()
+
+        except ImportError:
+            sink.abort()
+            raise
         except Exception as ex:
-            logger.error(f"execute_many_query failed: {ex}")
-            raise self._convert_exception(ex, sql_query)
+            sink.abort()
+            logger.error(f"export_to_parquet failed: {ex}")
+            raise self._convert_exception(ex, sql_query, sql_variables)
 
-    # =========================================================================
-    # Fetch Methods
-    # =========================================================================
+        result = ExportResult(
+            path=str(path),
+            rows=sink.rows,
+            row_groups=sink.row_groups,
+            files=sink.files,
+            bytes_written=sink.bytes_written(),
+            elapsed_seconds=time.perf_counter() - started,
+            peak_rss_bytes=peak_rss
+        )
+        rss = f", peak RSS {peak_rss / 2 ** 20:.0f} MiB" if peak_rss is not None else ""
+        logger.info(
+            f"export_to_parquet: {result.rows} rows to {len(result.files)} files in "
+            f"{result.elapsed_seconds:.1f}s ({result.rows_per_second:,.0f} rows/s{rss})"
+        )
+        return result
 
-    async def fetch_all_as_dicts(
+    @instrumented
+    @deadline_aware
+    async def fetch_all_as_numpy(
             self,
             sql_query: str,
-            sql_variables: Optional[Tuple] = None
-    ) -> List[Dict[str, Any]]:
+            sql_variables: Optional[Tuple] = None,
+            nulls: str = "nan"
+    ) -> np.ndarray:
         """
-        Fetch all rows as a list of dictionaries.
+        Fetch all rows as a NumPy structured array, one field per column.
+
+        When every column has a fixed-width type (bool, integers, floats,
+        numeric, date, timestamp[tz], time), the result is read with a binary
+        COPY and decoded straight into preallocated typed arrays, without a
+        Python object per cell. Other results are read row by row, with
+        object arrays for the other types (see postgres_helpers.arrays).
 
         Args:
             sql_query: SELECT query to execute.
             sql_variables: Query parameters as a tuple.
+            nulls: "nan" (default): NaN/NaT for nulls, int and bool columns
+                   holding nulls become float64. "mask": a
+                   numpy.ma.MaskedArray masking the nulls, types unchanged.
 
         Returns:
-            List of dicts where keys are column names.
-            Returns empty list if no rows found.
+            Structured array (MaskedArray with nulls="mask"); timestamptz
+            values are in UTC.
 
         Raises:
             PoolError: If pool creation fails.
             QueryExecutionError: If query execution fails.
+            ValueError: If nulls is not "nan" or "mask".
 
         Example:
-            users = await db.fetch_all_as_dicts(
-                "SELECT id, name, email FROM users WHERE active = $1",
-                (True,)
+            ticks = await db.fetch_all_as_numpy(
+                "SELECT ts, price, volume FROM ticks WHERE symbol = $1", ("ABC",)
             )
-            for user in users:
-                print(f"{user['name']}: {user['email']}")
+            vwap = (ticks["price"] * ticks["volume"]).sum() / ticks["volume"].sum()
         """
+        if nulls not in NULL_MODES:
+            raise ValueError(f"nulls must be one of {NULL_MODES}, got {nulls!r}")
+
         await self._create_pool_connection()
 
         try:
-            async with self.db_connection_pool.acquire() as conn:
-                results = await conn.fetch(
-                    sql_query,
-                    *(sql_variables if sql_variables else ())
+            pool = await self._read_pool(sql_query)
+            async with self._acquire(pool) as conn:
+                statement = await conn.prepare(sql_query)
+                columns = [(attribute.name, attribute.type.oid) for attribute in statement.get_attributes()]
+                if not is_fixed_width(columns):
+                    records = await statement.fetch(*(sql_variables if sql_variables else ()))
+                    return rows_to_numpy(records, columns, nulls)
+
+                output = bytearray()
+
+                async def collect(chunk: bytes) -> None:
+                    output.extend(chunk)
+
+                await conn.copy_from_query(
+                    copy_select(sql_query, columns),
+                    *(sql_variables if sql_variables else ()),
+                    output=collect,
+                    format="binary"
                 )
 
-            return [dict(r.items()) for r in results]
+            return parse_copy(output, columns, nulls)
 
         except Exception as ex:
-            logger.error(f"fetch_all_as_dicts failed: {ex}")
+            logger.error(f"fetch_all_as_numpy failed: {ex}")
             raise self._convert_exception(ex, sql_query, sql_variables)
 
-    async def fetch_all_as_df(
+    @instrumented
+    @deadline_aware
+    async def fetch_column(
             self,
             sql_query: str,
-            sql_variables: Optional[Tuple] = None
-    ) -> pd.DataFrame:
+            sql_variables: Optional[Tuple] = None,
+            dtype: Optional[Any] = None,
+            nulls: str = "nan"
+    ) -> np.ndarray:
         """
-        Fetch all rows as a pandas DataFrame.
+        Fetch the first column of the result as a 1-D NumPy array.
+
+        Same decoding as fetch_all_as_numpy().
 
         Args:
             sql_query: SELECT query to execute.
             sql_variables: Query parameters as a tuple.
+            dtype: Convert the column to this dtype (default: the type of the
+                   column, see fetch_all_as_numpy()).
+            nulls: "nan" (default) or "mask", as in fetch_all_as_numpy().
 
         Returns:
-            DataFrame with columns matching the query result.
-            Returns empty DataFrame if no rows found.
-
-        Raises:
-            PoolError: If pool creation fails.
-            QueryExecutionError: If query execution fails.
+            1-D array (MaskedArray with nulls="mask").
 
         Example:
-            df = await db.fetch_all_as_df(
-                "SELECT date, amount FROM transactions WHERE user_id = $1",
-                (user_id,)
-            )
-            total = df['amount'].sum()
+            prices = await db.fetch_column("SELECT price FROM ticks ORDER BY ts", dtype="float32")
         """
-        results = await self.fetch_all_as_dicts(
-            sql_query=sql_query,
-            sql_variables=sql_variables
-        )
-
-        return pd.DataFrame(results) if results else pd.DataFrame()
+        arrays = await self.fetch_all_as_numpy(sql_query, sql_variables, nulls)
+        return first_column(arrays, dtype)
 
+    @instrumented
+    @deadline_aware
     async def fetch_one_as_dict(
             self,
             sql_query: str,
-            sql_variables: Optional[Tuple] = None
-    ) -> Optional[Dict[str, Any]]:
+            sql_variables: Optional[Tuple] = None,
+            row_format: str = "dict"
+    ) -> Optional[Any]:
         """
-        Fetch a single row as a dictionary.
+        Fetch a single row as a dictionary (or row_format row).
 
         Args:
             sql_query: SELECT query to execute (should return 0 or 1 row).
             sql_variables: Query parameters as a tuple.
+            row_format: "dict" (default), "tuple", "record" (asyncpg Record)
+                        or "row" (tuple subclass with attribute access), see
+                        postgres_helpers.rows.
 
         Returns:
-            Dict with column names as keys, or None if no row found.
+            The row (a dict keyed by column name by default), or None if no
+            row found.
 
         Raises:
             PoolError: If pool creation fails.
@@ -568,21 +2008,22 @@ class PostgresConnectorAsyncPool:
             if user:
                 print(f"Found: {user['name']}")
         """
+        check_row_format(row_format)
         await self._create_pool_connection()
 
         try:
-            async with self.db_connection_pool.acquire() as conn:
-                result = await conn.fetchrow(
-                    sql_query,
-                    *(sql_variables if sql_variables else ())
-                )
+            pool = await self._read_pool(sql_query)
+            async with self._acquire(pool) as conn:
+                result = await self._run(conn, "fetchrow", sql_query, sql_variables)
 
-            return dict(result.items()) if result else None
+            return row_converter(result.keys(), row_format)(result) if result else None
 
         except Exception as ex:
             logger.error(f"fetch_one_as_dict failed: {ex}")
             raise self._convert_exception(ex, sql_query, sql_variables)
 
+    @instrumented
+    @deadline_aware
     async def fetch_value(
             self,
             sql_query: str,
@@ -612,11 +2053,9 @@ class PostgresConnectorAsyncPool:
         await self._create_pool_connection()
 
         try:
-            async with self.db_connection_pool.acquire() as conn:
-                return await conn.fetchval(
-                    sql_query,
-                    *(sql_variables if sql_variables else ())
-                )
+            pool = await self._read_pool(sql_query)
+            async with self._acquire(pool) as conn:
+                return await self._run(conn, "fetchval", sql_query, sql_variables)
 
         except Exception as ex:
             logger.error(f"fetch_value failed: {ex}")
@@ -626,6 +2065,8 @@ class PostgresConnectorAsyncPool:
     # Convenience Insert Methods
     # =========================================================================
 
+    @instrumented
+    @deadline_aware
     async def insert_into_with_dict(
             self,
             table_name: str,
@@ -660,18 +2101,17 @@ class PostgresConnectorAsyncPool:
                 print("User already exists")
         """
         # Build query
-        columns = '"' + '","'.join(parameters_dict.keys()) + '"'
-        placeholders = ", ".join(f"${i + 1}" for i in range(len(parameters_dict)))
-        conflict_clause = " ON CONFLICT DO NOTHING" if on_duplicate_ignore else ""
-
-        query = f'INSERT INTO "{table_name}" ({columns}) VALUES ({placeholders}){conflict_clause}'
-        params = tuple(parameters_dict.values())
+        query, params = build_insert_sql(
+            table_name, parameters_dict, "ignore" if on_duplicate_ignore else "insert"
+        )
 
         await self._create_pool_connection()
 
         try:
-            async with self.db_connection_pool.acquire() as conn:
-                result = await conn.execute(query, *params)
+            async with self._acquire(self.db_connection_pool) as conn:
+                result = await self._run(conn, "execute", query, params)
+
+            self._invalidate_cached_results(table_name=table_name)
 
             rows_affected = 0
             try:
@@ -699,6 +2139,8 @@ class PostgresConnectorAsyncPool:
             logger.error(f"insert_into_with_dict failed: {ex}")
             raise self._convert_exception(ex, query, params)
 
+    @instrumented
+    @deadline_aware
     async def insert_with_dict_returning(
             self,
             table_name: str,
@@ -734,18 +2176,17 @@ class PostgresConnectorAsyncPool:
                 print(f"Created at: {result.returning_row['created_at']}")
         """
         # Build query
-        columns = '"' + '","'.join(parameters_dict.keys()) + '"'
-        placeholders = ", ".join(f"${i + 1}" for i in range(len(parameters_dict)))
-        conflict_clause = " ON CONFLICT DO NOTHING" if on_duplicate_ignore else ""
-
-        query = f'INSERT INTO "{table_name}" ({columns}) VALUES ({placeholders}){conflict_clause} RETURNING *'
-        params = tuple(parameters_dict.values())
+        query, params = build_insert_sql(
+            table_name, parameters_dict, "ignore" if on_duplicate_ignore else "insert", returning="*"
+        )
 
         await self._create_pool_connection()
 
         try:
-            async with self.db_connection_pool.acquire() as conn:
-                row = await conn.fetchrow(query, *params)
+            async with self._acquire(self.db_connection_pool) as conn:
+                row = await self._run(conn, "fetchrow", query, params)
+
+            self._invalidate_cached_results(table_name=table_name)
 
             if row:
                 row_dict = dict(row.items())
@@ -777,6 +2218,119 @@ class PostgresConnectorAsyncPool:
             logger.error(f"insert_with_dict_returning failed: {ex}")
             raise self._convert_exception(ex, query, params)
 
+    @instrumented
+    @deadline_aware
+    async def insert_many_with_dict(
+            self,
+            table_name: str,
+            parameters_dicts: List[Dict[str, Any]],
+            on_duplicate_ignore: bool = True,
+            returning: Optional[Union[str, List[str]]] = None
+    ) -> InsertManyResult:
+        """
+        Insert many rows from dicts, one statement per distinct column set.
+
+        Each group of dicts sharing the same keys is sent as a single
+        INSERT ... SELECT ... FROM unnest($1::type[], ...), whose text doesn't
+        depend on the number of rows. All groups run in one transaction.
+        Column types are read from the catalog once per table.
+
+        Args:
+            table_name: Name of the table to insert into.
+            parameters_dicts: Dicts mapping column names to values.
+            on_duplicate_ignore: If True, skip rows that violate a unique
+                                 constraint instead of failing the batch.
+            returning: Columns to return for each row ("*" for all).
+
+        Returns:
+            InsertManyResult. With returning=, returning_rows holds one row
+            per input dict in input order (None for skipped duplicates).
+
+        Raises:
+            PoolError: If pool creation fails.
+            UniqueViolationError: If duplicate and on_duplicate_ignore=False.
+            QueryExecutionError: If a dict has a column the table doesn't have,
+                                 or for other errors (nothing is inserted).
+
+        Example:
+            result = await db.insert_many_with_dict(
+                "users",
+                [{"email": "a@example.com"}, {"email": "b@example.com", "name": "B"}],
+                returning=["id"]
+            )
+            ids = [row["id"] if row else None for row in result.returning_rows]
+        """
+        if not parameters_dicts:
+            return InsertManyResult(returning_rows=[] if returning else None)
+
+        returning_rows: List[Optional[Dict[str, Any]]] = [None] * len(parameters_dicts)
+        rows_affected = 0
+        query = None
+
+        await self._create_pool_connection()
+
+        try:
+            async with self._acquire(self.db_connection_pool) as conn:
+                schema = await self._table_schema(conn, table_name)
+                if schema is None:
+                    raise ValueError(f'Table "{table_name}" does not exist')
+                groups = plan_insert_many(
+                    table_name, parameters_dicts, schema.column_types, "$", on_duplicate_ignore, returning,
+                    schema.unique_keys
+                )
+                async with conn.transaction():
+                    for group in groups:
+                        query = group.query
+                        if returning:
+                            records = await self._run(conn, "fetch", query, group.params)
+                            returned = [dict(r.items()) for r in records]
+                            aligned = align_returning(group, returned, returning)
+                            for position, row in zip(group.positions, aligned):
+                                returning_rows[position] = row
+                            rows_affected += len(returned)
+                        else:
+                            status = await self._run(conn, "execute", query, group.params)
+                            rows_affected += int(status.split()[-1])
+
+            self._invalidate_cached_results(table_name=table_name)
+
+            return InsertManyResult(
+                rows_affected=rows_affected,
+                total_rows=len(parameters_dicts),
+                statements=len(groups),
+                returning_rows=returning_rows if returning else None
+            )
+
+        except Exception as ex:
+            logger.error(f"insert_many_with_dict failed: {ex}")
+            raise self._convert_exception(ex, query)
+
+    async def _table_schema(
+            self,
+            conn: Connection,
+            table_name: str,
+            schema_name: Optional[str] = None,
+            refresh: bool = False
+    ) -> Optional[TableSchema]:
+        """Metadata of a table from the schema cache, queried on conn on a miss (None if it doesn't exist)."""
+        if not refresh:
+            hit = self.schema_cache.get(table_name, schema_name)
+            if hit is not None:
+                return hit.value
+        version = self.schema_cache.version()
+        records = await conn.fetch(TABLE_SCHEMA_SQL.format(placeholder="$1"), qualified_name(table_name, schema_name))
+        schema = parse_table_schema(records)
+        self.schema_cache.set(table_name, schema_name, schema, loaded_at_version=version)
+        return schema
+
+    async def _primary_key(self, table_name: str) -> Optional[str]:
+        """Name of the primary key constraint of a table, from the schema cache."""
+        hit = self.schema_cache.get(table_name)
+        schema = hit.value if hit is not None else await self.get_table_schema(table_name, refresh=True)
+        return schema.primary_key if schema is not None else None
+
+    @instrumented
+    @deadline_aware
     async def insert_into_with_dict_update(
             self,
             table_name: str,
@@ -793,7 +2347,7 @@ class PostgresConnectorAsyncPool:
             table_name: Name of the table.
             parameters_dict: Dict mapping column names to values.
             constraint_key: Name of the unique constraint to use for conflict
-                           detection. Defaults to "{table_name}_pkey".
+                           detection. Defaults to the table's primary key.
             on_duplicate_update: If True, update on conflict. If False,
                                 behaves like insert_into_with_dict.
 
@@ -815,31 +2369,20 @@ class PostgresConnectorAsyncPool:
             else:
                 print("Settings updated")
         """
-        columns = '"' + '","'.join(parameters_dict.keys()) + '"'
-        placeholders = ", ".join(f"${i + 1}" for i in range(len(parameters_dict)))
-
-        if on_duplicate_update:
-            if constraint_key is None:
-                constraint_key = f"{table_name}_pkey"
-
-            set_clause = ", ".join(
-                f'"{key}" = EXCLUDED."{key}"' for key in parameters_dict.keys()
-            )
-            conflict_clause = (
-                f" ON CONFLICT ON CONSTRAINT {constraint_key}"
-                f" DO UPDATE SET {set_clause}"
-            )
-        else:
-            conflict_clause = " ON CONFLICT DO NOTHING"
+        if constraint_key is None and on_duplicate_update:
+            constraint_key = await self._primary_key(table_name)
 
-        query = f'INSERT INTO "{table_name}" ({columns}) VALUES ({placeholders}){conflict_clause}'
-        params = tuple(parameters_dict.values())
+        query, params = build_insert_sql(
+            table_name, parameters_dict, "update" if on_duplicate_update else "ignore", constraint_key
+        )
 
         await self._create_pool_connection()
 
         try:
-            async with self.db_connection_pool.acquire() as conn:
-                result = await conn.execute(query, *params)
+            async with self._acquire(self.db_connection_pool) as conn:
+                result = await self._run(conn, "execute", query, params)
+
+            self._invalidate_cached_results(table_name=table_name)
 
             rows_affected = 0
             try:
@@ -861,6 +2404,8 @@ class PostgresConnectorAsyncPool:
             logger.error(f"insert_into_with_dict_update failed: {ex}")
             raise self._convert_exception(ex, query, params)
 
+    @instrumented
+    @deadline_aware
     async def insert_into_with_dict_update_returning(
             self,
             table_name: str,
@@ -875,7 +2420,7 @@ class PostgresConnectorAsyncPool:
         Args:
             table_name: Name of the table.
             parameters_dict: Dict mapping column names to values.
-            constraint_key: Name of the unique constraint. Defaults to "{table_name}_pkey".
+            constraint_key: Name of the unique constraint. Defaults to the table's primary key.
 
         Returns:
             UpsertResult with accurate was_inserted/was_updated flags and returning_row.
@@ -890,31 +2435,21 @@ class PostgresConnectorAsyncPool:
             elif result.was_updated:
                 print(f"Updated settings: {result.returning_row}")
         """
-        columns = '"' + '","'.join(parameters_dict.keys()) + '"'
-        placeholders = ", ".join(f"${i + 1}" for i in range(len(parameters_dict)))
-
         if constraint_key is None:
-            constraint_key = f"{table_name}_pkey"
-
-        set_clause = ", ".join(
-            f'"{key}" = EXCLUDED."{key}"' for key in parameters_dict.keys()
-        )
+            constraint_key = await self._primary_key(table_name)
 
-        # Include xmax to detect insert vs update
         # xmax = 0 means insert, xmax > 0 means update
-        query = (
-            f'INSERT INTO "{table_name}" ({columns}) VALUES ({placeholders})'
-            f' ON CONFLICT ON CONSTRAINT {constraint_key}'
-            f' DO UPDATE SET {set_clause}'
-            f' RETURNING *, xmax'
+        query, params = build_insert_sql(
+            table_name, parameters_dict, "update", constraint_key, returning="*, xmax"
         )
-        params = tuple(parameters_dict.values())
 
         await self._create_pool_connection()
 
         try:
-            async with self.db_connection_pool.acquire() as conn:
-                row = await conn.fetchrow(query, *params)
+            async with self._acquire(self.db_connection_pool) as conn:
+                row = await self._run(conn, "fetchrow", query, params)
+
+            self._invalidate_cached_results(table_name=table_name)
 
             if row:
                 row_dict = dict(row.items())
@@ -937,10 +2472,229 @@ class PostgresConnectorAsyncPool:
             logger.error(f"insert_into_with_dict_update_returning failed: {ex}")
             raise self._convert_exception(ex, query, params)
 
+    @instrumented
+    @deadline_aware
+    async def bulk_upsert(
+            self,
+            table_name: str,
+            rows: Records,
+            conflict_columns: List[str],
+            update_columns: Optional[List[str]] = None,
+            columns: Optional[List[str]] = None,
+            schema_name: Optional[str] = None
+    ) -> BulkUpsertResult:
+        """
+        Upsert many rows in one transaction through a COPY-loaded staging table.
+
+        The rows are streamed with binary COPY into a temporary table, then
+        moved with a single INSERT ... SELECT ... ON CONFLICT DO UPDATE.
+        When a conflict key appears several times in the batch, the last
+        occurrence wins; rows with a NULL conflict column are all inserted.
+        Inserted and updated rows are told apart with xmax, as in
+        insert_into_with_dict_update_returning.
+
+        Args:
+            table_name: Name of the table.
+            rows: List, iterator or async iterator of tuples or dicts.
+            conflict_columns: Columns of the unique index or primary key
+                              used to detect existing rows.
+            update_columns: Columns overwritten on conflict. Defaults to
+                            every column not in conflict_columns; an empty
+                            list leaves existing rows untouched.
+            columns: Column names, in the order of the values in each row.
+                     Optional when rows is a list of dicts.
+            schema_name: Schema of the table (optional).
+
+        Returns:
+            BulkUpsertResult with rows_staged, inserted and updated counts.
+
+        Raises:
+            ValueError: If columns is missing or conflict_columns is invalid.
+            PoolError: If pool creation fails.
+            QueryExecutionError: If the load fails (nothing is written).
+
+        Example:
+            result = await db.bulk_upsert(
+                "prices",
+                [{"ticker": "AAPL", "day": day, "close": 189.5}, ...],
+                conflict_columns=["ticker", "day"]
+            )
+            print(f"{result.inserted} inserted, {result.updated} updated")
+        """
+        columns = resolve_columns(rows, columns)
+        if columns is None:
+            return BulkUpsertResult()
+
+        create_staging_sql, upsert_sql = build_bulk_upsert_sql(
+            table_name, columns, conflict_columns, update_columns, schema_name
+        )
+
+        await self._create_pool_connection()
+
+        try:
+            # Bypasses the statement cache: the staging table is new each time
+            async with self._acquire(self.db_connection_pool) as conn:
+                async with conn.transaction():
+                    await conn.execute(create_staging_sql)
+                    status = await conn.copy_records_to_table(
+                        UPSERT_STAGING_TABLE,
+                        records=numbered_records_as_tuples(rows, columns),
+                        columns=[*columns, UPSERT_ROW_NUMBER]
+                    )
+                    counts = await conn.fetchrow(upsert_sql)
+
+            self._invalidate_cached_results(table_name=table_name)
+
+            return BulkUpsertResult(
+                rows_staged=parse_copy_status(status),
+                inserted=counts["inserted"],
+                updated=counts["updated"]
+            )
+
+        except Exception as ex:
+            logger.error(f"bulk_upsert failed: {ex}")
+            raise self._convert_exception(ex, upsert_sql)
+
+    # =========================================================================
+    # Batch Execution
+    # =========================================================================
+
+    @instrumented
+    @deadline_aware
+    async def run_many(
+            self,
+            queries: Sequence[Tuple],
+            max_concurrency: Optional[int] = None
+    ) -> BatchResult:
+        """
+        Run independent queries concurrently, at most max_concurrency at once.
+
+        Unlike asyncio.gather over the query methods, the number of queries
+        in flight never exceeds the pool, and a failing query does not lose
+        the results of the others: each error is reported on its own item.
+
+        Args:
+            queries: (sql_query, sql_variables, mode) jobs. mode is the name of
+                     the method running the job: "execute_one_query",
+                     "fetch_all_as_dicts" (default if omitted), "fetch_all_as_df",
+                     "fetch_one_as_dict" or "fetch_value".
+            max_concurrency: Maximum queries in flight (default and upper
+                             bound: pool_size_max).
+
+        Returns:
+            BatchResult with one item per query in input order, the wall time
+            and the concurrency achieved.
+
+        Raises:
+            ValueError: If a job names an unknown mode.
+            PoolError: If pool creation fails.
+
+        Example:
+            batch = await db.run_many(
+                [("SELECT * FROM users WHERE id = $1", (user_id,), "fetch_one_as_dict")
+                 for user_id in user_ids],
+                max_concurrency=10
+            )
+            users = [item.value for item in batch.items if item.success]
+        """
+        jobs = []
+        for job in queries:
+            sql_query, sql_variables, mode = job if len(job) == 3 else (*job, "fetch_all_as_dicts")
+            if mode not in RUN_MANY_MODES:
+                raise ValueError(f"run_many: unknown mode {mode!r}, expected one of {RUN_MANY_MODES}")
+            jobs.append((sql_query, sql_variables, mode))
+
+        await self._create_pool_connection()
+
+        limit = min(max_concurrency or self.pool_size_max, self.pool_size_max)
+        semaphore = asyncio.Semaphore(limit)
+        in_flight = 0
+        peak = 0
+
+        async def run_one(index: int, sql_query: str, sql_variables: Optional[Tuple], mode: str) -> BatchItemResult:
+            nonlocal in_flight, peak
+            async with semaphore:
+                in_flight += 1
+                peak = max(peak, in_flight)
+                started = time.perf_counter()
+                try:
+                    value = await getattr(self, mode)(sql_query, sql_variables)
+                    return BatchItemResult(index=index, value=value, elapsed=time.perf_counter() - started)
+                except Exception as ex:
+                    return BatchItemResult(
+                        index=index,
+                        success=False,
+                        error=ex,
+                        elapsed=time.perf_counter() - started
+                    )
+                finally:
+                    in_flight -= 1
+
+        started = time.perf_counter()
+        items = await asyncio.gather(*(run_one(index, *job) for index, job in enumerate(jobs)))
+        result = BatchResult(
+            items=list(items),
+            wall_time=time.perf_counter() - started,
+            max_concurrency=limit,
+            concurrency_achieved=peak
+        )
+
+        if result.failed:
+            logger.warning(f"run_many: {result.failed}/{len(items)} queries failed")
+        return result
+
+    def loader(
+            self,
+            table_name: Optional[str] = None,
+            key_column: str = "id",
+            columns: Optional[Sequence[str]] = None,
+            sql_query: Optional[str] = None,
+            max_batch_size: int = 1000
+    ) -> RowLoader:
+        """
+        Create a loader batching row lookups by key (DataLoader pattern).
+
+        The keys requested in the same event-loop tick are fetched with one
+        `WHERE key_column = ANY($1)` query through fetch_all_as_dicts (so
+        replicas, metrics and the statement cache apply). Rows are cached
+        by the loader: create one per request.
+
+        Args:
+            table_name: Table to read from.
+            key_column: Column holding the keys (default: "id").
+            columns: Columns to return (default: all). Must include key_column.
+            sql_query: Custom query taking the array of keys as $1, instead of
+                       table_name/columns (joins, filters...). Its result must
+                       have key_column.
+            max_batch_size: Maximum keys per query (default: 1000).
+
+        Returns:
+            RowLoader with load(key), load_many(keys), prime() and clear().
+
+        Raises:
+            ValueError: If neither or both of table_name and sql_query are given.
+
+        Example:
+            users = db.loader("users")
+
+            async def resolve_author(post):
+                return await users.load(post["author_id"])
+
+            authors = await asyncio.gather(*(resolve_author(post) for post in posts))
+        """
+        if (table_name is None) == (sql_query is None):
+            raise ValueError("loader: give either table_name or sql_query")
+        if sql_query is None:
+            column_list = ", ".join(f'"{column}"' for column in columns) if columns else "*"
+            sql_query = f'SELECT {column_list} FROM "{table_name}" WHERE "{key_column}" = ANY($1)'
+        return RowLoader(self.fetch_all_as_dicts, sql_query, key_column, max_batch_size)
+
     # =========================================================================
     # Utility Methods
     # =========================================================================
 
+    @instrumented
+    @deadline_aware
     async def get_postgresql_version(self) -> str:
         """
         Get the PostgreSQL server version.
@@ -957,6 +2711,8 @@ class PostgresConnectorAsyncPool:
         logger.info(f"Connected to: {version}")
         return version
 
+    @instrumented
+    @deadline_aware
     async def table_exists(self, table_name: str, schema: str = "public") -> bool:
         """
         Check if a table exists.
@@ -972,16 +2728,61 @@ class PostgresConnectorAsyncPool:
             if await db.table_exists("users"):
                 print("Table exists")
         """
-        result = await self.fetch_value(
-            """
-            SELECT EXISTS (
-                SELECT FROM information_schema.tables 
-                WHERE table_schema = $1 AND table_name = $2
-            )
-            """,
-            (schema, table_name)
-        )
-        return bool(result)
+        return await self.get_table_schema(table_name, schema) is not None
+
+    @instrumented
+    @deadline_aware
+    async def get_table_schema(
+            self,
+            table_name: str,
+            schema_name: Optional[str] = None,
+            refresh: bool = False
+    ) -> Optional[TableSchema]:
+        """
+        Columns, type OIDs, primary key, unique constraints and partitions of a table.
+
+        Served from schema_cache; pg_catalog is queried on a miss, past the
+        cache TTL or with refresh=True.
+
+        Args:
+            table_name: Name of the table, view or partitioned table.
+            schema_name: Schema of the table (default: first match on the
+                         search_path).
+            refresh: If True, reload the metadata even if it is cached.
+
+        Returns:
+            TableSchema, or None if the table doesn't exist.
+
+        Example:
+            orders = await db.get_table_schema("orders")
+            orders.primary_key, orders.column_types["total"]
+        """
+        if not refresh:
+            hit = self.schema_cache.get(table_name, schema_name)
+            if hit is not None:
+                return hit.value
+
+        await self._create_pool_connection()
+
+        try:
+            async with self._acquire(self.db_connection_pool) as conn:
+                return await self._table_schema(conn, table_name, schema_name, refresh=True)
+
+        except Exception as ex:
+            logger.error(f"get_table_schema failed: {ex}")
+            raise self._convert_exception(ex, TABLE_SCHEMA_SQL)
+
+    def refresh_schema(self, table_name: Optional[str] = None) -> None:
+        """
+        Drop cached table metadata after DDL run outside this connector.
+
+        Args:
+            table_name: Table to drop (default: all tables).
+        """
+        if table_name is None:
+            self.schema_cache.clear()
+        else:
+            self.schema_cache.invalidate_tables([table_name])
 
 
 # =============================================================================
@@ -25,12 +25,15 @@ Usage:
         cursor.execute("UPDATE inventory ...")
 """
 
+import io
 import logging
+import time
 from contextlib import contextmanager
 from os import environ
 from pathlib import Path
-from typing import Union, Optional, List, Dict, Any, Tuple, Iterator
+from typing import Union, Optional, List, Dict, Any, Tuple, Iterator, Iterable, Callable, TYPE_CHECKING
 
+import numpy as np
 import pandas as pd
 import psycopg2
 import psycopg2.extras
@@ -38,11 +41,30 @@ from psycopg2 import Error
 from psycopg2.errors import (
     UniqueViolation,
     ForeignKeyViolation,
-    CheckViolation
+    CheckViolation,
+    QueryCanceled
 )
 from psycopg2.extensions import connection
 
+if TYPE_CHECKING:
+    import pyarrow as pa
+
 from postgres_helpers.app_config import load_postgres_details_to_env
+from postgres_helpers.bulk import (
+    Record,
+    plan_insert_many,
+    align_returning,
+    CopyTextReader,
+    numbered_records_as_tuples,
+    resolve_columns,
+    build_bulk_upsert_sql,
+    build_insert_sql,
+    qualified_name,
+    build_copy_from_stdin_sql,
+    UPSERT_STAGING_TABLE,
+    UPSERT_ROW_NUMBER
+)
+from postgres_helpers.columnar import rows_to_df
 from postgres_helpers.exceptions import (
     PostgresHelperError,
     ConnectionError,
@@ -50,6 +72,7 @@ from postgres_helpers.exceptions import (
     UniqueViolationError,
     ForeignKeyViolationError,
     CheckViolationError,
+    QueryTimeoutError,
     TransactionError
 )
 from postgres_helpers.results import (
@@ -57,8 +80,24 @@ from postgres_helpers.results import (
     ExecuteManyResult,
     InsertResult,
     UpsertResult,
-    ConnectionInfo
+    InsertManyResult,
+    BulkUpsertResult,
+    MetricsSnapshot,
+    ConnectionInfo,
+    TableSchema
+)
+from postgres_helpers.arrays import NULL_MODES, copy_query, first_column, is_fixed_width, parse_copy, rows_to_numpy
+from postgres_helpers.arrow import ArrowTableBuilder, prepare_psycopg2_cursor
+from postgres_helpers.deadlines import deadline_aware, begin_acquire, end_acquire
+from postgres_helpers.json_codecs import JsonCodecs
+from postgres_helpers.metrics import ConnectorMetrics, instrumented, record_acquire_wait
+from postgres_helpers.result_cache import (
+    ResultCache,
+    make_cache_key,
+    extract_read_tables
 )
+from postgres_helpers.rows import SYNC_ROW_FORMATS, check_row_format, convert_rows, cursor_columns, row_converter
+from postgres_helpers.schema_cache import SchemaCache, TABLE_SCHEMA_SQL, parse_table_schema
 
 logger = logging.getLogger(f"postgres_helpers:{Path(__file__).name}")
 
@@ -70,6 +109,10 @@ class PostgresConnector:
     This class manages a single database connection. For multi-threaded
     applications, consider using PostgresConnectorPool instead.
 
+    Every query method accepts keyword-only timeout= (seconds) and deadline=
+    (time.monotonic() value) covering the connect and the execution; past
+    it the statement is cancelled and QueryTimeoutError is raised.
+
     Args:
         db_host: Database host (falls back to POSTGRES_DB_HOST env var)
         db_port: Database port (falls back to POSTGRES_DB_PORT env var)
@@ -78,6 +121,15 @@ class PostgresConnector:
         db_name: Database name (falls back to POSTGRES_DB_NAME env var)
         connect_timeout: Connection timeout in seconds (default: 6)
         application_name: Name shown in pg_stat_activity (optional)
+        result_cache: ResultCache shared by the fetch methods called with
+                      cache_ttl= (optional, default: no caching).
+        json_codecs: JsonCodecs registered on every connection to decode
+                     and encode json/jsonb values (optional, default:
+                     driver defaults).
+        schema_cache: SchemaCache of the table metadata used by
+                      table_exists(), get_table_schema(), the upsert helpers
+                      and insert_many_with_dict() (optional, default: a new
+                      SchemaCache with a 300 s TTL).
 
     Example:
         with PostgresConnector() as db:
@@ -92,7 +144,10 @@ class PostgresConnector:
             db_password: Optional[str] = None,
             db_name: Optional[str] = None,
             connect_timeout: int = 6,
-            application_name: Optional[str] = None
+            application_name: Optional[str] = None,
+            result_cache: Optional[ResultCache] = None,
+            json_codecs: Optional[JsonCodecs] = None,
+            schema_cache: Optional[SchemaCache] = None
     ):
         if None in [db_host, db_port, db_name, db_user, db_password]:
             load_postgres_details_to_env()
@@ -106,8 +161,20 @@ class PostgresConnector:
         self.connect_timeout: int = connect_timeout
         self.application_name = application_name.replace(' ', '_') if application_name else None
 
+        # Query result cache (opt-in per call with cache_ttl=)
+        self.result_cache: Optional[ResultCache] = result_cache
+
+        # json/jsonb codecs registered on connect
+        self.json_codecs: Optional[JsonCodecs] = json_codecs
+
         self.db_connection: Optional[connection] = None
 
+        # Table metadata (columns, keys, partitions) read from pg_catalog
+        self.schema_cache: SchemaCache = schema_cache if schema_cache is not None else SchemaCache()
+
+        # Histograms of acquire wait, execution time, rows and bytes per method
+        self.metrics = ConnectorMetrics()
+
     # =========================================================================
     # Context Manager Support
     # =========================================================================
@@ -133,8 +200,12 @@ class PostgresConnector:
             ConnectionError: If connection fails.
         """
         if self.db_connection is not None and not self.db_connection.closed:
+            # Cancelled by the watchdog if the call has a deadline
+            end_acquire(self.db_connection)
             return
 
+        started = time.perf_counter()
+        begin_acquire()
         try:
             self.db_connection = psycopg2.connect(
                 host=self.db_host,
@@ -147,6 +218,8 @@ class PostgresConnector:
             )
             # Enable autocommit by default for single queries
             self.db_connection.autocommit = True
+            if self.json_codecs is not None:
+                self.json_codecs.register_psycopg2(self.db_connection)
 
         except Exception as ex:
             logger.error(f"Failed to connect: {ex}")
@@ -158,6 +231,10 @@ class PostgresConnector:
                 original_error=ex
             )
 
+        # Connecting is the single connector's acquire wait
+        record_acquire_wait(time.perf_counter() - started)
+        end_acquire(self.db_connection)
+
     def close_connection(self) -> None:
         """
         Close database connection.
@@ -198,11 +275,26 @@ class PostgresConnector:
 
         return info
 
+    # =========================================================================
+    # Metrics
+    # =========================================================================
+
+    def get_metrics(self, reset: bool = False) -> MetricsSnapshot:
+        """
+        Get the per-method metrics. Acquire wait is the time spent connecting.
+
+        Args:
+            reset: Start new histograms after taking the snapshot.
+        """
+        return self.metrics.snapshot(reset, pool_size=1 if self.is_connected() else 0)
+
     # =========================================================================
     # Transaction Support
     # =========================================================================
 
     @contextmanager
+    @instrumented
+    @deadline_aware
     def transaction(self) -> Iterator:
         """
         Context manager for database transactions.
@@ -270,6 +362,14 @@ class PostgresConnector:
                 params=params,
                 original_error=ex
             )
+        elif isinstance(ex, QueryCanceled):
+            # statement_timeout, or cancelled at the deadline of the call
+            return QueryTimeoutError(
+                f"Query cancelled: {ex}",
+                query=safe_query,
+                params=params,
+                original_error=ex
+            )
         elif isinstance(ex, Error):
             return QueryExecutionError(
                 f"Query execution failed: {ex}",
@@ -285,10 +385,59 @@ class PostgresConnector:
                 original_error=ex
             )
 
+    # =========================================================================
+    # Result Cache
+    # =========================================================================
+
+    def _fetch_cached(
+            self,
+            kind: str,
+            sql_query: str,
+            sql_variables: Optional[tuple],
+            cache_ttl: float,
+            cache_tags: Optional[Iterable[str]],
+            loader: Callable[[], Any]
+    ) -> Any:
+        """
+        Serve a read from the result cache, calling loader() on a miss.
+
+        Expired entries are reloaded in the foreground; only the async pool
+        serves them stale while refreshing in the background.
+        """
+        cache = self.result_cache
+        key = make_cache_key(kind, sql_query, sql_variables)
+
+        hit = cache.get(key, allow_stale=False)
+        if hit is not None:
+            return hit.value
+
+        version = cache.version()
+        value = loader()
+        tags = extract_read_tables(sql_query) | set(cache_tags or ())
+        cache.set(key, value, cache_ttl, tags=tags, loaded_at_version=version)
+        return value
+
+    def _invalidate_cached_results(
+            self,
+            sql_query: Optional[str] = None,
+            table_name: Optional[str] = None
+    ) -> None:
+        """Drop the cached results of the table a write touched, and the table metadata DDL changed."""
+        if sql_query is not None:
+            self.schema_cache.invalidate_for_sql(sql_query)
+        if self.result_cache is None:
+            return
+        if table_name is not None:
+            self.result_cache.invalidate_tables([table_name])
+        else:
+            self.result_cache.invalidate_for_sql(sql_query)
+
     # =========================================================================
     # Query Execution Methods
     # =========================================================================
 
+    @instrumented
+    @deadline_aware
     def execute_one_query(
             self,
             sql_query: str,
@@ -313,6 +462,8 @@ class PostgresConnector:
         try:
             cursor.execute(sql_query, sql_variables)
 
+            self._invalidate_cached_results(sql_query=sql_query)
+
             return QueryResult(
                 rows_affected=cursor.rowcount,
                 status_message=cursor.statusmessage,
@@ -328,6 +479,8 @@ class PostgresConnector:
             if close_connection:
                 self.close_connection()
 
+    @instrumented
+    @deadline_aware
     def execute_many_query(
             self,
             sql_query: str,
@@ -352,6 +505,8 @@ class PostgresConnector:
         try:
             cursor.executemany(sql_query, tuples_list)
 
+            self._invalidate_cached_results(sql_query=sql_query)
+
             return ExecuteManyResult(
                 success=True,
                 total_statements=len(tuples_list),
@@ -371,31 +526,49 @@ class PostgresConnector:
     # Fetch Methods
     # =========================================================================
 
+    @instrumented
+    @deadline_aware
     def fetch_all_as_dicts(
             self,
             sql_query: str,
             sql_variables: Optional[tuple] = None,
-            close_connection: bool = False
-    ) -> List[Dict[str, Any]]:
+            close_connection: bool = False,
+            cache_ttl: Optional[float] = None,
+            cache_tags: Optional[Iterable[str]] = None,
+            row_format: str = "dict"
+    ) -> List[Any]:
         """
-        Fetch all rows as a list of dictionaries.
+        Fetch all rows as a list of dictionaries (or row_format rows).
 
         Args:
             sql_query: SELECT query to execute.
             sql_variables: Query parameters as a tuple.
             close_connection: If True, close connection after execution.
+            cache_ttl: Serve the result from the result cache for this many
+                       seconds (requires result_cache). Default: not cached.
+            cache_tags: Extra table names the cached result depends on, on
+                        top of the tables read in FROM/JOIN clauses.
+            row_format: "dict" (default), "tuple" or "row" (tuple subclass
+                        with attribute access), see postgres_helpers.rows.
 
         Returns:
-            List of dicts where keys are column names.
+            List of rows, dicts keyed by column name by default.
         """
+        check_row_format(row_format, SYNC_ROW_FORMATS)
+        if cache_ttl is not None and self.result_cache is not None:
+            return self._fetch_cached(
+                f"rows:{row_format}", sql_query, sql_variables, cache_ttl, cache_tags,
+                lambda: self.fetch_all_as_dicts(sql_query, sql_variables, close_connection, row_format=row_format)
+            )
+
         self.open_connection()
 
-        cursor = self.db_connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        cursor = self.db_connection.cursor()
 
         try:
             cursor.execute(sql_query, sql_variables)
             rows = cursor.fetchall()
-            return [dict(row) for row in rows]
+            return convert_rows(rows, cursor_columns(cursor), row_format)
 
         except Exception as ex:
             logger.error(f"fetch_all_as_dicts failed: {ex}")
@@ -406,11 +579,15 @@ class PostgresConnector:
             if close_connection:
                 self.close_connection()
 
+    @instrumented
+    @deadline_aware
     def fetch_all_as_df(
             self,
             sql_query: str,
             sql_variables: Optional[tuple] = None,
-            close_connection: bool = False
+            close_connection: bool = False,
+            cache_ttl: Optional[float] = None,
+            cache_tags: Optional[Iterable[str]] = None
     ) -> pd.DataFrame:
         """
         Fetch all rows as a pandas DataFrame.
@@ -419,42 +596,238 @@ class PostgresConnector:
             sql_query: SELECT query to execute.
             sql_variables: Query parameters as a tuple.
             close_connection: If True, close connection after execution.
+            cache_ttl: Serve the result from the result cache for this many
+                       seconds (requires result_cache). Default: not cached.
+            cache_tags: Extra table names the cached result depends on, on
+                        top of the tables read in FROM/JOIN clauses.
 
         Returns:
-            DataFrame with columns matching the query result.
+            DataFrame with columns matching the query result. An empty
+            result keeps the column names.
         """
-        results = self.fetch_all_as_dicts(
-            sql_query=sql_query,
-            sql_variables=sql_variables,
-            close_connection=close_connection
-        )
-        return pd.DataFrame(results) if results else pd.DataFrame()
+        if cache_ttl is not None and self.result_cache is not None:
+            return self._fetch_cached(
+                "df", sql_query, sql_variables, cache_ttl, cache_tags,
+                lambda: self.fetch_all_as_df(sql_query, sql_variables, close_connection)
+            )
 
-    def fetch_one_as_dict(
+        self.open_connection()
+
+        cursor = self.db_connection.cursor()
+
+        try:
+            cursor.execute(sql_query, sql_variables)
+            rows = cursor.fetchall()
+            columns = [column.name for column in cursor.description]
+            return rows_to_df(rows, columns)
+
+        except Exception as ex:
+            logger.error(f"fetch_all_as_df failed: {ex}")
+            raise self._convert_exception(ex, sql_query, sql_variables)
+
+        finally:
+            cursor.close()
+            if close_connection:
+                self.close_connection()
+
+    @instrumented
+    @deadline_aware
+    def fetch_all_as_arrow(
+            self,
+            sql_query: str,
+            sql_variables: Optional[tuple] = None,
+            batch_size: int = 10000,
+            close_connection: bool = False
+    ) -> "pa.Table":
+        """
+        Fetch all rows as a pyarrow Table, built batch by batch.
+
+        Rows are read through a server-side cursor, batch_size at a time, and
+        each batch is converted to Arrow arrays before the next one is
+        fetched, so peak memory stays close to the size of the table. Column
+        types follow the Postgres types (see postgres_helpers.arrow).
+
+        Args:
+            sql_query: SELECT query to execute.
+            sql_variables: Query parameters as a tuple.
+            batch_size: Number of rows fetched and converted at a time.
+            close_connection: If True, close connection after execution.
+
+        Returns:
+            pyarrow.Table; an empty result keeps the columns and their types.
+
+        Raises:
+            QueryExecutionError: If query execution fails.
+            ImportError: If pyarrow is not installed.
+
+        Example:
+            table = db.fetch_all_as_arrow("SELECT * FROM events WHERE day = %s", (day,))
+            pyarrow.parquet.write_table(table, "events.parquet")
+        """
+        self.open_connection()
+
+        # Server-side cursor; WITH HOLD lets it outlive the statement in
+        # autocommit mode
+        cursor = self.db_connection.cursor(name="postgres_helpers_arrow", withhold=self.db_connection.autocommit)
+        prepare_psycopg2_cursor(cursor)
+
+        try:
+            cursor.execute(sql_query, sql_variables)
+            rows = cursor.fetchmany(batch_size)
+            # A named cursor has its description after the first fetch
+            builder = ArrowTableBuilder.from_description(cursor.description)
+            builder.add_rows(rows)
+            while len(rows) == batch_size:
+                rows = cursor.fetchmany(batch_size)
+                builder.add_rows(rows)
+            del rows
+
+            return builder.table()
+
+        except ImportError:
+            raise
+        except Exception as ex:
+            logger.error(f"fetch_all_as_arrow failed: {ex}")
+            raise self._convert_exception(ex, sql_query, sql_variables)
+
+        finally:
+            cursor.close()
+            if close_connection:
+                self.close_connection()
+
+    @instrumented
+    @deadline_aware
+    def fetch_all_as_numpy(
             self,
             sql_query: str,
             sql_variables: Optional[tuple] = None,
+            nulls: str = "nan",
             close_connection: bool = False
-    ) -> Optional[Dict[str, Any]]:
+    ) -> np.ndarray:
         """
-        Fetch a single row as a dictionary.
+        Fetch all rows as a NumPy structured array, one field per column.
+
+        When every column has a fixed-width type (bool, integers, floats,
+        numeric, date, timestamp[tz], time), the result is read with a binary
+        COPY and decoded straight into preallocated typed arrays, without a
+        Python object per cell. Other results are read row by row, with
+        object arrays for the other types (see postgres_helpers.arrays).
+
+        Args:
+            sql_query: SELECT query to execute.
+            sql_variables: Query parameters as a tuple.
+            nulls: "nan" (default): NaN/NaT for nulls, int and bool columns
+                   holding nulls become float64. "mask": a
+                   numpy.ma.MaskedArray masking the nulls, types unchanged.
+            close_connection: If True, close connection after execution.
+
+        Returns:
+            Structured array (MaskedArray with nulls="mask"); timestamptz
+            values are in UTC.
+
+        Raises:
+            QueryExecutionError: If query execution fails.
+            ValueError: If nulls is not "nan" or "mask".
+
+        Example:
+            ticks = db.fetch_all_as_numpy(
+                "SELECT ts, price, volume FROM ticks WHERE symbol = %s", ("ABC",)
+            )
+            vwap = (ticks["price"] * ticks["volume"]).sum() / ticks["volume"].sum()
+        """
+        if nulls not in NULL_MODES:
+            raise ValueError(f"nulls must be one of {NULL_MODES}, got {nulls!r}")
+
+        self.open_connection()
+
+        cursor = self.db_connection.cursor()
+
+        try:
+            # Column types, without running the query
+            cursor.execute(f"SELECT * FROM ({sql_query}) AS q LIMIT 0", sql_variables)
+            columns = [(column.name, column.type_code) for column in cursor.description]
+            if not is_fixed_width(columns):
+                cursor.execute(sql_query, sql_variables)
+                return rows_to_numpy(cursor.fetchall(), columns, nulls)
+
+            # COPY takes no parameters: render them client-side
+            rendered = cursor.mogrify(sql_query, sql_variables).decode()
+            output = io.BytesIO()
+            cursor.copy_expert(copy_query(rendered, columns), output)
+            return parse_copy(output.getbuffer(), columns, nulls)
+
+        except Exception as ex:
+            logger.error(f"fetch_all_as_numpy failed: {ex}")
+            raise self._convert_exception(ex, sql_query, sql_variables)
+
+        finally:
+            cursor.close()
+            if close_connection:
+                self.close_connection()
+
+    @instrumented
+    @deadline_aware
+    def fetch_column(
+            self,
+            sql_query: str,
+            sql_variables: Optional[tuple] = None,
+            dtype: Optional[Any] = None,
+            nulls: str = "nan",
+            close_connection: bool = False
+    ) -> np.ndarray:
+        """
+        Fetch the first column of the result as a 1-D NumPy array.
+
+        Same decoding as fetch_all_as_numpy().
+
+        Args:
+            sql_query: SELECT query to execute.
+            sql_variables: Query parameters as a tuple.
+            dtype: Convert the column to this dtype (default: the type of the
+                   column, see fetch_all_as_numpy()).
+            nulls: "nan" (default) or "mask", as in fetch_all_as_numpy().
+            close_connection: If True, close connection after execution.
+
+        Returns:
+            1-D array (MaskedArray with nulls="mask").
+
+        Example:
+            prices = db.fetch_column("SELECT price FROM ticks ORDER BY ts", dtype="float32")
+        """
+        return first_column(self.fetch_all_as_numpy(sql_query, sql_variables, nulls, close_connection), dtype)
+
+    @instrumented
+    @deadline_aware
+    def fetch_one_as_dict(
+            self,
+            sql_query: str,
+            sql_variables: Optional[tuple] = None,
+            close_connection: bool = False,
+            row_format: str = "dict"
+    ) -> Optional[Any]:
+        """
+        Fetch a single row as a dictionary (or row_format row).
 
         Args:
             sql_query: SELECT query (should return 0 or 1 row).
             sql_variables: Query parameters as a tuple.
             close_connection: If True, close connection after execution.
+            row_format: "dict" (default), "tuple" or "row" (tuple subclass
+                        with attribute access), see postgres_helpers.rows.
 
         Returns:
-            Dict with column names as keys, or None if no row found.
+            The row (a dict keyed by column name by default), or None if no
+            row found.
         """
+        check_row_format(row_format, SYNC_ROW_FORMATS)
         self.open_connection()
 
-        cursor = self.db_connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        cursor = self.db_connection.cursor()
 
         try:
             cursor.execute(sql_query, sql_variables)
             row = cursor.fetchone()
-            return dict(row) if row else None
+            return row_converter(cursor_columns(cursor), row_format)(row) if row else None
 
         except Exception as ex:
             logger.error(f"fetch_one_as_dict failed: {ex}")
@@ -465,6 +838,8 @@ class PostgresConnector:
             if close_connection:
                 self.close_connection()
 
+    @instrumented
+    @deadline_aware
     def fetch_value(
             self,
             sql_query: str,
@@ -504,6 +879,8 @@ class PostgresConnector:
     # Convenience Insert Methods
     # =========================================================================
 
+    @instrumented
+    @deadline_aware
     def insert_into_with_dict(
             self,
             table_name: str,
@@ -523,12 +900,9 @@ class PostgresConnector:
         Returns:
             InsertResult with insertion details.
         """
-        placeholder = ", ".join(["%s"] * len(parameters_dict))
-        columns = '"' + '","'.join(parameters_dict.keys()) + '"'
-        conflict_clause = " ON CONFLICT DO NOTHING" if on_duplicate_ignore else ""
-
-        query = f'INSERT INTO "{table_name}" ({columns}) VALUES ({placeholder}){conflict_clause}'
-        params = tuple(parameters_dict.values())
+        query, params = build_insert_sql(
+            table_name, parameters_dict, "ignore" if on_duplicate_ignore else "insert", placeholder="%s"
+        )
 
         self.open_connection()
         cursor = self.db_connection.cursor()
@@ -536,6 +910,8 @@ class PostgresConnector:
         try:
             cursor.execute(query, params)
 
+            self._invalidate_cached_results(table_name=table_name)
+
             return InsertResult(
                 rows_affected=cursor.rowcount,
                 status_message=cursor.statusmessage or "",
@@ -557,6 +933,8 @@ class PostgresConnector:
             if close_connection:
                 self.close_connection()
 
+    @instrumented
+    @deadline_aware
     def insert_with_dict_returning(
             self,
             table_name: str,
@@ -576,12 +954,9 @@ class PostgresConnector:
         Returns:
             InsertResult with returning_row containing the full inserted row.
         """
-        placeholder = ", ".join(["%s"] * len(parameters_dict))
-        columns = '"' + '","'.join(parameters_dict.keys()) + '"'
-        conflict_clause = " ON CONFLICT DO NOTHING" if on_duplicate_ignore else ""
-
-        query = f'INSERT INTO "{table_name}" ({columns}) VALUES ({placeholder}){conflict_clause} RETURNING *'
-        params = tuple(parameters_dict.values())
+        query, params = build_insert_sql(
+            table_name, parameters_dict, "ignore" if on_duplicate_ignore else "insert", placeholder="%s", returning="*"
+        )
 
         self.open_connection()
         cursor = self.db_connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
@@ -590,6 +965,8 @@ class PostgresConnector:
             cursor.execute(query, params)
             row = cursor.fetchone()
 
+            self._invalidate_cached_results(table_name=table_name)
+
             status = cursor.statusmessage or ""
 
             if row:
@@ -619,6 +996,117 @@ class PostgresConnector:
             if close_connection:
                 self.close_connection()
 
+    @instrumented
+    @deadline_aware
+    def insert_many_with_dict(
+            self,
+            table_name: str,
+            parameters_dicts: List[Dict[str, Any]],
+            on_duplicate_ignore: bool = True,
+            returning: Optional[Union[str, List[str]]] = None,
+            close_connection: bool = False
+    ) -> InsertManyResult:
+        """
+        Insert many rows from dicts, one statement per distinct column set.
+
+        Each group of dicts sharing the same keys is sent as a single
+        INSERT ... SELECT ... FROM unnest($1::type[], ...), whose text doesn't
+        depend on the number of rows. All groups run in one transaction.
+        Column types are read from the catalog once per table.
+
+        Args:
+            table_name: Name of the table to insert into.
+            parameters_dicts: Dicts mapping column names to values.
+            on_duplicate_ignore: If True, skip rows that violate a unique
+                                 constraint instead of failing the batch.
+            returning: Columns to return for each row ("*" for all).
+            close_connection: If True, close connection after execution.
+
+        Returns:
+            InsertManyResult. With returning=, returning_rows holds one row
+            per input dict in input order (None for skipped duplicates).
+        """
+        if not parameters_dicts:
+            return InsertManyResult(returning_rows=[] if returning else None)
+
+        returning_rows: List[Optional[Dict[str, Any]]] = [None] * len(parameters_dicts)
+        rows_affected = 0
+        query = None
+
+        self.open_connection()
+        conn = self.db_connection
+
+        original_autocommit = conn.autocommit
+        conn.autocommit = False
+
+        cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+
+        try:
+            schema = self._table_schema(conn, table_name)
+            if schema is None:
+                raise ValueError(f'Table "{table_name}" does not exist')
+            groups = plan_insert_many(
+                table_name, parameters_dicts, schema.column_types, "%s", on_duplicate_ignore, returning,
+                schema.unique_keys
+            )
+            for group in groups:
+                query = group.query
+                cursor.execute(query, group.params)
+                if returning:
+                    returned = [dict(row) for row in cursor.fetchall()]
+                    aligned = align_returning(group, returned, returning)
+                    for position, row in zip(group.positions, aligned):
+                        returning_rows[position] = row
+                rows_affected += cursor.rowcount
+            conn.commit()
+
+            self._invalidate_cached_results(table_name=table_name)
+
+            return InsertManyResult(
+                rows_affected=rows_affected,
+                total_rows=len(parameters_dicts),
+                statements=len(groups),
+                returning_rows=returning_rows if returning else None
+            )
+
+        except Exception as ex:
+            conn.rollback()
+            logger.error(f"insert_many_with_dict failed: {ex}")
+            raise self._convert_exception(ex, query)
+
+        finally:
+            cursor.close()
+            conn.autocommit = original_autocommit
+            if close_connection:
+                self.close_connection()
+
+    def _table_schema(
+            self,
+            conn,
+            table_name: str,
+            schema_name: Optional[str] = None,
+            refresh: bool = False
+    ) -> Optional[TableSchema]:
+        """Metadata of a table from the schema cache, queried on conn on a miss (None if it doesn't exist)."""
+        if not refresh:
+            hit = self.schema_cache.get(table_name, schema_name)
+            if hit is not None:
+                return hit.value
+        version = self.schema_cache.version()
+        with conn.cursor() as cursor:
+            cursor.execute(TABLE_SCHEMA_SQL.format(placeholder="%s"), (qualified_name(table_name, schema_name),))
+            schema = parse_table_schema(cursor.fetchall())
+        self.schema_cache.set(table_name, schema_name, schema, loaded_at_version=version)
+        return schema
+
+    def _primary_key(self, table_name: str) -> Optional[str]:
+        """Name of the primary key constraint of a table, from the schema cache."""
+        hit = self.schema_cache.get(table_name)
+        schema = hit.value if hit is not None else self.get_table_schema(table_name, refresh=True)
+        return schema.primary_key if schema is not None else None
+
+    @instrumented
+    @deadline_aware
     def insert_into_with_dict_update(
             self,
             table_name: str,
@@ -640,24 +1128,12 @@ class PostgresConnector:
         Returns:
             UpsertResult with operation details.
         """
-        placeholder = ", ".join(["%s"] * len(parameters_dict))
-        columns = '"' + '","'.join(parameters_dict.keys()) + '"'
+        if constraint_key is None and on_duplicate_update:
+            constraint_key = self._primary_key(table_name)
 
-        if on_duplicate_update:
-            if constraint_key is None:
-                constraint_key = f"{table_name}_pkey"
-            set_clause = ", ".join(
-                f'"{key}" = EXCLUDED."{key}"' for key in parameters_dict.keys()
-            )
-            conflict_clause = (
-                f" ON CONFLICT ON CONSTRAINT {constraint_key}"
-                f" DO UPDATE SET {set_clause}"
-            )
-        else:
-            conflict_clause = " ON CONFLICT DO NOTHING"
-
-        query = f'INSERT INTO "{table_name}" ({columns}) VALUES ({placeholder}){conflict_clause}'
-        params = tuple(parameters_dict.values())
+        query, params = build_insert_sql(
+            table_name, parameters_dict, "update" if on_duplicate_update else "ignore", constraint_key, placeholder="%s"
+        )
 
         self.open_connection()
         cursor = self.db_connection.cursor()
@@ -665,6 +1141,8 @@ class PostgresConnector:
         try:
             cursor.execute(query, params)
 
+            self._invalidate_cached_results(table_name=table_name)
+
             return UpsertResult(
                 rows_affected=cursor.rowcount,
                 status_message=cursor.statusmessage or "",
@@ -682,6 +1160,8 @@ class PostgresConnector:
             if close_connection:
                 self.close_connection()
 
+    @instrumented
+    @deadline_aware
     def insert_into_with_dict_update_returning(
             self,
             table_name: str,
@@ -701,24 +1181,14 @@ class PostgresConnector:
         Returns:
             UpsertResult with accurate was_inserted/was_updated flags.
         """
-        placeholder = ", ".join(["%s"] * len(parameters_dict))
-        columns = '"' + '","'.join(parameters_dict.keys()) + '"'
-
         if constraint_key is None:
-            constraint_key = f"{table_name}_pkey"
+            constraint_key = self._primary_key(table_name)
 
-        set_clause = ", ".join(
-            f'"{key}" = EXCLUDED."{key}"' for key in parameters_dict.keys()
+        # xmax = 0 means insert, xmax > 0 means update
+        query, params = build_insert_sql(
+            table_name, parameters_dict, "update", constraint_key, placeholder="%s", returning="*, xmax"
         )
 
-        query = (
-            f'INSERT INTO "{table_name}" ({columns}) VALUES ({placeholder})'
-            f' ON CONFLICT ON CONSTRAINT {constraint_key}'
-            f' DO UPDATE SET {set_clause}'
-            f' RETURNING *, xmax'
-        )
-        params = tuple(parameters_dict.values())
-
         self.open_connection()
         cursor = self.db_connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
 
@@ -726,6 +1196,8 @@ class PostgresConnector:
             cursor.execute(query, params)
             row = cursor.fetchone()
 
+            self._invalidate_cached_results(table_name=table_name)
+
             status = cursor.statusmessage or ""
 
             if row:
@@ -752,10 +1224,86 @@ class PostgresConnector:
             if close_connection:
                 self.close_connection()
 
+    @instrumented
+    @deadline_aware
+    def bulk_upsert(
+            self,
+            table_name: str,
+            rows: Iterable[Record],
+            conflict_columns: List[str],
+            update_columns: Optional[List[str]] = None,
+            columns: Optional[List[str]] = None,
+            schema_name: Optional[str] = None,
+            close_connection: bool = False
+    ) -> BulkUpsertResult:
+        """
+        Upsert many rows in one transaction through a COPY-loaded staging table.
+
+        Rows are streamed with COPY (text format) into a temporary table, then
+        moved with one INSERT ... SELECT ... ON CONFLICT DO UPDATE. The last
+        occurrence of a duplicated conflict key wins; rows with a NULL
+        conflict column are all inserted. Inserted and updated rows are told
+        apart with xmax.
+
+        Args:
+            table_name: Name of the table.
+            rows: List or iterator of tuples or dicts.
+            conflict_columns: Columns of the unique index used for conflicts.
+            update_columns: Columns overwritten on conflict (default: all
+                            others; empty list: leave existing rows untouched).
+            columns: Column names of the row values (optional for dicts).
+            schema_name: Schema of the table (optional).
+            close_connection: If True, close connection after execution.
+
+        Returns:
+            BulkUpsertResult with rows_staged, inserted and updated counts.
+        """
+        columns = resolve_columns(rows, columns)
+        if columns is None:
+            return BulkUpsertResult()
+
+        create_staging_sql, upsert_sql = build_bulk_upsert_sql(
+            table_name, columns, conflict_columns, update_columns, schema_name
+        )
+        copy_sql = build_copy_from_stdin_sql(UPSERT_STAGING_TABLE, [*columns, UPSERT_ROW_NUMBER])
+
+        self.open_connection()
+        conn = self.db_connection
+
+        original_autocommit = conn.autocommit
+        conn.autocommit = False
+
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute(create_staging_sql)
+            cursor.copy_expert(copy_sql, CopyTextReader(numbered_records_as_tuples(rows, columns)))
+            rows_staged = cursor.rowcount
+            cursor.execute(upsert_sql)
+            inserted, updated = cursor.fetchone()
+            conn.commit()
+
+            self._invalidate_cached_results(table_name=table_name)
+
+            return BulkUpsertResult(rows_staged=rows_staged, inserted=inserted, updated=updated)
+
+        except Exception as ex:
+            conn.rollback()
+            logger.error(f"bulk_upsert failed: {ex}")
+            raise self._convert_exception(ex, upsert_sql)
+
+        finally:
+            cursor.close()
+            conn.autocommit = original_autocommit
+            if close_connection:
+                self.close_connection()
+
     # =========================================================================
     # Utility Methods
     # =========================================================================
 
+    @instrumented
+    @deadline_aware
     def get_postgresql_version(self, close_connection: bool = False) -> str:
         """Get the PostgreSQL server version."""
         result = self.fetch_all_as_dicts(
@@ -766,6 +1314,8 @@ class PostgresConnector:
         logger.info(f"Connected to: {version}")
         return version
 
+    @instrumented
+    @deadline_aware
     def table_exists(
             self,
             table_name: str,
@@ -773,17 +1323,61 @@ class PostgresConnector:
             close_connection: bool = False
     ) -> bool:
         """Check if a table exists."""
-        result = self.fetch_value(
-            """
-            SELECT EXISTS (
-                SELECT FROM information_schema.tables 
-                WHERE table_schema = %s AND table_name = %s
-            )
-            """,
-            (schema, table_name),
-            close_connection=close_connection
-        )
-        return bool(result)
+        return self.get_table_schema(table_name, schema, close_connection=close_connection) is not None
+
+    @instrumented
+    @deadline_aware
+    def get_table_schema(
+            self,
+            table_name: str,
+            schema_name: Optional[str] = None,
+            refresh: bool = False,
+            close_connection: bool = False
+    ) -> Optional[TableSchema]:
+        """
+        Columns, type OIDs, primary key, unique constraints and partitions of a table.
+
+        Served from schema_cache; pg_catalog is queried on a miss, past the
+        cache TTL or with refresh=True.
+
+        Args:
+            table_name: Name of the table, view or partitioned table.
+            schema_name: Schema of the table (default: first match on the
+                         search_path).
+            refresh: If True, reload the metadata even if it is cached.
+            close_connection: If True, close connection after execution.
+
+        Returns:
+            TableSchema, or None if the table doesn't exist.
+
+        Example:
+            orders = db.get_table_schema("orders")
+            orders.primary_key, orders.column_types["total"]
+        """
+        self.open_connection()
+
+        try:
+            return self._table_schema(self.db_connection, table_name, schema_name, refresh)
+
+        except Exception as ex:
+            logger.error(f"get_table_schema failed: {ex}")
+            raise self._convert_exception(ex, TABLE_SCHEMA_SQL)
+
+        finally:
+            if close_connection:
+                self.close_connection()
+
+    def refresh_schema(self, table_name: Optional[str] = None) -> None:
+        """
+        Drop cached table metadata after DDL run outside this connector.
+
+        Args:
+            table_name: Table to drop (default: all tables).
+        """
+        if table_name is None:
+            self.schema_cache.clear()
+        else:
+            self.schema_cache.invalidate_tables([table_name])
 
 
 # =============================================================================
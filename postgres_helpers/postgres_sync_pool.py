@@ -24,23 +24,48 @@ Usage:
         cursor.execute("UPDATE inventory ...")
 """
 
+import io
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from os import environ
 from pathlib import Path
-from typing import Union, Optional, List, Dict, Any, Tuple, Iterator
+from typing import Union, Optional, List, Dict, Any, Set, Tuple, Iterator, Iterable, Callable, TYPE_CHECKING
 
+import numpy as np
 import pandas as pd
+import psycopg2
 from psycopg2 import Error
 from psycopg2.errors import (
     UniqueViolation,
     ForeignKeyViolation,
-    CheckViolation
+    CheckViolation,
+    QueryCanceled
 )
 from psycopg2.extras import RealDictCursor
 from psycopg2.pool import SimpleConnectionPool
 
+if TYPE_CHECKING:
+    import pyarrow as pa
+
 from postgres_helpers.app_config import load_postgres_details_to_env
+from postgres_helpers.bulk import (
+    Record,
+    plan_insert_many,
+    align_returning,
+    CopyTextReader,
+    numbered_records_as_tuples,
+    resolve_columns,
+    build_bulk_upsert_sql,
+    build_insert_sql,
+    qualified_name,
+    build_copy_from_stdin_sql,
+    UPSERT_STAGING_TABLE,
+    UPSERT_ROW_NUMBER
+)
+from postgres_helpers.columnar import chunk_dtypes, rows_to_df
 from postgres_helpers.exceptions import (
     PostgresHelperError,
     ConnectionError,
@@ -49,6 +74,7 @@ from postgres_helpers.exceptions import (
     UniqueViolationError,
     ForeignKeyViolationError,
     CheckViolationError,
+    QueryTimeoutError,
     TransactionError
 )
 from postgres_helpers.results import (
@@ -56,12 +82,104 @@ from postgres_helpers.results import (
     ExecuteManyResult,
     InsertResult,
     UpsertResult,
-    ConnectionInfo
+    InsertManyResult,
+    BulkUpsertResult,
+    MetricsSnapshot,
+    WarmupReport,
+    ConnectionInfo,
+    ReplicaStatus,
+    TableSchema
+)
+from postgres_helpers.arrays import NULL_MODES, copy_query, first_column, is_fixed_width, parse_copy, rows_to_numpy
+from postgres_helpers.arrow import ArrowTableBuilder, prepare_psycopg2_cursor
+from postgres_helpers.deadlines import deadline_aware, begin_acquire, end_acquire, release_connection
+from postgres_helpers.json_codecs import JsonCodecs
+from postgres_helpers.metrics import ConnectorMetrics, instrumented, record_acquire_wait
+from postgres_helpers.result_cache import (
+    ResultCache,
+    make_cache_key,
+    extract_read_tables
 )
+from postgres_helpers.routing import ReplicaRouter, REPLICA_LAG_SQL, is_write_query
+from postgres_helpers.rows import SYNC_ROW_FORMATS, check_row_format, convert_rows, cursor_columns, row_converter
+from postgres_helpers.schema_cache import SchemaCache, TABLE_SCHEMA_SQL, parse_table_schema
+from postgres_helpers.warmup import WarmupSpec, WarmupTimer, prepare_sql, session_options, timed_step
 
 logger = logging.getLogger(f"postgres_helpers:{Path(__file__).name}")
 
 
+class _WarmingConnectionPool(SimpleConnectionPool):
+    """
+    SimpleConnectionPool running setup(conn, connect_seconds) on every new
+    connection, and opening its minconn first connections concurrently.
+    """
+
+    def __init__(self, minconn: int, maxconn: int, *args, setup: Callable, **kwargs):
+        self._setup = setup
+        super().__init__(0, maxconn, *args, **kwargs)
+        self.minconn = int(minconn)
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, self.minconn)) as executor:
+                list(executor.map(lambda _: self._connect(), range(self.minconn)))
+        except Exception:
+            self.closeall()
+            raise
+
+    def _connect(self, key=None):
+        started = time.perf_counter()
+        conn = psycopg2.connect(*self._args, **self._kwargs)
+        try:
+            self._setup(conn, time.perf_counter() - started)
+        except Exception:
+            conn.close()
+            raise
+
+        if key is not None:
+            self._used[key] = conn
+            self._rused[id(conn)] = key
+        else:
+            self._pool.append(conn)
+        return conn
+
+
+class _PoolUsage:
+    """
+    Connections of a SimpleConnectionPool in use and idle, counted from the
+    checkouts instead of read from the pool's private lists.
+
+    The pool opens minconn connections up front, hands out an idle one
+    before opening another, and closes a returned connection when minconn
+    are already idle: a connection given back still open is idle until it
+    is checked out again.
+    """
+
+    def __init__(self, opened: int):
+        self.in_use = 0
+        self._opened = opened  # opened with the pool, never checked out
+        self._idle: Set[int] = set()  # id() of connections given back open
+        self._lock = threading.Lock()
+
+    @property
+    def idle(self) -> int:
+        return self._opened + len(self._idle)
+
+    def checked_out(self, conn) -> None:
+        with self._lock:
+            self.in_use += 1
+            if id(conn) in self._idle:
+                self._idle.discard(id(conn))
+            elif self._opened:
+                self._opened -= 1
+
+    def checked_in(self, conn) -> None:
+        """After pool.putconn(conn)."""
+        with self._lock:
+            self.in_use -= 1
+            if not conn.closed:
+                self._idle.add(id(conn))
+
+
 class PostgresConnectorPool:
     """
     Synchronous PostgreSQL connector with connection pooling.
@@ -69,6 +187,10 @@ class PostgresConnectorPool:
     This class manages a pool of database connections for efficient
     multi-threaded database access.
 
+    Every query method accepts keyword-only timeout= (seconds) and deadline=
+    (time.monotonic() value) covering the pool checkout and the execution;
+    past it the statement is cancelled and QueryTimeoutError is raised.
+
     Args:
         db_host: Database host (falls back to POSTGRES_DB_HOST env var)
         db_port: Database port (falls back to POSTGRES_DB_PORT env var)
@@ -79,6 +201,29 @@ class PostgresConnectorPool:
         pool_size_min: Minimum pool size (default: 2)
         pool_size_max: Maximum pool size (default: 5)
         application_name: Name shown in pg_stat_activity (optional)
+        result_cache: ResultCache shared by the fetch methods called with
+                      cache_ttl= (optional, default: no caching).
+        replica_dsns: DSNs of hot standby replicas (optional). Each gets its
+                      own pool of the same size; fetch_* methods read from
+                      them while writes and transaction() use the primary.
+                      A replica unreachable at startup starts out of rotation.
+        replica_routing: "round_robin" (default) or "least_busy".
+        max_replica_lag: Replay lag in seconds above which a replica is taken
+                         out of rotation (default: None, not checked).
+        replica_check_interval: Seconds between two lag checks (default: 5).
+        warmup: WarmupSpec applied to every new connection: session
+                settings, codecs and server-side prepared statements. The
+                pool_size_min first connections are opened concurrently and
+                warmed before the pool is returned; timings are in
+                warmup_report (optional). Prepared statement names must be
+                plain SQL identifiers (ValueError otherwise).
+        json_codecs: JsonCodecs registered on every connection to decode
+                     and encode json/jsonb values (optional, default:
+                     driver defaults).
+        schema_cache: SchemaCache of the table metadata used by
+                      table_exists(), get_table_schema(), the upsert helpers
+                      and insert_many_with_dict() (optional, default: a new
+                      SchemaCache with a 300 s TTL).
 
     Example:
         with PostgresConnectorPool(pool_size_max=10) as db:
@@ -95,7 +240,15 @@ class PostgresConnectorPool:
             connect_timeout: int = 6,
             pool_size_min: int = 2,
             pool_size_max: int = 5,
-            application_name: Optional[str] = None
+            application_name: Optional[str] = None,
+            result_cache: Optional[ResultCache] = None,
+            replica_dsns: Optional[List[str]] = None,
+            replica_routing: str = "round_robin",
+            max_replica_lag: Optional[float] = None,
+            replica_check_interval: float = 5.0,
+            warmup: Optional[WarmupSpec] = None,
+            json_codecs: Optional[JsonCodecs] = None,
+            schema_cache: Optional[SchemaCache] = None
     ):
         if None in [db_host, db_port, db_name, db_user, db_password]:
             load_postgres_details_to_env()
@@ -106,12 +259,47 @@ class PostgresConnectorPool:
         self.db_password: str = environ["POSTGRES_DB_PASS"] if db_password is None else db_password
         self.db_name: str = environ["POSTGRES_DB_NAME"] if db_name is None else db_name
 
+        if pool_size_min > pool_size_max:
+            logger.warning(f"pool_size_min={pool_size_min} is above pool_size_max={pool_size_max}, using {pool_size_max}")
+            pool_size_min = pool_size_max
+
         self.pool_size_min: int = pool_size_min
         self.pool_size_max: int = pool_size_max
         self.connect_timeout: int = connect_timeout
         self.application_name = application_name.strip().replace(" ", "_") if application_name else None
 
+        # Warm-up of new connections; timings of the last pool creation
+        if warmup is not None:
+            for name, sql_query in warmup.prepare.items():
+                prepare_sql(name, sql_query)
+        self.warmup: Optional[WarmupSpec] = warmup
+        self.warmup_report: Optional[WarmupReport] = None
+        self._warmup_timer: Optional[WarmupTimer] = None
+
+        # json/jsonb codecs registered on every new connection
+        self.json_codecs: Optional[JsonCodecs] = json_codecs
+
+        # Query result cache (opt-in per call with cache_ttl=)
+        self.result_cache: Optional[ResultCache] = result_cache
+
         self.db_connection_pool: Optional[SimpleConnectionPool] = None
+        self._pool_lock = threading.Lock()
+        self._pool_building = False
+
+        # Connections in use and idle per pool (id), counted by _getconn/_putconn
+        self._usage: Dict[int, _PoolUsage] = {}
+
+        # Read replicas (one pool per node, same order as replica_dsns)
+        self.replica_pools: List[Optional[SimpleConnectionPool]] = []  # None while unreachable
+        self._replica_router = ReplicaRouter(
+            replica_dsns or [], replica_routing, max_replica_lag, replica_check_interval
+        )
+
+        # Table metadata (columns, keys, partitions) read from pg_catalog
+        self.schema_cache: SchemaCache = schema_cache if schema_cache is not None else SchemaCache()
+
+        # Histograms of acquire wait, execution time, rows and bytes per method
+        self.metrics = ConnectorMetrics()
 
     # =========================================================================
     # Context Manager Support
@@ -134,27 +322,36 @@ class PostgresConnectorPool:
         """
         Create the connection pool if it doesn't exist.
 
+        Thread-safe: threads making the first call at once wait for a
+        single creation.
+
         Raises:
             PoolError: If pool creation fails.
         """
-        if self.db_connection_pool is not None:
+        if self.db_connection_pool is not None and not self._pool_building:
             return
 
-        # Ensure min < max
-        if self.pool_size_min >= self.pool_size_max:
-            self.pool_size_min = max(1, self.pool_size_max - 1)
+        with self._pool_lock:
+            if self.db_connection_pool is not None:
+                return
+            self._pool_building = True
+            try:
+                self._build_pool()
+            finally:
+                self._pool_building = False
+
+    def _build_pool(self) -> None:
+        """Create the primary pool and the replica pools."""
+        if self.warmup is not None:
+            self._warmup_timer = WarmupTimer()
 
         try:
-            self.db_connection_pool = SimpleConnectionPool(
-                minconn=self.pool_size_min,
-                maxconn=self.pool_size_max,
+            self.db_connection_pool = self._new_pool(
                 host=self.db_host,
                 port=self.db_port,
                 user=self.db_user,
                 password=self.db_password,
-                dbname=self.db_name,
-                connect_timeout=self.connect_timeout,
-                application_name=self.application_name
+                dbname=self.db_name
             )
         except Exception as ex:
             logger.error(f"Failed to create pool: {ex}")
@@ -165,12 +362,82 @@ class PostgresConnectorPool:
                 original_error=ex
             )
 
+        for index, dsn in enumerate(self._replica_router.dsns):
+            try:
+                self.replica_pools.append(self._new_pool(dsn=dsn))
+            except Exception as ex:
+                # Out of rotation until a lag check reaches it
+                logger.warning(f"Failed to create pool for replica {index}, starting without it: {ex}")
+                self.replica_pools.append(None)
+                self._replica_router.record_lag(index, None)
+
+        if self._warmup_timer is not None:
+            self.warmup_report = self._warmup_timer.report()
+            self._warmup_timer = None
+            logger.info(
+                f"Pool warmed up: {self.warmup_report.connections} connections in "
+                f"{self.warmup_report.total_seconds * 1000:.0f}ms, "
+                + ", ".join(f"{step} {seconds * 1000:.0f}ms" for step, seconds in self.warmup_report.steps.items())
+            )
+
+    def _new_pool(self, **connect_kwargs) -> SimpleConnectionPool:
+        """Pool of pool_size_min..pool_size_max connections, set up if a WarmupSpec or JsonCodecs is set."""
+        connect_kwargs.update(connect_timeout=self.connect_timeout, application_name=self.application_name)
+        if self.warmup is None and self.json_codecs is None:
+            pool = SimpleConnectionPool(self.pool_size_min, self.pool_size_max, **connect_kwargs)
+        else:
+            if self.warmup is not None and self.warmup.session_settings:
+                connect_kwargs["options"] = session_options(self.warmup.session_settings)
+            pool = _WarmingConnectionPool(
+                self.pool_size_min,
+                self.pool_size_max,
+                setup=self._setup_connection,
+                **connect_kwargs
+            )
+        self._usage[id(pool)] = _PoolUsage(self.pool_size_min)
+        return pool
+
+    def _setup_connection(self, conn, connect_seconds: float) -> None:
+        """Register the json codecs and run the warm-up on a new connection."""
+        if self.json_codecs is not None:
+            self.json_codecs.register_psycopg2(conn)
+        if self.warmup is not None:
+            self._warm_connection(conn, connect_seconds)
+
+    def _warm_connection(self, conn, connect_seconds: float) -> None:
+        """Register the warm-up codecs and prepare the hot statements on a new connection."""
+        timings = self._warmup_timer.connection(connect_seconds) if self._warmup_timer is not None else None
+
+        with timed_step(timings, "codecs"):
+            for codec in self.warmup.codecs:
+                codec(conn)
+
+        with timed_step(timings, "prepare"):
+            if self.warmup.prepare:
+                with conn.cursor() as cursor:
+                    for name, sql_query in self.warmup.prepare.items():
+                        cursor.execute(prepare_sql(name, sql_query))
+                # Leave the connection idle, not in a transaction
+                conn.commit()
+
     def close_pool(self) -> None:
         """
         Close all connections in the pool.
 
         Safe to call multiple times.
         """
+        for replica_pool in self.replica_pools:
+            if replica_pool is None:
+                continue
+            try:
+                replica_pool.closeall()
+            except Exception as ex:
+                logger.error(f"Error closing replica pool: {ex}")
+        self.replica_pools = []
+
+        self._warmup_timer = None
+        self._usage.clear()
+
         if self.db_connection_pool is not None:
             try:
                 self.db_connection_pool.closeall()
@@ -185,20 +452,146 @@ class PostgresConnectorPool:
 
     def get_pool_status(self) -> ConnectionInfo:
         """Get information about the pool."""
-        return ConnectionInfo(
+        info = ConnectionInfo(
             host=self.db_host,
             port=self.db_port,
             database=self.db_name,
             user=self.db_user,
-            is_connected=self.is_pool_active(),
-            pool_size=self.pool_size_max if self.is_pool_active() else None
+            is_connected=self.is_pool_active()
+        )
+
+        usage = self._usage.get(id(self.db_connection_pool))
+        if usage is not None:
+            info.pool_free = usage.idle
+            info.pool_size = usage.in_use + usage.idle
+
+        return info
+
+    # =========================================================================
+    # Metrics
+    # =========================================================================
+
+    def _getconn(self, pool: SimpleConnectionPool):
+        """pool.getconn(), timing the checkout for the metrics of the calling method."""
+        started = time.perf_counter()
+        begin_acquire()
+        conn = self._checkout(pool)
+        record_acquire_wait(time.perf_counter() - started)
+        # Cancelled by the watchdog if the call has a deadline
+        end_acquire(conn)
+        return conn
+
+    def _putconn(self, pool: SimpleConnectionPool, conn) -> None:
+        """pool.putconn(), once the deadline of the call no longer applies to conn."""
+        release_connection(conn)
+        self._checkin(pool, conn)
+
+    def _checkout(self, pool: SimpleConnectionPool):
+        """pool.getconn(), counted in the usage of the pool."""
+        conn = pool.getconn()
+        usage = self._usage.get(id(pool))
+        if usage is not None:
+            usage.checked_out(conn)
+        return conn
+
+    def _checkin(self, pool: SimpleConnectionPool, conn) -> None:
+        """pool.putconn(), counted in the usage of the pool."""
+        pool.putconn(conn)
+        usage = self._usage.get(id(pool))
+        if usage is not None:
+            usage.checked_in(conn)
+
+    def _in_use(self, pool: Optional[SimpleConnectionPool]) -> int:
+        """Connections of a pool checked out and not given back yet."""
+        usage = self._usage.get(id(pool))
+        return usage.in_use if usage is not None else 0
+
+    def get_metrics(self, reset: bool = False) -> MetricsSnapshot:
+        """
+        Get the per-method metrics and the saturation of the primary pool.
+
+        SimpleConnectionPool doesn't queue: at saturation getconn() raises
+        instead of waiting, which shows up as errors rather than acquire wait.
+
+        Args:
+            reset: Start new histograms after taking the snapshot.
+
+        Returns:
+            MetricsSnapshot with acquire wait, execution time, rows and
+            bytes histograms keyed by method name.
+        """
+        usage = self._usage.get(id(self.db_connection_pool))
+        in_use = usage.in_use if usage is not None else 0
+        idle = usage.idle if usage is not None else 0
+        return self.metrics.snapshot(
+            reset,
+            pool_size=in_use + idle,
+            pool_in_use=in_use,
+            pool_max=self.pool_size_max
         )
 
+    # =========================================================================
+    # Read Replicas
+    # =========================================================================
+
+    def _read_pool(self, sql_query: str) -> SimpleConnectionPool:
+        """
+        Pool serving a fetch: a replica in rotation, else the primary.
+
+        Queries that write (INSERT ... RETURNING, SELECT ... FOR UPDATE)
+        always go to the primary.
+        """
+        if not self.replica_pools or is_write_query(sql_query):
+            return self.db_connection_pool
+
+        if self._replica_router.due_for_check():
+            self._check_replica_lag()
+
+        index = self._replica_router.choose(lambda i: self._in_use(self.replica_pools[i]))
+        return self.db_connection_pool if index is None else self.replica_pools[index]
+
+    def _check_replica_lag(self) -> None:
+        """Measure the replay lag of every replica (creating the pools missing) and update the rotation."""
+        self._replica_router.start_check()
+        timeout_ms = int(self._replica_router.check_interval * 1000)
+
+        for index in range(len(self.replica_pools)):
+            lag = None
+            try:
+                if self.replica_pools[index] is None:
+                    self.replica_pools[index] = self._new_pool(dsn=self._replica_router.dsns[index])
+                replica_pool = self.replica_pools[index]
+                conn = self._checkout(replica_pool)
+                try:
+                    # In a transaction for SET LOCAL, rolled back below
+                    conn.autocommit = False
+                    with conn.cursor() as cursor:
+                        cursor.execute("SET LOCAL statement_timeout = %s", (timeout_ms,))
+                        cursor.execute(REPLICA_LAG_SQL)
+                        lag = cursor.fetchone()[0]
+                    conn.rollback()
+                finally:
+                    self._checkin(replica_pool, conn)
+            except Exception as ex:
+                logger.warning(f"Lag check of replica {index} failed: {ex}")
+            self._replica_router.record_lag(index, lag)
+
+    def get_replica_status(self) -> List[ReplicaStatus]:
+        """
+        Get the lag and rotation state of the read replicas.
+
+        Returns:
+            One ReplicaStatus per entry of replica_dsns.
+        """
+        return self._replica_router.status()
+
     # =========================================================================
     # Transaction Support
     # =========================================================================
 
     @contextmanager
+    @instrumented
+    @deadline_aware
     def transaction(self) -> Iterator:
         """
         Context manager for database transactions.
@@ -216,7 +609,7 @@ class PostgresConnectorPool:
                 cursor.execute("UPDATE inventory ...")
         """
         self._create_pool_connection()
-        conn = self.db_connection_pool.getconn()
+        conn = self._getconn(self.db_connection_pool)
 
         # Disable autocommit for transaction
         original_autocommit = conn.autocommit
@@ -234,9 +627,11 @@ class PostgresConnectorPool:
         finally:
             cursor.close()
             conn.autocommit = original_autocommit
-            self.db_connection_pool.putconn(conn)
+            self._putconn(self.db_connection_pool, conn)
 
     @contextmanager
+    @instrumented
+    @deadline_aware
     def acquire_connection(self) -> Iterator:
         """
         Acquire a connection from the pool.
@@ -245,11 +640,11 @@ class PostgresConnectorPool:
             psycopg2 connection.
         """
         self._create_pool_connection()
-        conn = self.db_connection_pool.getconn()
+        conn = self._getconn(self.db_connection_pool)
         try:
             yield conn
         finally:
-            self.db_connection_pool.putconn(conn)
+            self._putconn(self.db_connection_pool, conn)
 
     # =========================================================================
     # Error Handling Helper
@@ -285,6 +680,14 @@ class PostgresConnectorPool:
                 params=params,
                 original_error=ex
             )
+        elif isinstance(ex, QueryCanceled):
+            # statement_timeout, or cancelled at the deadline of the call
+            return QueryTimeoutError(
+                f"Query cancelled: {ex}",
+                query=safe_query,
+                params=params,
+                original_error=ex
+            )
         elif isinstance(ex, Error):
             return QueryExecutionError(
                 f"Query execution failed: {ex}",
@@ -300,10 +703,59 @@ class PostgresConnectorPool:
                 original_error=ex
             )
 
+    # =========================================================================
+    # Result Cache
+    # =========================================================================
+
+    def _fetch_cached(
+            self,
+            kind: str,
+            sql_query: str,
+            sql_variables: Optional[tuple],
+            cache_ttl: float,
+            cache_tags: Optional[Iterable[str]],
+            loader: Callable[[], Any]
+    ) -> Any:
+        """
+        Serve a read from the result cache, calling loader() on a miss.
+
+        Expired entries are reloaded in the foreground; only the async pool
+        serves them stale while refreshing in the background.
+        """
+        cache = self.result_cache
+        key = make_cache_key(kind, sql_query, sql_variables)
+
+        hit = cache.get(key, allow_stale=False)
+        if hit is not None:
+            return hit.value
+
+        version = cache.version()
+        value = loader()
+        tags = extract_read_tables(sql_query) | set(cache_tags or ())
+        cache.set(key, value, cache_ttl, tags=tags, loaded_at_version=version)
+        return value
+
+    def _invalidate_cached_results(
+            self,
+            sql_query: Optional[str] = None,
+            table_name: Optional[str] = None
+    ) -> None:
+        """Drop the cached results of the table a write touched, and the table metadata DDL changed."""
+        if sql_query is not None:
+            self.schema_cache.invalidate_for_sql(sql_query)
+        if self.result_cache is None:
+            return
+        if table_name is not None:
+            self.result_cache.invalidate_tables([table_name])
+        else:
+            self.result_cache.invalidate_for_sql(sql_query)
+
     # =========================================================================
     # Query Execution Methods
     # =========================================================================
 
+    @instrumented
+    @deadline_aware
     def execute_one_query(
             self,
             sql_query: str,
@@ -325,7 +777,7 @@ class PostgresConnectorPool:
             QueryExecutionError: For other query errors.
         """
         self._create_pool_connection()
-        conn = self.db_connection_pool.getconn()
+        conn = self._getconn(self.db_connection_pool)
         conn.autocommit = True
 
         cursor = conn.cursor()
@@ -333,6 +785,8 @@ class PostgresConnectorPool:
         try:
             cursor.execute(sql_query, sql_variables)
 
+            self._invalidate_cached_results(sql_query=sql_query)
+
             return QueryResult(
                 rows_affected=cursor.rowcount,
                 status_message=cursor.statusmessage,
@@ -345,8 +799,10 @@ class PostgresConnectorPool:
 
         finally:
             cursor.close()
-            self.db_connection_pool.putconn(conn)
+            self._putconn(self.db_connection_pool, conn)
 
+    @instrumented
+    @deadline_aware
     def execute_many_query(
             self,
             sql_query: str,
@@ -363,7 +819,7 @@ class PostgresConnectorPool:
             ExecuteManyResult with execution statistics.
         """
         self._create_pool_connection()
-        conn = self.db_connection_pool.getconn()
+        conn = self._getconn(self.db_connection_pool)
         conn.autocommit = True
 
         cursor = conn.cursor()
@@ -371,6 +827,8 @@ class PostgresConnectorPool:
         try:
             cursor.executemany(sql_query, tuples_list)
 
+            self._invalidate_cached_results(sql_query=sql_query)
+
             return ExecuteManyResult(
                 success=True,
                 total_statements=len(tuples_list),
@@ -383,36 +841,55 @@ class PostgresConnectorPool:
 
         finally:
             cursor.close()
-            self.db_connection_pool.putconn(conn)
+            self._putconn(self.db_connection_pool, conn)
 
     # =========================================================================
     # Fetch Methods
     # =========================================================================
 
+    @instrumented
+    @deadline_aware
     def fetch_all_as_dicts(
             self,
             sql_query: str,
-            sql_variables: Optional[tuple] = None
-    ) -> List[Dict[str, Any]]:
+            sql_variables: Optional[tuple] = None,
+            cache_ttl: Optional[float] = None,
+            cache_tags: Optional[Iterable[str]] = None,
+            row_format: str = "dict"
+    ) -> List[Any]:
         """
-        Fetch all rows as a list of dictionaries.
+        Fetch all rows as a list of dictionaries (or row_format rows).
 
         Args:
             sql_query: SELECT query to execute.
             sql_variables: Query parameters as a tuple.
+            cache_ttl: Serve the result from the result cache for this many
+                       seconds (requires result_cache). Default: not cached.
+            cache_tags: Extra table names the cached result depends on, on
+                        top of the tables read in FROM/JOIN clauses.
+            row_format: "dict" (default), "tuple" or "row" (tuple subclass
+                        with attribute access), see postgres_helpers.rows.
 
         Returns:
-            List of dicts where keys are column names.
+            List of rows, dicts keyed by column name by default.
         """
+        check_row_format(row_format, SYNC_ROW_FORMATS)
+        if cache_ttl is not None and self.result_cache is not None:
+            return self._fetch_cached(
+                f"rows:{row_format}", sql_query, sql_variables, cache_ttl, cache_tags,
+                lambda: self.fetch_all_as_dicts(sql_query, sql_variables, row_format=row_format)
+            )
+
         self._create_pool_connection()
-        conn = self.db_connection_pool.getconn()
+        pool = self._read_pool(sql_query)
+        conn = self._getconn(pool)
 
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        cursor = conn.cursor()
 
         try:
             cursor.execute(sql_query, sql_variables)
             rows = cursor.fetchall()
-            return [dict(row) for row in rows]
+            return convert_rows(rows, cursor_columns(cursor), row_format)
 
         except Exception as ex:
             logger.error(f"fetch_all_as_dicts failed: {ex}")
@@ -420,12 +897,16 @@ class PostgresConnectorPool:
 
         finally:
             cursor.close()
-            self.db_connection_pool.putconn(conn)
+            self._putconn(pool, conn)
 
+    @instrumented
+    @deadline_aware
     def fetch_all_as_df(
             self,
             sql_query: str,
-            sql_variables: Optional[tuple] = None
+            sql_variables: Optional[tuple] = None,
+            cache_ttl: Optional[float] = None,
+            cache_tags: Optional[Iterable[str]] = None
     ) -> pd.DataFrame:
         """
         Fetch all rows as a pandas DataFrame.
@@ -433,40 +914,301 @@ class PostgresConnectorPool:
         Args:
             sql_query: SELECT query to execute.
             sql_variables: Query parameters as a tuple.
+            cache_ttl: Serve the result from the result cache for this many
+                       seconds (requires result_cache). Default: not cached.
+            cache_tags: Extra table names the cached result depends on, on
+                        top of the tables read in FROM/JOIN clauses.
 
         Returns:
-            DataFrame with columns matching the query result.
+            DataFrame with columns matching the query result. An empty
+            result keeps the column names.
         """
-        results = self.fetch_all_as_dicts(
-            sql_query=sql_query,
-            sql_variables=sql_variables
-        )
-        return pd.DataFrame(results) if results else pd.DataFrame()
+        if cache_ttl is not None and self.result_cache is not None:
+            return self._fetch_cached(
+                "df", sql_query, sql_variables, cache_ttl, cache_tags,
+                lambda: self.fetch_all_as_df(sql_query, sql_variables)
+            )
+
+        self._create_pool_connection()
+        pool = self._read_pool(sql_query)
+        conn = self._getconn(pool)
 
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute(sql_query, sql_variables)
+            rows = cursor.fetchall()
+            columns = [column.name for column in cursor.description]
+            return rows_to_df(rows, columns)
+
+        except Exception as ex:
+            logger.error(f"fetch_all_as_df failed: {ex}")
+            raise self._convert_exception(ex, sql_query, sql_variables)
+
+        finally:
+            cursor.close()
+            self._putconn(pool, conn)
+
+    @instrumented
+    @deadline_aware
+    def iter_df(
+            self,
+            sql_query: str,
+            sql_variables: Optional[tuple] = None,
+            chunk_rows: int = 50000
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream the result as DataFrames of up to chunk_rows rows.
+
+        Rows are read through a server-side cursor, one chunk at a time, so
+        memory is bounded by the chunk size whatever the size of the result.
+        Every chunk has the same dtypes, derived from the column types:
+        nullable Int16/Int32/Int64 and boolean, float32/float64, datetime64
+        (UTC for timestamptz), the pandas string dtype for text, object for
+        the other types. A pooled connection is held until the
+        iteration ends: consume the generator fully or close it.
+
+        Args:
+            sql_query: SELECT query to execute.
+            sql_variables: Query parameters as a tuple.
+            chunk_rows: Maximum rows per DataFrame.
+
+        Yields:
+            DataFrames with the columns of the result; nothing for an empty
+            result.
+
+        Raises:
+            PoolError: If pool creation fails.
+            QueryExecutionError: If query execution fails.
+
+        Example:
+            total = 0
+            for chunk in db.iter_df("SELECT user_id, amount FROM events WHERE year = %s", (2024,)):
+                total += chunk["amount"].sum()
+        """
+        self._create_pool_connection()
+        pool = self._read_pool(sql_query)
+        conn = self._getconn(pool)
+
+        cursor = conn.cursor(name="postgres_helpers_iter_df", withhold=conn.autocommit)
+
+        try:
+            cursor.execute(sql_query, sql_variables)
+            columns, dtypes = None, None
+            while True:
+                rows = cursor.fetchmany(chunk_rows)
+                if dtypes is None:
+                    # A named cursor has its description after the first fetch
+                    columns = [column.name for column in cursor.description]
+                    dtypes = chunk_dtypes([column.type_code for column in cursor.description])
+                if rows:
+                    yield rows_to_df(rows, columns, dtypes)
+                if len(rows) < chunk_rows:
+                    break
+
+        except Exception as ex:
+            logger.error(f"iter_df failed: {ex}")
+            raise self._convert_exception(ex, sql_query, sql_variables)
+
+        finally:
+            cursor.close()
+            self._putconn(pool, conn)
+
+    @instrumented
+    @deadline_aware
+    def fetch_all_as_arrow(
+            self,
+            sql_query: str,
+            sql_variables: Optional[tuple] = None,
+            batch_size: int = 10000
+    ) -> "pa.Table":
+        """
+        Fetch all rows as a pyarrow Table, built batch by batch.
+
+        Rows are read through a server-side cursor, batch_size at a time, and
+        each batch is converted to Arrow arrays before the next one is
+        fetched, so peak memory stays close to the size of the table. Column
+        types follow the Postgres types (see postgres_helpers.arrow).
+
+        Args:
+            sql_query: SELECT query to execute.
+            sql_variables: Query parameters as a tuple.
+            batch_size: Number of rows fetched and converted at a time.
+
+        Returns:
+            pyarrow.Table; an empty result keeps the columns and their types.
+
+        Raises:
+            PoolError: If pool creation fails.
+            QueryExecutionError: If query execution fails.
+            ImportError: If pyarrow is not installed.
+
+        Example:
+            table = db.fetch_all_as_arrow("SELECT * FROM events WHERE day = %s", (day,))
+            pyarrow.parquet.write_table(table, "events.parquet")
+        """
+        self._create_pool_connection()
+        pool = self._read_pool(sql_query)
+        conn = self._getconn(pool)
+
+        # Server-side cursor, in the transaction psycopg2 opens implicitly
+        cursor = conn.cursor(name="postgres_helpers_arrow", withhold=conn.autocommit)
+        prepare_psycopg2_cursor(cursor)
+
+        try:
+            cursor.execute(sql_query, sql_variables)
+            rows = cursor.fetchmany(batch_size)
+            # A named cursor has its description after the first fetch
+            builder = ArrowTableBuilder.from_description(cursor.description)
+            builder.add_rows(rows)
+            while len(rows) == batch_size:
+                rows = cursor.fetchmany(batch_size)
+                builder.add_rows(rows)
+            del rows
+
+            return builder.table()
+
+        except ImportError:
+            raise
+        except Exception as ex:
+            logger.error(f"fetch_all_as_arrow failed: {ex}")
+            raise self._convert_exception(ex, sql_query, sql_variables)
+
+        finally:
+            cursor.close()
+            self._putconn(pool, conn)
+
+    @instrumented
+    @deadline_aware
+    def fetch_all_as_numpy(
+            self,
+            sql_query: str,
+            sql_variables: Optional[tuple] = None,
+            nulls: str = "nan"
+    ) -> np.ndarray:
+        """
+        Fetch all rows as a NumPy structured array, one field per column.
+
+        When every column has a fixed-width type (bool, integers, floats,
+        numeric, date, timestamp[tz], time), the result is read with a binary
+        COPY and decoded straight into preallocated typed arrays, without a
+        Python object per cell. Other results are read row by row, with
+        object arrays for the other types (see postgres_helpers.arrays).
+
+        Args:
+            sql_query: SELECT query to execute.
+            sql_variables: Query parameters as a tuple.
+            nulls: "nan" (default): NaN/NaT for nulls, int and bool columns
+                   holding nulls become float64. "mask": a
+                   numpy.ma.MaskedArray masking the nulls, types unchanged.
+
+        Returns:
+            Structured array (MaskedArray with nulls="mask"); timestamptz
+            values are in UTC.
+
+        Raises:
+            PoolError: If pool creation fails.
+            QueryExecutionError: If query execution fails.
+            ValueError: If nulls is not "nan" or "mask".
+
+        Example:
+            ticks = db.fetch_all_as_numpy(
+                "SELECT ts, price, volume FROM ticks WHERE symbol = %s", ("ABC",)
+            )
+            vwap = (ticks["price"] * ticks["volume"]).sum() / ticks["volume"].sum()
+        """
+        if nulls not in NULL_MODES:
+            raise ValueError(f"nulls must be one of {NULL_MODES}, got {nulls!r}")
+
+        self._create_pool_connection()
+        pool = self._read_pool(sql_query)
+        conn = self._getconn(pool)
+
+        cursor = conn.cursor()
+
+        try:
+            # Column types, without running the query
+            cursor.execute(f"SELECT * FROM ({sql_query}) AS q LIMIT 0", sql_variables)
+            columns = [(column.name, column.type_code) for column in cursor.description]
+            if not is_fixed_width(columns):
+                cursor.execute(sql_query, sql_variables)
+                return rows_to_numpy(cursor.fetchall(), columns, nulls)
+
+            # COPY takes no parameters: render them client-side
+            rendered = cursor.mogrify(sql_query, sql_variables).decode()
+            output = io.BytesIO()
+            cursor.copy_expert(copy_query(rendered, columns), output)
+            return parse_copy(output.getbuffer(), columns, nulls)
+
+        except Exception as ex:
+            logger.error(f"fetch_all_as_numpy failed: {ex}")
+            raise self._convert_exception(ex, sql_query, sql_variables)
+
+        finally:
+            cursor.close()
+            self._putconn(pool, conn)
+
+    @instrumented
+    @deadline_aware
+    def fetch_column(
+            self,
+            sql_query: str,
+            sql_variables: Optional[tuple] = None,
+            dtype: Optional[Any] = None,
+            nulls: str = "nan"
+    ) -> np.ndarray:
+        """
+        Fetch the first column of the result as a 1-D NumPy array.
+
+        Same decoding as fetch_all_as_numpy().
+
+        Args:
+            sql_query: SELECT query to execute.
+            sql_variables: Query parameters as a tuple.
+            dtype: Convert the column to this dtype (default: the type of the
+                   column, see fetch_all_as_numpy()).
+            nulls: "nan" (default) or "mask", as in fetch_all_as_numpy().
+
+        Returns:
+            1-D array (MaskedArray with nulls="mask").
+
+        Example:
+            prices = db.fetch_column("SELECT price FROM ticks ORDER BY ts", dtype="float32")
+        """
+        return first_column(self.fetch_all_as_numpy(sql_query, sql_variables, nulls), dtype)
+
+    @instrumented
+    @deadline_aware
     def fetch_one_as_dict(
             self,
             sql_query: str,
-            sql_variables: Optional[tuple] = None
-    ) -> Optional[Dict[str, Any]]:
+            sql_variables: Optional[tuple] = None,
+            row_format: str = "dict"
+    ) -> Optional[Any]:
         """
-        Fetch a single row as a dictionary.
+        Fetch a single row as a dictionary (or row_format row).
 
         Args:
             sql_query: SELECT query (should return 0 or 1 row).
             sql_variables: Query parameters as a tuple.
+            row_format: "dict" (default), "tuple" or "row" (tuple subclass
+                        with attribute access), see postgres_helpers.rows.
 
         Returns:
-            Dict with column names as keys, or None if no row found.
+            The row (a dict keyed by column name by default), or None if no
+            row found.
         """
+        check_row_format(row_format, SYNC_ROW_FORMATS)
         self._create_pool_connection()
-        conn = self.db_connection_pool.getconn()
+        pool = self._read_pool(sql_query)
+        conn = self._getconn(pool)
 
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        cursor = conn.cursor()
 
         try:
             cursor.execute(sql_query, sql_variables)
             row = cursor.fetchone()
-            return dict(row) if row else None
+            return row_converter(cursor_columns(cursor), row_format)(row) if row else None
 
         except Exception as ex:
             logger.error(f"fetch_one_as_dict failed: {ex}")
@@ -474,8 +1216,10 @@ class PostgresConnectorPool:
 
         finally:
             cursor.close()
-            self.db_connection_pool.putconn(conn)
+            self._putconn(pool, conn)
 
+    @instrumented
+    @deadline_aware
     def fetch_value(
             self,
             sql_query: str,
@@ -492,7 +1236,8 @@ class PostgresConnectorPool:
             The value, or None if no row found.
         """
         self._create_pool_connection()
-        conn = self.db_connection_pool.getconn()
+        pool = self._read_pool(sql_query)
+        conn = self._getconn(pool)
 
         cursor = conn.cursor()
 
@@ -507,12 +1252,14 @@ class PostgresConnectorPool:
 
         finally:
             cursor.close()
-            self.db_connection_pool.putconn(conn)
+            self._putconn(pool, conn)
 
     # =========================================================================
     # Convenience Insert Methods
     # =========================================================================
 
+    @instrumented
+    @deadline_aware
     def insert_into_with_dict(
             self,
             table_name: str,
@@ -530,15 +1277,12 @@ class PostgresConnectorPool:
         Returns:
             InsertResult with insertion details.
         """
-        placeholder = ", ".join(["%s"] * len(parameters_dict))
-        columns = '"' + '","'.join(parameters_dict.keys()) + '"'
-        conflict_clause = " ON CONFLICT DO NOTHING" if on_duplicate_ignore else ""
-
-        query = f'INSERT INTO "{table_name}" ({columns}) VALUES ({placeholder}){conflict_clause}'
-        params = tuple(parameters_dict.values())
+        query, params = build_insert_sql(
+            table_name, parameters_dict, "ignore" if on_duplicate_ignore else "insert", placeholder="%s"
+        )
 
         self._create_pool_connection()
-        conn = self.db_connection_pool.getconn()
+        conn = self._getconn(self.db_connection_pool)
         conn.autocommit = True
 
         cursor = conn.cursor()
@@ -546,6 +1290,8 @@ class PostgresConnectorPool:
         try:
             cursor.execute(query, params)
 
+            self._invalidate_cached_results(table_name=table_name)
+
             return InsertResult(
                 rows_affected=cursor.rowcount,
                 status_message=cursor.statusmessage or "",
@@ -564,8 +1310,10 @@ class PostgresConnectorPool:
 
         finally:
             cursor.close()
-            self.db_connection_pool.putconn(conn)
+            self._putconn(self.db_connection_pool, conn)
 
+    @instrumented
+    @deadline_aware
     def insert_with_dict_returning(
             self,
             table_name: str,
@@ -583,15 +1331,12 @@ class PostgresConnectorPool:
         Returns:
             InsertResult with returning_row containing the full inserted row.
         """
-        placeholder = ", ".join(["%s"] * len(parameters_dict))
-        columns = '"' + '","'.join(parameters_dict.keys()) + '"'
-        conflict_clause = " ON CONFLICT DO NOTHING" if on_duplicate_ignore else ""
-
-        query = f'INSERT INTO "{table_name}" ({columns}) VALUES ({placeholder}){conflict_clause} RETURNING *'
-        params = tuple(parameters_dict.values())
+        query, params = build_insert_sql(
+            table_name, parameters_dict, "ignore" if on_duplicate_ignore else "insert", placeholder="%s", returning="*"
+        )
 
         self._create_pool_connection()
-        conn = self.db_connection_pool.getconn()
+        conn = self._getconn(self.db_connection_pool)
         conn.autocommit = True
 
         cursor = conn.cursor(cursor_factory=RealDictCursor)
@@ -600,6 +1345,8 @@ class PostgresConnectorPool:
             cursor.execute(query, params)
             row = cursor.fetchone()
 
+            self._invalidate_cached_results(table_name=table_name)
+
             status = cursor.statusmessage or ""
 
             if row:
@@ -626,8 +1373,130 @@ class PostgresConnectorPool:
 
         finally:
             cursor.close()
-            self.db_connection_pool.putconn(conn)
+            self._putconn(self.db_connection_pool, conn)
+
+    @instrumented
+    @deadline_aware
+    def insert_many_with_dict(
+            self,
+            table_name: str,
+            parameters_dicts: List[Dict[str, Any]],
+            on_duplicate_ignore: bool = True,
+            returning: Optional[Union[str, List[str]]] = None
+    ) -> InsertManyResult:
+        """
+        Insert many rows from dicts, one statement per distinct column set.
+
+        Each group of dicts sharing the same keys is sent as a single
+        INSERT ... SELECT ... FROM unnest($1::type[], ...), whose text doesn't
+        depend on the number of rows. All groups run in one transaction.
+        Column types are read from the catalog once per table.
+
+        Args:
+            table_name: Name of the table to insert into.
+            parameters_dicts: Dicts mapping column names to values.
+            on_duplicate_ignore: If True, skip rows that violate a unique
+                                 constraint instead of failing the batch.
+            returning: Columns to return for each row ("*" for all).
+
+        Returns:
+            InsertManyResult. With returning=, returning_rows holds one row
+            per input dict in input order (None for skipped duplicates).
+
+        Raises:
+            PoolError: If pool creation fails.
+            UniqueViolationError: If duplicate and on_duplicate_ignore=False.
+            QueryExecutionError: If a dict has a column the table doesn't have,
+                                 or for other errors (nothing is inserted).
+
+        Example:
+            result = db.insert_many_with_dict(
+                "users",
+                [{"email": "a@example.com"}, {"email": "b@example.com", "name": "B"}],
+                returning=["id"]
+            )
+            ids = [row["id"] if row else None for row in result.returning_rows]
+        """
+        if not parameters_dicts:
+            return InsertManyResult(returning_rows=[] if returning else None)
+
+        returning_rows: List[Optional[Dict[str, Any]]] = [None] * len(parameters_dicts)
+        rows_affected = 0
+        query = None
+
+        self._create_pool_connection()
+        conn = self._getconn(self.db_connection_pool)
+
+        original_autocommit = conn.autocommit
+        conn.autocommit = False
+
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
+
+        try:
+            schema = self._table_schema(conn, table_name)
+            if schema is None:
+                raise ValueError(f'Table "{table_name}" does not exist')
+            groups = plan_insert_many(
+                table_name, parameters_dicts, schema.column_types, "%s", on_duplicate_ignore, returning,
+                schema.unique_keys
+            )
+            for group in groups:
+                query = group.query
+                cursor.execute(query, group.params)
+                if returning:
+                    returned = [dict(row) for row in cursor.fetchall()]
+                    aligned = align_returning(group, returned, returning)
+                    for position, row in zip(group.positions, aligned):
+                        returning_rows[position] = row
+                rows_affected += cursor.rowcount
+            conn.commit()
+
+            self._invalidate_cached_results(table_name=table_name)
+
+            return InsertManyResult(
+                rows_affected=rows_affected,
+                total_rows=len(parameters_dicts),
+                statements=len(groups),
+                returning_rows=returning_rows if returning else None
+            )
+
+        except Exception as ex:
+            conn.rollback()
+            logger.error(f"insert_many_with_dict failed: {ex}")
+            raise self._convert_exception(ex, query)
+
+        finally:
+            cursor.close()
+            conn.autocommit = original_autocommit
+            self._putconn(self.db_connection_pool, conn)
 
+    def _table_schema(
+            self,
+            conn,
+            table_name: str,
+            schema_name: Optional[str] = None,
+            refresh: bool = False
+    ) -> Optional[TableSchema]:
+        """Metadata of a table from the schema cache, queried on conn on a miss (None if it doesn't exist)."""
+        if not refresh:
+            hit = self.schema_cache.get(table_name, schema_name)
+            if hit is not None:
+                return hit.value
+        version = self.schema_cache.version()
+        with conn.cursor() as cursor:
+            cursor.execute(TABLE_SCHEMA_SQL.format(placeholder="%s"), (qualified_name(table_name, schema_name),))
+            schema = parse_table_schema(cursor.fetchall())
+        self.schema_cache.set(table_name, schema_name, schema, loaded_at_version=version)
+        return schema
+
+    def _primary_key(self, table_name: str) -> Optional[str]:
+        """Name of the primary key constraint of a table, from the schema cache."""
+        hit = self.schema_cache.get(table_name)
+        schema = hit.value if hit is not None else self.get_table_schema(table_name, refresh=True)
+        return schema.primary_key if schema is not None else None
+
+    @instrumented
+    @deadline_aware
     def insert_into_with_dict_update(
             self,
             table_name: str,
@@ -647,27 +1516,15 @@ class PostgresConnectorPool:
         Returns:
             UpsertResult with operation details.
         """
-        placeholder = ", ".join(["%s"] * len(parameters_dict))
-        columns = '"' + '","'.join(parameters_dict.keys()) + '"'
-
-        if on_duplicate_update:
-            if constraint_key is None:
-                constraint_key = f"{table_name}_pkey"
-            set_clause = ", ".join(
-                f'"{key}" = EXCLUDED."{key}"' for key in parameters_dict.keys()
-            )
-            conflict_clause = (
-                f" ON CONFLICT ON CONSTRAINT {constraint_key}"
-                f" DO UPDATE SET {set_clause}"
-            )
-        else:
-            conflict_clause = " ON CONFLICT DO NOTHING"
+        if constraint_key is None and on_duplicate_update:
+            constraint_key = self._primary_key(table_name)
 
-        query = f'INSERT INTO "{table_name}" ({columns}) VALUES ({placeholder}){conflict_clause}'
-        params = tuple(parameters_dict.values())
+        query, params = build_insert_sql(
+            table_name, parameters_dict, "update" if on_duplicate_update else "ignore", constraint_key, placeholder="%s"
+        )
 
         self._create_pool_connection()
-        conn = self.db_connection_pool.getconn()
+        conn = self._getconn(self.db_connection_pool)
         conn.autocommit = True
 
         cursor = conn.cursor()
@@ -675,6 +1532,8 @@ class PostgresConnectorPool:
         try:
             cursor.execute(query, params)
 
+            self._invalidate_cached_results(table_name=table_name)
+
             return UpsertResult(
                 rows_affected=cursor.rowcount,
                 status_message=cursor.statusmessage or "",
@@ -689,8 +1548,10 @@ class PostgresConnectorPool:
 
         finally:
             cursor.close()
-            self.db_connection_pool.putconn(conn)
+            self._putconn(self.db_connection_pool, conn)
 
+    @instrumented
+    @deadline_aware
     def insert_into_with_dict_update_returning(
             self,
             table_name: str,
@@ -708,26 +1569,16 @@ class PostgresConnectorPool:
         Returns:
             UpsertResult with accurate was_inserted/was_updated flags.
         """
-        placeholder = ", ".join(["%s"] * len(parameters_dict))
-        columns = '"' + '","'.join(parameters_dict.keys()) + '"'
-
         if constraint_key is None:
-            constraint_key = f"{table_name}_pkey"
+            constraint_key = self._primary_key(table_name)
 
-        set_clause = ", ".join(
-            f'"{key}" = EXCLUDED."{key}"' for key in parameters_dict.keys()
+        # xmax = 0 means insert, xmax > 0 means update
+        query, params = build_insert_sql(
+            table_name, parameters_dict, "update", constraint_key, placeholder="%s", returning="*, xmax"
         )
 
-        query = (
-            f'INSERT INTO "{table_name}" ({columns}) VALUES ({placeholder})'
-            f' ON CONFLICT ON CONSTRAINT {constraint_key}'
-            f' DO UPDATE SET {set_clause}'
-            f' RETURNING *, xmax'
-        )
-        params = tuple(parameters_dict.values())
-
         self._create_pool_connection()
-        conn = self.db_connection_pool.getconn()
+        conn = self._getconn(self.db_connection_pool)
         conn.autocommit = True
 
         cursor = conn.cursor(cursor_factory=RealDictCursor)
@@ -736,6 +1587,8 @@ class PostgresConnectorPool:
             cursor.execute(query, params)
             row = cursor.fetchone()
 
+            self._invalidate_cached_results(table_name=table_name)
+
             status = cursor.statusmessage or ""
 
             if row:
@@ -759,12 +1612,98 @@ class PostgresConnectorPool:
 
         finally:
             cursor.close()
-            self.db_connection_pool.putconn(conn)
+            self._putconn(self.db_connection_pool, conn)
+
+    @instrumented
+    @deadline_aware
+    def bulk_upsert(
+            self,
+            table_name: str,
+            rows: Iterable[Record],
+            conflict_columns: List[str],
+            update_columns: Optional[List[str]] = None,
+            columns: Optional[List[str]] = None,
+            schema_name: Optional[str] = None
+    ) -> BulkUpsertResult:
+        """
+        Upsert many rows in one transaction through a COPY-loaded staging table.
+
+        Rows are streamed with COPY (text format) into a temporary table, then
+        moved with one INSERT ... SELECT ... ON CONFLICT DO UPDATE. The last
+        occurrence of a duplicated conflict key wins; rows with a NULL
+        conflict column are all inserted. Inserted and updated rows are told
+        apart with xmax.
+
+        Args:
+            table_name: Name of the table.
+            rows: List or iterator of tuples or dicts.
+            conflict_columns: Columns of the unique index used for conflicts.
+            update_columns: Columns overwritten on conflict (default: all
+                            others; empty list: leave existing rows untouched).
+            columns: Column names of the row values (optional for dicts).
+            schema_name: Schema of the table (optional).
+
+        Returns:
+            BulkUpsertResult with rows_staged, inserted and updated counts.
+
+        Raises:
+            ValueError: If columns is missing or conflict_columns is invalid.
+            PoolError: If pool creation fails.
+            QueryExecutionError: If the load fails (nothing is written).
+
+        Example:
+            result = db.bulk_upsert(
+                "prices",
+                [{"ticker": "AAPL", "day": day, "close": 189.5}, ...],
+                conflict_columns=["ticker", "day"]
+            )
+            print(f"{result.inserted} inserted, {result.updated} updated")
+        """
+        columns = resolve_columns(rows, columns)
+        if columns is None:
+            return BulkUpsertResult()
+
+        create_staging_sql, upsert_sql = build_bulk_upsert_sql(
+            table_name, columns, conflict_columns, update_columns, schema_name
+        )
+        copy_sql = build_copy_from_stdin_sql(UPSERT_STAGING_TABLE, [*columns, UPSERT_ROW_NUMBER])
+
+        self._create_pool_connection()
+        conn = self._getconn(self.db_connection_pool)
+
+        original_autocommit = conn.autocommit
+        conn.autocommit = False
+
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute(create_staging_sql)
+            cursor.copy_expert(copy_sql, CopyTextReader(numbered_records_as_tuples(rows, columns)))
+            rows_staged = cursor.rowcount
+            cursor.execute(upsert_sql)
+            inserted, updated = cursor.fetchone()
+            conn.commit()
+
+            self._invalidate_cached_results(table_name=table_name)
+
+            return BulkUpsertResult(rows_staged=rows_staged, inserted=inserted, updated=updated)
+
+        except Exception as ex:
+            conn.rollback()
+            logger.error(f"bulk_upsert failed: {ex}")
+            raise self._convert_exception(ex, upsert_sql)
+
+        finally:
+            cursor.close()
+            conn.autocommit = original_autocommit
+            self._putconn(self.db_connection_pool, conn)
 
     # =========================================================================
     # Utility Methods
     # =========================================================================
 
+    @instrumented
+    @deadline_aware
     def get_postgresql_version(self) -> str:
         """Get the PostgreSQL server version."""
         result = self.fetch_all_as_dicts("SELECT version()")
@@ -772,18 +1711,69 @@ class PostgresConnectorPool:
         logger.info(f"Connected to: {version}")
         return version
 
+    @instrumented
+    @deadline_aware
     def table_exists(self, table_name: str, schema: str = "public") -> bool:
         """Check if a table exists."""
-        result = self.fetch_value(
-            """
-            SELECT EXISTS (
-                SELECT FROM information_schema.tables 
-                WHERE table_schema = %s AND table_name = %s
-            )
-            """,
-            (schema, table_name)
-        )
-        return bool(result)
+        return self.get_table_schema(table_name, schema) is not None
+
+    @instrumented
+    @deadline_aware
+    def get_table_schema(
+            self,
+            table_name: str,
+            schema_name: Optional[str] = None,
+            refresh: bool = False
+    ) -> Optional[TableSchema]:
+        """
+        Columns, type OIDs, primary key, unique constraints and partitions of a table.
+
+        Served from schema_cache; pg_catalog is queried on a miss, past the
+        cache TTL or with refresh=True.
+
+        Args:
+            table_name: Name of the table, view or partitioned table.
+            schema_name: Schema of the table (default: first match on the
+                         search_path).
+            refresh: If True, reload the metadata even if it is cached.
+
+        Returns:
+            TableSchema, or None if the table doesn't exist.
+
+        Example:
+            orders = db.get_table_schema("orders")
+            orders.primary_key, orders.column_types["total"]
+        """
+        if not refresh:
+            hit = self.schema_cache.get(table_name, schema_name)
+            if hit is not None:
+                return hit.value
+
+        self._create_pool_connection()
+        conn = self._getconn(self.db_connection_pool)
+        conn.autocommit = True
+
+        try:
+            return self._table_schema(conn, table_name, schema_name, refresh=True)
+
+        except Exception as ex:
+            logger.error(f"get_table_schema failed: {ex}")
+            raise self._convert_exception(ex, TABLE_SCHEMA_SQL)
+
+        finally:
+            self._putconn(self.db_connection_pool, conn)
+
+    def refresh_schema(self, table_name: Optional[str] = None) -> None:
+        """
+        Drop cached table metadata after DDL run outside this connector.
+
+        Args:
+            table_name: Table to drop (default: all tables).
+        """
+        if table_name is None:
+            self.schema_cache.clear()
+        else:
+            self.schema_cache.invalidate_tables([table_name])
 
 
 # =============================================================================
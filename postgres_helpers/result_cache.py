@@ -0,0 +1,331 @@
+"""
+Opt-in cache for the results of read queries.
+
+A ResultCache is shared by passing it to one or more connectors. Reads opt in
+per call with `cache_ttl=`; entries are keyed by the normalised SQL text and
+the parameters, tagged with the tables the query reads, and evicted in LRU
+order once the memory cap is reached.
+
+Writes made through the connector (execute_one_query, execute_many_query,
+the insert helpers, bulk loads) invalidate the entries tagged with the table
+they write. Other processes can invalidate entries with
+NOTIFY postgres_helpers_cache, '<table>[,<table>...]' once the async pool
+listens for it (see PostgresConnectorAsyncPool.listen_for_cache_invalidation).
+
+Cached values are shared between callers: treat them as read-only.
+
+Usage:
+    from postgres_helpers.result_cache import ResultCache
+    from postgres_helpers.postgres_async_pool import PostgresConnectorAsyncPool
+
+    cache = ResultCache(max_bytes=128 * 1024 ** 2, stale_ttl=30)
+    async with PostgresConnectorAsyncPool(result_cache=cache) as db:
+        rows = await db.fetch_all_as_dicts("SELECT * FROM currencies", cache_ttl=60)
+"""
+
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from postgres_helpers.results import ResultCacheStats
+
+DEFAULT_INVALIDATION_CHANNEL = "postgres_helpers_cache"
+
+_NAME = r'(?:"(?:[^"]|"")+"|[A-Za-z_][\w$]*)'
+_QUALIFIED_NAME = rf'{_NAME}(?:\s*\.\s*{_NAME})?'
+# Set-returning function calls (FROM unnest(...)) are not tables
+_READ_TABLES = re.compile(
+    rf'\b(?:FROM|JOIN)\s+(?:ONLY\s+)?({_QUALIFIED_NAME})(?![\w$."]|\s*\()',
+    re.IGNORECASE
+)
+_WRITTEN_TABLES = re.compile(
+    r'\b(?:INSERT\s+INTO|UPDATE|DELETE\s+FROM|MERGE\s+INTO|TRUNCATE(?:\s+TABLE)?'
+    r'|ALTER\s+TABLE(?:\s+IF\s+EXISTS)?|DROP\s+TABLE(?:\s+IF\s+EXISTS)?|COPY)'
+    rf'\s+(?:ONLY\s+)?({_QUALIFIED_NAME})',
+    re.IGNORECASE
+)
+# Words that follow UPDATE without being a table (ON CONFLICT DO UPDATE SET,
+# SELECT ... FOR UPDATE OF / NOWAIT / SKIP LOCKED)
+_NOT_TABLES = {"set", "of", "nowait", "skip"}
+_QUOTED_OR_SPACE = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")|\s+")
+
+
+def normalize_sql(sql_query: str) -> str:
+    """Collapse whitespace outside quoted literals and drop a trailing semicolon."""
+    normalized = _QUOTED_OR_SPACE.sub(lambda m: m.group(1) or " ", sql_query).strip()
+    return normalized.rstrip(";").rstrip()
+
+
+def _table_tag(name: str) -> str:
+    """Tag of a (possibly schema qualified, possibly quoted) table name."""
+    parts = re.findall(_NAME, name)
+    last = parts[-1] if parts else name
+    return last.strip('"').replace('""', '"').lower()
+
+
+def _tags(names: Iterable[str]) -> Set[str]:
+    return {tag for tag in map(_table_tag, names) if tag not in _NOT_TABLES}
+
+
+def extract_read_tables(sql_query: str) -> Set[str]:
+    """Tags of the tables a query reads (FROM and JOIN clauses)."""
+    return _tags(_READ_TABLES.findall(sql_query))
+
+
+def extract_written_tables(sql_query: str) -> Set[str]:
+    """Tags of the tables a statement writes or alters."""
+    return _tags(_WRITTEN_TABLES.findall(sql_query))
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+def make_cache_key(kind: str, sql_query: str, params: Optional[Tuple] = None) -> Hashable:
+    """Cache key of a query: result kind, normalised SQL and parameters."""
+    return kind, normalize_sql(sql_query), _freeze(tuple(params) if params else ())
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate memory used by a cached result, in bytes."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+
+    if isinstance(value, list):
+        size = sys.getsizeof(value)
+        if not value:
+            return size
+        # Measure a sample of rows and scale it to the whole list
+        sample = value[:100]
+        sample_size = 0
+        for row in sample:
+            sample_size += sys.getsizeof(row)
+            if isinstance(row, dict):
+                sample_size += sum(sys.getsizeof(item) for item in row.values())
+            elif not isinstance(row, (str, bytes)) and hasattr(row, "__iter__"):
+                # tuple or Record; the list of an array value holds scalars
+                sample_size += sum(sys.getsizeof(item) for item in row)
+        return size + sample_size * len(value) // len(sample)
+
+    return sys.getsizeof(value)
+
+
+@dataclass
+class CacheHit:
+    """A value found in the cache. is_stale is True past its TTL."""
+    value: Any
+    is_stale: bool = False
+
+
+@dataclass
+class _Entry:
+    value: Any
+    size: int
+    expires_at: float
+    stale_until: float
+    tags: Set[str] = field(default_factory=set)
+
+
+class ResultCache:
+    """
+    LRU cache of query results with TTL, memory cap and table tags.
+
+    Args:
+        max_bytes: Approximate memory cap over all entries (default: 64 MiB).
+        max_entries: Maximum number of entries (default: 10000).
+        stale_ttl: Seconds an expired entry may still be served while it is
+                   refreshed in the background (stale-while-revalidate).
+                   Only the async pool refreshes in the background; the
+                   other connectors treat expired entries as misses.
+                   Default: 0 (disabled).
+
+    Example:
+        cache = ResultCache(max_bytes=32 * 1024 ** 2, stale_ttl=10)
+        db = PostgresConnectorAsyncPool(result_cache=cache)
+        rates = await db.fetch_all_as_dicts("SELECT * FROM fx_rates", cache_ttl=30)
+        cache.invalidate_tables(["fx_rates"])
+    """
+
+    def __init__(
+            self,
+            max_bytes: int = 64 * 1024 ** 2,
+            max_entries: int = 10_000,
+            stale_ttl: float = 0.0
+    ):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.stale_ttl = stale_ttl
+
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._keys_by_tag: Dict[str, Set[Hashable]] = {}
+        self._size = 0
+        self._version = 0
+        self._cleared_version = 0
+        self._tag_versions: Dict[str, int] = {}
+        self._refreshing: Set[Hashable] = set()
+        self._stats = ResultCacheStats()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def version(self) -> int:
+        """Invalidation counter. Pass it to set() to drop results loaded before an invalidation."""
+        return self._version
+
+    def get(self, key: Hashable, allow_stale: bool = True) -> Optional[CacheHit]:
+        """
+        Look up a key.
+
+        Returns:
+            CacheHit, or None on a miss. Expired entries within stale_ttl are
+            returned with is_stale=True when allow_stale is set.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now < entry.expires_at:
+                    self._entries.move_to_end(key)
+                    self._stats.hits += 1
+                    return CacheHit(entry.value)
+                if allow_stale and now < entry.stale_until:
+                    self._entries.move_to_end(key)
+                    self._stats.stale_hits += 1
+                    return CacheHit(entry.value, is_stale=True)
+                self._remove(key)
+            self._stats.misses += 1
+            return None
+
+    def set(
+            self,
+            key: Hashable,
+            value: Any,
+            ttl: float,
+            tags: Iterable[str] = (),
+            loaded_at_version: Optional[int] = None
+    ) -> None:
+        """
+        Store a value for ttl seconds, tagged with table names.
+
+        Args:
+            key: Key from make_cache_key().
+            value: Result to cache.
+            ttl: Seconds the value is fresh.
+            tags: Table names the value depends on.
+            loaded_at_version: version() read before loading the value. The
+                               value is dropped if one of its tags has been
+                               invalidated since.
+        """
+        tags = {_table_tag(tag) for tag in tags}
+        size = estimate_size(value)
+        now = time.monotonic()
+
+        with self._lock:
+            if loaded_at_version is not None and (
+                    loaded_at_version < self._cleared_version
+                    or any(self._tag_versions.get(tag, 0) > loaded_at_version for tag in tags)
+            ):
+                return
+            if size > self.max_bytes:
+                return
+
+            self._remove(key)
+            self._entries[key] = _Entry(value, size, now + ttl, now + ttl + self.stale_ttl, tags)
+            self._size += size
+            for tag in tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+
+            while self._entries and (self._size > self.max_bytes or len(self._entries) > self.max_entries):
+                self._remove(next(iter(self._entries)))
+                self._stats.evictions += 1
+
+    def invalidate_tables(self, tables: Iterable[str]) -> int:
+        """
+        Drop every entry tagged with one of the tables.
+
+        Returns:
+            Number of entries removed.
+        """
+        removed = 0
+        with self._lock:
+            self._version += 1
+            for tag in {_table_tag(table) for table in tables}:
+                self._tag_versions[tag] = self._version
+                for key in list(self._keys_by_tag.get(tag, ())):
+                    self._remove(key)
+                    removed += 1
+            self._stats.invalidations += removed
+        return removed
+
+    def invalidate_for_sql(self, sql_query: str) -> int:
+        """Drop the entries of the tables a write statement touches."""
+        tables = extract_written_tables(sql_query)
+        return self.invalidate_tables(tables) if tables else 0
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._version += 1
+            self._cleared_version = self._version
+            self._stats.invalidations += len(self._entries)
+            self._entries.clear()
+            self._keys_by_tag.clear()
+            self._size = 0
+
+    def start_refresh(self, key: Hashable) -> bool:
+        """Claim the background refresh of a stale key. False if already claimed."""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def end_refresh(self, key: Hashable) -> None:
+        """Release a refresh claimed with start_refresh()."""
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def get_stats(self) -> ResultCacheStats:
+        """Get a snapshot of the cache counters."""
+        with self._lock:
+            return ResultCacheStats(
+                hits=self._stats.hits,
+                stale_hits=self._stats.stale_hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                invalidations=self._stats.invalidations,
+                entries=len(self._entries),
+                size_bytes=self._size
+            )
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._size -= entry.size
+        for tag in entry.tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+
+def parse_invalidation_payload(payload: str) -> List[str]:
+    """Table names of a NOTIFY payload ("users" or "users,orders"). "*" means all."""
+    return [name.strip() for name in payload.split(",") if name.strip()]
@@ -159,6 +159,462 @@ class UpsertResult:
     # This is set by the connector if it can determine it
 
 
+@dataclass
+class InsertManyResult:
+    """
+    Result of insert_many_with_dict().
+
+    Attributes:
+        rows_affected: Rows inserted (skipped duplicates are not counted).
+        total_rows: Dicts received.
+        statements: INSERT statements sent (one per distinct column set).
+        success: True if no error occurred.
+        returning_rows: With returning=, one entry per input dict in input
+                        order: the returned row, or None if it was skipped
+                        as a duplicate. None when returning wasn't requested.
+
+    Example:
+        result = await db.insert_many_with_dict("users", users, returning=["id"])
+        ids = [row["id"] if row else None for row in result.returning_rows]
+    """
+    rows_affected: int = 0
+    total_rows: int = 0
+    statements: int = 0
+    success: bool = True
+    returning_rows: Optional[List[Optional[Dict[str, Any]]]] = None
+
+    @property
+    def duplicates(self) -> int:
+        """Rows skipped because of a conflict."""
+        return self.total_rows - self.rows_affected
+
+
+@dataclass
+class BulkUpsertResult:
+    """
+    Result of bulk_upsert().
+
+    Rows whose conflict key appears more than once in the batch are upserted
+    once, with the values of the last occurrence, so inserted + updated can
+    be lower than rows_staged.
+
+    Attributes:
+        rows_staged: Rows copied into the staging table.
+        inserted: New rows inserted into the table.
+        updated: Existing rows updated.
+        success: True if no error occurred.
+
+    Example:
+        result = db.bulk_upsert("prices", rows, conflict_columns=["ticker", "day"])
+        print(f"{result.inserted} inserted, {result.updated} updated")
+    """
+    rows_staged: int = 0
+    inserted: int = 0
+    updated: int = 0
+    success: bool = True
+
+    @property
+    def rows_affected(self) -> int:
+        """Rows inserted or updated."""
+        return self.inserted + self.updated
+
+
+@dataclass
+class BatchItemResult:
+    """
+    Outcome of one query of a run_many() batch.
+
+    Attributes:
+        index: Position of the query in the input list.
+        success: True if the query ran without errors.
+        value: What the query's method returned (QueryResult, list of dicts,
+               DataFrame, dict or value), None on failure.
+        error: The exception raised by the query, None on success.
+        elapsed: Seconds spent on this query, including the wait for a
+                 connection.
+    """
+    index: int
+    success: bool = True
+    value: Any = None
+    error: Optional[Exception] = None
+    elapsed: float = 0.0
+
+
+@dataclass
+class BatchResult:
+    """
+    Result of PostgresConnectorAsyncPool.run_many().
+
+    A failing query does not stop the others: its error is reported on its
+    own item.
+
+    Attributes:
+        items: One BatchItemResult per query, in input order.
+        wall_time: Seconds from the start of the batch to the end of its
+                   last query.
+        max_concurrency: Limit of queries in flight at once.
+        concurrency_achieved: Highest number of queries actually in flight.
+
+    Example:
+        batch = await db.run_many(jobs, max_concurrency=10)
+        for item in batch.items:
+            if not item.success:
+                print(f"Query {item.index} failed: {item.error}")
+        print(f"{batch.succeeded}/{len(batch.items)} in {batch.wall_time:.2f}s")
+    """
+    items: List[BatchItemResult] = field(default_factory=list)
+    wall_time: float = 0.0
+    max_concurrency: int = 0
+    concurrency_achieved: int = 0
+
+    @property
+    def values(self) -> List[Any]:
+        """Values of all items in input order (None for failed ones)."""
+        return [item.value for item in self.items]
+
+    @property
+    def succeeded(self) -> int:
+        """Number of queries that succeeded."""
+        return sum(1 for item in self.items if item.success)
+
+    @property
+    def failed(self) -> int:
+        """Number of queries that failed."""
+        return len(self.items) - self.succeeded
+
+
+@dataclass
+class StatementCacheStats:
+    """
+    Counters of the prepared statement cache of an async pool connector.
+
+    Attributes:
+        hits: Statements found already prepared on the connection.
+        misses: Statements that had to be parsed and prepared.
+        evictions: Statements dropped to respect the cache capacity.
+        reprepares: Statements prepared again after a schema change
+                    invalidated them (or on each new checkout, with an
+                    asyncpg version the cache can't rebind statements of).
+        prepares_by_name: Number of prepares of each statement registered
+                          with prepare(), keyed by its name. Once every
+                          connection is warm these should stop growing.
+        cached_statements: Statements currently cached over all connections.
+        capacity: Configured capacity per connection.
+
+    Example:
+        stats = db.get_statement_cache_stats()
+        print(f"Hit ratio: {stats.hit_ratio:.1%}")
+    """
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    reprepares: int = 0
+    prepares_by_name: Dict[str, int] = field(default_factory=dict)
+    cached_statements: int = 0
+    capacity: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass
+class ResultCacheStats:
+    """
+    Counters of a ResultCache.
+
+    Attributes:
+        hits: Lookups served with a fresh entry.
+        stale_hits: Lookups served with an expired entry while it was
+                    refreshed in the background.
+        misses: Lookups that had to run the query.
+        evictions: Entries dropped to respect the memory or entry cap.
+        invalidations: Entries dropped because a table they read was written.
+        entries: Entries currently cached.
+        size_bytes: Approximate memory used by the cached results.
+    """
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+
+
+@dataclass
+class SchemaCacheStats:
+    """
+    Counters of a SchemaCache.
+
+    Attributes:
+        hits: Lookups served from the cache.
+        misses: Lookups that had to query pg_catalog.
+        invalidations: Entries dropped by DDL, refresh or invalidate calls.
+        entries: Tables currently cached (missing tables included).
+    """
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    entries: int = 0
+
+
+@dataclass
+class ColumnSchema:
+    """
+    A column of a table, from pg_attribute.
+
+    Attributes:
+        name: Column name.
+        sql_type: Declared type (format_type output, e.g. "numeric(10,2)").
+        type_oid: Type OID (see postgres_helpers.arrow for the built-in ones).
+        not_null: Whether the column has a NOT NULL constraint.
+        position: Column number (attnum), starting at 1.
+    """
+    name: str
+    sql_type: str
+    type_oid: int
+    not_null: bool = False
+    position: int = 0
+
+
+@dataclass
+class TableSchema:
+    """
+    Metadata of a table, view or partitioned table, from pg_catalog.
+
+    Attributes:
+        schema_name: Schema of the table.
+        table_name: Name of the table.
+        oid: Table OID.
+        kind: pg_class.relkind: "r" table, "p" partitioned table, "v" view,
+              "m" materialized view, "f" foreign table.
+        columns: Columns by name, in column order.
+        primary_key: Name of the primary key constraint, if any.
+        primary_key_columns: Columns of the primary key, in key order.
+        unique_constraints: Columns of each unique constraint, by name.
+        partitions: Qualified names of the partitions (partitioned tables).
+
+    Example:
+        schema = await db.get_table_schema("orders")
+        schema.column_types          # {"id": "bigint", "total": "numeric(10,2)", ...}
+        schema.constraint_for(["customer_id", "ref"])
+    """
+    schema_name: str
+    table_name: str
+    oid: int
+    kind: str = "r"
+    columns: Dict[str, ColumnSchema] = field(default_factory=dict)
+    primary_key: Optional[str] = None
+    primary_key_columns: List[str] = field(default_factory=list)
+    unique_constraints: Dict[str, List[str]] = field(default_factory=dict)
+    partitions: List[str] = field(default_factory=list)
+
+    @property
+    def column_types(self) -> Dict[str, str]:
+        """SQL type of each column."""
+        return {name: column.sql_type for name, column in self.columns.items()}
+
+    @property
+    def is_partitioned(self) -> bool:
+        return self.kind == "p"
+
+    @property
+    def unique_keys(self) -> List[List[str]]:
+        """Columns of the primary key, then of each unique constraint."""
+        keys = [self.primary_key_columns] if self.primary_key_columns else []
+        return keys + list(self.unique_constraints.values())
+
+    def constraint_for(self, columns: List[str]) -> Optional[str]:
+        """Name of the primary key or unique constraint on exactly these columns."""
+        wanted = set(columns)
+        if self.primary_key is not None and set(self.primary_key_columns) == wanted:
+            return self.primary_key
+        for name, constraint_columns in self.unique_constraints.items():
+            if set(constraint_columns) == wanted:
+                return name
+        return None
+
+
+@dataclass
+class ReplicaStatus:
+    """
+    State of a read replica of a pooled connector.
+
+    Attributes:
+        index: Position of the replica in replica_dsns.
+        host: Host of the replica.
+        lag_seconds: Replay lag at the last check (None if never checked or
+                     unreachable).
+        in_rotation: False while the replica is skipped for reads.
+    """
+    index: int
+    host: str = ""
+    lag_seconds: Optional[float] = None
+    in_rotation: bool = True
+
+
+@dataclass
+class ExportResult:
+    """
+    Outcome of export_to_parquet().
+
+    Attributes:
+        path: File written, or root directory of the partitioned dataset.
+        rows: Rows exported.
+        row_groups: Row groups written, all files together.
+        files: Parquet files written.
+        bytes_written: Total size of the files.
+        elapsed_seconds: Duration of the export, query included.
+        peak_rss_bytes: Highest resident set size of the process seen during
+                        the export, sampled after each batch (None where it
+                        can't be read).
+    """
+    path: str
+    rows: int = 0
+    row_groups: int = 0
+    files: List[str] = field(default_factory=list)
+    bytes_written: int = 0
+    elapsed_seconds: float = 0.0
+    peak_rss_bytes: Optional[int] = None
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+@dataclass
+class Notification:
+    """
+    A NOTIFY received by listen().
+
+    Attributes:
+        channel: Channel it was sent on.
+        payload: Payload text ("" when none was given).
+        pid: Backend PID of the session that sent it.
+    """
+    channel: str
+    payload: str = ""
+    pid: int = 0
+
+
+@dataclass
+class HistogramSnapshot:
+    """
+    Summary of a metrics histogram.
+
+    Percentiles are estimated from buckets spaced by a factor of 2 (durations)
+    or 4 (rows and bytes); they are never below the true value.
+
+    Attributes:
+        count: Values recorded.
+        total: Sum of the values.
+        min: Smallest value.
+        max: Largest value.
+        p50: Median.
+        p90: 90th percentile.
+        p99: 99th percentile.
+    """
+    count: int = 0
+    total: float = 0.0
+    min: float = 0.0
+    max: float = 0.0
+    p50: float = 0.0
+    p90: float = 0.0
+    p99: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        """Average of the values."""
+        return self.total / self.count if self.count else 0.0
+
+
+@dataclass
+class MethodMetrics:
+    """
+    Metrics of one connector method.
+
+    Attributes:
+        calls: Calls recorded (failed ones included).
+        errors: Calls that raised.
+        acquire_wait: Seconds spent getting a connection.
+        execution: Seconds spent in the call once it had a connection. For
+                   transaction() and fetch_iter() this includes the time the
+                   caller held the transaction or the iterator.
+        rows: Rows returned, streamed or affected per call.
+        bytes: Approximate size of the decoded result per call.
+    """
+    calls: int = 0
+    errors: int = 0
+    acquire_wait: HistogramSnapshot = field(default_factory=HistogramSnapshot)
+    execution: HistogramSnapshot = field(default_factory=HistogramSnapshot)
+    rows: HistogramSnapshot = field(default_factory=HistogramSnapshot)
+    bytes: HistogramSnapshot = field(default_factory=HistogramSnapshot)
+
+
+@dataclass
+class MetricsSnapshot:
+    """
+    Result of get_metrics().
+
+    Attributes:
+        methods: MethodMetrics keyed by method name.
+        window_seconds: Seconds covered, since the connector was created
+                        or since the last get_metrics(reset=True).
+        pool_size: Connections open in the pool (for single connectors, 1
+                   when connected).
+        pool_in_use: Connections checked out (0 for single connectors).
+        pool_max: Configured maximum size of the pool (0 for single
+                  connectors).
+
+    Example:
+        metrics = db.get_metrics(reset=True)
+        for name, method in metrics.methods.items():
+            print(name, method.calls, method.acquire_wait.p99, method.execution.p99)
+        print(f"Pool saturation: {metrics.pool_saturation:.0%}")
+    """
+    methods: Dict[str, MethodMetrics] = field(default_factory=dict)
+    window_seconds: float = 0.0
+    pool_size: int = 0
+    pool_in_use: int = 0
+    pool_max: int = 0
+
+    @property
+    def pool_saturation(self) -> float:
+        """Share of the maximum pool size checked out (1.0: callers will wait)."""
+        return self.pool_in_use / self.pool_max if self.pool_max else 0.0
+
+    @property
+    def calls(self) -> int:
+        """Calls over all methods."""
+        return sum(method.calls for method in self.methods.values())
+
+
+@dataclass
+class WarmupReport:
+    """
+    Time spent warming up a pool (see postgres_helpers.warmup.WarmupSpec).
+
+    Connections are warmed concurrently, so each step reports its slowest
+    connection.
+
+    Attributes:
+        connections: Connections warmed while the pool was created.
+        total_seconds: Wall time of the pool creation, warm-up included.
+        steps: Seconds per step: "connect" (session settings included),
+               "codecs" and "prepare".
+
+    Example:
+        async with PostgresConnectorAsyncPool(warmup=spec) as db:
+            print(db.warmup_report.steps)  # {"connect": 0.021, "codecs": 0.004, "prepare": 0.012}
+    """
+    connections: int = 0
+    total_seconds: float = 0.0
+    steps: Dict[str, float] = field(default_factory=dict)
+
+
 @dataclass
 class ConnectionInfo:
     """
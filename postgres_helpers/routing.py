@@ -0,0 +1,154 @@
+"""
+Read routing between a primary and its hot standby replicas.
+
+The pooled connectors keep one pool per node. Reads (fetch_* methods) go to
+a replica chosen by a ReplicaRouter, writes and transactions go to the
+primary. Replicas whose replay lag exceeds max_replica_lag, or that can't
+be reached (at startup too), are taken out of rotation until they catch up;
+with no replica in rotation, reads fall back to the primary.
+
+Usage:
+    from postgres_helpers.postgres_async_pool import PostgresConnectorAsyncPool
+
+    db = PostgresConnectorAsyncPool(
+        replica_dsns=["postgresql://app@standby-1/app", "postgresql://app@standby-2/app"],
+        replica_routing="least_busy",
+        max_replica_lag=5.0
+    )
+"""
+
+import itertools
+import logging
+import re
+import time
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence
+from urllib.parse import urlparse
+
+from postgres_helpers.result_cache import extract_written_tables
+from postgres_helpers.results import ReplicaStatus
+
+logger = logging.getLogger(f"postgres_helpers:{Path(__file__).name}")
+
+ROUTING_STRATEGIES = ("round_robin", "least_busy")
+
+# Row locks can't be taken on a standby
+_LOCKING_CLAUSE = re.compile(r"\bFOR\s+(?:NO\s+KEY\s+UPDATE|UPDATE|KEY\s+SHARE|SHARE)\b", re.IGNORECASE)
+
+# Seconds since the last replayed transaction, 0 when the standby streams
+# from the primary and has replayed everything it received (an idle primary
+# is not lag). Without a WAL receiver (disconnected, or replaying from an
+# archive) nothing more is coming in, so the replay timestamp is the lag.
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn()
+             AND EXISTS (SELECT 1 FROM pg_stat_wal_receiver) THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END::float8
+"""
+
+
+def is_write_query(sql_query: str) -> bool:
+    """True if a query passed to a fetch method writes (INSERT ... RETURNING, ...)."""
+    return bool(extract_written_tables(sql_query)) or bool(_LOCKING_CLAUSE.search(sql_query))
+
+
+def _dsn_host(dsn: str) -> str:
+    if "://" in dsn:
+        return urlparse(dsn).hostname or ""
+    for part in dsn.split():
+        if part.startswith("host="):
+            return part[len("host="):]
+    return ""
+
+
+class ReplicaRouter:
+    """
+    Choice of the replica serving the next read.
+
+    Args:
+        dsns: Connection strings of the replicas.
+        strategy: "round_robin" or "least_busy" (fewest connections in use).
+        max_lag: Replay lag in seconds above which a replica leaves the
+                 rotation. None disables the lag check; unreachable replicas
+                 are still checked until they are back.
+        check_interval: Seconds between two lag checks.
+
+    Raises:
+        ValueError: If strategy is unknown.
+    """
+
+    def __init__(
+            self,
+            dsns: Sequence[str],
+            strategy: str = "round_robin",
+            max_lag: Optional[float] = None,
+            check_interval: float = 5.0
+    ):
+        if strategy not in ROUTING_STRATEGIES:
+            raise ValueError(f"Unknown replica_routing {strategy!r}, expected one of {ROUTING_STRATEGIES}")
+
+        self.dsns = list(dsns)
+        self.strategy = strategy
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+
+        self._lags: List[Optional[float]] = [None] * len(self.dsns)
+        self._in_rotation: List[bool] = [True] * len(self.dsns)
+        self._turns = itertools.count()
+        self._checked_at = float("-inf")
+
+    def __len__(self) -> int:
+        return len(self.dsns)
+
+    def due_for_check(self) -> bool:
+        """True when check_interval has passed and the lag check is enabled or a replica is out of rotation."""
+        if not self.dsns or (self.max_lag is None and all(self._in_rotation)):
+            return False
+        return time.monotonic() - self._checked_at >= self.check_interval
+
+    def start_check(self) -> None:
+        """Mark a lag check as started, so concurrent reads don't repeat it."""
+        self._checked_at = time.monotonic()
+
+    def record_lag(self, index: int, lag: Optional[float]) -> None:
+        """
+        Store the measured lag of a replica (None if it couldn't be reached)
+        and update its place in the rotation.
+        """
+        self._lags[index] = lag
+        healthy = lag is not None and (self.max_lag is None or lag <= self.max_lag)
+
+        if healthy != self._in_rotation[index]:
+            host = _dsn_host(self.dsns[index])
+            if healthy:
+                logger.info(f"Replica {index} ({host}) back in rotation, lag {lag:.1f}s")
+            else:
+                reason = "unreachable" if lag is None else f"lag {lag:.1f}s > {self.max_lag}s"
+                logger.warning(f"Replica {index} ({host}) dropped from rotation: {reason}")
+        self._in_rotation[index] = healthy
+
+    def choose(self, busy: Callable[[int], int]) -> Optional[int]:
+        """
+        Index of the replica for the next read, or None to use the primary.
+
+        Args:
+            busy: Number of connections in use on replica `index`.
+        """
+        candidates = [index for index, ok in enumerate(self._in_rotation) if ok]
+        if not candidates:
+            return None
+
+        start = next(self._turns) % len(candidates)
+        rotated = candidates[start:] + candidates[:start]
+        if self.strategy == "least_busy":
+            return min(rotated, key=busy)
+        return rotated[0]
+
+    def status(self) -> List[ReplicaStatus]:
+        """Lag and rotation state of every replica."""
+        return [
+            ReplicaStatus(index=index, host=_dsn_host(dsn), lag_seconds=lag, in_rotation=ok)
+            for index, (dsn, lag, ok) in enumerate(zip(self.dsns, self._lags, self._in_rotation))
+        ]
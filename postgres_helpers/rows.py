@@ -0,0 +1,112 @@
+"""
+Row formats of the fetch methods.
+
+fetch_all_as_dicts(), fetch_one_as_dict() and fetch_iter() return one dict
+per row by default. A dict holds its own hash table for every row, which for
+large results takes several times the memory of the values. row_format=
+selects a more compact shape:
+
+- "dict" (default): {column: value},
+- "tuple": plain tuples, in column order,
+- "record": the driver's row as is (asyncpg.Record, with index and key
+  access; async connectors only),
+- "row": instances of a tuple subclass generated for the column names, with
+  index access (row[0]) and attribute access (row.name), and _asdict().
+
+Row classes are built once per column signature and cached. Columns whose
+name is not a valid attribute (keywords, duplicates, names starting with an
+underscore) are reachable by index only; as with namedtuple, columns named
+count or index hide the tuple methods.
+
+Usage:
+    users = await db.fetch_all_as_dicts("SELECT id, name FROM users", row_format="row")
+    users[0].name, users[0][0]
+"""
+
+import functools
+import keyword
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+ROW_FORMATS = ("dict", "tuple", "record", "row")
+
+# Formats the sync (psycopg2) connectors support
+SYNC_ROW_FORMATS = ("dict", "tuple", "row")
+
+Columns = Tuple[str, ...]
+
+
+def check_row_format(row_format: str, formats: Sequence[str] = ROW_FORMATS) -> None:
+    if row_format not in formats:
+        raise ValueError(f"row_format must be one of {tuple(formats)}, got {row_format!r}")
+
+
+def _asdict(self) -> Dict[str, Any]:
+    """The row as {column: value}."""
+    return dict(zip(self._fields, self))
+
+
+def _repr(self) -> str:
+    values = ", ".join(f"{name}={value!r}" for name, value in zip(self._fields, self))
+    return f"Row({values})"
+
+
+def _reduce(self):
+    # Generated classes can't be found by name: pickle as (columns, values)
+    return _rebuild, (self._fields, tuple(self))
+
+
+def _rebuild(columns: Columns, values: tuple) -> tuple:
+    return row_class(columns)(values)
+
+
+@functools.lru_cache(maxsize=1024)
+def row_class(columns: Columns) -> type:
+    """
+    Tuple subclass for rows with these column names (cached per signature).
+
+    Instances hold only the values: __slots__ is empty, the column names live
+    on the class.
+    """
+    namespace: Dict[str, Any] = {
+        "__slots__": (),
+        "_fields": columns,
+        "_asdict": _asdict,
+        "__repr__": _repr,
+        "__reduce__": _reduce,
+    }
+    seen = set()
+    for index, name in enumerate(columns):
+        if name.isidentifier() and not keyword.iskeyword(name) and not name.startswith("_") and name not in seen:
+            namespace[name] = property(itemgetter(index), doc=f"Column {index}: {name}")
+        seen.add(name)
+    return type("Row", (tuple,), namespace)
+
+
+def row_converter(columns: Iterable[str], row_format: str) -> Callable[[Any], Any]:
+    """Function turning one driver row (asyncpg Record, psycopg2 tuple) into row_format."""
+    columns = tuple(columns)
+    if row_format == "dict":
+        return lambda row: dict(zip(columns, row))
+    if row_format == "tuple":
+        return tuple
+    if row_format == "row":
+        return row_class(columns)
+    return lambda row: row
+
+
+def convert_rows(rows: Sequence[Any], columns: Iterable[str], row_format: str) -> List[Any]:
+    """Driver rows as a list of row_format rows."""
+    if row_format == "record":
+        return list(rows)
+    return list(map(row_converter(columns, row_format), rows))
+
+
+def record_columns(records: Sequence[Any]) -> Columns:
+    """Column names of asyncpg Records (empty when there are no records)."""
+    return tuple(records[0].keys()) if records else ()
+
+
+def cursor_columns(cursor: Any) -> Columns:
+    """Column names of the result of a psycopg2 cursor."""
+    return tuple(column.name for column in cursor.description or ())
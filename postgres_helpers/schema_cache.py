@@ -0,0 +1,249 @@
+"""
+Cache of table metadata read from pg_catalog.
+
+Every connector keeps a SchemaCache (pass one to share it between
+connectors). The first lookup of a table loads its columns and type OIDs,
+primary key, unique constraints and partitions in one query. Later lookups
+are served from memory until the TTL expires. Tables that don't exist are
+cached too, so table_exists() is also answered from memory.
+
+Users of the metadata:
+
+- table_exists(),
+- the upsert helpers: without constraint_key, the table's actual primary
+  key constraint instead of the "{table_name}_pkey" guess,
+- insert_many_with_dict(): the column types its unnest() arrays are cast to.
+
+DDL run through the connector's execute_one_query()/execute_many_query()
+(CREATE, ALTER, DROP) drops the entries of the tables it names, or every
+entry when the statement names none (DROP INDEX, DROP SCHEMA, ...). DDL run
+elsewhere is picked up when the TTL expires, or at once with
+refresh_schema() on the connector.
+
+Usage:
+    from postgres_helpers.schema_cache import SchemaCache
+
+    schemas = SchemaCache(ttl=600)
+    async with PostgresConnectorAsyncPool(schema_cache=schemas) as db:
+        orders = await db.get_table_schema("orders")
+        print(orders.primary_key, orders.column_types)
+"""
+
+import re
+import threading
+import time
+from typing import Any, Dict, Hashable, Iterable, Optional, Sequence, Set
+
+from postgres_helpers.result_cache import CacheHit, _QUALIFIED_NAME, _table_tag
+from postgres_helpers.results import ColumnSchema, SchemaCacheStats, TableSchema
+
+# One row per table, column, constraint and partition:
+# (item, name, detail, kind, type_oid, columns, position)
+TABLE_SCHEMA_SQL = """
+    WITH t AS (
+        SELECT c.oid, c.relkind, c.relname, n.nspname
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE c.oid = to_regclass({placeholder}) AND c.relkind IN ('r', 'p', 'v', 'm', 'f')
+    )
+    SELECT 'table', t.relname::text, t.nspname::text, t.relkind::text, t.oid::int8, NULL::text[], 0
+    FROM t
+    UNION ALL
+    SELECT 'column', a.attname::text, format_type(a.atttypid, a.atttypmod), a.attnotnull::text,
+           a.atttypid::int8, NULL::text[], a.attnum::int
+    FROM t
+    JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum > 0 AND NOT a.attisdropped
+    UNION ALL
+    SELECT 'constraint', con.conname::text, NULL, con.contype::text, NULL,
+           ARRAY(
+               SELECT att.attname::text
+               FROM unnest(con.conkey) WITH ORDINALITY AS k(attnum, ord)
+               JOIN pg_attribute att ON att.attrelid = con.conrelid AND att.attnum = k.attnum
+               ORDER BY k.ord
+           ), 0
+    FROM t
+    JOIN pg_constraint con ON con.conrelid = t.oid AND con.contype IN ('p', 'u')
+    UNION ALL
+    SELECT 'partition', child.relname::text, cn.nspname::text, child.relkind::text, child.oid::int8, NULL::text[], 0
+    FROM t
+    JOIN pg_inherits i ON i.inhparent = t.oid
+    JOIN pg_class child ON child.oid = i.inhrelid
+    JOIN pg_namespace cn ON cn.oid = child.relnamespace
+"""
+
+_DDL = re.compile(r"(?:^|;)\s*(?:CREATE|ALTER|DROP)\b", re.IGNORECASE)
+_DDL_TABLES = re.compile(
+    r"\b(?:TABLE|VIEW|PARTITION\s+OF|ON|ATTACH\s+PARTITION|DETACH\s+PARTITION|RENAME\s+TO)"
+    rf"\s+(?:IF\s+(?:NOT\s+)?EXISTS\s+)?(?:ONLY\s+)?({_QUALIFIED_NAME}(?:\s*,\s*{_QUALIFIED_NAME})*)",
+    re.IGNORECASE
+)
+
+
+def extract_ddl_tables(sql_query: str) -> Optional[Set[str]]:
+    """
+    Tags of the tables a DDL statement names.
+
+    Returns:
+        None if the statement is not DDL, an empty set for DDL naming no
+        table (which can affect any table).
+    """
+    if not _DDL.search(sql_query):
+        return None
+    tables = set()
+    for names in _DDL_TABLES.findall(sql_query):
+        tables.update(_table_tag(name) for name in re.findall(_QUALIFIED_NAME, names))
+    return tables
+
+
+def parse_table_schema(rows: Sequence[Sequence[Any]]) -> Optional[TableSchema]:
+    """TableSchema from the rows of TABLE_SCHEMA_SQL (None when the table doesn't exist)."""
+    schema = None
+    columns = []
+    for item, name, detail, kind, oid, constraint_columns, position in rows:
+        if item == "table":
+            schema = TableSchema(schema_name=detail, table_name=name, oid=oid, kind=kind)
+    if schema is None:
+        return None
+
+    for item, name, detail, kind, oid, constraint_columns, position in rows:
+        if item == "column":
+            columns.append(ColumnSchema(name, detail, oid, kind == "true", position))
+        elif item == "constraint" and kind == "p":
+            schema.primary_key = name
+            schema.primary_key_columns = list(constraint_columns)
+        elif item == "constraint":
+            schema.unique_constraints[name] = list(constraint_columns)
+        elif item == "partition":
+            schema.partitions.append(f"{detail}.{name}")
+    schema.columns = {column.name: column for column in sorted(columns, key=lambda column: column.position)}
+    schema.partitions.sort()
+    return schema
+
+
+class SchemaCache:
+    """
+    Table metadata by (schema, table), with a TTL.
+
+    Thread-safe; share one between connectors to the same database.
+
+    Args:
+        ttl: Seconds an entry is used before it is loaded again
+             (default: 300). None keeps entries until invalidated.
+    """
+
+    def __init__(self, ttl: Optional[float] = 300.0):
+        self.ttl = ttl
+
+        self._entries: Dict[Hashable, Any] = {}  # key -> (schema or None, expires_at)
+        self._version = 0
+        self._cleared_version = 0
+        self._tag_versions: Dict[str, int] = {}
+        self._stats = SchemaCacheStats()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(table_name: str, schema_name: Optional[str] = None) -> Hashable:
+        return schema_name, table_name
+
+    def version(self) -> int:
+        """Invalidation counter. Pass it to set() to drop metadata loaded before an invalidation."""
+        return self._version
+
+    def get(self, table_name: str, schema_name: Optional[str] = None) -> Optional[CacheHit]:
+        """
+        Look up a table.
+
+        Returns:
+            CacheHit whose value is the TableSchema, or None for a table
+            known not to exist; None on a miss.
+        """
+        key = self.key(table_name, schema_name)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] is None or now < entry[1]:
+                    self._stats.hits += 1
+                    return CacheHit(entry[0])
+                del self._entries[key]
+            self._stats.misses += 1
+            return None
+
+    def set(
+            self,
+            table_name: str,
+            schema_name: Optional[str],
+            schema: Optional[TableSchema],
+            loaded_at_version: Optional[int] = None
+    ) -> None:
+        """
+        Store the metadata of a table (None: the table doesn't exist).
+
+        Args:
+            loaded_at_version: version() read before loading. The metadata is
+                               dropped if the table was invalidated since.
+        """
+        with self._lock:
+            if loaded_at_version is not None and (
+                    loaded_at_version < self._cleared_version
+                    or self._tag_versions.get(_table_tag(table_name), 0) > loaded_at_version
+            ):
+                return
+            expires_at = None if self.ttl is None else time.monotonic() + self.ttl
+            self._entries[self.key(table_name, schema_name)] = (schema, expires_at)
+
+    def invalidate_tables(self, tables: Iterable[str]) -> int:
+        """
+        Drop the entries of tables (any schema), and of the partitioned
+        tables they are partitions of.
+
+        Returns:
+            Number of entries removed.
+        """
+        tags = {_table_tag(table) for table in tables}
+        removed = 0
+        with self._lock:
+            self._version += 1
+            for tag in tags:
+                self._tag_versions[tag] = self._version
+            for key, (schema, _) in list(self._entries.items()):
+                if _table_tag(key[1]) in tags or (
+                        schema is not None and any(_table_tag(name) in tags for name in schema.partitions)
+                ):
+                    del self._entries[key]
+                    self._tag_versions[_table_tag(key[1])] = self._version
+                    removed += 1
+            self._stats.invalidations += removed
+        return removed
+
+    def invalidate_for_sql(self, sql_query: str) -> int:
+        """Drop the entries a DDL statement may have changed (nothing for other statements)."""
+        tables = extract_ddl_tables(sql_query)
+        if tables is None:
+            return 0
+        if not tables:
+            removed = len(self._entries)
+            self.clear()
+            return removed
+        return self.invalidate_tables(tables)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._version += 1
+            self._cleared_version = self._version
+            self._stats.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def get_stats(self) -> SchemaCacheStats:
+        """Get a snapshot of the cache counters."""
+        with self._lock:
+            return SchemaCacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                invalidations=self._stats.invalidations,
+                entries=len(self._entries)
+            )
@@ -0,0 +1,164 @@
+"""
+Library-level prepared statement cache for asyncpg connections.
+
+Each pooled connection gets its own StatementCache, an LRU of prepared
+statements keyed by SQL text. Unlike asyncpg's built-in per-connection
+cache, its capacity is set per connector and its hits, misses, evictions
+and re-prepares are counted in a shared StatementCacheStats.
+
+Statements registered with PostgresConnectorAsyncPool.prepare() are pinned:
+they are never evicted, so hot queries are parsed once per connection.
+
+Usage:
+    from postgres_helpers.postgres_async_pool import PostgresConnectorAsyncPool
+
+    async with PostgresConnectorAsyncPool(statement_cache_size=200) as db:
+        await db.prepare("user_by_id", "SELECT * FROM users WHERE id = $1")
+        user = await db.fetch_one_as_dict("SELECT * FROM users WHERE id = $1", (1,))
+        print(db.get_statement_cache_stats())
+"""
+
+import inspect
+import itertools
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence
+
+import asyncpg
+from asyncpg.connection import Connection
+from asyncpg.prepared_stmt import PreparedStatement
+
+from postgres_helpers.results import StatementCacheStats
+
+# Errors raised by a prepared statement whose plan or result types changed
+# after a schema change. The statement must be prepared again.
+STALE_STATEMENT_ERRORS = (
+    asyncpg.exceptions.InvalidCachedStatementError,
+    asyncpg.exceptions.OutdatedSchemaCacheError,
+)
+
+# Whether PreparedStatement can wrap the state of another one, see
+# StatementCache._bind(). Otherwise cached statements are prepared again
+# on each checkout of their connection.
+_CAN_REBIND = list(inspect.signature(PreparedStatement.__init__).parameters) == [
+    "self", "connection", "query", "state"
+]
+
+
+class CachingConnection(Connection):
+    """asyncpg Connection carrying a library-level StatementCache."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.statement_cache: Optional["StatementCache"] = None
+
+
+class StatementCache:
+    """
+    LRU cache of prepared statements for a single connection.
+
+    Args:
+        connection: The raw connection owning the statements.
+        capacity: Maximum number of unpinned statements kept.
+        stats: Counters shared by all caches of a connector.
+        pinned: SQL text -> registered name of statements never evicted.
+    """
+
+    def __init__(
+            self,
+            connection: Connection,
+            capacity: int,
+            stats: StatementCacheStats,
+            pinned: Dict[str, str]
+    ):
+        self._connection = weakref.ref(connection)
+        self._capacity = capacity
+        self._stats = stats
+        self._pinned = pinned
+        self._statements: "OrderedDict[str, PreparedStatement]" = OrderedDict()
+        self._names = itertools.count(1)
+
+    def __len__(self) -> int:
+        return len(self._statements)
+
+    def __contains__(self, sql_query: str) -> bool:
+        return sql_query in self._statements
+
+    async def get(self, sql_query: str) -> PreparedStatement:
+        """Return the prepared statement for sql_query, preparing it on a miss."""
+        statement = self._statements.get(sql_query)
+        if statement is not None:
+            self._statements.move_to_end(sql_query)
+            bound = self._bind(statement, sql_query)
+            if bound is not None:
+                self._stats.hits += 1
+                return bound
+            self._stats.reprepares += 1
+            return await self._prepare(sql_query)
+
+        self._stats.misses += 1
+        return await self._prepare(sql_query)
+
+    async def run(self, method: str, sql_query: str, params: Sequence[Any]) -> Any:
+        """
+        Run a statement with `method` ("execute", "fetch", "fetchrow", "fetchval").
+
+        A statement invalidated by a schema change is prepared again and
+        retried once, unless the connection is inside a transaction (which
+        the failed statement has already aborted).
+        """
+        statement = await self.get(sql_query)
+        try:
+            return await _call(statement, method, params)
+        except STALE_STATEMENT_ERRORS:
+            connection = self._connection()
+            if connection is None or connection.is_in_transaction():
+                raise
+            self._statements.pop(sql_query, None)
+            self._stats.reprepares += 1
+            statement = await self._prepare(sql_query)
+            return await _call(statement, method, params)
+
+    def discard(self, sql_query: str) -> None:
+        """Drop a statement from the cache (it is closed by asyncpg)."""
+        self._statements.pop(sql_query, None)
+
+    async def _prepare(self, sql_query: str) -> PreparedStatement:
+        connection = self._connection()
+        statement = await connection.prepare(sql_query, name=f"__ph_stmt_{next(self._names)}")
+        self._statements[sql_query] = statement
+
+        name = self._pinned.get(sql_query)
+        if name is not None:
+            self._stats.prepares_by_name[name] = self._stats.prepares_by_name.get(name, 0) + 1
+
+        self._evict()
+        return statement
+
+    def _evict(self) -> None:
+        unpinned = [sql for sql in self._statements if sql not in self._pinned]
+        for sql_query in unpinned[:max(0, len(unpinned) - self._capacity)]:
+            del self._statements[sql_query]
+            self._stats.evictions += 1
+
+    def _bind(self, statement: PreparedStatement, sql_query: str) -> Optional[PreparedStatement]:
+        """
+        The cached statement, usable in the current checkout of the connection.
+
+        asyncpg refuses to use a PreparedStatement once its connection has
+        been released to the pool. The cached object keeps the server-side
+        statement alive; a fresh wrapper binds it to the current checkout.
+        That relies on asyncpg internals (_state, the constructor): when
+        they differ, None is returned and the statement is prepared again.
+        """
+        state = getattr(statement, "_state", None)
+        if not _CAN_REBIND or state is None:
+            return None
+        return PreparedStatement(self._connection(), sql_query, state)
+
+
+async def _call(statement: PreparedStatement, method: str, params: Sequence[Any]) -> Any:
+    if method == "execute":
+        await statement.fetch(*params)
+        return statement.get_statusmsg()
+    return await getattr(statement, method)(*params)
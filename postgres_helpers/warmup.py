@@ -0,0 +1,144 @@
+"""
+Warm-up of pooled connections before the first request.
+
+A WarmupSpec given to PostgresConnectorAsyncPool or PostgresConnectorPool is
+applied to every connection the pool opens:
+
+- session_settings are sent with the connection startup (server_settings
+  for asyncpg, `options` for psycopg2), so they cost no round trip and
+  survive the RESET ALL asyncpg runs when a connection goes back to the pool,
+- codecs are called with the new connection (awaited if they return an
+  awaitable), e.g. to register type codecs,
+- prepare statements are prepared on it.
+
+The pool_size_min connections opened when the pool is created are warmed
+concurrently before __aenter__/__enter__ returns, and the time spent in
+each step is reported in the connector's warmup_report.
+
+Usage:
+    from postgres_helpers.warmup import WarmupSpec
+
+    async def jsonb_codec(conn):
+        await conn.set_type_codec("jsonb", encoder=json.dumps, decoder=json.loads, schema="pg_catalog")
+
+    spec = WarmupSpec(
+        session_settings={"statement_timeout": "5s", "search_path": "app,public"},
+        codecs=[jsonb_codec],
+        prepare={"user_by_id": "SELECT * FROM users WHERE id = $1"}
+    )
+    async with PostgresConnectorAsyncPool(warmup=spec, statement_cache_size=100) as db:
+        print(db.warmup_report)
+
+    # Sync pool: codecs take the psycopg2 connection
+    spec = WarmupSpec(codecs=[lambda conn: psycopg2.extras.register_uuid(conn_or_curs=conn)])
+"""
+
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from postgres_helpers.results import WarmupReport
+
+WARMUP_STEPS = ("connect", "codecs", "prepare")
+
+
+@dataclass
+class WarmupSpec:
+    """
+    Setup applied to every new pooled connection.
+
+    Attributes:
+        session_settings: Run-time parameters set for the session
+                          ({"statement_timeout": "5s"}).
+        codecs: Callables receiving each new connection. Async pool:
+                coroutine functions or plain functions; sync pool: plain
+                functions, e.g. lambda conn: register_uuid(conn_or_curs=conn)
+                (register_uuid's first parameter is oids, not the connection).
+        prepare: Hot statements prepared on every connection, name -> SQL.
+                 Async pool: the SQL text exactly as later passed to the
+                 query methods, pinned in the statement cache (see
+                 PostgresConnectorAsyncPool.prepare()). Sync pool: prepared
+                 server-side with PREPARE name AS ..., written with $1, $2
+                 placeholders and run with EXECUTE name (%s, ...); names
+                 must be plain SQL identifiers.
+    """
+    session_settings: Dict[str, str] = field(default_factory=dict)
+    codecs: Sequence[Callable[[Any], Any]] = ()
+    prepare: Dict[str, str] = field(default_factory=dict)
+
+
+# Statement names PREPARE takes unquoted, as EXECUTE name refers to them
+_STATEMENT_NAME = re.compile(r"[A-Za-z_][A-Za-z0-9_$]*\Z")
+
+
+def prepare_sql(name: str, sql_query: str) -> str:
+    """
+    PREPARE statement of the sync pool warm-up.
+
+    Raises:
+        ValueError: If name is not a plain SQL identifier.
+    """
+    if not _STATEMENT_NAME.match(name):
+        raise ValueError(f"Prepared statement name {name!r} is not a plain SQL identifier")
+    return f"PREPARE {name} AS {sql_query}"
+
+
+def session_options(settings: Dict[str, str]) -> str:
+    """libpq `options` string setting run-time parameters: -c name=value ..."""
+    parts = []
+    for name, value in settings.items():
+        value = str(value).replace("\\", "\\\\").replace(" ", "\\ ")
+        parts.append(f"-c {name}={value}")
+    return " ".join(parts)
+
+
+class WarmupTimer:
+    """Per-connection step timings collected while a pool is created."""
+
+    def __init__(self):
+        self._started = time.perf_counter()
+        self._connections: List[Dict[str, float]] = []
+        self._lock = threading.Lock()
+
+    def connection(self, connect_seconds: Optional[float] = None) -> Dict[str, float]:
+        """
+        Start the timings of a new connection.
+
+        Args:
+            connect_seconds: Time its connect took; default: time since the
+                             pool creation started (connections are opened
+                             concurrently).
+        """
+        if connect_seconds is None:
+            connect_seconds = time.perf_counter() - self._started
+        timings = {"connect": connect_seconds}
+        with self._lock:
+            self._connections.append(timings)
+        return timings
+
+    def report(self) -> WarmupReport:
+        with self._lock:
+            connections = list(self._connections)
+        steps = {
+            step: max((timings.get(step, 0.0) for timings in connections), default=0.0)
+            for step in WARMUP_STEPS
+        }
+        return WarmupReport(
+            connections=len(connections),
+            total_seconds=time.perf_counter() - self._started,
+            steps=steps
+        )
+
+
+@contextmanager
+def timed_step(timings: Optional[Dict[str, float]], step: str) -> Iterator[None]:
+    """Add the duration of the block to timings[step] (no-op when timings is None)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings[step] = timings.get(step, 0.0) + time.perf_counter() - started
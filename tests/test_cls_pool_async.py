@@ -8,17 +8,28 @@ These tests demonstrate the new features:
 - Exception handling
 """
 
+import asyncio
+from decimal import Decimal
+
+import asyncpg
 import pytest
+from postgres_helpers.autoscale import AutoscalePolicy
+from postgres_helpers.bulk import build_insert_sql
+from postgres_helpers.json_codecs import JsonCodecs
 from postgres_helpers.postgres_async_pool import PostgresConnectorAsyncPool
+from postgres_helpers.result_cache import ResultCache
+from postgres_helpers.warmup import WarmupSpec
 from postgres_helpers.results import (
     QueryResult,
     InsertResult,
     UpsertResult,
-    ExecuteManyResult
+    ExecuteManyResult,
+    BatchResult
 )
 from postgres_helpers.exceptions import (
     UniqueViolationError,
     QueryExecutionError,
+    QueryTimeoutError,
     PostgresHelperError
 )
 
@@ -48,6 +59,30 @@ async def test_fetch_all_as_dicts():
         assert "version" in results[0]
 
 
+@pytest.mark.asyncio
+async def test_row_format():
+    """Test the tuple, record and generated row class formats."""
+    async with PostgresConnectorAsyncPool() as db:
+        sql = "SELECT g AS id, 'user ' || g AS name FROM generate_series(1, 3) AS g"
+
+        assert await db.fetch_all_as_dicts(sql, row_format="tuple") == [(1, "user 1"), (2, "user 2"), (3, "user 3")]
+        records = await db.fetch_all_as_dicts(sql, row_format="record")
+        assert isinstance(records[0], asyncpg.Record) and records[0]["name"] == "user 1"
+
+        rows = await db.fetch_all_as_dicts(sql, row_format="row")
+        assert rows[1].id == 2 and rows[1][1] == "user 2"
+        assert rows[1]._asdict() == {"id": 2, "name": "user 2"}
+        assert type(rows[0]) is type((await db.fetch_all_as_dicts(sql, row_format="row"))[0])
+
+        row = await db.fetch_one_as_dict(sql + " LIMIT 1", row_format="row")
+        assert row.name == "user 1"
+        streamed = [r async for r in db.fetch_iter(sql, batch_size=2, row_format="tuple")]
+        assert streamed == [(1, "user 1"), (2, "user 2"), (3, "user 3")]
+
+        with pytest.raises(ValueError):
+            await db.fetch_all_as_dicts(sql, row_format="namedtuple")
+
+
 @pytest.mark.asyncio
 async def test_fetch_all_as_df():
     """Test fetching results as DataFrame."""
@@ -56,6 +91,147 @@ async def test_fetch_all_as_df():
         assert len(df) == 1
         assert list(df.columns) == ["a", "b"]
 
+        # Empty results keep the column names
+        df = await db.fetch_all_as_df("SELECT 1 as a, 2 as b WHERE false")
+        assert len(df) == 0
+        assert list(df.columns) == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_fetch_iter():
+    """Test streaming rows through a server-side cursor."""
+    async with PostgresConnectorAsyncPool() as db:
+        sql = "SELECT g AS n FROM generate_series(1, $1) AS g"
+
+        rows = [row async for row in db.fetch_iter(sql, (25,), batch_size=10)]
+        assert rows == [{"n": i} for i in range(1, 26)]
+
+        batches = [batch async for batch in db.fetch_iter(sql, (25,), batch_size=10, as_batches=True)]
+        assert [len(batch) for batch in batches] == [10, 10, 5]
+
+        # Breaking out early releases the connection
+        async for row in db.fetch_iter(sql, (1000,), batch_size=10):
+            break
+        assert await db.fetch_value("SELECT 1") == 1
+
+
+@pytest.mark.asyncio
+async def test_iter_df():
+    """Test chunked DataFrames keeping the same dtypes in every chunk."""
+    async with PostgresConnectorAsyncPool() as db:
+        chunks = [
+            chunk async for chunk in db.iter_df("""
+                SELECT n AS id, CASE WHEN n > 20 THEN NULL ELSE n * 0.5::float8 END AS half,
+                       CASE WHEN n > 20 THEN NULL ELSE 'row ' || n END AS label
+                FROM generate_series(1, $1::int) AS n
+            """, (25,), chunk_rows=10)
+        ]
+
+        assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+        assert all((chunk.dtypes == chunks[0].dtypes).all() for chunk in chunks)
+        assert str(chunks[0]["id"].dtype) == "Int32"
+        assert chunks[2]["half"].isna().all()
+        assert sum(chunk["id"].sum() for chunk in chunks) == 325
+
+
+@pytest.mark.asyncio
+async def test_fetch_all_as_arrow():
+    """Test Arrow types mapped from the Postgres types, across several batches."""
+    pa = pytest.importorskip("pyarrow")
+    async with PostgresConnectorAsyncPool() as db:
+        table = await db.fetch_all_as_arrow("""
+            SELECT n AS id, n::numeric(10, 2) / 4 AS amount, n::numeric / 3 AS ratio,
+                   timestamptz '2024-01-01 12:00+02' AS at, gen_random_uuid() AS uid,
+                   jsonb_build_object('n', n) AS doc, ARRAY[n, n + 1] AS pair
+            FROM generate_series(1, 25) AS n
+        """, batch_size=10)
+
+        assert table.num_rows == 25
+        assert table.schema.field("id").type == pa.int32()
+        # asyncpg doesn't report numeric precision: inferred from the values
+        assert pa.types.is_decimal(table.schema.field("amount").type)
+        assert table.column("amount").to_pylist()[1] == Decimal("0.50")
+        assert pa.types.is_decimal(table.schema.field("ratio").type)
+        assert table.schema.field("at").type == pa.timestamp("us", tz="UTC")
+        assert table.schema.field("uid").type == pa.uuid()
+        assert table.schema.field("doc").type == pa.string()
+        assert table.schema.field("pair").type == pa.list_(pa.int32())
+        assert table.column("id").num_chunks == 3
+        assert table.slice(4, 1).to_pylist()[0]["pair"] == [5, 6]
+
+        nan = await db.fetch_all_as_arrow("SELECT x FROM (VALUES (1.5::numeric), ('NaN'::numeric)) AS v(x)")
+        assert nan.column("x").to_pylist() == [Decimal("1.5"), None]
+
+        empty = await db.fetch_all_as_arrow("SELECT 1::int8 AS id WHERE false")
+        assert empty.num_rows == 0
+        assert empty.schema.field("id").type == pa.int64()
+
+
+@pytest.mark.asyncio
+async def test_export_to_parquet(tmp_path):
+    """Test that the export writes row groups of row_group_rows rows, and one file per partition."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    sql = "SELECT n AS id, n % 3 AS bucket FROM generate_series(1, 2500) AS n"
+    async with PostgresConnectorAsyncPool() as db:
+        result = await db.export_to_parquet(sql, None, tmp_path / "out.parquet", row_group_rows=1000, batch_size=300)
+        assert result.rows == 2500 and result.row_groups == 3
+        assert pq.read_table(tmp_path / "out.parquet").column("id").to_pylist() == list(range(1, 2501))
+
+        result = await db.export_to_parquet(sql, None, tmp_path / "by_bucket", partition_by="bucket")
+        assert sorted(result.files) == [
+            str(tmp_path / "by_bucket" / f"bucket={bucket}" / "part-0.parquet") for bucket in range(3)
+        ]
+        assert result.rows_per_second > 0
+
+        # numeric growing past the first batch, and null in the whole first row group
+        sql = """
+            SELECT n AS id, (10::numeric ^ (n / 100))::numeric(40, 2) AS amount,
+                   CASE WHEN n > 2000 THEN n / 7.0 END AS late
+            FROM generate_series(1, 2500) AS n
+        """
+        await db.export_to_parquet(sql, None, tmp_path / "numeric.parquet", row_group_rows=1000, batch_size=300)
+        table = pq.read_table(tmp_path / "numeric.parquet")
+        assert table.column("amount").to_pylist()[-1] == Decimal(10) ** 25
+        late = table.column("late").to_pylist()
+        assert late[0] is None and float(late[-1]) == pytest.approx(2500 / 7)
+
+
+@pytest.mark.asyncio
+async def test_fetch_all_as_numpy():
+    """Test typed arrays from binary COPY, null handling and fetch_column."""
+    np = pytest.importorskip("numpy")
+    query = """
+        SELECT timestamp '2024-01-01' + n * interval '1 minute' AS ts,
+               n * 1.5::float8 AS price,
+               CASE WHEN n % 10 = 0 THEN NULL ELSE n::int8 END AS volume
+        FROM generate_series(1, $1::int) AS n
+    """
+    async with PostgresConnectorAsyncPool() as db:
+        ticks = await db.fetch_all_as_numpy(query, (100,))
+        assert ticks.dtype.names == ("ts", "price", "volume")
+        assert ticks["ts"].dtype == np.dtype("datetime64[us]")
+        assert ticks["ts"][0] == np.datetime64("2024-01-01T00:01")
+        assert ticks["price"].dtype == np.float64
+        assert ticks["price"][1] == 3.0
+        # int8 with nulls: float64 with NaN
+        assert ticks["volume"].dtype == np.float64
+        assert np.isnan(ticks["volume"][9])
+
+        masked = await db.fetch_all_as_numpy(query, (100,), nulls="mask")
+        assert masked["volume"].dtype == np.int64
+        assert masked["volume"].mask.sum() == 10
+        assert masked["volume"].sum() == sum(n for n in range(1, 101) if n % 10)
+
+        prices = await db.fetch_column(query, (100,), dtype="float32")
+        assert prices.dtype == np.float32 and len(prices) == 100
+
+        # Non fixed-width types: read row by row, as objects
+        mixed = await db.fetch_all_as_numpy("SELECT 1 AS id, 'a' AS name")
+        assert mixed["name"][0] == "a"
+
+        empty = await db.fetch_all_as_numpy(query, (0,))
+        assert len(empty) == 0 and empty["volume"].dtype == np.int64
+
 
 @pytest.mark.asyncio
 async def test_fetch_one_as_dict():
@@ -80,6 +256,96 @@ async def test_fetch_value():
         assert value is None
 
 
+@pytest.mark.asyncio
+async def test_statement_cache():
+    """Test the prepared statement cache counters, LRU eviction and pinning."""
+    async with PostgresConnectorAsyncPool(
+            pool_size_min=1, pool_size_max=2, statement_cache_size=2
+    ) as db:
+        hot_sql = "SELECT $1::int + 1 AS n"
+        await db.prepare("plus_one", hot_sql)
+
+        for i in range(10):
+            assert await db.fetch_value(hot_sql, (i,)) == i + 1
+
+        for i in range(5):
+            await db.fetch_value(f"SELECT $1::int + {i}", (i,))
+
+        stats = db.get_statement_cache_stats()
+        assert stats.hits >= 10
+        assert stats.evictions > 0
+        # The pinned statement was prepared at most once per connection
+        assert stats.prepares_by_name["plus_one"] <= 2
+        assert stats.capacity == 2
+
+
+@pytest.mark.asyncio
+async def test_result_cache():
+    """Test cached reads and their invalidation by writes to the table."""
+    cache = ResultCache()
+    async with PostgresConnectorAsyncPool(pool_size_min=1, pool_size_max=1, result_cache=cache) as db:
+        await db.execute_one_query("CREATE TEMP TABLE test_cache (id INT PRIMARY KEY)")
+        await db.insert_into_with_dict("test_cache", {"id": 1})
+
+        sql = "SELECT id FROM test_cache ORDER BY id"
+        assert await db.fetch_all_as_dicts(sql, cache_ttl=60) == [{"id": 1}]
+        assert await db.fetch_all_as_dicts(sql, cache_ttl=60) == [{"id": 1}]
+        assert cache.get_stats().hits == 1
+
+        # A write through the connector drops the cached result
+        await db.insert_into_with_dict("test_cache", {"id": 2})
+        assert await db.fetch_all_as_dicts(sql, cache_ttl=60) == [{"id": 1}, {"id": 2}]
+
+        await db.execute_one_query("DELETE FROM test_cache WHERE id = $1", (1,))
+        df = await db.fetch_all_as_df(sql, cache_ttl=60)
+        assert df["id"].tolist() == [2]
+
+        stats = cache.get_stats()
+        assert stats.invalidations >= 2
+        assert stats.entries == 1
+
+
+@pytest.mark.asyncio
+async def test_replica_routing():
+    """Test reads routed to a replica and writes kept on the primary."""
+    primary = PostgresConnectorAsyncPool()
+    # The primary itself stands in for a replica (it reports no replay lag)
+    dsn = (
+        f"postgresql://{primary.db_user}:{primary.db_password}"
+        f"@{primary.db_host}:{primary.db_port}/{primary.db_name}"
+    )
+    async with PostgresConnectorAsyncPool(
+            pool_size_min=1, pool_size_max=2,
+            replica_dsns=[dsn, dsn], replica_routing="least_busy", max_replica_lag=5
+    ) as db:
+        assert len(db.replica_pools) == 2
+
+        for _ in range(4):
+            assert await db.fetch_value("SELECT 1") == 1
+
+        status = db.get_replica_status()
+        assert [replica.in_rotation for replica in status] == [True, True]
+        assert all(replica.lag_seconds == 0 for replica in status)
+
+        assert await db._read_pool("SELECT 1") in db.replica_pools
+        assert await db._read_pool("INSERT INTO t VALUES (1) RETURNING id") is db.db_connection_pool
+
+    assert db.replica_pools == []
+
+
+@pytest.mark.asyncio
+async def test_replica_unreachable_at_startup():
+    """Test that a replica down at startup is left out of rotation instead of failing the pool."""
+    async with PostgresConnectorAsyncPool(
+            pool_size_min=1, pool_size_max=1,
+            replica_dsns=["postgresql://nobody@127.0.0.1:1/none"], replica_check_interval=60
+    ) as db:
+        assert db.replica_pools == [None]
+        assert [replica.in_rotation for replica in db.get_replica_status()] == [False]
+        assert await db._read_pool("SELECT 1") is db.db_connection_pool
+        assert await db.fetch_value("SELECT 1") == 1
+
+
 @pytest.mark.asyncio
 async def test_get_postgresql_version():
     """Test version retrieval."""
@@ -97,6 +363,128 @@ async def test_pool_status():
         assert status.pool_size is not None
 
 
+@pytest.mark.asyncio
+async def test_single_flight_pool_creation(monkeypatch):
+    """Test thousands of concurrent first calls building exactly one pool."""
+    created = []
+    create_pool = asyncpg.create_pool
+
+    async def counting_create_pool(*args, **kwargs):
+        created.append(kwargs.get("dsn"))
+        return await create_pool(*args, **kwargs)
+
+    monkeypatch.setattr(asyncpg, "create_pool", counting_create_pool)
+
+    db = PostgresConnectorAsyncPool(pool_size_min=1, pool_size_max=4, application_name="ph_single_flight")
+    try:
+        values = await asyncio.gather(*(db.fetch_value("SELECT 1") for _ in range(2000)))
+        assert values == [1] * 2000
+        assert created == [None]
+
+        backends = await db.fetch_value(
+            "SELECT count(*) FROM pg_stat_activity WHERE application_name = $1",
+            ("ph_single_flight",)
+        )
+        assert backends <= 4
+    finally:
+        await db.close_pool()
+
+
+@pytest.mark.asyncio
+async def test_autoscale():
+    """Test the pool growing under acquire-wait pressure, within its ceiling."""
+    policy = AutoscalePolicy(max_size=6, target_wait=0.001, check_interval=0, cooldown=60)
+    async with PostgresConnectorAsyncPool(pool_size_min=1, pool_size_max=2, autoscale=policy) as db:
+        await asyncio.gather(*(db.fetch_value("SELECT pg_sleep(0.05)") for _ in range(30)))
+
+        metrics = db.get_metrics()
+        assert 2 < metrics.pool_max <= 6
+        assert db.db_connection_pool.get_size() <= 6
+
+    with pytest.raises(ValueError):
+        PostgresConnectorAsyncPool(pool_size_max=10, autoscale=AutoscalePolicy(max_size=5))
+
+    db = PostgresConnectorAsyncPool(pool_size_min=8, pool_size_max=4)
+    assert db.pool_size_min == 4
+
+
+@pytest.mark.asyncio
+async def test_warmup():
+    """Test session settings, codecs and pre-prepared statements on every connection."""
+    registered = []
+
+    async def codec(conn):
+        registered.append(conn)
+
+    sql = "SELECT $1::int + 1"
+    spec = WarmupSpec(session_settings={"statement_timeout": "5s"}, codecs=[codec], prepare={"add_one": sql})
+    async with PostgresConnectorAsyncPool(
+            pool_size_min=2, pool_size_max=3, statement_cache_size=10, warmup=spec
+    ) as db:
+        assert db.warmup_report.connections == 2
+        assert len(registered) == 2
+        assert db.get_statement_cache_stats().prepares_by_name["add_one"] == 2
+
+        # RESET ALL on release keeps the startup settings
+        for _ in range(3):
+            assert await db.fetch_value("SHOW statement_timeout") == "5s"
+        assert await db.fetch_value(sql, (1,)) == 2
+        assert db.get_statement_cache_stats().prepares_by_name["add_one"] == 2
+
+
+@pytest.mark.asyncio
+async def test_json_codecs():
+    """Test json/jsonb decoded to Python objects and dict parameters encoded."""
+    async with PostgresConnectorAsyncPool(pool_size_min=1, pool_size_max=2, json_codecs=JsonCodecs()) as db:
+        assert await db.fetch_value("""SELECT '{"a": 1, "b": [1, 2]}'::jsonb""") == {"a": 1, "b": [1, 2]}
+        assert await db.fetch_value("""SELECT '[1, "x"]'::json""") == [1, "x"]
+        assert await db.fetch_value("SELECT $1::jsonb ->> 'k'", ({"k": "v"},)) == "v"
+
+    async with PostgresConnectorAsyncPool(pool_size_min=1, pool_size_max=1) as db:
+        assert await db.fetch_value("""SELECT '{"a": 1}'::jsonb""") == '{"a": 1}'
+
+
+@pytest.mark.asyncio
+async def test_json_codecs_copy():
+    """Test that binary COPY writes dicts to json/jsonb columns with the codecs."""
+    async with PostgresConnectorAsyncPool(pool_size_min=1, pool_size_max=1, json_codecs=JsonCodecs()) as db:
+        await db.execute_one_query("CREATE TEMP TABLE test_json_copy (id INT, doc JSONB, raw JSON)")
+        result = await db.bulk_insert_records(
+            "test_json_copy", ["id", "doc", "raw"],
+            [(1, {"a": 1, "b": [1, 2]}, {"x": "y"}), (2, [1, "x"], None)]
+        )
+        assert result.rows_affected == 2
+
+        rows = await db.fetch_all_as_dicts("SELECT doc, raw FROM test_json_copy ORDER BY id")
+        assert rows == [{"doc": {"a": 1, "b": [1, 2]}, "raw": {"x": "y"}}, {"doc": [1, "x"], "raw": None}]
+
+
+@pytest.mark.asyncio
+async def test_metrics():
+    """Test per-method metrics and pool gauges."""
+    async with PostgresConnectorAsyncPool(pool_size_min=1, pool_size_max=3) as db:
+        for _ in range(5):
+            rows = await db.fetch_all_as_dicts("SELECT generate_series(1, 10) AS n")
+            assert len(rows) == 10
+        with pytest.raises(QueryExecutionError):
+            await db.fetch_value("SELEKT 1")
+        # An array value is one row, not a list of rows
+        assert await db.fetch_value("SELECT ARRAY[1,2]") == [1, 2]
+
+        metrics = db.get_metrics(reset=True)
+        fetch = metrics.methods["fetch_all_as_dicts"]
+        assert fetch.calls == 5 and fetch.errors == 0
+        assert fetch.rows.max == 10
+        assert fetch.bytes.total > 0
+        assert 0 <= fetch.acquire_wait.p99 <= fetch.acquire_wait.max
+        assert metrics.methods["fetch_value"].errors == 1
+        assert metrics.methods["fetch_value"].rows.max == 1
+        assert metrics.pool_max == 3
+        assert 0 <= metrics.pool_saturation <= 1
+
+        assert db.get_metrics().methods == {}
+
+
 # =============================================================================
 # Query Execution Tests
 # =============================================================================
@@ -144,10 +532,185 @@ async def test_execute_many_query():
         assert count == 5
 
 
+@pytest.mark.asyncio
+async def test_bulk_insert_records():
+    """Test binary COPY bulk insert from tuples, dicts and async iterators."""
+    async with PostgresConnectorAsyncPool() as db:
+        await db.execute_one_query("""
+            CREATE TEMP TABLE test_bulk (id INT PRIMARY KEY, name TEXT)
+        """)
+
+        result = await db.bulk_insert_records(
+            "test_bulk",
+            ["id", "name"],
+            [(1, "a"), {"name": "b", "id": 2}]
+        )
+
+        assert isinstance(result, ExecuteManyResult)
+        assert result.success
+        assert result.rows_affected == 2
+
+        async def more_rows():
+            for i in range(3, 103):
+                yield (i, f"name_{i}")
+
+        result = await db.bulk_insert_records("test_bulk", ["id", "name"], more_rows())
+        assert result.rows_affected == 100
+
+        count = await db.fetch_value("SELECT COUNT(*) FROM test_bulk")
+        assert count == 102
+
+        with pytest.raises(UniqueViolationError):
+            await db.bulk_insert_records("test_bulk", ["id", "name"], [(1, "dup")])
+
+
+@pytest.mark.asyncio
+async def test_run_many():
+    """Test bounded fan-out: input order, per-item errors and concurrency."""
+    async with PostgresConnectorAsyncPool(pool_size_min=1, pool_size_max=4) as db:
+        jobs = [("SELECT $1::int * 2", (i,), "fetch_value") for i in range(20)]
+        jobs.append(("SELEKT 1", None, "fetch_value"))  # Intentional typo
+        jobs.append(("SELECT 1 AS one", None))  # mode defaults to fetch_all_as_dicts
+
+        batch = await db.run_many(jobs, max_concurrency=10)
+
+        assert isinstance(batch, BatchResult)
+        assert batch.values[:20] == [i * 2 for i in range(20)]
+        assert batch.values[21] == [{"one": 1}]
+        assert batch.failed == 1
+        assert isinstance(batch.items[20].error, QueryExecutionError)
+        assert batch.max_concurrency == 4
+        assert 1 <= batch.concurrency_achieved <= 4
+
+        with pytest.raises(ValueError):
+            await db.run_many([("SELECT 1", None, "fetch_everything")])
+
+
+@pytest.mark.asyncio
+async def test_loader():
+    """Test that keys requested in the same tick are loaded with one query."""
+    async with PostgresConnectorAsyncPool(pool_size_min=1, pool_size_max=1) as db:
+        await db.execute_one_query("CREATE TEMP TABLE test_loader (id INT PRIMARY KEY, name TEXT)")
+        await db.execute_one_query("INSERT INTO test_loader SELECT n, 'user ' || n FROM generate_series(1, 50) AS n")
+        db.get_metrics(reset=True)
+
+        users = db.loader("test_loader", columns=["id", "name"])
+        rows = await asyncio.gather(*(users.load(user_id) for user_id in [3, 1, 3, 404, *range(1, 51)]))
+
+        assert rows[0] == {"id": 3, "name": "user 3"}
+        assert rows[1]["name"] == "user 1"
+        assert rows[2] is rows[0]
+        assert rows[3] is None
+        assert db.get_metrics().methods["fetch_all_as_dicts"].calls == 1
+
+        # Cached for the life of the loader
+        assert await users.load(50) == {"id": 50, "name": "user 50"}
+        assert db.get_metrics().methods["fetch_all_as_dicts"].calls == 1
+
+        doubles = db.loader(sql_query="SELECT n AS id, n * 2 AS double FROM unnest($1::int[]) AS n", max_batch_size=2)
+        assert [row["double"] for row in await doubles.load_many([1, 2, 3])] == [2, 4, 6]
+
+        with pytest.raises(ValueError):
+            db.loader()
+
+
 # =============================================================================
 # Insert Methods Tests
 # =============================================================================
 
+@pytest.mark.asyncio
+async def test_write_df():
+    """Test loading a DataFrame with COPY, table creation and if_exists modes."""
+    import pandas as pd
+
+    df = pd.DataFrame({
+        "id": pd.array([1, 2, 3], dtype="Int32"),
+        "price": [1.5, None, 3.25],
+        "at": pd.to_datetime(["2024-01-01 10:00", None, "2024-01-03 00:00"]).tz_localize("UTC"),
+        "side": pd.Categorical(["buy", "sell", None]),
+        "note": ["a", None, "c"],
+    })
+    async with PostgresConnectorAsyncPool() as db:
+        await db.execute_one_query("DROP TABLE IF EXISTS test_write_df")
+        try:
+            result = await db.write_df(df, "test_write_df", chunk_rows=2)
+            assert result.rows_affected == 3
+
+            types = await db.fetch_all_as_dicts(
+                "SELECT column_name, data_type FROM information_schema.columns "
+                "WHERE table_name = 'test_write_df' ORDER BY ordinal_position"
+            )
+            assert [row["data_type"] for row in types] == [
+                "integer", "double precision", "timestamp with time zone", "text", "text"
+            ]
+            rows = await db.fetch_all_as_dicts("SELECT * FROM test_write_df ORDER BY id")
+            assert rows[1]["price"] is None and rows[1]["at"] is None
+            assert rows[2]["side"] is None and rows[0]["side"] == "buy"
+
+            await db.write_df(df, "test_write_df")
+            assert await db.fetch_value("SELECT count(*) FROM test_write_df") == 6
+            await db.write_df(df.head(1), "test_write_df", if_exists="truncate")
+            assert await db.fetch_value("SELECT count(*) FROM test_write_df") == 1
+            await db.write_df(df[["id"]], "test_write_df", if_exists="replace")
+            assert await db.fetch_all_as_dicts("SELECT * FROM test_write_df LIMIT 1") == [{"id": 1}]
+
+            with pytest.raises(ValueError):
+                await db.write_df(df, "test_write_df", if_exists="fail")
+        finally:
+            await db.execute_one_query("DROP TABLE IF EXISTS test_write_df")
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert():
+    """Test staged COPY upsert: insert/update counts and last-wins dedupe."""
+    async with PostgresConnectorAsyncPool(pool_size_min=1, pool_size_max=1) as db:
+        await db.execute_one_query("""
+            CREATE TEMP TABLE test_bulk_upsert (id INT PRIMARY KEY, name TEXT, hits INT DEFAULT 0)
+        """)
+        await db.insert_into_with_dict("test_bulk_upsert", {"id": 1, "name": "old", "hits": 5})
+
+        result = await db.bulk_upsert(
+            "test_bulk_upsert",
+            [
+                {"id": 1, "name": "new"},
+                {"id": 2, "name": "first"},
+                {"id": 2, "name": "last"},
+            ],
+            conflict_columns=["id"]
+        )
+
+        assert result.rows_staged == 3
+        assert result.inserted == 1
+        assert result.updated == 1
+        assert result.rows_affected == 2
+
+        rows = await db.fetch_all_as_dicts("SELECT id, name, hits FROM test_bulk_upsert ORDER BY id")
+        assert rows == [
+            {"id": 1, "name": "new", "hits": 5},  # hits not loaded, not overwritten
+            {"id": 2, "name": "last", "hits": 0},
+        ]
+
+        # Empty update_columns: existing rows are left untouched
+        result = await db.bulk_upsert(
+            "test_bulk_upsert", [(1, "ignored")], ["id"], update_columns=[], columns=["id", "name"]
+        )
+        assert (result.inserted, result.updated) == (0, 0)
+
+        # A NULL in a conflict column never conflicts: such rows are all kept
+        await db.execute_one_query(
+            "CREATE TEMP TABLE test_bulk_upsert_null (code TEXT, region TEXT, name TEXT, UNIQUE (code, region))"
+        )
+        result = await db.bulk_upsert(
+            "test_bulk_upsert_null",
+            [("a", None, "first"), ("a", None, "second"), ("a", "eu", "first"), ("a", "eu", "last")],
+            conflict_columns=["code", "region"],
+            columns=["code", "region", "name"]
+        )
+        assert (result.inserted, result.updated) == (3, 0)
+        names = await db.fetch_all_as_dicts("SELECT name FROM test_bulk_upsert_null ORDER BY region, name")
+        assert [row["name"] for row in names] == ["last", "first", "second"]
+
+
 @pytest.mark.asyncio
 async def test_insert_into_with_dict():
     """Test dictionary-based insert."""
@@ -172,6 +735,96 @@ async def test_insert_into_with_dict():
         assert result.was_inserted
         assert not result.was_duplicate
 
+        # Same keys in another order: same statement, values follow the columns
+        result = await db.insert_with_dict_returning(
+            "test_dict_insert",
+            {"name": "Other User", "email": "other@example.com"}
+        )
+        assert result.returning_row["email"] == "other@example.com"
+
+
+def test_insert_sql_key_order():
+    """Test that the insert statement text doesn't depend on the key order."""
+    query, params = build_insert_sql("t", {"b": 2, "a": 1}, "update", placeholder="%s")
+    assert query == build_insert_sql("t", {"a": 1, "b": 2}, "update", placeholder="%s")[0]
+    assert query == 'INSERT INTO "t" ("a", "b") VALUES (%s, %s) ON CONFLICT ON CONSTRAINT t_pkey DO UPDATE SET "a" = EXCLUDED."a", "b" = EXCLUDED."b"'
+    assert params == (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_listen_notify():
+    """Test that notifications reach listen() in batches, and those of a transaction on commit only."""
+    async with PostgresConnectorAsyncPool(pool_size_min=1, pool_size_max=2) as db:
+        listener = db.listen(["test_channel_a", "test_channel_b"], batch_window=0.2)
+        received = asyncio.ensure_future(listener.__anext__())
+        await asyncio.sleep(0.5)  # LISTEN runs on the first iteration
+
+        async with db.transaction():
+            await db.notify("test_channel_a", "1")
+            await db.notify("test_channel_b", "2")
+            await db.notify("test_channel_a", "1")
+        batch = await asyncio.wait_for(received, 5)
+        assert [(n.channel, n.payload) for n in batch] == [("test_channel_a", "1"), ("test_channel_b", "2")]
+
+        with pytest.raises(ZeroDivisionError):
+            async with db.transaction():
+                await db.notify("test_channel_a", "rolled back")
+                1 / 0
+        await db.notify("test_channel_b", "3")
+        batch = await asyncio.wait_for(listener.__anext__(), 5)
+        assert [n.payload for n in batch] == ["3"]
+
+        await listener.aclose()
+
+
+@pytest.mark.asyncio
+async def test_transaction_timeout_notify():
+    """Test that notifications of a transaction with a timeout are held until the commit."""
+    async with PostgresConnectorAsyncPool(pool_size_min=1, pool_size_max=2) as db:
+        listener = db.listen("test_channel_timeout", batch_window=0.2)
+        received = asyncio.ensure_future(listener.__anext__())
+        await asyncio.sleep(0.5)
+
+        async with db.transaction(timeout=5) as conn:
+            await db.notify("test_channel_timeout", "1")
+            await conn.execute("SELECT pg_sleep(0.3)")
+            assert not received.done()
+        batch = await asyncio.wait_for(received, 5)
+        assert [n.payload for n in batch] == ["1"]
+
+        await listener.aclose()
+
+
+@pytest.mark.asyncio
+async def test_schema_cache():
+    """Test that table metadata is cached and dropped by DDL."""
+    async with PostgresConnectorAsyncPool(pool_size_min=1, pool_size_max=1) as db:
+        await db.execute_one_query("""
+            CREATE TEMP TABLE test_schema (
+                id SERIAL,
+                email TEXT NOT NULL UNIQUE,
+                CONSTRAINT test_schema_id PRIMARY KEY (id)
+            )
+        """)
+
+        schema = await db.get_table_schema("test_schema")
+        assert list(schema.columns) == ["id", "email"]
+        assert schema.columns["email"].not_null
+        assert schema.primary_key == "test_schema_id"
+        assert schema.constraint_for(["email"]) == "test_schema_email_key"
+        assert await db.get_table_schema("test_schema") is schema
+
+        # The upsert uses the actual primary key, not "test_schema_pkey"
+        result = await db.insert_into_with_dict_update_returning("test_schema", {"id": 1, "email": "a@example.com"})
+        assert result.was_inserted
+
+        await db.execute_one_query("ALTER TABLE test_schema ADD COLUMN name TEXT")
+        assert "name" in (await db.get_table_schema("test_schema")).columns
+
+        assert await db.get_table_schema("test_schema_new") is None
+        await db.execute_one_query("CREATE TEMP TABLE test_schema_new (id INT)")
+        assert await db.get_table_schema("test_schema_new") is not None
+
 
 @pytest.mark.asyncio
 async def test_insert_into_with_dict_duplicate_ignored():
@@ -246,6 +899,89 @@ async def test_insert_with_dict_returning():
         assert result.last_inserted_id == result.returning_row["id"]
 
 
+@pytest.mark.asyncio
+async def test_insert_many_with_dict():
+    """Test unnest multi-row insert: grouping, arrays and RETURNING order."""
+    async with PostgresConnectorAsyncPool(pool_size_min=1, pool_size_max=1) as db:
+        await db.execute_one_query("""
+            CREATE TEMP TABLE test_many (
+                id SERIAL PRIMARY KEY,
+                email TEXT UNIQUE,
+                name TEXT,
+                tags TEXT[]
+            )
+        """)
+        await db.insert_into_with_dict("test_many", {"email": "dup@example.com"})
+
+        rows = [
+            {"email": "a@example.com", "name": "A"},
+            {"email": "b@example.com", "tags": ["x", "y"]},
+            {"email": "dup@example.com", "name": "Dup"},
+            {"email": "c@example.com", "name": "C"},
+        ]
+        result = await db.insert_many_with_dict("test_many", rows, returning=["id", "email"])
+
+        assert result.statements == 2
+        assert result.rows_affected == 3
+        assert result.duplicates == 1
+        emails = [row["email"] if row else None for row in result.returning_rows]
+        assert emails == ["a@example.com", "b@example.com", None, "c@example.com"]
+        assert set(result.returning_rows[0]) == {"id", "email"}
+
+        tags = await db.fetch_value("SELECT tags FROM test_many WHERE email = $1", ("b@example.com",))
+        assert tags == ["x", "y"]
+
+        with pytest.raises(UniqueViolationError):
+            await db.insert_many_with_dict(
+                "test_many", [{"email": "d@example.com"}, {"email": "a@example.com"}],
+                on_duplicate_ignore=False
+            )
+        # The failed batch was rolled back as a whole
+        assert await db.fetch_value("SELECT COUNT(*) FROM test_many WHERE email = 'd@example.com'") == 0
+
+
+@pytest.mark.asyncio
+async def test_insert_many_with_dict_returning_column():
+    """Test returning= as one column name, and dicts with the same keys in another order."""
+    async with PostgresConnectorAsyncPool(pool_size_min=1, pool_size_max=1) as db:
+        await db.execute_one_query(
+            "CREATE TEMP TABLE test_many_column (id SERIAL PRIMARY KEY, email TEXT UNIQUE, name TEXT)"
+        )
+        rows = [
+            {"email": "a@example.com", "name": "A"},
+            {"name": "B", "email": "b@example.com"},
+            {"email": "c@example.com", "name": "C"},
+        ]
+        result = await db.insert_many_with_dict("test_many_column", rows, on_duplicate_ignore=False, returning="id")
+
+        assert result.statements == 1
+        assert all(set(row) == {"id"} for row in result.returning_rows)
+        inserted = await db.fetch_all_as_dicts("SELECT id, email FROM test_many_column")
+        ids = {row["email"]: row["id"] for row in inserted}
+        assert [row["id"] for row in result.returning_rows] == [ids[row["email"]] for row in rows]
+
+
+@pytest.mark.asyncio
+async def test_insert_many_with_dict_coerced_returning():
+    """Test that RETURNING rows are matched to the input when the server coerces the values."""
+    async with PostgresConnectorAsyncPool(pool_size_min=1, pool_size_max=1) as db:
+        await db.execute_one_query("""
+            CREATE TEMP TABLE test_many_coerced (
+                id UUID PRIMARY KEY,
+                created TIMESTAMPTZ NOT NULL DEFAULT now()
+            )
+        """)
+        first = "00000000-0000-0000-0000-000000000001"
+        second = "00000000-0000-0000-0000-000000000002"
+        rows = [{"id": first}, {"id": first}, {"id": second}]
+        result = await db.insert_many_with_dict("test_many_coerced", rows, returning="*")
+
+        assert result.rows_affected == 2
+        ids = [str(row["id"]) if row else None for row in result.returning_rows]
+        assert ids == [first, None, second]
+        assert result.returning_rows[2]["created"] is not None
+
+
 @pytest.mark.asyncio
 async def test_insert_into_with_dict_update():
     """Test upsert functionality."""
@@ -414,6 +1150,50 @@ async def test_query_execution_error():
             await db.execute_one_query("SELEKT * FORM users")  # Intentional typo
 
 
+@pytest.mark.asyncio
+async def test_timeout_cancels_query():
+    """Test that timeout= cancels the statement and reports acquire/execute time."""
+    async with PostgresConnectorAsyncPool(pool_size_min=1, pool_size_max=1) as db:
+        with pytest.raises(QueryTimeoutError) as exc_info:
+            await db.fetch_value("SELECT pg_sleep(5)", timeout=0.2)
+        error = exc_info.value
+        assert error.timeout_seconds == pytest.approx(0.2, abs=0.01)
+        assert error.execute_seconds > 0
+        assert error.acquire_seconds + error.execute_seconds < 1
+
+        # The only connection is back in the pool and idle
+        assert await db.fetch_value("SELECT 1", timeout=1) == 1
+        running = await db.fetch_value(
+            "SELECT count(*) FROM pg_stat_activity WHERE query = 'SELECT pg_sleep(5)' AND state = 'active'"
+        )
+        assert running == 0
+
+        # Waiting for a connection counts against the budget
+        async with db.acquire_connection():
+            with pytest.raises(QueryTimeoutError) as exc_info:
+                await db.fetch_value("SELECT 1", timeout=0.1)
+        assert exc_info.value.acquire_seconds > 0.05
+
+
+@pytest.mark.asyncio
+async def test_timeout_fetch_iter_closed_elsewhere():
+    """Test that an iterator with a timeout can be closed from another task and keeps its budget to itself."""
+    async with PostgresConnectorAsyncPool(pool_size_min=1, pool_size_max=2) as db:
+        rows = db.fetch_iter("SELECT generate_series(1, 1000) AS n", timeout=5)
+        async for row in rows:
+            break
+        # Closed from another task, as the event loop's asyncgen finalizer does
+        await asyncio.create_task(rows.aclose())
+        assert await db.fetch_value("SELECT 1") == 1
+
+        # Calls made while holding a row don't run under the iterator's budget
+        rows = db.fetch_iter("SELECT generate_series(1, 1000) AS n", timeout=0.5)
+        async for row in rows:
+            assert await db.fetch_value("SELECT 1 FROM pg_sleep(0.8)") == 1
+            break
+        await asyncio.create_task(rows.aclose())
+
+
 # =============================================================================
 # Utility Tests
 # =============================================================================
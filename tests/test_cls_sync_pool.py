@@ -1,6 +1,11 @@
+import pytest
 from dotenv import load_dotenv
 
+from postgres_helpers.exceptions import QueryTimeoutError
+from postgres_helpers.json_codecs import JsonCodecs
 from postgres_helpers.postgres_sync_pool import PostgresConnectorPool
+from postgres_helpers.result_cache import ResultCache
+from postgres_helpers.warmup import WarmupSpec
 
 
 def test_fetch_as_dict():
@@ -16,6 +21,20 @@ def test_fetch_as_dict():
     assert len(my_results) > 0
 
 
+def test_row_format():
+    load_dotenv()
+    with PostgresConnectorPool() as db:
+        sql = "SELECT g AS id, 'user ' || g AS name FROM generate_series(1, 3) AS g"
+        assert db.fetch_all_as_dicts(sql, row_format="tuple")[0] == (1, "user 1")
+
+        rows = db.fetch_all_as_dicts(sql, row_format="row")
+        assert rows[2].name == "user 3" and rows[2][0] == 3
+        assert db.fetch_one_as_dict(sql + " LIMIT 1", row_format="row")._asdict() == {"id": 1, "name": "user 1"}
+
+        with pytest.raises(ValueError):
+            db.fetch_all_as_dicts(sql, row_format="record")
+
+
 def test_fetch_as_df():
     load_dotenv()
     my_postgres = PostgresConnectorPool()
@@ -29,6 +48,127 @@ def test_fetch_as_df():
     assert len(result_df) > 0
 
 
+def test_fetch_as_df_empty_keeps_columns():
+    load_dotenv()
+    my_postgres = PostgresConnectorPool()
+    result_df = my_postgres.fetch_all_as_df(
+        sql_query="SELECT 1 AS a, 'x' AS b WHERE false",
+    )
+
+    assert len(result_df) == 0
+    assert list(result_df.columns) == ['a', 'b']
+
+
+def test_iter_df():
+    load_dotenv()
+    with PostgresConnectorPool() as db:
+        chunks = list(db.iter_df(
+            "SELECT n AS id, CASE WHEN n > 5 THEN NULL ELSE n END::int8 AS value "
+            "FROM generate_series(1, %s) AS n",
+            (12,),
+            chunk_rows=5
+        ))
+
+    assert [len(chunk) for chunk in chunks] == [5, 5, 2]
+    assert all(str(chunk["value"].dtype) == "Int64" for chunk in chunks)
+    assert chunks[0]["value"].sum() == 15
+
+
+def test_fetch_as_arrow():
+    pa = pytest.importorskip("pyarrow")
+    load_dotenv()
+    with PostgresConnectorPool() as db:
+        table = db.fetch_all_as_arrow(
+            "SELECT n AS id, n::numeric(8, 3) AS amount, jsonb_build_object('n', n) AS doc "
+            "FROM generate_series(1, %s) AS n",
+            (25,),
+            batch_size=10
+        )
+
+    assert table.num_rows == 25
+    assert table.schema.field("id").type == pa.int32()
+    assert table.schema.field("amount").type == pa.decimal128(8, 3)
+    assert table.column("doc").to_pylist()[0] == '{"n": 1}'
+
+
+def test_fetch_as_numpy():
+    load_dotenv()
+    with PostgresConnectorPool() as db:
+        ticks = db.fetch_all_as_numpy(
+            "SELECT n AS id, CASE WHEN n = 2 THEN NULL ELSE n / 2.0 END AS half, "
+            "date '2024-01-01' + n AS day FROM generate_series(1, %s) AS n",
+            (3,)
+        )
+        volumes = db.fetch_column("SELECT n::int2 FROM generate_series(1, 5) AS n", dtype="float64")
+
+    assert ticks["id"].tolist() == [1, 2, 3]
+    assert str(ticks["day"].dtype) == "datetime64[D]"
+    assert str(ticks["day"][0]) == "2024-01-02"
+    assert ticks["half"][0] == 0.5 and ticks["half"][1] != ticks["half"][1]
+    assert volumes.tolist() == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+
+def test_warmup():
+    load_dotenv()
+    registered = []
+    spec = WarmupSpec(
+        session_settings={"statement_timeout": "5s"},
+        codecs=[registered.append],
+        prepare={"ph_warm_add": "SELECT $1::int + 1 AS n"}
+    )
+    with PostgresConnectorPool(pool_size_min=2, pool_size_max=3, warmup=spec) as db:
+        assert db.warmup_report.connections == 2
+        assert set(db.warmup_report.steps) == {"connect", "codecs", "prepare"}
+        assert len(registered) == 2
+
+        assert db.fetch_value("SHOW statement_timeout") == "5s"
+        assert db.fetch_value("EXECUTE ph_warm_add (%s)", (41,)) == 42
+
+
+def test_json_codecs():
+    load_dotenv()
+    with PostgresConnectorPool(pool_size_min=1, pool_size_max=2, json_codecs=JsonCodecs(adapt_dicts=True)) as db:
+        assert db.fetch_value("""SELECT '{"a": 1, "b": [1, 2]}'::jsonb""") == {"a": 1, "b": [1, 2]}
+        assert db.fetch_value("SELECT %s::jsonb ->> 'k'", ({"k": "v"},)) == "v"
+
+
+def test_schema_cache():
+    load_dotenv()
+    with PostgresConnectorPool(pool_size_min=1, pool_size_max=1) as db:
+        db.execute_one_query("CREATE TEMP TABLE test_schema (id INT PRIMARY KEY, email TEXT UNIQUE)")
+
+        schema = db.get_table_schema("test_schema")
+        assert schema.primary_key_columns == ["id"]
+        assert schema.column_types == {"id": "integer", "email": "text"}
+        assert db.get_table_schema("test_schema") is schema
+
+        db.execute_one_query("ALTER TABLE test_schema ADD COLUMN name TEXT")
+        assert "name" in db.get_table_schema("test_schema").columns
+
+
+def test_timeout_cancels_query():
+    load_dotenv()
+    with PostgresConnectorPool(pool_size_min=1, pool_size_max=1) as db:
+        with pytest.raises(QueryTimeoutError) as exc_info:
+            db.fetch_value("SELECT pg_sleep(5)", timeout=0.2)
+        assert exc_info.value.execute_seconds < 1
+
+        # The cancelled connection went back to the pool and is usable
+        assert db.fetch_value("SELECT 1", timeout=1) == 1
+
+
+def test_metrics():
+    load_dotenv()
+    with PostgresConnectorPool(pool_size_min=1, pool_size_max=1, result_cache=ResultCache()) as db:
+        # An array value is one row, not a list of rows
+        assert db.fetch_value("SELECT ARRAY[1,2]") == [1, 2]
+        assert db.fetch_value("SELECT ARRAY[1,NULL]", cache_ttl=60) == [1, None]
+
+        fetch = db.get_metrics().methods["fetch_value"]
+        assert fetch.calls == 2 and fetch.errors == 0
+        assert fetch.rows.max == 1
+
+
 def test_create_insert_delete():
     load_dotenv()
     database_name = 'test_db'
@@ -73,5 +213,37 @@ def test_create_insert_delete():
     print(f'drop database :', result)
 
 
+def test_bulk_upsert():
+    load_dotenv()
+    table_name = 'test_bulk_upsert'
+    my_postgres = PostgresConnectorPool()
+    my_postgres.execute_one_query(f"DROP TABLE IF EXISTS {table_name}")
+    my_postgres.execute_one_query(f"CREATE TABLE {table_name} (id INT PRIMARY KEY, name TEXT, tags TEXT[])")
+
+    try:
+        result = my_postgres.bulk_upsert(
+            table_name,
+            [{'id': 1, 'name': 'a\tb', 'tags': ['x']}, {'id': 2, 'name': None, 'tags': []}],
+            conflict_columns=['id']
+        )
+        assert (result.inserted, result.updated) == (2, 0)
+
+        # id 2 appears twice: the last occurrence wins
+        result = my_postgres.bulk_upsert(
+            table_name,
+            iter([(2, 'first', None), (3, 'c', None), (2, 'last', None)]),
+            conflict_columns=['id'],
+            columns=['id', 'name', 'tags']
+        )
+        assert result.rows_staged == 3
+        assert (result.inserted, result.updated) == (1, 1)
+
+        rows = my_postgres.fetch_all_as_dicts(f"SELECT * FROM {table_name} ORDER BY id")
+        assert [row['name'] for row in rows] == ['a\tb', 'last', 'c']
+        assert rows[0]['tags'] == ['x']
+    finally:
+        my_postgres.execute_one_query(f"DROP TABLE IF EXISTS {table_name}")
+
+
 if __name__ == '__main__':
     test_create_insert_delete()